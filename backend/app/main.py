@@ -1,3 +1,4 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
@@ -18,10 +19,39 @@ from app.shared.core.startup_diagnostics import (
     log_bootstrap_diagnostics,
     log_runtime_diagnostics,
 )
+from app.shared.core.startup_timing import begin_startup_report
 from app.shared.infrastructure import initialize_infrastructure, shutdown_infrastructure
 from app.shared.infrastructure.bootstrap import initialize_beanie, validate_workflow_consistency
 from app.shared.kafka.health import check_kafka_health
 from app.shared.middleware import RequestLoggingMiddleware, AuditLogMiddleware
+from app.shared.service import CURSOR_HEADER
+
+# Redis 初始化超时（秒），超时后不阻断启动
+REDIS_INIT_TIMEOUT_SECONDS = 8
+
+
+async def _initialize_redis() -> None:
+    """初始化 Redis 连接池并订阅广播（超时或失败只告警，不阻断服务启动）。"""
+    from app.shared.redis.service import init_redis
+
+    try:
+        await asyncio.wait_for(asyncio.to_thread(init_redis), timeout=REDIS_INIT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        log.warning("Redis 连接池初始化超时（非阻塞，将继续启动）")
+        return
+    except Exception as e:
+        log.warning("Redis 连接池初始化失败（非阻塞，将继续启动）: {}", e)
+        return
+    log.success("Redis 连接池初始化完成")
+    # 订阅配置变更广播，其他实例修改运行时配置后本实例即时失效配置快照
+    from app.modules.system_config.service.config_snapshot import start_config_change_listener
+    start_config_change_listener()
+    # 订阅用户变更广播，其他实例修改用户后本实例即时失效用户目录缓存
+    from app.modules.auth.user_directory import start_user_change_listener
+    start_user_change_listener()
+    # 订阅 Kafka worker 广播的执行进度增量，供任务/计划进度推送端点使用
+    from app.modules.execution.application.progress_stream import start_progress_listener
+    start_progress_listener()
 
 
 @asynccontextmanager
@@ -35,33 +65,46 @@ async def lifespan(app: FastAPI):
     client = AsyncMongoClient(mongo_cfg.uri)
 
     runtime_loaded = False
+    report = begin_startup_report("api")
     try:
-        await client.admin.command('ping')
+        await report.step("mongo_ping", client.admin.command('ping'))
         log.success("MongoDB 连接成功")
 
         # 注入全局 Mongo 客户端，供需要底层访问或事务的代码使用
         set_mongo_client(client)
 
-        # 初始化 Beanie ODM，注册所有文档模型并确保索引
-        await initialize_beanie(client[mongo_cfg.db_name])
+        # 初始化 Beanie ODM，注册所有文档模型；索引按 SKIP_INDEX_SYNC 模式同步（默认跳过）
+        index_sync = await report.step("beanie_init", initialize_beanie(client[mongo_cfg.db_name]))
+        report.note("index_sync", index_sync)
         log.success("Beanie ODM 初始化完成")
 
         from app.modules.system_config.service import ConfigService
 
-        runtime_settings = await ConfigService.load_runtime_settings()
+        # 运行配置与 workflow 校验只依赖 Beanie，二者并发执行
+        runtime_settings, _ = await asyncio.gather(
+            report.step("runtime_settings", ConfigService.load_runtime_settings()),
+            report.step("workflow_consistency", validate_workflow_consistency()),
+        )
         runtime_loaded = True
         log.success("MongoDB 运行配置加载完成")
         log_runtime_diagnostics(runtime_settings)
-
-        await validate_workflow_consistency()
         log.success("Workflow 配置一致性校验通过")
 
-        # Kafka 基础设施检查（不阻塞启动）：Worker 心跳过期仅警告
-        log.info("正在检查 Kafka 基础设施状态...")
-        kafka_result = await check_kafka_health()
-        if not kafka_result.healthy:
+        # 以下步骤相互独立且都不阻断启动（Kafka 检查只告警、Redis/通知失败降级），并发执行
+        from app.modules.notification.service import NotificationService
+
+        log.info("正在初始化应用级基础设施，并检查 Kafka 基础设施状态...")
+        kafka_result, *_ = await asyncio.gather(
+            report.step("kafka_health", check_kafka_health(), required=False),
+            report.step("redis", _initialize_redis(), required=False),
+            report.step("infrastructure", initialize_infrastructure()),
+            report.step("notification_recovery", NotificationService.recover_pending(), required=False),
+        )
+        log.success("应用级基础设施初始化完成")
+        if kafka_result is None or not kafka_result.healthy:
+            detail = kafka_result.detail if kafka_result is not None else "健康检查异常"
             log.warning(
-                f"Kafka 基础设施不健康: {kafka_result.detail}\n"
+                f"Kafka 基础设施不健康: {detail}\n"
                 f"自动化执行结果将无法自动入库。仍可正常使用用例管理等其他功能。\n"
                 f"如需执行自动化测试，请先启动 Kafka Worker: "
                 f"python -m app.workers.kafka_worker_main"
@@ -69,39 +112,9 @@ async def lifespan(app: FastAPI):
         else:
             log.success(f"Kafka 基础设施健康检查通过 ({kafka_result.detail})")
 
+        report.finish()
         log.success("FastAPI 服务启动完成")
 
-        # Phase 6: 初始化应用级基础设施
-        log.info("正在初始化应用级基础设施...")
-        await initialize_infrastructure()
-        log.success("应用级基础设施初始化完成")
-
-        # 初始化 Redis 连接池（非阻塞：超时或失败不阻断服务启动）
-        try:
-            from app.shared.redis.service import init_redis
-            import concurrent.futures
-            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-            _fut = _executor.submit(init_redis)
-            try:
-                _fut.result(timeout=8)
-                log.success("Redis 连接池初始化完成")
-            except concurrent.futures.TimeoutError:
-                log.warning("Redis 连接池初始化超时（非阻塞，将继续启动）")
-            except Exception as e:
-                log.warning("Redis 连接池初始化失败（非阻塞，将继续启动）: {}", e)
-            finally:
-                _executor.shutdown(wait=False)
-        except Exception as e:
-            log.warning("Redis 连接池初始化异常（非阻塞）: {}", e)
-
-        # 恢复未发送的通知批次
-        from app.modules.notification.service import NotificationService
-        try:
-            await NotificationService.recover_pending()
-            log.success("通知批次恢复完成")
-        except Exception as e:
-            log.warning("通知批次恢复失败（非阻塞）: {}", e)
-
         yield
     finally:
         log.info("FastAPI 服务已关闭")
@@ -149,6 +162,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER],
 )
 # 全链路追踪中间件（始终启用，不受 APP_DEBUG 控制）
 app.add_middleware(RequestLoggingMiddleware)
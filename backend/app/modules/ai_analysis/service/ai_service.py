@@ -72,6 +72,7 @@ class AIService:
                 user_content=prompt,
                 temperature=float(ai_config.get("temperature", 0.3)),
                 max_tokens=int(ai_config.get("max_tokens", 2048)),
+                route="ai_analysis.pending_tasks",
             )
             result = AIClient._parse_json(content)
             if not isinstance(result, dict):
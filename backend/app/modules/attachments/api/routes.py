@@ -1,6 +1,8 @@
 from typing import Annotated, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from app.modules.attachments.schemas.attachment import (
     AttachmentInfo,
@@ -10,6 +12,11 @@ from app.modules.attachments.schemas.attachment import (
     UploadResponse,
 )
 from app.modules.attachments.service import AttachmentService
+from app.modules.attachments.service.streaming import (
+    RangeNotSatisfiableError,
+    UploadTooLargeError,
+    parse_range_header,
+)
 from app.modules.attachments.application import is_attachment_referenced
 from app.shared.auth import get_current_user, get_user_permissions, is_admin_role, require_permission
 
@@ -41,16 +48,21 @@ async def _ensure_attachment_access(attachment, current_user: dict) -> None:
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="permission denied")
 
 
-async def _read_limited_file(file: UploadFile, max_size: int = MAX_UPLOAD_SIZE) -> bytes:
-    content = bytearray()
-    while chunk := await file.read(1024 * 1024):
-        content.extend(chunk)
-        if len(content) > max_size:
-            raise HTTPException(
-                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
-                detail=f"文件大小超过限制（最大 {max_size // (1024 * 1024)}MB）",
-            )
-    return bytes(content)
+def _too_large(max_size: int = MAX_UPLOAD_SIZE) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"文件大小超过限制（最大 {max_size // (1024 * 1024)}MB）",
+    )
+
+
+def _ensure_declared_size(file: UploadFile, max_size: int = MAX_UPLOAD_SIZE) -> None:
+    """请求已声明文件大小时提前拒绝超限上传，未声明时由流式读取过程校验。"""
+    if file.size is not None and file.size > max_size:
+        raise _too_large(max_size)
+
+
+def _content_disposition(filename: str) -> str:
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
 
 
 @router.post(
@@ -64,15 +76,19 @@ async def upload_attachment(
     file: UploadFile = File(..., description="要上传的文件"),
     current_user: CurrentUser = None,
 ):
-    """上传附件到 MinIO 并保存元数据。"""
-    content = await _read_limited_file(file)
+    """流式上传附件到 MinIO 并保存元数据。"""
+    _ensure_declared_size(file)
     attachment_service = get_service()
-    return await attachment_service.upload_file(
-        filename=file.filename or "unknown",
-        content=content,
-        content_type=file.content_type or "application/octet-stream",
-        uploaded_by=current_user["user_id"],
-    )
+    try:
+        return await attachment_service.upload_stream(
+            filename=file.filename or "unknown",
+            stream=file.file,
+            content_type=file.content_type or "application/octet-stream",
+            uploaded_by=current_user["user_id"],
+            max_size=MAX_UPLOAD_SIZE,
+        )
+    except UploadTooLargeError:
+        raise _too_large()
 
 
 @router.get("/{file_id}", response_model=AttachmentInfo, summary="获取附件信息", dependencies=[READ_PERMISSION])
@@ -114,6 +130,47 @@ async def get_download_url(
     return DownloadResponse(download_url=download_url, expires_in=resolved_expires)
 
 
+@router.get("/{file_id}/content", summary="下载附件内容（支持 Range）", dependencies=[READ_PERMISSION])
+async def download_attachment_content(
+    file_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user: CurrentUser = None,
+):
+    """经后端代理流式下载附件，支持单段 HTTP Range 断点续传。"""
+    attachment_service = get_service()
+    attachment = await attachment_service.get_attachment(file_id)
+    if not attachment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"附件 {file_id} 不存在")
+
+    await _ensure_attachment_access(attachment, current_user)
+    try:
+        byte_range = parse_range_header(range_header, attachment.size)
+    except RangeNotSatisfiableError:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="请求的字节范围无效",
+            headers={"Content-Range": f"bytes */{attachment.size}"},
+        )
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": _content_disposition(attachment.original_filename),
+        "Content-Length": str(byte_range.length if byte_range else attachment.size),
+    }
+    if attachment.sha256:
+        headers["ETag"] = f'"{attachment.sha256}"'
+    if byte_range:
+        headers["Content-Range"] = byte_range.content_range(attachment.size)
+
+    chunks = await attachment_service.open_content_stream(attachment, byte_range)
+    return StreamingResponse(
+        chunks,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=attachment.content_type,
+        headers=headers,
+    )
+
+
 @router.delete("/{file_id}", response_model=DeleteResponse, summary="删除附件", dependencies=[DELETE_PERMISSION])
 async def delete_attachment(
     file_id: str,
@@ -1,3 +1,4 @@
+from .attachment_content import download_attachment_content, get_attachment_filename
 from .attachment_references import is_attachment_referenced
 
-__all__ = ["is_attachment_referenced"]
+__all__ = ["download_attachment_content", "get_attachment_filename", "is_attachment_referenced"]
@@ -0,0 +1,27 @@
+import asyncio
+from typing import BinaryIO
+
+from app.modules.attachments.repository.models import AttachmentDoc
+
+
+async def get_attachment_filename(file_id: str) -> str | None:
+    """返回未删除附件的原始文件名，不存在返回 None。"""
+    attachment = await AttachmentDoc.find_one({"file_id": file_id, "is_deleted": False})
+    return attachment.original_filename if attachment else None
+
+
+async def download_attachment_content(file_id: str, target: BinaryIO) -> str:
+    """把附件内容按块写入 target（通常是临时文件），返回原始文件名；附件不存在抛 KeyError。"""
+    from app.modules.attachments.service import AttachmentService
+
+    attachment = await AttachmentDoc.find_one({"file_id": file_id, "is_deleted": False})
+    if not attachment:
+        raise KeyError(f"attachment not found: {file_id}")
+    chunks = await AttachmentService().open_content_stream(attachment)
+
+    def _copy() -> None:
+        for chunk in chunks:
+            target.write(chunk)
+
+    await asyncio.to_thread(_copy)
+    return attachment.original_filename
@@ -1,8 +1,9 @@
 from .attachment import AttachmentDoc
+from .attachment_blob import AttachmentBlobDoc
 
-__all__ = ["AttachmentDoc", "DOCUMENT_MODELS"]
+__all__ = ["AttachmentBlobDoc", "AttachmentDoc", "DOCUMENT_MODELS"]
 
-DOCUMENT_MODELS = [AttachmentDoc]
+DOCUMENT_MODELS = [AttachmentDoc, AttachmentBlobDoc]
 
 from app.shared.infrastructure.document_registry import register_document_model
 
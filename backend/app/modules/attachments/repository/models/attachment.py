@@ -17,6 +17,10 @@ class AttachmentDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMixin)
     size: int = Field(description="文件大小（字节）")
     content_type: str = Field(description="MIME类型")
     sha256: Optional[str] = Field(default=None, description="文件 SHA256 校验和")
+    blob_sha256: Optional[str] = Field(
+        default=None,
+        description="共享内容对象的 SHA256（参与引用计数）；去重上线前的历史附件为空",
+    )
     uploaded_by: str = Field(description="上传人ID")
     uploaded_at: datetime = Field(description="上传时间")
     deleted_at: Optional[datetime] = Field(default=None, description="删除时间")
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+
+class AttachmentBlobDoc(Document):
+    """附件内容对象（按 SHA256 去重）
+
+    内容相同的附件共享同一个 MinIO 对象，ref_count 记录引用它的未删除附件数，
+    归零时删除对象。
+    """
+
+    sha256: str = Field(description="内容 SHA256（同一存储桶内唯一）")
+    bucket: str = Field(description="MinIO存储桶名称")
+    object_name: str = Field(description="MinIO对象名")
+    size: int = Field(description="文件大小（字节）")
+    ref_count: int = Field(default=0, description="引用该对象的未删除附件数")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "attachment_blobs"
+        indexes = [
+            IndexModel([("sha256", 1), ("bucket", 1)], unique=True),
+        ]
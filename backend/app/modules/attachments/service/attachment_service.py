@@ -1,12 +1,21 @@
 import asyncio
-import hashlib
+import io
 import uuid
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional
 
-from app.modules.attachments.repository.models import AttachmentDoc
+from pymongo import ReturnDocument
+
+from app.modules.attachments.repository.models import AttachmentBlobDoc, AttachmentDoc
 from app.modules.attachments.schemas.attachment import AttachmentInfo, UploadResponse
+from app.modules.attachments.service.streaming import (
+    ByteRange,
+    HashingReader,
+    UploadTooLargeError,
+    iter_object_chunks,
+)
+from app.shared.core.logger import log
 from app.shared.domain.exceptions import ConflictError
 from app.shared.minio import get_minio_client
 
@@ -43,6 +52,50 @@ class AttachmentService:
             download_url=download_url,
         )
 
+    @staticmethod
+    def _dispatch_payload(doc: AttachmentDoc) -> dict:
+        return {
+            "file_id": doc.file_id,
+            "original_filename": doc.original_filename,
+            "storage_path": f"{doc.bucket}/{doc.object_name}",
+            "bucket": doc.bucket,
+            "object_name": doc.object_name,
+            "size": doc.size,
+            "content_type": doc.content_type,
+            "sha256": doc.sha256,
+            "uploaded_at": doc.uploaded_at.isoformat() if doc.uploaded_at else None,
+        }
+
+    async def _load_active_docs(
+        self,
+        file_ids: List[str],
+        *,
+        skip_missing: bool = False,
+    ) -> dict[str, AttachmentDoc]:
+        """批量读取未删除附件；任一 file_id 不存在时抛出 KeyError（skip_missing=True 时只返回找到的）。"""
+        docs = await AttachmentDoc.find({
+            "file_id": {"$in": file_ids},
+            "is_deleted": False,
+        }).to_list()
+        doc_map = {doc.file_id: doc for doc in docs}
+        if not skip_missing:
+            for file_id in file_ids:
+                if file_id not in doc_map:
+                    raise KeyError(f"attachment not found or deleted: {file_id}")
+        return doc_map
+
+    async def presign_object_urls(
+        self,
+        object_names: Iterable[str],
+        expires_seconds: int | None = None,
+    ) -> dict[str, str]:
+        """批量获取预签名链接：先查进程内缓存，未命中的对象在一次线程切换中统一签名。"""
+        expires = self.resolve_expires_seconds(expires_seconds)
+        urls, misses = self.minio_client.cached_presigned_urls(object_names, expires)
+        if misses:
+            urls.update(await asyncio.to_thread(self.minio_client.presigned_get_objects, misses, expires))
+        return urls
+
     async def enrich_for_dispatch(
         self,
         file_ids: List[str],
@@ -51,51 +104,29 @@ class AttachmentService:
         if not file_ids:
             return []
 
-        docs = await AttachmentDoc.find({
-            "file_id": {"$in": file_ids},
-            "is_deleted": False,
-        }).to_list()
-        doc_map = {doc.file_id: doc for doc in docs}
+        doc_map = await self._load_active_docs(file_ids)
+        return [self._dispatch_payload(doc_map[file_id]) for file_id in file_ids]
 
-        enriched: List[dict] = []
-        for file_id in file_ids:
-            doc = doc_map.get(file_id)
-            if not doc:
-                raise KeyError(f"attachment not found or deleted: {file_id}")
-            enriched.append({
-                "file_id": doc.file_id,
-                "original_filename": doc.original_filename,
-                "storage_path": f"{doc.bucket}/{doc.object_name}",
-                "bucket": doc.bucket,
-                "object_name": doc.object_name,
-                "size": doc.size,
-                "content_type": doc.content_type,
-                "sha256": doc.sha256,
-                "uploaded_at": doc.uploaded_at.isoformat() if doc.uploaded_at else None,
-            })
-        return enriched
+    async def enrich_many(self, file_ids: List[str], *, skip_missing: bool = False) -> dict[str, dict]:
+        """批量 enrich 附件（含预签名下载链接），一次查询、一次批量签名。
 
-    async def enrich_single(self, file_id: str) -> dict:
-        """Enrich a single file for per-case dispatch, including a fresh presigned download URL."""
-        doc = await AttachmentDoc.find_one({"file_id": file_id, "is_deleted": False})
-        if not doc:
-            raise KeyError(f"attachment not found or deleted: {file_id}")
-        download_url = await asyncio.to_thread(
-            self.minio_client.presigned_get_object, doc.object_name
-        )
+        skip_missing=True 时不存在或已删除的附件不抛错，只是不出现在结果中，由调用方按条目处理。
+        """
+        unique_ids = list(dict.fromkeys(file_ids))
+        if not unique_ids:
+            return {}
+
+        doc_map = await self._load_active_docs(unique_ids, skip_missing=skip_missing)
+        urls = await self.presign_object_urls(doc.object_name for doc in doc_map.values())
         return {
-            "file_id": doc.file_id,
-            "original_filename": doc.original_filename,
-            "storage_path": f"{doc.bucket}/{doc.object_name}",
-            "bucket": doc.bucket,
-            "object_name": doc.object_name,
-            "size": doc.size,
-            "content_type": doc.content_type,
-            "sha256": doc.sha256,
-            "uploaded_at": doc.uploaded_at.isoformat() if doc.uploaded_at else None,
-            "download_url": download_url,
+            file_id: {**self._dispatch_payload(doc), "download_url": urls[doc.object_name]}
+            for file_id, doc in doc_map.items()
         }
 
+    async def enrich_single(self, file_id: str) -> dict:
+        """Enrich a single file for per-case dispatch, including a fresh presigned download URL."""
+        return (await self.enrich_many([file_id]))[file_id]
+
     async def upload_file(
         self,
         filename: str,
@@ -103,43 +134,77 @@ class AttachmentService:
         content_type: str,
         uploaded_by: str,
     ) -> UploadResponse:
-        """上传文件到 MinIO，并保存附件元数据。"""
+        """上传内存中的文件内容（小文件/内部调用），实际走流式上传路径。"""
+        return await self.upload_stream(
+            filename=filename,
+            stream=io.BytesIO(content),
+            content_type=content_type,
+            uploaded_by=uploaded_by,
+        )
+
+    async def upload_stream(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        content_type: str,
+        uploaded_by: str,
+        max_size: int | None = None,
+    ) -> UploadResponse:
+        """流式上传文件到 MinIO，并保存附件元数据。
+
+        MinIO 按分片从 stream 读取并上传，读取过程中同步计算 SHA256 与大小，
+        内存占用只与分片大小有关。超过 max_size 时中断上传并抛出 UploadTooLargeError。
+        """
         file_id = str(uuid.uuid4())
         extension = filename.rsplit(".", 1)[-1] if "." in filename else ""
         object_name = f"attachments/{file_id}.{extension}" if extension else f"attachments/{file_id}"
-        sha256_hash = hashlib.sha256(content).hexdigest()
         bucket = self.minio_client.get_bucket()
+        reader = HashingReader(stream, max_size=max_size)
         uploaded = False
+        blob_sha256: str | None = None
 
         try:
             await asyncio.to_thread(
-                self.minio_client.put_object,
+                self.minio_client.put_stream,
                 object_name=object_name,
-                data=content,
+                stream=reader,
                 content_type=content_type,
-                length=len(content),
             )
             uploaded = True
 
+            sha256 = reader.hexdigest()
+            blob = await self._acquire_blob(sha256, bucket, object_name, reader.size)
+            blob_sha256 = sha256
+            if blob["object_name"] != object_name:
+                # 相同内容已存在：引用已有对象，删除本次上传的副本
+                await self._remove_object_quietly(object_name)
+                uploaded = False
+                object_name = blob["object_name"]
+
             attachment = AttachmentDoc(
                 file_id=file_id,
                 original_filename=filename,
                 bucket=bucket,
                 object_name=object_name,
-                size=len(content),
+                size=reader.size,
                 content_type=content_type,
-                sha256=sha256_hash,
+                sha256=sha256,
+                blob_sha256=blob_sha256,
                 uploaded_by=uploaded_by,
                 uploaded_at=datetime.now(timezone.utc),
                 is_deleted=False,
             )
             await attachment.create()
+        except UploadTooLargeError:
+            raise
         except Exception as e:
-            if uploaded:
+            if blob_sha256 is not None:
                 try:
-                    await asyncio.to_thread(self.minio_client.remove_object, object_name)
+                    await self._release_blob(blob_sha256, bucket)
                 except Exception:
                     pass
+            elif uploaded:
+                await self._remove_object_quietly(object_name)
             raise RuntimeError(
                 f"Failed to upload file {file_id} for user {uploaded_by}: {e}"
             ) from e
@@ -148,12 +213,52 @@ class AttachmentService:
             file_id=file_id,
             original_filename=filename,
             storage_path=f"{bucket}/{object_name}",
-            size=len(content),
+            size=attachment.size,
             content_type=content_type,
-            sha256=sha256_hash,
+            sha256=attachment.sha256,
             uploaded_at=attachment.uploaded_at,
         )
 
+    @staticmethod
+    async def _acquire_blob(sha256: str, bucket: str, object_name: str, size: int) -> dict[str, Any]:
+        """按内容哈希登记对象并增加引用计数，返回生效的内容对象（可能是已有对象）。"""
+        return await AttachmentBlobDoc.get_pymongo_collection().find_one_and_update(
+            {"sha256": sha256, "bucket": bucket},
+            {
+                "$inc": {"ref_count": 1},
+                "$setOnInsert": {
+                    "object_name": object_name,
+                    "size": size,
+                    "created_at": datetime.now(timezone.utc),
+                },
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _release_blob(self, sha256: str, bucket: str) -> None:
+        """减少内容对象引用计数，归零时删除登记与 MinIO 对象。
+
+        删除登记时再次校验 ref_count，避免与并发上传的引用竞争。
+        """
+        collection = AttachmentBlobDoc.get_pymongo_collection()
+        blob = await collection.find_one_and_update(
+            {"sha256": sha256, "bucket": bucket},
+            {"$inc": {"ref_count": -1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if blob is None or blob["ref_count"] > 0:
+            return
+        result = await collection.delete_one({"_id": blob["_id"], "ref_count": {"$lte": 0}})
+        if result.deleted_count:
+            await self._remove_object_quietly(blob["object_name"])
+
+    async def _remove_object_quietly(self, object_name: str) -> None:
+        try:
+            await asyncio.to_thread(self.minio_client.remove_object, object_name)
+        except Exception as exc:
+            log.warning("attachments: 删除 MinIO 对象失败 object={} err={}", object_name, exc)
+
     async def get_attachment(self, file_id: str) -> Optional[AttachmentDoc]:
         """获取未删除附件文档。"""
         return await AttachmentDoc.find_one(
@@ -192,6 +297,12 @@ class AttachmentService:
         attachment.is_deleted = True
         attachment.deleted_at = datetime.now(timezone.utc)
         await attachment.update()
+        if attachment.blob_sha256:
+            try:
+                await self._release_blob(attachment.blob_sha256, attachment.bucket)
+            except Exception as exc:
+                # 引用计数偏高只会让对象晚回收，不影响删除结果
+                log.warning("attachments: 释放内容引用失败 file_id={} err={}", file_id, exc)
         return True
 
     async def get_download_url(
@@ -204,11 +315,24 @@ class AttachmentService:
         if not attachment:
             return None
 
-        return await asyncio.to_thread(
-            self.minio_client.presigned_get_object,
+        urls = await self.presign_object_urls([attachment.object_name], expires_seconds)
+        return urls[attachment.object_name]
+
+    async def open_content_stream(
+        self,
+        attachment: AttachmentDoc,
+        byte_range: ByteRange | None = None,
+    ) -> Iterator[bytes]:
+        """打开附件内容流（可指定字节范围），供下载代理按块转发。"""
+        offset = byte_range.start if byte_range else 0
+        length = byte_range.length if byte_range else 0
+        response = await asyncio.to_thread(
+            self.minio_client.get_object_stream,
             attachment.object_name,
-            expires_seconds=self.resolve_expires_seconds(expires_seconds),
+            offset=offset,
+            length=length,
         )
+        return iter_object_chunks(response)
 
     async def get_attachment_info(self, file_id: str) -> Optional[AttachmentInfo]:
         """获取附件详细信息（含下载链接）。"""
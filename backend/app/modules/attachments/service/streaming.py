@@ -0,0 +1,107 @@
+"""附件流式上传/下载辅助工具。
+
+上传：`HashingReader` 包装请求体文件对象，MinIO 分片读取时边读边计算 SHA256 与大小，
+超过上限立即中断，整个过程只保留一个分片大小的缓冲。
+下载：`parse_range_header` 解析单段 HTTP Range，`iter_object_chunks` 按块转发 MinIO 响应。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """上传内容超过大小上限。"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"upload exceeds max size {max_size} bytes")
+        self.max_size = max_size
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Range 请求超出对象范围。"""
+
+    def __init__(self, size: int):
+        super().__init__(f"requested range not satisfiable for size {size}")
+        self.size = size
+
+
+class HashingReader:
+    """只读文件包装器：读取时累计 SHA256 与字节数，并校验大小上限。"""
+
+    def __init__(self, stream: BinaryIO, max_size: int | None = None):
+        self._stream = stream
+        self._max_size = max_size
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        if chunk:
+            self.size += len(chunk)
+            if self._max_size is not None and self.size > self._max_size:
+                raise UploadTooLargeError(self._max_size)
+            self._hash.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ByteRange:
+    """闭区间字节范围 [start, end]。"""
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+def parse_range_header(header: str | None, size: int) -> ByteRange | None:
+    """解析 `Range: bytes=...` 头。
+
+    返回 None 表示按完整内容响应（无 Range、非 bytes 单位或多段 Range）；
+    范围无法满足时抛出 RangeNotSatisfiableError。
+    """
+    if not header:
+        return None
+    unit, _, spec = header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    if not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+
+    if not first:
+        # 后缀范围：bytes=-N 表示最后 N 个字节
+        suffix = int(last)
+        if suffix <= 0 or size == 0:
+            raise RangeNotSatisfiableError(size)
+        return ByteRange(max(size - suffix, 0), size - 1)
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiableError(size)
+    return ByteRange(start, min(end, size - 1))
+
+
+def iter_object_chunks(response, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """按块迭代 MinIO 对象响应，结束或中断时释放连接。"""
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.close()
+        response.release_conn()
@@ -4,6 +4,8 @@
 """
 from __future__ import annotations
 
+from typing import Dict
+
 from app.modules.execution_plan.application.ports import UserQueryPort
 
 
@@ -22,3 +24,7 @@ class PlanUserQueryAdapter(UserQueryPort):
             rid.strip().upper().replace("ROLE_", "") == "ADMIN"
             for rid in (user.role_ids or [])
         )
+
+    async def get_user_names(self, user_ids: list[str]) -> Dict[str, str]:
+        from app.modules.auth.user_directory import UserDirectory
+        return await UserDirectory.get_names(user_ids)
@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 from app.modules.auth.repository.models import UserDoc
 from app.modules.auth.service.exceptions import UserNotFoundError
 from app.modules.auth.service.support import AuthServiceSupport
+from app.modules.auth.user_directory import invalidate_users
 from app.shared.auth import hash_password, verify_password
 from app.shared.auth.jwt_auth import get_permissions_by_role_ids, is_admin_role
 
@@ -28,6 +29,8 @@ class UserService(AuthServiceSupport):
         payload.pop("password", None)
         doc = UserDoc(**payload)
         await doc.insert()
+        # 清掉该 user_id 的负缓存
+        invalidate_users([doc.user_id])
         return self._doc_to_dict(doc)
 
     async def authenticate_user(self, user_id: str, password: str) -> Dict[str, Any]:
@@ -70,6 +73,7 @@ class UserService(AuthServiceSupport):
         doc = await self._find_or_raise(UserDoc, UserDoc.user_id == user_id, UserNotFoundError)
         self._apply_updates(doc, data, self._USER_UPDATABLE_FIELDS)
         await doc.save()
+        invalidate_users([user_id])
         return self._doc_to_dict(doc)
 
     async def update_user_roles(self, user_id: str, role_ids: List[str]) -> Dict[str, Any]:
@@ -114,6 +118,7 @@ class UserService(AuthServiceSupport):
         # 软删除：设置状态为 DISABLED
         doc.status = "DISABLED"
         await doc.save()
+        invalidate_users([user_id])
 
     async def get_effective_permissions(self, user_id: str) -> Dict[str, Any]:
         user = await UserDoc.find_one(UserDoc.user_id == user_id)
@@ -0,0 +1,172 @@
+"""进程内用户目录缓存。
+
+列表页、变更记录、项目动态、通知发送等都需要把 user_id 解析成用户名/通知信息，
+这里统一缓存 `UserDoc` 的少量展示字段，调用方用 `UserDirectory.get_many` 批量解析：
+
+- 命中且未过期的条目直接返回，其余 id 合并成一次 `$in` 查询；
+- 查不到的 id 记为负缓存（较短的 `USER_DIRECTORY_NEGATIVE_TTL_SECONDS`），避免反复回库；
+- `UserService` 写用户后调用 `invalidate_users`：清掉本实例条目，并经 Redis Pub/Sub 广播给其他实例；
+  Redis 不可用时其他实例依靠条目过期（`USER_DIRECTORY_TTL_SECONDS`）感知变化。
+
+加载期间若发生失效，本次查询结果不写入缓存，避免旧数据覆盖失效。
+鉴权（`jwt_auth`）与权限判断不走该缓存，始终读取最新用户文档；
+通知发送前的订阅校验用 `fresh=True` 回库，不依赖失效广播是否已送达。
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from app.shared.core.logger import log
+
+USER_CHANGED_EVENT = "auth.user_changed"
+USER_DIRECTORY_TTL_SECONDS = 300
+USER_DIRECTORY_NEGATIVE_TTL_SECONDS = 60
+USER_DIRECTORY_MAX_ENTRIES = 10000
+
+
+@dataclass(frozen=True, slots=True)
+class DirectoryUser:
+    """缓存的用户展示字段。"""
+
+    user_id: str
+    username: str
+    status: str = "ACTIVE"
+    itcode: str = ""
+    subscribe_notifications: bool = False
+
+
+def _to_directory_user(doc: Any) -> DirectoryUser:
+    # 缺省值与 UserDoc 字段默认值一致（兼容只投影了部分字段的文档）
+    return DirectoryUser(
+        user_id=doc.user_id,
+        username=doc.username,
+        status=getattr(doc, "status", None) or "ACTIVE",
+        itcode=getattr(doc, "itcode", None) or "",
+        subscribe_notifications=bool(getattr(doc, "subscribe_notifications", False)),
+    )
+
+
+class UserDirectory:
+    """user_id → `DirectoryUser` 的进程内缓存，值为 None 表示用户不存在（负缓存）。"""
+
+    # user_id -> (用户或 None, 过期时间)
+    _entries: dict[str, tuple[Optional[DirectoryUser], float]] = {}
+    # 每次失效自增，加载前后不一致时放弃写入
+    _generation: int = 0
+    _clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    @classmethod
+    async def get_many(
+        cls,
+        user_ids: Iterable[Optional[str]],
+        *,
+        fresh: bool = False,
+    ) -> dict[str, DirectoryUser]:
+        """批量解析用户，只返回存在的用户；fresh=True 时跳过缓存直接回库（结果仍写回缓存）。"""
+        now = cls._clock()
+        found: dict[str, DirectoryUser] = {}
+        missing: list[str] = []
+        for user_id in sorted({uid for uid in user_ids if uid}):
+            entry = cls._entries.get(user_id)
+            if fresh or entry is None or entry[1] <= now:
+                missing.append(user_id)
+            elif entry[0] is not None:
+                found[user_id] = entry[0]
+        if missing:
+            loaded = await cls._load(missing)
+            found.update(loaded)
+        return found
+
+    @classmethod
+    async def get(cls, user_id: Optional[str], *, fresh: bool = False) -> Optional[DirectoryUser]:
+        return (await cls.get_many([user_id], fresh=fresh)).get(user_id) if user_id else None
+
+    @classmethod
+    async def get_names(cls, user_ids: Iterable[Optional[str]]) -> dict[str, str]:
+        """返回 user_id → username。"""
+        return {user_id: user.username for user_id, user in (await cls.get_many(user_ids)).items()}
+
+    @classmethod
+    async def _load(cls, user_ids: list[str]) -> dict[str, DirectoryUser]:
+        from app.modules.auth.repository.models import UserDoc
+
+        generation = cls._generation
+        docs = await UserDoc.find({"user_id": {"$in": user_ids}}).to_list()
+        loaded = {doc.user_id: _to_directory_user(doc) for doc in docs}
+        if generation == cls._generation:
+            now = cls._clock()
+            for user_id in user_ids:
+                user = loaded.get(user_id)
+                ttl = USER_DIRECTORY_TTL_SECONDS if user else USER_DIRECTORY_NEGATIVE_TTL_SECONDS
+                cls._entries[user_id] = (user, now + ttl)
+            cls._evict_overflow()
+        return loaded
+
+    @classmethod
+    def _evict_overflow(cls) -> None:
+        # dict 保持插入顺序，超出上限时淘汰最早写入的条目
+        overflow = len(cls._entries) - USER_DIRECTORY_MAX_ENTRIES
+        for user_id in list(cls._entries)[:max(overflow, 0)]:
+            cls._entries.pop(user_id, None)
+
+    @classmethod
+    def invalidate(cls, user_ids: Optional[Iterable[str]] = None) -> None:
+        """失效指定用户；不传时清空整个目录。可能由 Redis 订阅线程调用。"""
+        cls._generation += 1
+        if user_ids is None:
+            cls._entries = {}
+            return
+        for user_id in user_ids:
+            cls._entries.pop(user_id, None)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._entries = {}
+        cls._generation = 0
+
+
+def build_user_changed_message(user_ids: list[str]) -> str:
+    return json.dumps(
+        {"event": USER_CHANGED_EVENT, "user_ids": user_ids},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def handle_user_event(message: str) -> None:
+    """Redis 订阅回调：收到用户变更广播时失效本地条目（在订阅线程中执行）。"""
+    try:
+        payload = json.loads(message)
+    except (TypeError, ValueError):
+        return
+    if not isinstance(payload, dict) or payload.get("event") != USER_CHANGED_EVENT:
+        return
+    user_ids = payload.get("user_ids")
+    if not isinstance(user_ids, list):
+        log.warning("忽略格式错误的用户变更广播: {}", message)
+        return
+    UserDirectory.invalidate([str(user_id) for user_id in user_ids])
+
+
+def invalidate_users(user_ids: list[str]) -> None:
+    """用户写入后调用：失效本实例缓存并广播给其他实例（Redis 未初始化时只失效本地）。"""
+    import app.shared.redis.service as redis_service
+
+    UserDirectory.invalidate(user_ids)
+    if redis_service.redis_conn is not None:
+        redis_service.publish_event(build_user_changed_message(user_ids))
+
+
+def start_user_change_listener() -> bool:
+    """订阅 Redis 事件频道以接收其他实例的用户变更；Redis 未初始化时返回 False。"""
+    import app.shared.redis.service as redis_service
+
+    if redis_service.redis_conn is None:
+        log.warning("Redis 未初始化，用户目录只能依靠条目过期（{} 秒）感知变更", USER_DIRECTORY_TTL_SECONDS)
+        return False
+    redis_service.subscribe_events(handle_user_event)
+    return True
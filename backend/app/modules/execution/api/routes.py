@@ -4,9 +4,17 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sse_starlette.sse import EventSourceResponse
 
 from app.modules.execution.application.agent_service import ExecutionAgentService
+from app.modules.execution.application.progress_stream import (
+    parse_progress_cursor,
+    plan_topic,
+    progress_hub,
+    stream_progress_events,
+    task_topic,
+)
 from app.modules.execution.application.task_command_service import ExecutionTaskCommandService
 from app.modules.execution.application.task_query_service import ExecutionTaskQueryService
 from app.modules.execution.schemas import (
@@ -352,3 +360,46 @@ async def get_task_timeline(
         return APIResponse(data=data)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
+
+
+def _ensure_progress_push_available() -> None:
+    if not progress_hub.listening:
+        raise HTTPException(status_code=503, detail="执行进度推送不可用，请改用轮询")
+
+
+@router.get(
+    "/tasks/{task_id}/progress/stream",
+    summary="订阅任务执行进度（SSE）",
+    dependencies=[Depends(require_permission("execution_tasks:read"))],
+)
+async def stream_task_progress(
+        task_id: str,
+        current_user=Depends(get_current_user),
+        since_seq: int | None = Query(None, ge=0, description="已收到的最后一个进度序号，断线重连时传入"),
+        last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """推送任务进度增量（`delta` 事件，id 为 `task_id:seq`），任务结束后关闭连接。
+
+    重连时带 `since_seq` 或 `Last-Event-ID`，只补发缺失增量；补不齐时下发 `resync`，前端再调用一次任务状态接口。
+    """
+    _ensure_progress_push_available()
+    cursor = parse_progress_cursor(last_event_id, f"{task_id}:{since_seq}" if since_seq is not None else None)
+    return EventSourceResponse(stream_progress_events(task_topic(task_id), cursor, close_on_terminal=True))
+
+
+@router.get(
+    "/plans/{plan_id}/progress/stream",
+    summary="订阅计划下全部任务的执行进度（SSE）",
+    dependencies=[Depends(require_permission("execution_tasks:read"))],
+)
+async def stream_plan_progress(
+        plan_id: str,
+        current_user=Depends(get_current_user),
+        cursor: str | None = Query(None, description="各任务已收到的进度序号，格式 task_id:seq[,task_id:seq...]"),
+        last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """推送计划下各执行任务的进度增量；重连续传规则同任务进度推送，`resync` 只针对补不齐的任务。"""
+    _ensure_progress_push_available()
+    return EventSourceResponse(
+        stream_progress_events(plan_topic(plan_id), parse_progress_cursor(last_event_id, cursor)),
+    )
@@ -1,13 +1,33 @@
-"""执行模块 application 层。"""
+"""执行模块 application 层。
+
+导出对象按需从子模块加载：worker 只用到心跳、Kafka handler 等少数服务，
+不必为此导入任务下发、查询等全部 application 服务及其依赖。
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "ExecutionAgentService": ".agent_service",
+    "DispatchExecutionTaskCommand": ".commands",
+    "ExecutionEventIngestService": ".event_ingest_service",
+    "ExecutionProgressCoordinator": ".progress_coordinator",
+    "ExecutionKafkaHandlers": ".kafka_handlers",
+    "register_execution_kafka_handlers": ".kafka_handlers",
+    "ExecutionTaskCommandService": ".task_command_service",
+    "ExecutionDispatchService": ".task_dispatch_service",
+    "ExecutionTaskQueryService": ".task_query_service",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .agent_service import ExecutionAgentService
-from .commands import DispatchExecutionTaskCommand
-from .event_ingest_service import ExecutionEventIngestService
-from .progress_coordinator import ExecutionProgressCoordinator
-from .kafka_handlers import ExecutionKafkaHandlers, register_execution_kafka_handlers
-from .task_command_service import ExecutionTaskCommandService
-from .task_dispatch_service import ExecutionDispatchService
-from .task_query_service import ExecutionTaskQueryService
 
 __all__ = [
     "ExecutionAgentService",
@@ -0,0 +1,172 @@
+"""执行代理负载注册表（进程内）。
+
+注册表缓存在线代理的容量、心跳上报的在途数和专属路由键，供下发时做负载感知选择：
+
+- 快照按 `execution.agent_registry_refresh_sec` 从数据库刷新，本进程处理的注册/心跳即时覆盖。
+- 两次心跳之间，本进程每下发一个 case 就对目标代理记一次预占（reservation），
+  避免同一窗口内把任务都压到同一个"看起来空闲"的代理上。
+- 心跳上报的在途数已包含心跳之前下发的 case，因此新心跳到达时只保留心跳之后的预占。
+
+预占只存在于执行下发的进程内（API 首次下发、worker 补位下发各记各的），case 完成事件
+由 worker 消费，无法归还 API 进程的预占，所以 case 结束时不做归还：预占统一由代理的
+下一次心跳覆盖，两次心跳之间的负载估计偏保守。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List
+
+from app.shared.config import get_settings
+from app.shared.core.datetime_utils import ensure_utc_datetime
+
+if TYPE_CHECKING:
+    from app.modules.execution.application.agent_service import ExecutionAgentService
+
+
+@dataclass
+class AgentLoad:
+    """单个代理的负载视图。"""
+
+    agent_id: str
+    region: str | None
+    capacity: int
+    reported_in_flight: int
+    routing_key: str | None
+    last_heartbeat_at: datetime | None
+    reservations: List[datetime] = field(default_factory=list)
+
+    @property
+    def in_flight(self) -> int:
+        return self.reported_in_flight + len(self.reservations)
+
+    @property
+    def free_slots(self) -> int:
+        return max(self.capacity - self.in_flight, 0)
+
+    @property
+    def load_ratio(self) -> float:
+        return self.in_flight / max(self.capacity, 1)
+
+
+class ExecutionAgentRegistry:
+    """在线代理负载快照，支持最小负载 + 区域亲和选择。"""
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._clock = clock
+        self._agents: Dict[str, AgentLoad] = {}
+        self._refreshed_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def _refresh_interval(self) -> float:
+        if self._refresh_interval_seconds is not None:
+            return self._refresh_interval_seconds
+        return max(float(get_settings().execution.agent_registry_refresh_sec), 0.0)
+
+    def _is_fresh(self) -> bool:
+        return self._refreshed_at is not None and self._clock() - self._refreshed_at < self._refresh_interval()
+
+    async def ensure_fresh(self, agent_service: ExecutionAgentService) -> None:
+        """快照过期时从数据库重新加载在线代理；并发调用只触发一次查询。"""
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            self.replace(await agent_service.list_agents(online_only=True))
+            self._refreshed_at = self._clock()
+
+    def replace(self, agents: Iterable[Dict[str, Any]]) -> None:
+        """用在线代理列表整体替换快照，沿用未被心跳覆盖的预占。"""
+        self._agents = {
+            agent["agent_id"]: self._build(agent, self._agents.get(agent["agent_id"]))
+            for agent in agents
+        }
+
+    def observe(self, agent: Dict[str, Any]) -> None:
+        """合并单个代理的注册/心跳结果（`ExecutionAgentService` 序列化结构）。"""
+        if not agent.get("is_online"):
+            self._agents.pop(agent["agent_id"], None)
+            return
+        self._agents[agent["agent_id"]] = self._build(agent, self._agents.get(agent["agent_id"]))
+
+    @staticmethod
+    def _build(agent: Dict[str, Any], previous: AgentLoad | None) -> AgentLoad:
+        heartbeat_at = agent.get("last_heartbeat_at")
+        heartbeat_at = ensure_utc_datetime(heartbeat_at) if heartbeat_at else None
+        reservations: List[datetime] = []
+        if previous is not None:
+            reservations = [
+                reserved_at for reserved_at in previous.reservations
+                if heartbeat_at is None or reserved_at > heartbeat_at
+            ]
+        return AgentLoad(
+            agent_id=agent["agent_id"],
+            region=agent.get("region"),
+            capacity=max(int(agent.get("capacity") or 1), 1),
+            reported_in_flight=max(int(agent.get("in_flight_count") or 0), 0),
+            routing_key=agent.get("routing_key"),
+            last_heartbeat_at=heartbeat_at,
+            reservations=reservations,
+        )
+
+    def get(self, agent_id: str) -> AgentLoad | None:
+        return self._agents.get(agent_id)
+
+    def list_loads(self, exclude: Iterable[str] = ()) -> List[AgentLoad]:
+        excluded = set(exclude)
+        return [load for agent_id, load in self._agents.items() if agent_id not in excluded]
+
+    def reserve(self, agent_id: str, now: datetime | None = None) -> None:
+        load = self._agents.get(agent_id)
+        if load is not None:
+            load.reservations.append(now or datetime.now(timezone.utc))
+
+    def release(self, agent_id: str | None) -> None:
+        """撤销本进程最近一次预占（投递失败时调用）；预占已被心跳覆盖时不做处理。"""
+        load = self._agents.get(agent_id) if agent_id else None
+        if load is not None and load.reservations:
+            load.reservations.pop()
+
+    def select(
+        self,
+        region: str | None = None,
+        exclude: Iterable[str] = (),
+        routable_only: bool = False,
+    ) -> AgentLoad | None:
+        """选择仍有空闲容量的代理：同区域优先，其次负载率最低，再次在途数最少。
+
+        routable_only 时只考虑声明了专属路由键的代理（只有它们能被定向投递）。
+        没有合适代理时返回 None，由调用方回落到共享队列，让最先空闲的代理竞争消费。
+        """
+        candidates = [
+            load for load in self.list_loads(exclude)
+            if load.free_slots > 0 and (load.routing_key or not routable_only)
+        ]
+        if region:
+            candidates = [load for load in candidates if load.region == region] or candidates
+        if not candidates:
+            return None
+        return min(candidates, key=lambda load: (load.load_ratio, load.in_flight))
+
+    def invalidate(self) -> None:
+        self._refreshed_at = None
+
+    def clear(self) -> None:
+        self._agents.clear()
+        self._refreshed_at = None
+
+
+_agent_registry = ExecutionAgentRegistry()
+
+
+def get_agent_registry() -> ExecutionAgentRegistry:
+    return _agent_registry
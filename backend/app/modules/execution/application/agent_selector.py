@@ -0,0 +1,89 @@
+"""下发时的执行代理选择。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+from app.modules.execution.application.agent_registry import (
+    AgentLoad,
+    ExecutionAgentRegistry,
+    get_agent_registry,
+)
+from app.modules.execution.application.agent_service import ExecutionAgentService
+from app.modules.execution.application.worker_presence import get_kafka_worker_agent_id
+from app.modules.execution.shared.execution_log import ExecutionNode, elog
+
+if TYPE_CHECKING:
+    from app.modules.execution.application.commands import DispatchExecutionTaskCommand
+
+
+class ExecutionAgentSelector:
+    """基于代理负载注册表为每次下发挑选目标代理。
+
+    - 候选代理：注册表中的在线代理，排除平台自身 Kafka worker 的登记。
+    - 任务指定了 agent_id 时只发给该代理，仅补充其专属路由键。
+    - 未指定时在声明了专属路由键的代理中选同区域优先、负载率最低且仍有空闲容量的代理；
+      全部满载、没有可定向的代理或注册表不可用时不指定代理，走共享队列由 RabbitMQ 竞争消费分摊。
+    - 并行模式的槽位数不超过候选代理的容量之和。
+    """
+
+    def __init__(
+        self,
+        agent_service: ExecutionAgentService | None = None,
+        registry: ExecutionAgentRegistry | None = None,
+    ) -> None:
+        self._agent_service = agent_service or ExecutionAgentService()
+        self._registry = registry or get_agent_registry()
+
+    async def _refresh(self) -> bool:
+        try:
+            await self._registry.ensure_fresh(self._agent_service)
+        except Exception as exc:
+            elog(
+                "warning",
+                ExecutionNode.TASK_DISPATCH,
+                "agent registry refresh failed, falling back to shared queue",
+                outcome="failed",
+                error=str(exc),
+            )
+            return False
+        return True
+
+    def _candidates(self, pinned_agent_id: str | None) -> List[AgentLoad]:
+        if pinned_agent_id:
+            load = self._registry.get(pinned_agent_id)
+            return [load] if load else []
+        return self._registry.list_loads(exclude=[get_kafka_worker_agent_id()])
+
+    async def resolve_slot_count(self, max_parallel_cases: int, pinned_agent_id: str | None) -> int:
+        """并行模式可用槽位；注册表中没有候选代理时不做限制。"""
+        if not await self._refresh():
+            return max_parallel_cases
+        capacity = sum(load.capacity for load in self._candidates(pinned_agent_id))
+        if not capacity:
+            return max_parallel_cases
+        return max(1, min(max_parallel_cases, capacity))
+
+    async def assign(self, command: DispatchExecutionTaskCommand) -> None:
+        """为下发命令确定 agent_id 与 routing_key。"""
+        if not await self._refresh():
+            command.routing_key = None
+            return
+        if command.agent_id:
+            load = self._registry.get(command.agent_id)
+        else:
+            load = self._registry.select(
+                region=command.region,
+                exclude=[get_kafka_worker_agent_id()],
+                routable_only=True,
+            )
+            command.agent_id = load.agent_id if load else None
+        command.routing_key = load.routing_key if load else None
+
+    def reserve(self, agent_id: str | None) -> None:
+        if agent_id:
+            self._registry.reserve(agent_id)
+
+    def release(self, agent_id: str | None) -> None:
+        """撤销一次尚未真正投递成功的预占。"""
+        self._registry.release(agent_id)
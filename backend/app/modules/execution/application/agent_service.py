@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 
+from app.modules.execution.application.agent_registry import get_agent_registry
 from app.modules.execution.application.constants import AgentStatus
 from app.modules.execution.repository.models import ExecutionAgentDoc
 
@@ -15,7 +16,7 @@ class ExecutionAgentService:
     这个服务负责维护平台视角下的"执行代理当前态"：
 
     - 注册时保存代理的静态信息，例如主机名、IP、区域、base_url
-    - 心跳时刷新代理的动态信息，例如最近心跳时间和当前声明状态
+    - 心跳时刷新代理的动态信息，例如最近心跳时间、当前声明状态、容量和在途 case 数
     - 查询时基于心跳时间和 TTL 推导真实在线状态，而不是盲信数据库中的 `status`
 
     这里的设计重点是：
@@ -119,6 +120,9 @@ class ExecutionAgentService:
                 "status": payload.get("status", AgentStatus.ONLINE),
                 "last_heartbeat_at": now,
                 "heartbeat_ttl_seconds": ttl_seconds,
+                "capacity": payload.get("capacity", 1),
+                "in_flight_count": 0,
+                "routing_key": payload.get("routing_key"),
                 "is_deleted": False,
             }},
             on_insert=ExecutionAgentDoc(
@@ -132,17 +136,21 @@ class ExecutionAgentService:
                 registered_at=now,
                 last_heartbeat_at=now,
                 heartbeat_ttl_seconds=ttl_seconds,
+                capacity=payload.get("capacity", 1),
+                routing_key=payload.get("routing_key"),
             ),
         )
 
-        return self._serialize_agent_doc(agent_doc, now=now)
+        data = self._serialize_agent_doc(agent_doc, now=now)
+        get_agent_registry().observe(data)
+        return data
 
     async def heartbeat_agent(self, agent_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """刷新指定代理的心跳时间，并可选更新其动态状态。
 
         Args:
             agent_id: 目标代理 ID
-            payload: 心跳请求体，允许携带最新 `status`
+            payload: 心跳请求体，允许携带最新 `status`、`capacity` 和 `in_flight_count`
 
         Returns:
             更新后的代理序列化结果
@@ -153,6 +161,7 @@ class ExecutionAgentService:
         设计上，心跳接口只更新"活性相关"信息：
             - `last_heartbeat_at`
             - 可选的 `status`
+            - 可选的 `capacity`、`in_flight_count`（负载感知下发依据）
 
         它不会修改主机名、IP、端口、区域等静态信息，
         这些信息统一由注册接口维护。
@@ -167,9 +176,16 @@ class ExecutionAgentService:
         now = datetime.now(timezone.utc)
         # 心跳允许代理顺带声明自己当前进入了某个状态，例如 ONLINE/OFFLINE/MAINTENANCE。
         agent_doc.status = payload.get("status", agent_doc.status)
+        # 容量和在途数不传时保持上一次上报的值，兼容只上报状态的旧代理。
+        if payload.get("capacity") is not None:
+            agent_doc.capacity = payload["capacity"]
+        if payload.get("in_flight_count") is not None:
+            agent_doc.in_flight_count = payload["in_flight_count"]
         agent_doc.last_heartbeat_at = now
         await agent_doc.save()
-        return self._serialize_agent_doc(agent_doc, now=now)
+        data = self._serialize_agent_doc(agent_doc, now=now)
+        get_agent_registry().observe(data)
+        return data
 
     async def list_agents(
         self,
@@ -251,6 +267,7 @@ class ExecutionAgentService:
 
         agent_doc.is_deleted = True
         await agent_doc.save()
+        get_agent_registry().observe({"agent_id": agent_id, "is_online": False})
         return {"agent_id": agent_id, "deleted": True}
 
     async def cleanup_offline_agents(self) -> Dict[str, Any]:
@@ -21,6 +21,8 @@ class DispatchExecutionTaskCommand:
     case_ids: List[str]
     source_task_id: Optional[str] = None
     agent_id: Optional[str] = None
+    region: Optional[str] = None
+    routing_key: Optional[str] = None  # 目标代理专属队列的路由键，为空走共享队列
     script_entity_ids: Optional[List[Optional[str]]] = None
     case_configs: Optional[List[Dict[str, Any]]] = None
     case_payloads: Optional[List[Dict[str, Any]]] = None
@@ -45,4 +47,5 @@ class DispatchExecutionTaskCommand:
 
     is_proxy: bool = True  # 是否为代理命令，默认为 False
     nc_pypi: str = 'http://10.32.12.28:8080/simple'
+    max_parallel_cases: int = 1  # 同时在途的最大 case 数，1 为串行
     skip_dedup: bool = False  # 计划下发时跳过业务去重（计划条目已有唯一性保障）
@@ -53,5 +53,12 @@ class AgentStatus(str, Enum):
     HEARTBEAT_LOST = "HEARTBEAT_LOST"
 
 
+# 单任务并行度：1 为串行编排（默认），上限防止单个任务占满全部执行资源
+DEFAULT_MAX_PARALLEL_CASES = 1
+MAX_PARALLEL_CASES_LIMIT = 64
+
+# 单个执行代理可声明的并发容量上限
+MAX_AGENT_CAPACITY = 256
+
 FINAL_CASE_STATUSES = {CaseStatus.PASSED, CaseStatus.FAILED, CaseStatus.SKIPPED}
 FINAL_TASK_STATUSES = {OverallStatus.PASSED, OverallStatus.FAILED, OverallStatus.SKIPPED, OverallStatus.CANCELLED}
@@ -3,16 +3,40 @@ from __future__ import annotations
 from datetime import timezone
 from typing import Any, Protocol
 
-from app.modules.execution.application.constants import ConsumeStatus, DispatchStatus, OverallStatus
+from app.modules.execution.application.constants import (
+    FINAL_TASK_STATUSES,
+    ConsumeStatus,
+    DispatchStatus,
+    OverallStatus,
+)
 from app.modules.execution.application.progress_coordinator import ExecutionProgressCoordinator
+from app.modules.execution.application.progress_stream import publish_task_progress
 from app.modules.execution.domain.status_rules import resolve_case_status
 from app.modules.execution.repository.models import (
     ExecutionTaskCaseDoc,
     ExecutionTaskDoc,
 )
+from app.modules.execution.repository.task_progress_repository import (
+    ExecutionTaskProgressRepository,
+    sync_task_doc,
+)
 from app.modules.execution.schemas.kafka_events import TestEvent
 from app.modules.execution.shared.execution_context import set_execution_context
 from app.modules.execution.shared.execution_log import ExecutionNode, elog
+from app.modules.project.domain.constants import STATS_SECTION_TASKS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
+
+# 并行任务事件聚合只维护这些运行态字段（计数与收口由进度协调器按 case 明细重算）
+PARALLEL_AGGREGATE_FIELDS = (
+    "last_event_id",
+    "last_event_at",
+    "last_event_type",
+    "last_event_phase",
+    "consumed_at",
+    "consume_status",
+    "overall_status",
+    "last_callback_at",
+)
 
 
 class ExecutionResultSink(Protocol):
@@ -31,14 +55,18 @@ class ExecutionEventIngestService:
        保存任务内每条 case 的当前状态、最近事件、断言统计和结果摘要
     2. `ExecutionTaskDoc`
        保存整个任务的当前游标、聚合进度、整体状态，以及是否要继续推进到下一条 case
+
+    每条事件应用完成后，经 Redis 广播一条紧凑进度增量，供 API 进程推送给前端（见 `progress_stream`）。
     """
 
     def __init__(
         self,
         progress_coordinator: ExecutionProgressCoordinator | None = None,
         result_sink: ExecutionResultSink | None = None,
+        progress_repository: ExecutionTaskProgressRepository | None = None,
     ) -> None:
         self._progress_coordinator = progress_coordinator or ExecutionProgressCoordinator()
+        self._progress_repository = progress_repository or ExecutionTaskProgressRepository()
         if result_sink is None:
             from app.modules.execution_plan.application.execution_result_adapter import (
                 ExecutionPlanResultAdapter,
@@ -99,7 +127,6 @@ class ExecutionEventIngestService:
             case_doc = await ExecutionTaskCaseDoc.find_one({
                 "task_id": event.task_id,
                 "case_id": event.case_id,
-                "is_deleted": False,
             })
             # 框架上报的 case_id 可能不匹配系统 case_id，兜底取第一条 case
             if case_doc is None:
@@ -153,7 +180,18 @@ class ExecutionEventIngestService:
             "current_case_id": getattr(task_doc, "current_case_id", None),
         }
         self._apply_task_aggregate(task_doc, event, event_time)
-        await task_doc.save()
+        if getattr(task_doc, "max_parallel_cases", 1) > 1:
+            # 并行任务只写聚合字段：整文档 save 会覆盖 API 并发写入的在途列表与游标
+            fields = {key: getattr(task_doc, key, None) for key in PARALLEL_AGGREGATE_FIELDS}
+            if getattr(task_doc, "started_at", None) is not None:
+                fields["started_at"] = task_doc.started_at
+            updated = await self._progress_repository.update_fields(
+                task_doc.task_id, fields, inc={"progress_seq": 1}
+            )
+            sync_task_doc(task_doc, fields, updated)
+        else:
+            task_doc.progress_seq = getattr(task_doc, "progress_seq", 0) + 1
+            await task_doc.save()
         elog(
             "debug",
             ExecutionNode.EVENT_INGEST,
@@ -177,6 +215,10 @@ class ExecutionEventIngestService:
             event_time=event_time,
             resolved_case_status=case_status,
         )
+        # 推进/收口之后再广播，增量里是本条事件处理完成后的最终状态
+        publish_task_progress(task_doc, case_doc)
+        if task_doc.overall_status != before_task_status["overall_status"]:
+            schedule_project_stats_refresh(getattr(task_doc, "project_ids", None) or [], STATS_SECTION_TASKS)
         await self._publish_final_task_result(task_doc)
 
         return True
@@ -341,6 +383,15 @@ class ExecutionEventIngestService:
         # 只要有事件成功进入聚合，说明下游已经真实消费过该任务。
         task_doc.consumed_at = event_time
         task_doc.consume_status = ConsumeStatus.CONSUMED
+        if getattr(task_doc, "max_parallel_cases", 1) > 1:
+            # 并行模式下事件里的计数只反映单条 case，任务级计数与收口
+            # 由进度协调器在 case_finish 时按 case 明细重算，这里只维护运行态。
+            if event.phase == "case_start" and getattr(task_doc, "started_at", None) is None:
+                task_doc.started_at = event_time
+            if task_doc.overall_status not in FINAL_TASK_STATUSES and event.phase in {"case_start", "case_finish"}:
+                task_doc.overall_status = OverallStatus.RUNNING
+            task_doc.last_callback_at = event_time
+            return
         # 这里统一使用 max，避免乱序事件把聚合计数倒退。
         task_doc.started_case_count = max(getattr(task_doc, "started_case_count", 0), event.started_cases)
         task_doc.finished_case_count = max(getattr(task_doc, "finished_case_count", 0), event.finished_cases)
@@ -5,12 +5,14 @@
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from app.modules.execution.application.task_command_service import ExecutionTaskCommandService
 from app.modules.execution.repository.models import ExecutionTaskDoc
 from app.modules.execution.schemas import DispatchCaseItem, DispatchTaskRequest
-from app.modules.execution_plan.application.ports import ExecutionDispatchPort
+from app.modules.execution_plan.application.ports import ExecutionDispatchPort, PlanDispatchTarget
+from app.modules.project.domain.constants import STATS_SECTION_TASKS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
 from app.shared.core.logger import log as logger
 from app.shared.service import SequenceIdService
 
@@ -47,26 +49,21 @@ class PlanDispatchAdapter(ExecutionDispatchPort):
         parameters: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        trigger_source = f"execution_plan:{plan_id}:{item_id}"
-        dispatch_category = category or f"{plan_id}/{item_id}"
-        dispatch_request = DispatchTaskRequest(
-            trigger_source=trigger_source,
-            category=dispatch_category,
+        dispatch_request = self._build_request(
+            item_id=item_id,
+            case_id=case_id,
+            plan_id=plan_id,
             agent_id=agent_id,
             schedule_type=schedule_type,
             planned_at=planned_at,
+            category=category,
             project_tag=project_tag,
             repo_url=repo_url,
             branch=branch,
-            pytest_options=pytest_options or {},
+            pytest_options=pytest_options,
             timeout=timeout,
-            cases=[
-                DispatchCaseItem(
-                    auto_case_id=case_id,
-                    parameters=dict(parameters or {}),
-                    config=dict(config or {}),
-                )
-            ],
+            parameters=parameters,
+            config=config,
         )
         sequence_service = SequenceIdService()
         data = await self._task_command_service.create_and_dispatch_task(
@@ -77,6 +74,75 @@ class PlanDispatchAdapter(ExecutionDispatchPort):
         )
         return data
 
+    async def dispatch_tasks(
+        self,
+        *,
+        actor_id: str,
+        targets: List[PlanDispatchTarget],
+    ) -> List[Dict[str, Any]]:
+        """整批创建并下发计划条目对应的执行任务。"""
+        requests = [
+            self._build_request(
+                item_id=target.item_id,
+                case_id=target.case_id,
+                plan_id=target.plan_id,
+                agent_id=target.agent_id,
+                schedule_type=target.schedule_type,
+                planned_at=target.planned_at,
+                category=target.category,
+                project_tag=target.project_tag,
+                pytest_options=target.pytest_options,
+                timeout=target.timeout,
+                parameters=target.parameters,
+            )
+            for target in targets
+        ]
+        results = await self._task_command_service.create_and_dispatch_tasks(
+            requests=requests,
+            actor_id=actor_id,
+            sequence_service=SequenceIdService(),
+            skip_dedup=True,
+        )
+        return [{"error": str(result)} if isinstance(result, Exception) else result for result in results]
+
+    @staticmethod
+    def _build_request(
+        *,
+        item_id: str,
+        case_id: str,
+        plan_id: str,
+        agent_id: Optional[str],
+        schedule_type: str = "IMMEDIATE",
+        planned_at: Any = None,
+        category: Optional[str] = None,
+        project_tag: Optional[str] = None,
+        repo_url: Optional[str] = None,
+        branch: Optional[str] = None,
+        pytest_options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[int] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> DispatchTaskRequest:
+        return DispatchTaskRequest(
+            trigger_source=f"execution_plan:{plan_id}:{item_id}",
+            category=category or f"{plan_id}/{item_id}",
+            agent_id=agent_id,
+            schedule_type=schedule_type,
+            planned_at=planned_at,
+            project_tag=project_tag,
+            repo_url=repo_url,
+            branch=branch,
+            pytest_options=pytest_options or {},
+            timeout=timeout,
+            cases=[
+                DispatchCaseItem(
+                    auto_case_id=case_id,
+                    parameters=dict(parameters or {}),
+                    config=dict(config or {}),
+                )
+            ],
+        )
+
     async def cancel_task(self, task_id: str) -> bool:
         """软删除执行任务。"""
         task_doc = await ExecutionTaskDoc.find_one(
@@ -86,6 +152,7 @@ class PlanDispatchAdapter(ExecutionDispatchPort):
         if task_doc:
             task_doc.is_deleted = True
             await task_doc.save()
+            schedule_project_stats_refresh(task_doc.project_ids, STATS_SECTION_TASKS)
             logger.info("[ADAPTER] task {} deleted (soft)", task_id)
             return True
         return False
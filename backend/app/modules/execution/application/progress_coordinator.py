@@ -1,6 +1,7 @@
 """任务执行进度协调器。
 
 负责当前 case 完成后决定：任务收口，还是自动推进下一条 case。
+并行模式（max_parallel_cases > 1）下释放完成 case 的槽位并补位下发。
 """
 from __future__ import annotations
 
@@ -8,18 +9,29 @@ from typing import Any
 
 from app.modules.execution.application.constants import (
     FINAL_CASE_STATUSES,
+    CaseStatus,
     DispatchStatus,
     OverallStatus,
 )
 from app.modules.execution.application.task_dispatch_service import ExecutionDispatchService
+from app.modules.execution.repository.models import ExecutionTaskCaseDoc
+from app.modules.execution.repository.task_progress_repository import (
+    ExecutionTaskProgressRepository,
+    sync_task_doc,
+)
 from app.modules.execution.shared.execution_log import ExecutionNode, elog
 
 
 class ExecutionProgressCoordinator:
     """串行编排的核心协调器。"""
 
-    def __init__(self, dispatch_service: ExecutionDispatchService | None = None) -> None:
+    def __init__(
+        self,
+        dispatch_service: ExecutionDispatchService | None = None,
+        progress_repository: ExecutionTaskProgressRepository | None = None,
+    ) -> None:
         self._dispatch_service = dispatch_service or ExecutionDispatchService()
+        self._progress_repository = progress_repository or ExecutionTaskProgressRepository()
 
     async def advance_after_case_finish(
         self,
@@ -42,6 +54,9 @@ class ExecutionProgressCoordinator:
                 event_case_id=event.case_id,
             )
             return
+        if getattr(task_doc, "max_parallel_cases", 1) > 1:
+            await self._advance_parallel(task_doc, case_doc, event_time)
+            return
         if event.case_id != getattr(task_doc, "current_case_id", None):
             elog(
                 "debug",
@@ -52,16 +67,9 @@ class ExecutionProgressCoordinator:
                 current_case_id=task_doc.current_case_id,
             )
             return
-
         next_case_index = getattr(task_doc, "current_case_index", 0) + 1
         if next_case_index >= task_doc.case_count:
-            task_doc.current_case_id = None
-            task_doc.current_case_index = task_doc.case_count
-            task_doc.finished_at = event_time
-            task_doc.last_callback_at = event_time
-            task_doc.overall_status = OverallStatus.FAILED if task_doc.failed_case_count > 0 else OverallStatus.PASSED
-            if getattr(task_doc, "dispatch_status", None) not in {DispatchStatus.DISPATCH_FAILED, DispatchStatus.PENDING}:
-                task_doc.dispatch_status = DispatchStatus.COMPLETED
+            self._complete_task(task_doc, event_time)
             await task_doc.save()
             elog(
                 "info",
@@ -118,3 +126,122 @@ class ExecutionProgressCoordinator:
             task_doc.overall_status = OverallStatus.FAILED
             task_doc.finished_at = event_time
             await task_doc.save()
+
+    @staticmethod
+    def _completion_fields(task_doc: Any, event_time: Any) -> dict[str, Any]:
+        fields: dict[str, Any] = {
+            "current_case_id": None,
+            "current_case_index": task_doc.case_count,
+            "finished_at": event_time,
+            "last_callback_at": event_time,
+            "overall_status": (
+                OverallStatus.FAILED.value if task_doc.failed_case_count > 0 else OverallStatus.PASSED.value
+            ),
+        }
+        if getattr(task_doc, "dispatch_status", None) not in {DispatchStatus.DISPATCH_FAILED, DispatchStatus.PENDING}:
+            fields["dispatch_status"] = DispatchStatus.COMPLETED.value
+        return fields
+
+    @classmethod
+    def _complete_task(cls, task_doc: Any, event_time: Any) -> None:
+        for key, value in cls._completion_fields(task_doc, event_time).items():
+            setattr(task_doc, key, value)
+
+    async def _advance_parallel(self, task_doc: Any, case_doc: Any, event_time: Any) -> None:
+        """并行模式：原子释放完成 case 的槽位并重算进度，然后补位下发或收口。
+
+        API 与 worker 会并发改写同一任务，在途列表与游标只走条件更新，
+        是否收口以更新后返回的文档为准。
+        """
+        counters = await self._recount_case_progress(task_doc)
+        released = await self._progress_repository.release_case(task_doc.task_id, case_doc.case_id, counters)
+        if released is None:
+            elog(
+                "debug",
+                ExecutionNode.TASK_ADVANCE,
+                "skipping parallel advance because case is not in flight",
+                outcome="skipped",
+                finished_case_id=case_doc.case_id,
+                in_flight_case_ids=list(task_doc.in_flight_case_ids),
+            )
+            return
+        # 代理预占记在下发所在进程（可能是 API），这里不归还，由代理下一次心跳覆盖
+        sync_task_doc(task_doc, counters, released)
+
+        dispatch_failed = task_doc.dispatch_status == DispatchStatus.DISPATCH_FAILED
+        if not dispatch_failed and task_doc.next_case_index < task_doc.case_count:
+            try:
+                dispatched = await self._dispatch_service.fill_parallel_slots(task_doc)
+                elog(
+                    "info",
+                    ExecutionNode.TASK_ADVANCE,
+                    "refilled parallel execution slots",
+                    outcome="started",
+                    finished_case_id=case_doc.case_id,
+                    dispatched_count=dispatched,
+                    in_flight_count=len(task_doc.in_flight_case_ids),
+                    next_case_index=task_doc.next_case_index,
+                )
+            except Exception as exc:
+                elog(
+                    "error",
+                    ExecutionNode.TASK_ADVANCE,
+                    "failed to refill parallel execution slots",
+                    outcome="failed",
+                    next_case_index=task_doc.next_case_index,
+                    error=str(exc),
+                )
+                fields = {
+                    "dispatch_status": DispatchStatus.DISPATCH_FAILED.value,
+                    "dispatch_error": f"Parallel dispatch failed: {exc}",
+                    "overall_status": OverallStatus.FAILED.value,
+                }
+                updated = await self._progress_repository.update_fields(task_doc.task_id, fields)
+                sync_task_doc(task_doc, fields, updated)
+            dispatch_failed = task_doc.dispatch_status == DispatchStatus.DISPATCH_FAILED
+
+        # 下发失败后不再补位，等在途 case 全部结束再收口
+        drained = not task_doc.in_flight_case_ids
+        if not drained or not (dispatch_failed or task_doc.next_case_index >= task_doc.case_count):
+            return
+        fields = self._completion_fields(task_doc, event_time)
+        if dispatch_failed:
+            fields["overall_status"] = OverallStatus.FAILED.value
+        completed = await self._progress_repository.complete_if_drained(task_doc.task_id, fields)
+        if completed is None:
+            # 条件更新未命中：期间已有新 case 下发，由其完成事件负责收口
+            return
+        sync_task_doc(task_doc, fields, completed)
+        elog(
+            "info",
+            ExecutionNode.TASK_COMPLETE,
+            "parallel execution task completed",
+            outcome=task_doc.overall_status,
+            final_case_id=case_doc.case_id,
+            after={"overall_status": task_doc.overall_status},
+        )
+
+    @staticmethod
+    async def _recount_case_progress(task_doc: Any) -> dict[str, Any]:
+        """按 case 明细状态重算任务级计数（并行模式下事件计数只反映单条 case）。"""
+        rows = await ExecutionTaskCaseDoc.aggregate(
+            [
+                {"$match": {"task_id": task_doc.task_id}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ],
+            projection_model=None,
+        ).to_list()
+        counts = {row["_id"]: row["count"] for row in rows}
+        passed = counts.get(CaseStatus.PASSED.value, 0)
+        failed = counts.get(CaseStatus.FAILED.value, 0)
+        finished = passed + failed + counts.get(CaseStatus.SKIPPED.value, 0)
+        counters: dict[str, Any] = {
+            "passed_case_count": passed,
+            "failed_case_count": failed,
+            "finished_case_count": finished,
+            "reported_case_count": finished,
+            "started_case_count": sum(counts.values()) - counts.get(CaseStatus.QUEUED.value, 0),
+        }
+        if task_doc.case_count:
+            counters["progress_percent"] = round(finished / task_doc.case_count * 100, 2)
+        return counters
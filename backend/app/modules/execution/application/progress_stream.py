@@ -0,0 +1,331 @@
+"""执行进度推送通道。
+
+任务进度只在 Kafka worker（`ExecutionEventIngestService`）里变化。worker 每应用一条事件，就经 Redis Pub/Sub
+广播一条紧凑的 task/case 增量（只含前端进度展示需要的字段）；API 进程订阅后分发给按任务或计划订阅的 SSE 连接，
+前端不再轮询 `get_task_status` / `get_task_timeline`。
+
+- 序号：每个任务的 `progress_seq` 随事件单调递增，增量携带 `task_id + seq`；
+- 续传：每个 API 进程为最近活跃的任务保留一小段增量缓冲，断线重连时带上各任务已收到的序号，
+  缓冲能补齐则只补发缺失增量，补不齐的任务单独下发 `resync`，由前端只重新加载该任务；
+- 背压与合并：每条连接的待发送增量按 (task_id, case_id) 合并，只保留最新状态，
+  连接写得慢时不会无限堆积；超出 `PROGRESS_MAX_PENDING` 时清空并下发整体 `resync`；
+- 已结束的任务：任务级连接订阅后先读一次任务当前态，已是终态时只下发一条快照增量就关闭，
+  不会因为再也等不到增量而一直挂着。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque
+
+from app.shared.core.logger import log
+
+PROGRESS_EVENT_CHANNEL = "dmlv4:execution:progress"
+PROGRESS_BUFFER_SIZE = 200
+PROGRESS_MAX_TRACKED_TASKS = 1000
+PROGRESS_MAX_PENDING = 500
+PLAN_TRIGGER_PREFIX = "execution_plan:"
+TASK_TOPIC_PREFIX = "task:"
+TERMINAL_TASK_STATUSES = {"PASSED", "FAILED", "SKIPPED", "CANCELLED", "TIMEOUT"}
+
+ProgressCursor = dict[str, int]
+
+
+def _value(value: Any) -> Any:
+    value = getattr(value, "value", value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def plan_id_of(task_doc: Any) -> str | None:
+    """从计划下发的 trigger_source（`execution_plan:{plan_id}:{item_id}`）中取计划 ID。"""
+    trigger_source = str((getattr(task_doc, "request_payload", None) or {}).get("trigger_source") or "")
+    if not trigger_source.startswith(PLAN_TRIGGER_PREFIX):
+        return None
+    return trigger_source[len(PLAN_TRIGGER_PREFIX):].split(":", 1)[0] or None
+
+
+def build_progress_delta(task_doc: Any, case_doc: Any | None) -> dict[str, Any]:
+    """构造一条紧凑进度增量；task/case 部分都是当前态，后到的增量覆盖先到的。"""
+    delta: dict[str, Any] = {
+        "task_id": task_doc.task_id,
+        "plan_id": plan_id_of(task_doc),
+        "seq": getattr(task_doc, "progress_seq", 0),
+        "task": {
+            "overall_status": _value(task_doc.overall_status),
+            "progress_percent": task_doc.progress_percent,
+            "started_case_count": task_doc.started_case_count,
+            "finished_case_count": task_doc.finished_case_count,
+            "passed_case_count": task_doc.passed_case_count,
+            "failed_case_count": task_doc.failed_case_count,
+            "current_case_id": getattr(task_doc, "current_case_id", None),
+            "last_event_at": _value(getattr(task_doc, "last_event_at", None)),
+            "finished_at": _value(getattr(task_doc, "finished_at", None)),
+        },
+        "case": None,
+    }
+    if case_doc is not None:
+        delta["case"] = {
+            "case_id": case_doc.case_id,
+            "status": _value(case_doc.status),
+            "progress_percent": case_doc.progress_percent,
+            "dispatch_status": _value(case_doc.dispatch_status),
+            "event_count": getattr(case_doc, "event_count", 0),
+            "failure_message": getattr(case_doc, "failure_message", None),
+            "started_at": _value(getattr(case_doc, "started_at", None)),
+            "finished_at": _value(getattr(case_doc, "finished_at", None)),
+        }
+    return delta
+
+
+def publish_task_progress(task_doc: Any, case_doc: Any | None) -> None:
+    """worker 侧：广播一条进度增量；Redis 未初始化时跳过，前端仍可轮询。"""
+    import app.shared.redis.service as redis_service
+
+    if redis_service.redis_conn is None:
+        return
+    redis_service.publish_event(
+        json.dumps(build_progress_delta(task_doc, case_doc), ensure_ascii=False, separators=(",", ":")),
+        channel=PROGRESS_EVENT_CHANNEL,
+    )
+
+
+def parse_progress_cursor(*values: str | None) -> ProgressCursor | None:
+    """解析续传游标 `task_id:seq[,task_id:seq...]`（也是 SSE 事件 id 的格式）；没有游标返回 None。"""
+    cursor: ProgressCursor = {}
+    for value in values:
+        for part in (value or "").split(","):
+            task_id, sep, seq = part.strip().rpartition(":")
+            if not sep or not task_id:
+                continue
+            try:
+                cursor[task_id] = max(cursor.get(task_id, 0), int(seq))
+            except ValueError:
+                continue
+    return cursor or None
+
+
+def task_topic(task_id: str) -> str:
+    return f"{TASK_TOPIC_PREFIX}{task_id}"
+
+
+def plan_topic(plan_id: str) -> str:
+    return f"plan:{plan_id}"
+
+
+class ProgressSubscription:
+    """单条推送连接的待发送队列：按 (task_id, case_id) 合并，只保留最新状态。"""
+
+    def __init__(self, topic: str, max_pending: int = PROGRESS_MAX_PENDING) -> None:
+        self.topic = topic
+        self._max_pending = max_pending
+        self._pending: OrderedDict[tuple[str, str | None], dict[str, Any]] = OrderedDict()
+        self._resync_tasks: list[str] = []
+        self._resync_all = False
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+
+    def push(self, delta: dict[str, Any]) -> None:
+        key = (delta["task_id"], (delta.get("case") or {}).get("case_id"))
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            self.coalesced += 1
+            if previous["seq"] > delta["seq"]:
+                delta = previous
+        elif len(self._pending) >= self._max_pending:
+            # 连接消费太慢：放弃逐条增量，让前端整体重新加载一次
+            self._pending.clear()
+            self._resync_all = True
+        # 重新插入到末尾，待发送顺序即各 key 最新增量的到达顺序
+        self._pending[key] = delta
+        self._ready.set()
+
+    def request_resync(self, task_id: str) -> None:
+        if task_id not in self._resync_tasks:
+            self._resync_tasks.append(task_id)
+        self._ready.set()
+
+    def drain(self) -> list[tuple[str, dict[str, Any]]]:
+        """取出当前全部待发送事件：先 resync，再按到达顺序的增量。"""
+        self._ready.clear()
+        events: list[tuple[str, dict[str, Any]]] = []
+        if self._resync_all:
+            events.append(("resync", {"task_id": None}))
+        events.extend(("resync", {"task_id": task_id}) for task_id in self._resync_tasks)
+        events.extend(("delta", delta) for delta in self._pending.values())
+        self._resync_all = False
+        self._resync_tasks.clear()
+        self._pending.clear()
+        return events
+
+    async def next_events(self) -> list[tuple[str, dict[str, Any]]]:
+        await self._ready.wait()
+        return self.drain()
+
+
+class ExecutionProgressHub:
+    """API 进程内的进度分发中心：Redis 订阅线程收消息，事件循环内分发给订阅连接。"""
+
+    def __init__(
+        self,
+        *,
+        buffer_size: int = PROGRESS_BUFFER_SIZE,
+        max_tracked_tasks: int = PROGRESS_MAX_TRACKED_TASKS,
+    ) -> None:
+        self._buffer_size = buffer_size
+        self._max_tracked_tasks = max_tracked_tasks
+        self._buffers: OrderedDict[str, Deque[dict[str, Any]]] = OrderedDict()
+        self._subscribers: dict[str, set[ProgressSubscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def listening(self) -> bool:
+        return self._loop is not None
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def handle_message(self, message: str) -> None:
+        """Redis 订阅回调（在订阅线程中执行），转交事件循环处理。"""
+        try:
+            delta = json.loads(message)
+            if not isinstance(delta, dict) or not delta.get("task_id") or "seq" not in delta:
+                return
+        except (TypeError, ValueError):
+            log.warning("忽略格式错误的执行进度消息: {}", message)
+            return
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.dispatch, delta)
+
+    def dispatch(self, delta: dict[str, Any]) -> None:
+        task_id = delta["task_id"]
+        buffer = self._buffers.get(task_id)
+        if buffer is None:
+            buffer = self._buffers[task_id] = deque(maxlen=self._buffer_size)
+            while len(self._buffers) > self._max_tracked_tasks:
+                self._buffers.popitem(last=False)
+        elif buffer and delta["seq"] <= buffer[-1]["seq"]:
+            # 重复投递或乱序的旧增量，不再下发
+            return
+        self._buffers.move_to_end(task_id)
+        buffer.append(delta)
+        for topic in self._topics_of(delta):
+            for subscription in self._subscribers.get(topic, ()):
+                subscription.push(delta)
+
+    def subscribe(self, topic: str, cursor: ProgressCursor | None = None) -> ProgressSubscription:
+        """登记一条连接；带游标时先从缓冲补发断线期间的增量。"""
+        subscription = ProgressSubscription(topic)
+        self._subscribers.setdefault(topic, set()).add(subscription)
+        if cursor is not None:
+            self._replay(subscription, cursor)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.topic]
+
+    def connection_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def reset(self) -> None:
+        self._buffers.clear()
+        self._subscribers.clear()
+        self._loop = None
+
+    def _replay(self, subscription: ProgressSubscription, cursor: ProgressCursor) -> None:
+        for task_id, buffer in self._buffers.items():
+            if not buffer or subscription.topic not in self._topics_of(buffer[-1]):
+                continue
+            last_seq = cursor.get(task_id, 0)
+            if buffer[-1]["seq"] <= last_seq:
+                continue
+            if buffer[0]["seq"] > last_seq + 1:
+                subscription.request_resync(task_id)
+                continue
+            for delta in buffer:
+                if delta["seq"] > last_seq:
+                    subscription.push(delta)
+        for task_id in cursor:
+            # 游标中的任务已不在缓冲里（进程重启或被淘汰），无法判断是否有遗漏
+            if task_id not in self._buffers and subscription.topic == task_topic(task_id):
+                subscription.request_resync(task_id)
+
+    @staticmethod
+    def _topics_of(delta: dict[str, Any]) -> list[str]:
+        topics = [task_topic(delta["task_id"])]
+        if delta.get("plan_id"):
+            topics.append(plan_topic(delta["plan_id"]))
+        return topics
+
+
+progress_hub = ExecutionProgressHub()
+
+
+def start_progress_listener() -> bool:
+    """API 进程启动时订阅进度频道；Redis 未初始化时返回 False，推送端点不可用，前端回退到轮询。"""
+    import app.shared.redis.service as redis_service
+
+    if redis_service.redis_conn is None:
+        log.warning("Redis 未初始化，执行进度推送不可用")
+        return False
+    progress_hub.attach(asyncio.get_running_loop())
+    redis_service.subscribe_events(progress_hub.handle_message, channel=PROGRESS_EVENT_CHANNEL)
+    return True
+
+
+async def load_task_snapshot(task_id: str) -> dict[str, Any] | None:
+    """读取任务当前态，构造与增量同格式的快照（不含 case 部分）；任务不存在返回 None。"""
+    from app.modules.execution.repository.models import ExecutionTaskDoc
+
+    task_doc = await ExecutionTaskDoc.find_one({"task_id": task_id, "is_deleted": False})
+    return build_progress_delta(task_doc, None) if task_doc is not None else None
+
+
+def _delta_event(payload: dict[str, Any]) -> dict[str, str]:
+    return {
+        "event": "delta",
+        "id": f"{payload['task_id']}:{payload['seq']}",
+        "data": json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+    }
+
+
+async def stream_progress_events(
+    topic: str,
+    cursor: ProgressCursor | None = None,
+    *,
+    close_on_terminal: bool = False,
+    hub: ExecutionProgressHub | None = None,
+    snapshot_loader: Callable[[str], Awaitable[dict[str, Any] | None]] = load_task_snapshot,
+):
+    """单条 SSE 连接的事件生成器；连接断开（生成器被关闭）时自动注销订阅。
+
+    close_on_terminal 的任务级连接在订阅后检查一次任务当前态（先订阅再读，避免漏掉期间的增量），
+    任务已结束时下发一条快照增量后立即关闭。
+    """
+    hub = hub or progress_hub
+    subscription = hub.subscribe(topic, cursor)
+    try:
+        if close_on_terminal and topic.startswith(TASK_TOPIC_PREFIX):
+            snapshot = await snapshot_loader(topic[len(TASK_TOPIC_PREFIX):])
+            if snapshot is not None and snapshot["task"]["overall_status"] in TERMINAL_TASK_STATUSES:
+                yield _delta_event(snapshot)
+                return
+        while True:
+            for kind, payload in await subscription.next_events():
+                if kind == "resync":
+                    yield {"event": "resync", "data": json.dumps(payload)}
+                    continue
+                yield _delta_event(payload)
+                if close_on_terminal and payload["task"]["overall_status"] in TERMINAL_TASK_STATUSES:
+                    return
+    finally:
+        hub.unsubscribe(subscription)
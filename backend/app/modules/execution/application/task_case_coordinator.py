@@ -142,28 +142,43 @@ class ExecutionTaskCaseCoordinator:
         for existing_doc in existing_docs:
             await existing_doc.delete()
 
-        auto_case_id_map = {
-            case_id: auto_case_id
-            for case_id, auto_case_id in zip(case_ids, auto_case_ids)
-        }
         dispatch_bindings = await self.resolve_case_dispatch_bindings_by_auto_case_ids(auto_case_ids)
         script_entity_id_map = {
             binding.case_id: binding.script_entity_id
             for binding in dispatch_bindings
         }
 
-        for order_no, case_id in enumerate(case_ids):
-            case_doc = doc_map[case_id]
-            snapshot = self.build_case_snapshot(
-                case_doc,
-                auto_case_id=auto_case_id_map.get(case_id),
-                script_entity_id=script_entity_id_map.get(case_id),
-                case_config=case_configs[order_no] if order_no < len(case_configs) else {},
-            )
-            await ExecutionTaskCaseDoc(
+        case_docs = self.build_task_case_docs(
+            task_id,
+            case_ids,
+            auto_case_ids,
+            [script_entity_id_map.get(case_id) for case_id in case_ids],
+            case_configs,
+            doc_map,
+        )
+        for case_doc in case_docs:
+            await case_doc.insert()
+
+    def build_task_case_docs(
+        self,
+        task_id: str,
+        case_ids: List[str],
+        auto_case_ids: List[str],
+        script_entity_ids: List[str | None],
+        case_configs: List[Dict[str, Any]],
+        doc_map: Dict[str, Any],
+    ) -> List[ExecutionTaskCaseDoc]:
+        """按 case 顺序构建待写入的 case 明细快照，不落库。"""
+        return [
+            ExecutionTaskCaseDoc(
                 task_id=task_id,
                 case_id=case_id,
-                case_snapshot=snapshot,
+                case_snapshot=self.build_case_snapshot(
+                    doc_map[case_id],
+                    auto_case_id=auto_case_ids[order_no] if order_no < len(auto_case_ids) else None,
+                    script_entity_id=script_entity_ids[order_no] if order_no < len(script_entity_ids) else None,
+                    case_config=case_configs[order_no] if order_no < len(case_configs) else {},
+                ),
                 order_no=order_no,
                 dispatch_status=DispatchStatus.PENDING,
                 status=CaseStatus.QUEUED,
@@ -173,7 +188,9 @@ class ExecutionTaskCaseCoordinator:
                 step_skipped=0,
                 last_seq=0,
                 result_data={},
-            ).insert()
+            )
+            for order_no, case_id in enumerate(case_ids)
+        ]
 
 
 class _PlaceholderCaseDoc:
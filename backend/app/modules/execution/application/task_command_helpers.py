@@ -13,6 +13,7 @@ from typing import Any, Dict
 
 from app.modules.execution.application.commands import DispatchExecutionTaskCommand
 from app.modules.execution.application.constants import (
+    DEFAULT_MAX_PARALLEL_CASES,
     FINAL_TASK_STATUSES,
     ConsumeStatus,
     OverallStatus,
@@ -34,6 +35,7 @@ def build_dedup_key(command: DispatchExecutionTaskCommand) -> str:
     payload = {
         "dispatch_channel": command.dispatch_channel,
         "agent_id": command.agent_id,
+        "region": command.region,
         "trigger_source": command.trigger_source,
         "schedule_type": command.schedule_type,
         "planned_at": command.planned_at.isoformat() if command.planned_at else None,
@@ -109,6 +111,7 @@ def build_task_request_payload(command: DispatchExecutionTaskCommand) -> Dict[st
         "branch": command.branch,
         "pytest_options": command.pytest_options,
         "timeout": command.timeout,
+        "max_parallel_cases": command.max_parallel_cases,
         "cases": [
             {
                 "case_id": case_id,
@@ -206,6 +209,7 @@ async def build_rerun_command_from_payload(
         source_task_id=getattr(source_task_doc, "task_id", None),
         dispatch_channel=dispatch_channel,
         agent_id=agent_id,
+        region=request.region if request.region is not None else payload.get("region"),
         created_by=actor_id,
         auto_case_ids=auto_case_ids,
         case_ids=case_ids,
@@ -221,6 +225,11 @@ async def build_rerun_command_from_payload(
         branch=request.branch if request.branch is not None else payload.get("branch"),
         pytest_options=_resolve_override_dict(request.pytest_options, payload, "pytest_options"),
         timeout=request.timeout if request.timeout is not None else payload.get("timeout"),
+        max_parallel_cases=(
+            request.max_parallel_cases
+            if request.max_parallel_cases is not None
+            else payload.get("max_parallel_cases") or DEFAULT_MAX_PARALLEL_CASES
+        ),
         attachments=[],
     )
     await initialize_command(command)
@@ -269,6 +278,9 @@ def apply_task_command_to_doc(
         reported_case_count=0,
         current_case_id=command.case_ids[0],
         current_case_index=0,
+        max_parallel_cases=command.max_parallel_cases,
+        in_flight_case_ids=[],
+        next_case_index=0,
         planned_at=command.planned_at,
         schedule_type=schedule_type,
         schedule_status=schedule_status,
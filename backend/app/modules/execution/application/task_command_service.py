@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import secrets
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from app.modules.attachments.service.attachment_service import AttachmentService
-from app.modules.execution.application.case_resolver import ExecutionCaseResolver
+from app.modules.execution.application.case_resolver import AutoCaseDispatchBinding, ExecutionCaseResolver
 from app.modules.test_specs.application.case_metadata_query import TestCaseMetadataQuery
 from app.modules.execution.application.commands import DispatchExecutionTaskCommand
 from app.modules.execution.application.task_command_helpers import (
@@ -20,8 +20,13 @@ from app.modules.execution.repository.models import ExecutionTaskDoc
 from app.modules.execution.schemas import DispatchTaskRequest, RerunTaskRequest
 from app.modules.execution.shared.execution_context import execution_scope, set_execution_context
 from app.modules.execution.shared.execution_log import ExecutionNode, elog
+from app.modules.project.domain.constants import STATS_SECTION_TASKS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
 from app.shared.service import SequenceIdService
 
+# 批量创建中通过校验的请求：(原始位置, 请求, 脚本绑定, case 下发载荷)
+_PreparedRequest = tuple[int, DispatchTaskRequest, List[AutoCaseDispatchBinding], List[Dict[str, Any]]]
+
 
 class ExecutionTaskCommandService:
     """处理任务创建、重跑、删除等命令。"""
@@ -37,14 +42,39 @@ class ExecutionTaskCommandService:
         self._attachment_service = attachment_service or AttachmentService()
 
     @staticmethod
-    async def _enrich_case_file_params(parameters: Dict[str, Any], attachment_service: AttachmentService) -> Dict[str, Any]:
-        """Detect file-type parameters and enrich with download URLs."""
-        result = dict(parameters)
-        for key, value in result.items():
-            if isinstance(value, dict) and value.get("type") == "file" and value.get("file_id"):
-                enriched = await attachment_service.enrich_single(value["file_id"])
-                result[key] = {**value, **enriched}
-        return result
+    async def _enrich_case_file_params(
+        case_payloads: List[Dict[str, Any]],
+        attachment_service: AttachmentService,
+    ) -> None:
+        """Detect file-type parameters across all cases and enrich them with download URLs in one batch."""
+        file_ids = ExecutionTaskCommandService._file_param_ids(case_payloads)
+        enriched = await attachment_service.enrich_many(file_ids) if file_ids else {}
+        ExecutionTaskCommandService._apply_file_params(case_payloads, enriched)
+
+    @staticmethod
+    def _file_param_ids(case_payloads: List[Dict[str, Any]]) -> List[str]:
+        return [
+            value["file_id"]
+            for payload in case_payloads
+            for value in (payload.get("parameters") or {}).values()
+            if isinstance(value, dict) and value.get("type") == "file" and value.get("file_id")
+        ]
+
+    @staticmethod
+    def _apply_file_params(case_payloads: List[Dict[str, Any]], enriched: Dict[str, dict]) -> None:
+        """把 enrich 结果合并进文件参数；引用的附件不在结果中（不存在或已删除）时抛出 KeyError。"""
+        merged: List[Dict[str, Any]] = []
+        for payload in case_payloads:
+            result = dict(payload.get("parameters") or {})
+            for key, value in result.items():
+                if isinstance(value, dict) and value.get("type") == "file" and value.get("file_id"):
+                    if value["file_id"] not in enriched:
+                        raise KeyError(f"attachment not found or deleted: {value['file_id']}")
+                    result[key] = {**value, **enriched[value["file_id"]]}
+            merged.append(result)
+        # 全部参数校验通过后再写回，失败时不留下部分 enrich 的 payload
+        for payload, result in zip(case_payloads, merged):
+            payload["parameters"] = result
 
     async def create_and_dispatch_task(
         self,
@@ -75,8 +105,7 @@ class ExecutionTaskCommandService:
 
         year = datetime.now().year
         seq = await sequence_service.next(f"execution_task:{year}")
-        rand = secrets.token_hex(4)
-        task_id = f"ET-{year}-{str(seq).zfill(6)}-{rand}"
+        task_id = self._format_task_id(year, seq)
         set_execution_context(task_id=task_id, agent_id=request.agent_id)
 
         auto_case_ids = [item.auto_case_id for item in request.cases]
@@ -86,17 +115,8 @@ class ExecutionTaskCommandService:
         )
         case_ids = [binding.case_id for binding in dispatch_bindings]
         script_entity_ids = [binding.script_entity_id for binding in dispatch_bindings]
-        case_payloads = [
-            {
-                "case_id": binding.case_id,
-                "script_path": binding.script_path,
-                "script_name": binding.script_name,
-                "parameters": dict(item.parameters),
-            }
-            for item, binding in zip(request.cases, dispatch_bindings)
-        ]
-        for payload in case_payloads:
-            payload["parameters"] = await self._enrich_case_file_params(payload["parameters"], self._attachment_service)
+        case_payloads = self._build_case_payloads(request, dispatch_bindings)
+        await self._enrich_case_file_params(case_payloads, self._attachment_service)
         elog(
             "debug",
             ExecutionNode.TASK_CREATE,
@@ -108,28 +128,7 @@ class ExecutionTaskCommandService:
             case_payloads=case_payloads,
         )
 
-        command = DispatchExecutionTaskCommand(
-            task_id=task_id,
-            dispatch_channel=request.dispatch_channel,
-            agent_id=request.agent_id,
-            created_by=actor_id,
-            auto_case_ids=auto_case_ids,
-            case_ids=case_ids,
-            script_entity_ids=script_entity_ids,
-            case_configs=case_configs,
-            case_payloads=case_payloads,
-            schedule_type=request.schedule_type,
-            planned_at=request.planned_at,
-            trigger_source=request.trigger_source,
-            category=request.category,
-            project_tag=request.project_tag,
-            repo_url=request.repo_url,
-            branch=request.branch,
-            pytest_options=request.pytest_options,
-            timeout=request.timeout,
-            attachments=[],
-            skip_dedup=skip_dedup,
-        )
+        command = self._build_command(request, task_id, actor_id, dispatch_bindings, case_payloads, skip_dedup)
         await initialize_command(command)
 
         async with execution_scope(task_id=task_id, agent_id=request.agent_id, node=ExecutionNode.TASK_CREATE.value):
@@ -148,6 +147,151 @@ class ExecutionTaskCommandService:
         )
         return data
 
+    async def create_and_dispatch_tasks(
+        self,
+        requests: List[DispatchTaskRequest],
+        actor_id: str,
+        sequence_service: SequenceIdService,
+        skip_dedup: bool = False,
+    ) -> List[Dict[str, Any] | Exception]:
+        """批量创建执行任务。
+
+        任务编号一次预留，脚本绑定与文件参数整批解析，任务落库与首次下发交给
+        `create_tasks_from_commands` 整批完成。单个请求失败时对应位置返回异常对象，不影响其余请求。
+        """
+        results: List[Dict[str, Any] | Exception | None] = [None] * len(requests)
+        if not requests:
+            return []
+        elog(
+            "info",
+            ExecutionNode.TASK_CREATE,
+            "batch dispatch task request received",
+            actor_id=actor_id,
+            task_count=len(requests),
+        )
+        year = datetime.now().year
+        seqs = await sequence_service.next_many(f"execution_task:{year}", len(requests))
+        bindings_by_request = await self._resolve_bindings_many(requests, results)
+
+        candidates: List[_PreparedRequest] = []
+        for index, (request, bindings) in enumerate(zip(requests, bindings_by_request)):
+            if bindings is not None:
+                candidates.append((index, request, bindings, self._build_case_payloads(request, bindings)))
+        # 文件参数整批 enrich；引用了不存在或已删除附件的请求单独失败
+        file_ids = self._file_param_ids([payload for *_, payloads in candidates for payload in payloads])
+        enriched = await self._attachment_service.enrich_many(file_ids, skip_missing=True) if file_ids else {}
+        prepared: List[_PreparedRequest] = []
+        for index, request, bindings, payloads in candidates:
+            try:
+                self._apply_file_params(payloads, enriched)
+            except KeyError as exc:
+                results[index] = exc
+                continue
+            prepared.append((index, request, bindings, payloads))
+
+        indexes: List[int] = []
+        commands: List[DispatchExecutionTaskCommand] = []
+        for (index, request, bindings, payloads), seq in zip(prepared, seqs):
+            command = self._build_command(
+                request, self._format_task_id(year, seq), actor_id, bindings, payloads, skip_dedup
+            )
+            try:
+                await initialize_command(command)
+            except Exception as exc:
+                results[index] = exc
+                continue
+            indexes.append(index)
+            commands.append(command)
+
+        created = await self._dispatch_service.create_tasks_from_commands(commands, actor_id=actor_id)
+        for index, data in zip(indexes, created):
+            results[index] = data
+        elog(
+            "info",
+            ExecutionNode.TASK_CREATE,
+            "batch dispatch task request handled",
+            outcome="success",
+            task_count=len(requests),
+            failed_count=sum(isinstance(result, Exception) for result in results),
+        )
+        return results
+
+    async def _resolve_bindings_many(
+        self,
+        requests: List[DispatchTaskRequest],
+        results: List[Any],
+    ) -> List[List[AutoCaseDispatchBinding] | None]:
+        """整批解析脚本绑定；有无效用例时退回逐个请求解析，只让出错的请求失败（异常写入 results）。"""
+        auto_case_ids = list(dict.fromkeys(item.auto_case_id for request in requests for item in request.cases))
+        try:
+            bindings = await self._case_resolver.resolve_case_dispatch_bindings_by_auto_case_ids(auto_case_ids)
+        except Exception:
+            resolved: List[List[AutoCaseDispatchBinding] | None] = []
+            for index, request in enumerate(requests):
+                try:
+                    resolved.append(await self._case_resolver.resolve_case_dispatch_bindings_by_auto_case_ids(
+                        [item.auto_case_id for item in request.cases]
+                    ))
+                except Exception as exc:
+                    results[index] = exc
+                    resolved.append(None)
+            return resolved
+        binding_map = {binding.auto_case_id: binding for binding in bindings}
+        return [[binding_map[item.auto_case_id] for item in request.cases] for request in requests]
+
+    @staticmethod
+    def _format_task_id(year: int, seq: int) -> str:
+        return f"ET-{year}-{str(seq).zfill(6)}-{secrets.token_hex(4)}"
+
+    @staticmethod
+    def _build_case_payloads(
+        request: DispatchTaskRequest,
+        dispatch_bindings: List[AutoCaseDispatchBinding],
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "case_id": binding.case_id,
+                "script_path": binding.script_path,
+                "script_name": binding.script_name,
+                "parameters": dict(item.parameters),
+            }
+            for item, binding in zip(request.cases, dispatch_bindings)
+        ]
+
+    @staticmethod
+    def _build_command(
+        request: DispatchTaskRequest,
+        task_id: str,
+        actor_id: str,
+        dispatch_bindings: List[AutoCaseDispatchBinding],
+        case_payloads: List[Dict[str, Any]],
+        skip_dedup: bool,
+    ) -> DispatchExecutionTaskCommand:
+        return DispatchExecutionTaskCommand(
+            task_id=task_id,
+            dispatch_channel=request.dispatch_channel,
+            agent_id=request.agent_id,
+            region=request.region,
+            created_by=actor_id,
+            auto_case_ids=[item.auto_case_id for item in request.cases],
+            case_ids=[binding.case_id for binding in dispatch_bindings],
+            script_entity_ids=[binding.script_entity_id for binding in dispatch_bindings],
+            case_configs=[dict(item.config) for item in request.cases],
+            case_payloads=case_payloads,
+            schedule_type=request.schedule_type,
+            planned_at=request.planned_at,
+            trigger_source=request.trigger_source,
+            category=request.category,
+            project_tag=request.project_tag,
+            repo_url=request.repo_url,
+            branch=request.branch,
+            pytest_options=request.pytest_options,
+            timeout=request.timeout,
+            max_parallel_cases=request.max_parallel_cases,
+            attachments=[],
+            skip_dedup=skip_dedup,
+        )
+
     async def delete_task(self, task_id: str, actor_id: str) -> Dict[str, Any]:
         """删除执行任务（逻辑删除）。"""
         async with execution_scope(task_id=task_id, node=ExecutionNode.TASK_DELETE.value):
@@ -158,6 +302,7 @@ class ExecutionTaskCommandService:
 
             task_doc.is_deleted = True
             await task_doc.save()
+            schedule_project_stats_refresh(task_doc.project_ids, STATS_SECTION_TASKS)
             elog(
                 "info",
                 ExecutionNode.TASK_DELETE,
@@ -199,9 +344,7 @@ class ExecutionTaskCommandService:
             actor_id=actor_id,
             dispatch_bindings=dispatch_bindings,
         )
-        for i in range(len(command.case_payloads)):
-            params = command.case_payloads[i].get("parameters") or {}
-            command.case_payloads[i]["parameters"] = await self._enrich_case_file_params(params, self._attachment_service)
+        await self._enrich_case_file_params(command.case_payloads, self._attachment_service)
         command.attachments = []
 
         elog(
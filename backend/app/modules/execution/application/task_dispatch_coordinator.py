@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from time import perf_counter
 from typing import TYPE_CHECKING, List
 
+from app.modules.execution.application.agent_selector import ExecutionAgentSelector
 from app.modules.execution.application.commands import DispatchExecutionTaskCommand
 from app.modules.execution.application.constants import DispatchStatus, OverallStatus, ScheduleStatus
 from app.modules.execution.application.task_case_coordinator import ExecutionTaskCaseCoordinator
@@ -14,11 +15,15 @@ from app.modules.execution.repository.models import (
     ExecutionTaskCaseDoc,
     ExecutionTaskDoc,
 )
+from app.modules.execution.repository.task_progress_repository import (
+    ExecutionTaskProgressRepository,
+    sync_task_doc,
+)
 from app.modules.execution.shared.execution_context import execution_scope
 from app.modules.execution.shared.execution_log import ExecutionNode, elog
 
 if TYPE_CHECKING:
-    from app.modules.execution.service.task_dispatcher import ExecutionTaskDispatcher
+    from app.modules.execution.service.task_dispatcher import DispatchResult, ExecutionTaskDispatcher
 
 
 class ExecutionTaskDispatchCoordinator:
@@ -28,12 +33,20 @@ class ExecutionTaskDispatchCoordinator:
         self,
         dispatcher: ExecutionTaskDispatcher | None = None,
         case_coordinator: ExecutionTaskCaseCoordinator | None = None,
+        agent_selector: ExecutionAgentSelector | None = None,
+        progress_repository: ExecutionTaskProgressRepository | None = None,
     ) -> None:
         # 延迟导入，打破 service.task_dispatcher <-> application 之间的循环依赖。
         from app.modules.execution.service.task_dispatcher import ExecutionTaskDispatcher
 
         self._dispatcher = dispatcher or ExecutionTaskDispatcher()
         self._case_coordinator = case_coordinator or ExecutionTaskCaseCoordinator()
+        self._agent_selector = agent_selector or ExecutionAgentSelector()
+        self._progress_repository = progress_repository or ExecutionTaskProgressRepository()
+
+    @staticmethod
+    def is_parallel(task_doc: ExecutionTaskDoc) -> bool:
+        return getattr(task_doc, "max_parallel_cases", 1) > 1
 
     @staticmethod
     async def build_case_dispatch_command(
@@ -52,6 +65,7 @@ class ExecutionTaskDispatchCoordinator:
             task_id=task_doc.task_id,
             dispatch_channel=task_doc.dispatch_channel,
             agent_id=task_doc.agent_id,
+            region=request_payload.get("region"),
             created_by=task_doc.created_by,
             auto_case_ids=auto_case_ids,
             case_ids=case_ids,
@@ -104,26 +118,66 @@ class ExecutionTaskDispatchCoordinator:
         should_dispatch_now: bool,
         dispatch_case_index: int,
     ) -> None:
-        """按需下发指定索引的 case。"""
+        """按需下发指定索引的 case；并行模式下一次填满可用槽位。"""
         if not should_dispatch_now:
             return
+        if self.is_parallel(task_doc):
+            await self.fill_parallel_slots(task_doc)
+            return
         await self.dispatch_existing_task(
             task_doc,
             await self.build_task_dispatch_command(task_doc, dispatch_case_index),
         )
 
+    async def fill_parallel_slots(self, task_doc: ExecutionTaskDoc) -> int:
+        """并行模式：按顺序下发后续 case，直到在途数达到可用槽位，返回本次下发数。
+
+        每个槽位先在库中条件认领（推进游标并登记在途），认领成功才发布消息；
+        API 首次下发与 worker 补位并发时，同一条 case 只会被其中一方下发。
+        """
+        slot_count = await self._agent_selector.resolve_slot_count(task_doc.max_parallel_cases, task_doc.agent_id)
+
+        dispatched = 0
+        case_pairs = None
+        while (
+            len(task_doc.in_flight_case_ids) < slot_count
+            and task_doc.next_case_index < task_doc.case_count
+        ):
+            # case 清单每次补位只解析一次，各槽位复用
+            if case_pairs is None:
+                case_pairs = await self._case_coordinator.resolve_task_case_pairs(task_doc)
+            dispatch_case_index = task_doc.next_case_index
+            command = await self.build_case_dispatch_command(task_doc, *case_pairs, dispatch_case_index)
+            claimed = await self._progress_repository.claim_case_slot(
+                task_doc.task_id, command.dispatch_case_id, dispatch_case_index, slot_count
+            )
+            if claimed is None:
+                # 游标已被其他进程推进或槽位已满：以库中最新状态为准重新判断
+                latest = await self._progress_repository.load_progress(task_doc.task_id)
+                if latest is None:
+                    break
+                sync_task_doc(task_doc, {}, latest)
+                if (
+                    task_doc.next_case_index == dispatch_case_index
+                    and len(task_doc.in_flight_case_ids) < slot_count
+                ):
+                    # 状态看起来仍可认领却认领失败（任务已删除等），停止补位
+                    break
+                continue
+            sync_task_doc(task_doc, {}, claimed)
+            await self.dispatch_existing_task(task_doc, command)
+            if task_doc.dispatch_status == DispatchStatus.DISPATCH_FAILED:
+                break
+            dispatched += 1
+        return dispatched
+
     async def dispatch_existing_task(
         self,
         task_doc: ExecutionTaskDoc,
         command: DispatchExecutionTaskCommand,
     ) -> None:
         """对已有任务执行真正下发。"""
-        before_status = {
-            "dispatch_status": task_doc.dispatch_status,
-            "overall_status": task_doc.overall_status,
-            "current_case_id": task_doc.current_case_id,
-            "current_case_index": task_doc.current_case_index,
-        }
+        before_status = self._status_snapshot(task_doc)
         async with execution_scope(
             task_id=command.task_id,
             case_id=command.dispatch_case_id,
@@ -137,83 +191,209 @@ class ExecutionTaskDispatchCoordinator:
                 case_index=command.dispatch_case_index,
             )
             start = perf_counter()
-            dispatch_result = await self._dispatcher.dispatch(command)
+            try:
+                # 选定目标代理与路由键：未指定代理时按负载挑选，满载或不可定向时走共享队列
+                await self._agent_selector.assign(command)
+                dispatch_result = await self._dispatcher.dispatch(command)
+            except Exception:
+                if self.is_parallel(task_doc):
+                    # 发布前已认领槽位，发布异常时回滚认领，避免 case 永久占用在途列表
+                    await self._progress_repository.release_case(
+                        task_doc.task_id, command.dispatch_case_id, {}
+                    )
+                raise
             elapsed_ms = (perf_counter() - start) * 1000
+            if dispatch_result.success:
+                self._agent_selector.reserve(command.agent_id)
+            await self._apply_dispatch_result(task_doc, command, dispatch_result, before_status, elapsed_ms)
 
-            case_doc = await ExecutionTaskCaseDoc.find_one({
-                "task_id": task_doc.task_id,
-                "case_id": command.dispatch_case_id,
-                "is_deleted": False,
-            })
-            dispatch_time = datetime.now(timezone.utc)
-            task_doc.dispatch_channel = dispatch_result.channel
-            task_doc.dispatch_status = (
-                DispatchStatus.DISPATCHED if dispatch_result.success else DispatchStatus.DISPATCH_FAILED
+    async def dispatch_new_tasks(self, task_docs: List[ExecutionTaskDoc]) -> None:
+        """批量触发新建任务的首次下发。
+
+        串行任务的首条 case 命令整批交给分发器一次发布；并行任务需要逐个按槽位补齐，仍走单任务路径。
+        任务此时已经落库，下发阶段的异常只把涉及的任务记为下发失败，不向调用方抛出。
+        """
+        serial: List[tuple[ExecutionTaskDoc, DispatchExecutionTaskCommand]] = []
+        for task_doc in task_docs:
+            try:
+                if self.is_parallel(task_doc):
+                    await self.fill_parallel_slots(task_doc)
+                    continue
+                command = await self.build_task_dispatch_command(task_doc, 0)
+                # 逐条选代理并立即预占，后面的命令才能看到前面命令带来的负载
+                await self._agent_selector.assign(command)
+            except Exception as exc:
+                await self._mark_dispatch_failed(task_doc, exc)
+                continue
+            self._agent_selector.reserve(command.agent_id)
+            serial.append((task_doc, command))
+        if not serial:
+            return
+
+        before_statuses = [self._status_snapshot(task_doc) for task_doc, _ in serial]
+        start = perf_counter()
+        try:
+            results = await self._dispatcher.dispatch_many([command for _, command in serial])
+        except Exception as exc:
+            for task_doc, command in serial:
+                self._agent_selector.release(command.agent_id)
+                await self._mark_dispatch_failed(task_doc, exc)
+            return
+        elapsed_ms = (perf_counter() - start) * 1000
+        for (task_doc, command), dispatch_result, before_status in zip(serial, results, before_statuses):
+            if not dispatch_result.success:
+                self._agent_selector.release(command.agent_id)
+            async with execution_scope(
+                task_id=command.task_id,
+                case_id=command.dispatch_case_id,
+                agent_id=command.agent_id,
+                node=ExecutionNode.TASK_DISPATCH.value,
+            ):
+                await self._apply_dispatch_result(task_doc, command, dispatch_result, before_status, elapsed_ms)
+
+    async def _mark_dispatch_failed(self, task_doc: ExecutionTaskDoc, exc: Exception) -> None:
+        """把首次下发抛出异常的任务记为下发失败；并行任务已有在途 case 时由其完成事件收口。"""
+        fields = {
+            "dispatch_status": DispatchStatus.DISPATCH_FAILED.value,
+            "dispatch_error": f"Dispatch failed: {exc}",
+            "overall_status": OverallStatus.FAILED.value,
+        }
+        if not task_doc.in_flight_case_ids:
+            fields["finished_at"] = datetime.now(timezone.utc)
+        async with execution_scope(task_id=task_doc.task_id, node=ExecutionNode.TASK_DISPATCH.value):
+            elog(
+                "error",
+                ExecutionNode.TASK_DISPATCH,
+                "failed to dispatch new execution task",
+                outcome="failed",
+                error=str(exc),
             )
-            task_doc.dispatch_error = dispatch_result.error
-            task_doc.dispatch_response = dispatch_result.response
-            task_doc.schedule_status = ScheduleStatus.TRIGGERED
-            task_doc.current_case_id = command.dispatch_case_id
-            task_doc.current_case_index = command.dispatch_case_index
-            if not task_doc.triggered_at:
-                task_doc.triggered_at = dispatch_time
-            if dispatch_result.success:
-                task_doc.overall_status = OverallStatus.QUEUED
-                task_doc.finished_at = None
-            else:
-                task_doc.overall_status = OverallStatus.FAILED
-                task_doc.finished_at = dispatch_time
-            await task_doc.save()
-
-            after_status = {
-                "dispatch_status": task_doc.dispatch_status,
-                "overall_status": task_doc.overall_status,
-                "current_case_id": task_doc.current_case_id,
-                "current_case_index": task_doc.current_case_index,
-            }
-
-            if case_doc:
-                case_doc.dispatch_attempts += 1
-                case_doc.dispatch_status = (
-                    DispatchStatus.DISPATCHED if dispatch_result.success else DispatchStatus.DISPATCH_FAILED
-                )
-                case_doc.dispatched_at = dispatch_time
-                await case_doc.save()
+            try:
+                updated = await self._progress_repository.update_fields(task_doc.task_id, fields)
+            except Exception as save_exc:
                 elog(
-                    "debug",
+                    "error",
                     ExecutionNode.TASK_DISPATCH,
-                    "updated execution case dispatch state",
-                    dispatch_attempts=case_doc.dispatch_attempts,
-                    case_dispatch_status=case_doc.dispatch_status,
-                )
-            else:
-                elog(
-                    "warning",
-                    ExecutionNode.TASK_DISPATCH,
-                    "execution case doc missing during dispatch",
+                    "failed to persist dispatch failure",
                     outcome="failed",
+                    error=str(save_exc),
                 )
+                updated = None
+        sync_task_doc(task_doc, fields, updated)
 
-            if dispatch_result.success:
-                elog(
-                    "info",
-                    ExecutionNode.TASK_DISPATCH,
-                    "successfully dispatched execution task case",
-                    outcome="success",
-                    channel=dispatch_result.channel,
-                    before=before_status,
-                    after=after_status,
-                    duration_ms=elapsed_ms,
-                )
-            else:
-                elog(
-                    "warning",
-                    ExecutionNode.TASK_DISPATCH,
-                    "failed to dispatch execution task case",
-                    outcome="failed",
-                    channel=dispatch_result.channel,
-                    error=dispatch_result.error,
-                    before=before_status,
-                    after=after_status,
-                    duration_ms=elapsed_ms,
+    @staticmethod
+    def _status_snapshot(task_doc: ExecutionTaskDoc) -> dict:
+        return {
+            "dispatch_status": task_doc.dispatch_status,
+            "overall_status": task_doc.overall_status,
+            "current_case_id": task_doc.current_case_id,
+            "current_case_index": task_doc.current_case_index,
+        }
+
+    async def _apply_dispatch_result(
+        self,
+        task_doc: ExecutionTaskDoc,
+        command: DispatchExecutionTaskCommand,
+        dispatch_result: DispatchResult,
+        before_status: dict,
+        elapsed_ms: float,
+    ) -> None:
+        """把一次下发结果写回任务与 case 明细。"""
+        # case 明细没有软删除字段，按 is_deleted 过滤会永远查不到
+        case_doc = await ExecutionTaskCaseDoc.find_one({
+            "task_id": task_doc.task_id,
+            "case_id": command.dispatch_case_id,
+        })
+        dispatch_time = datetime.now(timezone.utc)
+        dispatch_status = (
+            DispatchStatus.DISPATCHED if dispatch_result.success else DispatchStatus.DISPATCH_FAILED
+        )
+        fields = {
+            "dispatch_channel": dispatch_result.channel,
+            "dispatch_status": dispatch_status.value,
+            "dispatch_error": dispatch_result.error,
+            "dispatch_response": dispatch_result.response,
+            "schedule_status": ScheduleStatus.TRIGGERED.value,
+            "current_case_id": command.dispatch_case_id,
+            "current_case_index": command.dispatch_case_index,
+            "triggered_at": task_doc.triggered_at or dispatch_time,
+        }
+        # 只写本次下发涉及的字段，避免整文档 save 覆盖 worker 并发写入的在途列表与计数
+        if not dispatch_result.success:
+            fields.update(overall_status=OverallStatus.FAILED.value, finished_at=dispatch_time)
+            updated = None
+            if self.is_parallel(task_doc):
+                # 回滚发布前的槽位认领：未发出的 case 移出在途列表
+                updated = await self._progress_repository.release_case(
+                    task_doc.task_id, command.dispatch_case_id, fields
                 )
+            if updated is None:
+                updated = await self._progress_repository.update_fields(task_doc.task_id, fields)
+        elif not self.is_parallel(task_doc):
+            fields.update(overall_status=OverallStatus.QUEUED.value, finished_at=None)
+            updated = await self._progress_repository.update_fields(task_doc.task_id, fields)
+        else:
+            fields["finished_at"] = None
+            updated = await self._progress_repository.mark_case_dispatched(
+                task_doc.task_id, command.dispatch_case_id, fields
+            )
+            # 其他 case 仍在执行时补位下发不应把 RUNNING 回退为 QUEUED
+            active = [OverallStatus.RUNNING.value, OverallStatus.QUEUED.value]
+            if updated is None:
+                # 完成事件先于下发结果到达，case 已被释放（任务可能已收口），不再改写任务
+                fields = {}
+            elif updated.get("overall_status") not in active:
+                if await self._progress_repository.set_status_unless(
+                    task_doc.task_id, OverallStatus.QUEUED.value, active
+                ):
+                    updated["overall_status"] = OverallStatus.QUEUED.value
+        sync_task_doc(task_doc, fields, updated)
+
+        after_status = self._status_snapshot(task_doc)
+
+        if case_doc:
+            case_doc.dispatch_attempts += 1
+            case_doc.dispatch_status = (
+                DispatchStatus.DISPATCHED if dispatch_result.success else DispatchStatus.DISPATCH_FAILED
+            )
+            case_doc.dispatched_at = dispatch_time
+            case_doc.agent_id = command.agent_id
+            await case_doc.save()
+            elog(
+                "debug",
+                ExecutionNode.TASK_DISPATCH,
+                "updated execution case dispatch state",
+                dispatch_attempts=case_doc.dispatch_attempts,
+                case_dispatch_status=case_doc.dispatch_status,
+            )
+        else:
+            elog(
+                "warning",
+                ExecutionNode.TASK_DISPATCH,
+                "execution case doc missing during dispatch",
+                outcome="failed",
+            )
+
+        if dispatch_result.success:
+            elog(
+                "info",
+                ExecutionNode.TASK_DISPATCH,
+                "successfully dispatched execution task case",
+                outcome="success",
+                channel=dispatch_result.channel,
+                before=before_status,
+                after=after_status,
+                duration_ms=elapsed_ms,
+            )
+        else:
+            elog(
+                "warning",
+                ExecutionNode.TASK_DISPATCH,
+                "failed to dispatch execution task case",
+                outcome="failed",
+                channel=dispatch_result.channel,
+                error=dispatch_result.error,
+                before=before_status,
+                after=after_status,
+                duration_ms=elapsed_ms,
+            )
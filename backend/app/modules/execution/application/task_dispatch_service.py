@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from beanie import PydanticObjectId
 
 from app.modules.execution.application.task_case_coordinator import ExecutionTaskCaseCoordinator
 from app.modules.execution.application.task_command_helpers import (
@@ -17,7 +19,7 @@ from app.modules.execution.application.task_dispatch_coordinator import Executio
 from app.modules.execution.application.task_serializer import ExecutionTaskSerializer
 from app.modules.execution.application.commands import DispatchExecutionTaskCommand
 from app.modules.execution.application.constants import DispatchStatus
-from app.modules.execution.repository.models import ExecutionTaskDoc
+from app.modules.execution.repository.models import ExecutionTaskCaseDoc, ExecutionTaskDoc
 from app.modules.execution.service.task_dispatcher import ExecutionTaskDispatcher
 from app.shared.core.logger import log as logger
 
@@ -38,6 +40,83 @@ class ExecutionDispatchService:
         actor_id: str,
     ) -> Dict[str, Any]:
         """创建执行任务，并在需要时立即触发首条 case 下发。"""
+        task_doc, should_dispatch_now = await self._prepare_task_doc(command, actor_id)
+        doc_map = await self._case_coordinator.load_case_docs(command.case_ids)
+        await task_doc.insert()
+        await self._case_coordinator.replace_task_case_docs(
+            task_doc.task_id,
+            command.case_ids,
+            command.auto_case_ids,
+            command.case_configs or [{} for _ in command.case_ids],
+            doc_map,
+        )
+        await task_doc.save()
+        await self._dispatch_coordinator.dispatch_task_if_needed(
+            task_doc,
+            should_dispatch_now,
+            0,
+        )
+        logger.info(
+            "Execution task created: "
+            f"task_id={task_doc.task_id}, schedule_status={task_doc.schedule_status}, "
+            f"dispatch_status={task_doc.dispatch_status}, should_dispatch_now={should_dispatch_now}"
+        )
+        return self._serializer.serialize_task_doc(task_doc)
+
+    async def create_tasks_from_commands(
+        self,
+        commands: List[DispatchExecutionTaskCommand],
+        actor_id: str,
+    ) -> List[Dict[str, Any] | Exception]:
+        """批量创建执行任务并整批触发首次下发。
+
+        用例快照一次加载，任务与 case 明细各一次 `insert_many`，需要立即下发的任务交给分发器整批发布。
+        单条命令校验失败只影响自身：对应位置返回异常对象，其余结果为序列化后的任务。
+        """
+        results: List[Dict[str, Any] | Exception | None] = [None] * len(commands)
+        doc_map = await self._case_coordinator.load_case_docs(
+            list(dict.fromkeys(case_id for command in commands for case_id in command.case_ids))
+        )
+        prepared: List[tuple[int, ExecutionTaskDoc, bool]] = []
+        case_docs: List[ExecutionTaskCaseDoc] = []
+        for index, command in enumerate(commands):
+            try:
+                task_doc, should_dispatch_now = await self._prepare_task_doc(command, actor_id)
+            except Exception as exc:
+                results[index] = exc
+                continue
+            # insert_many 不回填主键，预先分配 _id，后续 save 才会按主键更新而不是重复插入
+            task_doc.id = PydanticObjectId()
+            prepared.append((index, task_doc, should_dispatch_now))
+            case_docs.extend(self._case_coordinator.build_task_case_docs(
+                task_doc.task_id,
+                command.case_ids,
+                command.auto_case_ids,
+                command.script_entity_ids or [],
+                command.case_configs or [],
+                doc_map,
+            ))
+        if prepared:
+            for case_doc in case_docs:
+                case_doc.id = PydanticObjectId()
+            await ExecutionTaskDoc.insert_many([task_doc for _, task_doc, _ in prepared])
+            await ExecutionTaskCaseDoc.insert_many(case_docs)
+            await self._dispatch_coordinator.dispatch_new_tasks(
+                [task_doc for _, task_doc, dispatch_now in prepared if dispatch_now]
+            )
+        for index, task_doc, _ in prepared:
+            results[index] = self._serializer.serialize_task_doc(task_doc)
+        logger.info(
+            f"Execution tasks created in batch: requested={len(commands)}, created={len(prepared)}"
+        )
+        return results
+
+    async def _prepare_task_doc(
+        self,
+        command: DispatchExecutionTaskCommand,
+        actor_id: str,
+    ) -> tuple[ExecutionTaskDoc, bool]:
+        """校验命令并构建待写入的任务文档，返回 (任务文档, 是否立即下发)。"""
         ensure_actor_identity(actor_id, command.created_by)
         if not command.case_ids:
             raise ValueError("case_ids must not be empty")
@@ -46,7 +125,6 @@ class ExecutionDispatchService:
             f"task_id={command.task_id}, agent_id={command.agent_id}, "
             f"case_count={len(command.case_ids)}, schedule_type={command.schedule_type}"
         )
-        doc_map = await self._case_coordinator.load_case_docs(command.case_ids)
         schedule_type, planned_at, schedule_status, should_dispatch_now = normalize_schedule(
             command.schedule_type,
             command.planned_at,
@@ -72,26 +150,7 @@ class ExecutionDispatchService:
             schedule_status=schedule_status,
             dispatch_status=DispatchStatus.DISPATCHING if should_dispatch_now else DispatchStatus.PENDING,
         )
-        await task_doc.insert()
-        await self._case_coordinator.replace_task_case_docs(
-            task_doc.task_id,
-            command.case_ids,
-            command.auto_case_ids,
-            command.case_configs or [{} for _ in command.case_ids],
-            doc_map,
-        )
-        await task_doc.save()
-        await self._dispatch_coordinator.dispatch_task_if_needed(
-            task_doc,
-            should_dispatch_now,
-            0,
-        )
-        logger.info(
-            "Execution task created: "
-            f"task_id={task_doc.task_id}, schedule_status={task_doc.schedule_status}, "
-            f"dispatch_status={task_doc.dispatch_status}, should_dispatch_now={should_dispatch_now}"
-        )
-        return self._serializer.serialize_task_doc(task_doc)
+        return task_doc, should_dispatch_now
 
     async def build_task_dispatch_command(
         self,
@@ -111,3 +170,7 @@ class ExecutionDispatchService:
     ) -> None:
         """对已有任务执行一次真正下发。"""
         await self._dispatch_coordinator.dispatch_existing_task(task_doc, command)
+
+    async def fill_parallel_slots(self, task_doc: ExecutionTaskDoc) -> int:
+        """并行模式下补齐在途 case，返回本次下发数。"""
+        return await self._dispatch_coordinator.fill_parallel_slots(task_doc)
@@ -71,6 +71,8 @@ class ExecutionTaskSerializer:
             "current_case_id": getattr(task_doc, "current_case_id", None),
             "current_auto_case_id": current_auto_case_id,
             "current_case_index": current_case_index,
+            "max_parallel_cases": getattr(task_doc, "max_parallel_cases", 1),
+            "in_flight_case_ids": list(getattr(task_doc, "in_flight_case_ids", None) or []),
             "planned_at": task_doc.planned_at,
             "triggered_at": task_doc.triggered_at,
             "started_at": task_doc.started_at,
@@ -97,6 +99,7 @@ class ExecutionTaskSerializer:
             "progress_percent": case_doc.progress_percent,
             "dispatch_status": case_doc.dispatch_status,
             "dispatch_attempts": case_doc.dispatch_attempts,
+            "agent_id": getattr(case_doc, "agent_id", None),
             "event_count": getattr(case_doc, "event_count", 0),
             "failure_message": getattr(case_doc, "failure_message", None),
             "started_at": case_doc.started_at,
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from beanie import Document
 from pydantic import Field
@@ -58,6 +58,12 @@ class ExecutionTaskDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMix
     progress_percent: Optional[float] = Field(default=None, description="任务进度百分比")
     current_case_id: Optional[str] = Field(None, description="当前下发中的测试用例 ID")
     current_case_index: int = Field(default=0, description="当前下发中的测试用例序号")
+    max_parallel_cases: int = Field(default=1, description="同时在途的最大 case 数；1 为串行编排（默认）")
+    in_flight_case_ids: List[str] = Field(
+        default_factory=list,
+        description="并行模式下已下发、尚未完成的 case ID",
+    )
+    next_case_index: int = Field(default=0, description="并行模式下下一条待下发 case 的顺序索引")
     planned_at: Optional[datetime] = Field(None, description="计划触发时间（UTC），定时任务使用")
     triggered_at: Optional[datetime] = Field(None, description="任务首次真正触发下发的时间（UTC）")
     started_at: Optional[datetime] = Field(None, description="任务开始执行时间（UTC）")
@@ -68,6 +74,7 @@ class ExecutionTaskDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMix
     last_event_type: Optional[str] = Field(None, description="最近一次 Kafka 事件类型")
     last_event_phase: Optional[str] = Field(None, description="最近一次 Kafka 事件阶段")
     consumed_at: Optional[datetime] = Field(None, description="下游消费者确认消费该任务的时间（UTC）")
+    progress_seq: int = Field(default=0, description="进度推送序号，每应用一条执行事件递增一次")
 
     class Settings:
         name = "execution_tasks"
@@ -126,6 +133,7 @@ class ExecutionTaskCaseDoc(Document, TimestampedDocumentMixin):
     started_at: Optional[datetime] = Field(None, description="当前 case 开始时间（UTC）")
     finished_at: Optional[datetime] = Field(None, description="当前 case 结束时间（UTC）")
     dispatched_at: Optional[datetime] = Field(None, description="当前 case 最近一次被平台下发的时间（UTC）")
+    agent_id: Optional[str] = Field(None, description="当前 case 最近一次下发的目标代理 ID")
     failure_message: Optional[str] = Field(None, description="当前 case 失败信息")
     nodeid: Optional[str] = Field(None, description="测试节点标识")
     project_tag: Optional[str] = Field(None, description="项目标签")
@@ -165,6 +173,9 @@ class ExecutionAgentDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMi
         description="最近一次心跳时间（UTC）",
     )
     heartbeat_ttl_seconds: int = Field(default=90, description="心跳过期阈值（秒）")
+    capacity: int = Field(default=1, description="可同时执行的 case 数")
+    in_flight_count: int = Field(default=0, description="最近一次心跳上报的在途 case 数")
+    routing_key: Optional[str] = Field(None, description="代理专属队列的路由键，为空时走共享任务队列")
 
     class Settings:
         name = "execution_agents"
@@ -0,0 +1,141 @@
+"""执行任务当前态的原子更新边界。
+
+并行模式下 API（首次下发）与 worker（事件消费、补位下发）会同时改写同一条任务，
+整文档 `save()` 会互相覆盖 `in_flight_case_ids` / `next_case_index`。
+这里的方法只用 `$set` / `$inc` / `$addToSet` / `$pull` 改动涉及的字段，
+并返回更新后的文档（dict），调用方据此判断任务是否该收口。
+
+并行槽位在发布消息之前用一次条件更新认领（游标与在途列表同时推进），
+同一位置只会被一个进程认领；case 在认领后即处于在途列表，完成事件先于下发结果到达也能正常释放。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+
+from pymongo import ReturnDocument
+
+from app.modules.execution.repository.models import ExecutionTaskDoc
+
+# 其他进程可能并发改写的编排字段：每次原子更新后以库里返回的值为准
+SYNCED_TASK_FIELDS = (
+    "in_flight_case_ids",
+    "next_case_index",
+    "overall_status",
+    "dispatch_status",
+    "failed_case_count",
+    "progress_seq",
+)
+
+
+def sync_task_doc(task_doc: Any, fields: dict[str, Any], updated: dict[str, Any] | None) -> None:
+    """把本次写入的字段与更新后文档中的编排字段同步回内存中的任务对象。"""
+    for key, value in fields.items():
+        setattr(task_doc, key, value)
+    for key in SYNCED_TASK_FIELDS:
+        if updated and key in updated:
+            setattr(task_doc, key, updated[key])
+
+
+class ExecutionTaskProgressRepository:
+    """封装任务级字段更新、在途 case 登记/释放与条件收口。"""
+
+    @staticmethod
+    async def _find_one_and_update(query: dict, update: dict) -> dict[str, Any] | None:
+        # 原子更新不经过 Beanie 的序列化与保存钩子，这里展开枚举值并补上 updated_at
+        fields = {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in update.get("$set", {}).items()
+        }
+        fields["updated_at"] = datetime.now(timezone.utc)
+        return await ExecutionTaskDoc.get_pymongo_collection().find_one_and_update(
+            query,
+            {**update, "$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def update_fields(
+        self,
+        task_id: str,
+        fields: dict[str, Any],
+        *,
+        inc: dict[str, int] | None = None,
+    ) -> dict[str, Any] | None:
+        """只 `$set` 指定字段（可附带 `$inc`），不触碰在途 case 列表。"""
+        update: dict[str, Any] = {"$set": fields}
+        if inc:
+            update["$inc"] = inc
+        return await self._find_one_and_update({"task_id": task_id, "is_deleted": False}, update)
+
+    async def load_progress(self, task_id: str) -> dict[str, Any] | None:
+        """读取任务当前的编排字段，认领失败后据此刷新内存中的任务对象。"""
+        return await ExecutionTaskDoc.get_pymongo_collection().find_one(
+            {"task_id": task_id, "is_deleted": False},
+            {key: 1 for key in SYNCED_TASK_FIELDS},
+        )
+
+    async def claim_case_slot(
+        self,
+        task_id: str,
+        case_id: str,
+        case_index: int,
+        slot_count: int,
+    ) -> dict[str, Any] | None:
+        """认领一个并行槽位：游标仍停在 case_index 且在途数未满时推进游标并登记在途 case。
+
+        游标已被其他进程推进、case 已下发完或槽位已满时返回 None，调用方不得发布该 case。
+        """
+        return await self._find_one_and_update(
+            {
+                "task_id": task_id,
+                "is_deleted": False,
+                "next_case_index": case_index,
+                "case_count": {"$gt": case_index},
+                "$expr": {"$lt": [{"$size": "$in_flight_case_ids"}, slot_count]},
+            },
+            {
+                "$inc": {"next_case_index": 1},
+                "$addToSet": {"in_flight_case_ids": case_id},
+            },
+        )
+
+    async def mark_case_dispatched(
+        self,
+        task_id: str,
+        case_id: str,
+        fields: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """写入已认领 case 的下发结果；case 已完成并被释放时不再改写任务，返回 None。"""
+        return await self._find_one_and_update(
+            {"task_id": task_id, "in_flight_case_ids": case_id},
+            {"$set": fields},
+        )
+
+    async def set_status_unless(self, task_id: str, status: str, keep_statuses: list[str]) -> bool:
+        """当前状态不在 keep_statuses 内时才写入 overall_status，返回是否写入。"""
+        result = await ExecutionTaskDoc.get_pymongo_collection().update_one(
+            {"task_id": task_id, "overall_status": {"$nin": keep_statuses}},
+            {"$set": {"overall_status": status, "updated_at": datetime.now(timezone.utc)}},
+        )
+        return result.modified_count > 0
+
+    async def release_case(
+        self,
+        task_id: str,
+        case_id: str,
+        fields: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """`$pull` 一条完成（或下发失败需回滚认领）的在途 case；该 case 已不在途时返回 None。"""
+        return await self._find_one_and_update(
+            {"task_id": task_id, "in_flight_case_ids": case_id},
+            {"$pull": {"in_flight_case_ids": case_id}, "$set": fields},
+        )
+
+    async def complete_if_drained(self, task_id: str, fields: dict[str, Any]) -> dict[str, Any] | None:
+        """在途列表为空时才写入收口字段；期间有新 case 下发则返回 None。"""
+        return await self._find_one_and_update(
+            {"task_id": task_id, "in_flight_case_ids": {"$size": 0}},
+            {"$set": fields},
+        )
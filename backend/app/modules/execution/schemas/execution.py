@@ -4,7 +4,11 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from app.modules.execution.application.constants import AgentStatus
+from app.modules.execution.application.constants import (
+    MAX_AGENT_CAPACITY,
+    MAX_PARALLEL_CASES_LIMIT,
+    AgentStatus,
+)
 
 
 class DispatchCaseItem(BaseModel):
@@ -38,6 +42,7 @@ class _TaskDispatchBase(BaseModel):
         description="已废弃，固定使用 RABBITMQ 下发，传入值会被忽略",
     )
     agent_id: Optional[str] = Field(None, description="目标执行代理 ID")
+    region: Optional[str] = Field(None, description="优先选择的代理区域；指定 agent_id 时忽略")
     schedule_type: Optional[str] = Field(None, description="调度类型：IMMEDIATE 或 SCHEDULED")
     planned_at: Optional[datetime] = Field(None, description="计划执行时间（UTC）")
     category: Optional[str] = Field(None, description="任务分类，例如 bmc")
@@ -46,6 +51,12 @@ class _TaskDispatchBase(BaseModel):
     branch: Optional[str] = Field(None, description="代码分支")
     pytest_options: Optional[Dict[str, Any]] = Field(None, description="pytest 扩展选项")
     timeout: Optional[int] = Field(None, description="任务超时时间，单位秒")
+    max_parallel_cases: Optional[int] = Field(
+        None,
+        ge=1,
+        le=MAX_PARALLEL_CASES_LIMIT,
+        description="同时在途的最大 case 数；重跑时不传沿用原任务",
+    )
 
     model_config = ConfigDict(extra="forbid")
 
@@ -71,6 +82,12 @@ class DispatchTaskRequest(_TaskDispatchBase):
     pytest_options: Dict[str, Any] = Field(default_factory=dict, description="pytest 扩展选项")
     cases: List[DispatchCaseItem] = Field(default_factory=list, description="用例列表")
     attachments: List[DispatchAttachmentItem] = Field(default_factory=list, description="附件列表")
+    max_parallel_cases: int = Field(
+        default=1,
+        ge=1,
+        le=MAX_PARALLEL_CASES_LIMIT,
+        description="同时在途的最大 case 数；1 为按顺序串行执行（默认）",
+    )
 
     @model_validator(mode="after")
     def validate_dispatch_request(self) -> "DispatchTaskRequest":
@@ -109,6 +126,8 @@ class DispatchTaskResponse(BaseModel):
     current_case_id: Optional[str] = Field(None, description="当前正在执行或最近一次下发的测试用例 ID")
     current_auto_case_id: Optional[str] = Field(None, description="当前正在执行或最近一次下发的自动化用例 ID")
     current_case_index: int = Field(0, description="当前测试用例在任务内的顺序索引，从 0 开始")
+    max_parallel_cases: int = Field(1, description="同时在途的最大 case 数，1 为串行")
+    in_flight_case_ids: List[str] = Field(default_factory=list, description="并行模式下正在执行的 case ID")
     planned_at: Optional[datetime] = Field(None, description="计划执行时间（UTC）")
     triggered_at: Optional[datetime] = Field(None, description="任务首次真正触发下发的时间（UTC）")
     created_at: datetime = Field(..., description="任务创建时间（UTC）")
@@ -130,6 +149,8 @@ class ExecutionTaskListItem(BaseModel):
     current_case_id: Optional[str] = Field(None, description="当前游标指向的测试用例 ID")
     current_auto_case_id: Optional[str] = Field(None, description="当前游标指向的自动化用例 ID")
     current_case_index: int = Field(0, description="当前游标指向的测试用例顺序索引")
+    max_parallel_cases: int = Field(1, description="同时在途的最大 case 数，1 为串行")
+    in_flight_case_ids: List[str] = Field(default_factory=list, description="并行模式下正在执行的 case ID")
     planned_at: Optional[datetime] = Field(None, description="计划执行时间（UTC）")
     triggered_at: Optional[datetime] = Field(None, description="任务首次被触发执行的时间（UTC）")
     created_at: datetime = Field(..., description="任务创建时间（UTC）")
@@ -147,6 +168,7 @@ class ExecutionTaskListCaseItem(BaseModel):
     progress_percent: Optional[float] = Field(None, description="当前执行进度")
     dispatch_status: str = Field(..., description="当前下发状态")
     dispatch_attempts: int = Field(..., description="下发次数")
+    agent_id: Optional[str] = Field(None, description="最近一次下发的目标代理 ID")
     event_count: int = Field(..., description="事件数量")
     failure_message: Optional[str] = Field(None, description="失败原因")
     started_at: Optional[datetime] = Field(None, description="开始时间")
@@ -165,12 +187,20 @@ class AgentRegisterRequest(BaseModel):
     region: str = Field(..., min_length=1, description="区域")
     status: str = Field(default=AgentStatus.ONLINE, description="代理状态")
     heartbeat_ttl_seconds: int = Field(default=90, ge=10, le=3600, description="心跳租约秒数")
+    capacity: int = Field(default=1, ge=1, le=MAX_AGENT_CAPACITY, description="可同时执行的 case 数")
+    routing_key: Optional[str] = Field(
+        None,
+        min_length=1,
+        description="代理专属队列的路由键；为空时只从共享任务队列消费",
+    )
 
     model_config = ConfigDict(extra="forbid")
 
 
 class AgentHeartbeatRequest(BaseModel):
     status: str = Field(default=AgentStatus.ONLINE, description="代理状态")
+    capacity: Optional[int] = Field(None, ge=1, le=MAX_AGENT_CAPACITY, description="可同时执行的 case 数，不传保持不变")
+    in_flight_count: Optional[int] = Field(None, ge=0, description="当前在途 case 数，不传保持不变")
 
     model_config = ConfigDict(extra="forbid")
 
@@ -194,6 +224,9 @@ class ExecutionAgentResponse(BaseModel):
     registered_at: datetime = Field(..., description="代理首次注册或最近一次注册时间（UTC）")
     last_heartbeat_at: datetime = Field(..., description="最近一次心跳时间（UTC）")
     heartbeat_ttl_seconds: int = Field(..., description="心跳租约时长，超过后可判定离线")
+    capacity: int = Field(1, description="可同时执行的 case 数")
+    in_flight_count: int = Field(0, description="最近一次心跳上报的在途 case 数")
+    routing_key: Optional[str] = Field(None, description="代理专属队列的路由键")
     is_online: bool = Field(..., description="平台根据心跳和租约推导的在线状态")
     created_at: datetime = Field(..., description="代理记录创建时间（UTC）")
     updated_at: datetime = Field(..., description="代理记录最近更新时间（UTC）")
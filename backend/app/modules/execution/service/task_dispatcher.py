@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from app.modules.execution.shared.execution_log import ExecutionNode, elog
 from app.shared.kafka import TaskMessage
@@ -30,25 +30,39 @@ class ExecutionTaskDispatcher:
         """通过 RabbitMQ 下发任务。"""
         return await self._dispatch_via_rabbitmq(command)
 
-    async def _dispatch_via_rabbitmq(self, command: DispatchExecutionTaskCommand) -> DispatchResult:
-        """通过 RabbitMQ 下发任务。"""
-        from app.modules.execution.application.task_command_helpers import build_dispatch_task_data
+    async def dispatch_many(self, commands: List[DispatchExecutionTaskCommand]) -> List[DispatchResult]:
+        """批量下发：整批消息一次交给生产者连续发布，按输入顺序返回结果。"""
         from app.shared.infrastructure import get_rabbitmq_manager
 
+        if not commands:
+            return []
         rabbitmq_manager = get_rabbitmq_manager()
         if not rabbitmq_manager:
-            return DispatchResult(
-                success=False,
-                channel="RABBITMQ",
-                message="RabbitMQ manager not available",
-                response={"accepted": False, "message": "RabbitMQ manager not available"},
-                error="RabbitMQ manager not available",
-            )
+            return [_manager_unavailable() for _ in commands]
+
+        messages = [
+            (self._build_task_message(command), getattr(command, "routing_key", None))
+            for command in commands
+        ]
+        elog(
+            "info",
+            ExecutionNode.TASK_DISPATCH,
+            "dispatching execution task batch via RabbitMQ",
+            channel="RABBITMQ",
+            queue="dmlv4.tasks",
+            batch_size=len(messages),
+        )
+        sent = await rabbitmq_manager.send_tasks_async(messages)
+        return [_accepted() if success else _rejected() for success in sent]
+
+    @staticmethod
+    def _build_task_message(command: DispatchExecutionTaskCommand) -> TaskMessage:
+        from app.modules.execution.application.task_command_helpers import build_dispatch_task_data
 
         delivery_id = f"{command.task_id}:{command.dispatch_case_id}"
         task_data = build_dispatch_task_data(command)
         task_data["delivery_id"] = delivery_id
-        task_message = TaskMessage(
+        return TaskMessage(
             task_id=command.task_id,
             task_type="execution_task",
             task_data=task_data,
@@ -56,20 +70,33 @@ class ExecutionTaskDispatcher:
             source="dmlv4-execution-api",
             priority=1,
         )
+
+    async def _dispatch_via_rabbitmq(self, command: DispatchExecutionTaskCommand) -> DispatchResult:
+        """通过 RabbitMQ 下发任务。"""
+        from app.shared.infrastructure import get_rabbitmq_manager
+
+        rabbitmq_manager = get_rabbitmq_manager()
+        if not rabbitmq_manager:
+            return _manager_unavailable()
+
+        # 选中了声明专属队列的代理时定向投递，否则走共享任务队列
+        routing_key = getattr(command, "routing_key", None)
+        task_message = self._build_task_message(command)
         elog(
             "info",
             ExecutionNode.TASK_DISPATCH,
             "dispatching execution task via RabbitMQ",
             channel="RABBITMQ",
             queue="dmlv4.tasks",
+            routing_key=routing_key,
         )
         elog(
             "debug",
             ExecutionNode.TASK_DISPATCH,
             "RabbitMQ execution dispatch payload",
-            payload=task_data,
+            payload=task_message.task_data,
         )
-        success = await rabbitmq_manager.send_task_async(task_message)
+        success = await rabbitmq_manager.send_task_async(task_message, routing_key=routing_key)
         if success:
             elog(
                 "info",
@@ -78,12 +105,7 @@ class ExecutionTaskDispatcher:
                 outcome="success",
                 channel="RABBITMQ",
             )
-            return DispatchResult(
-                success=True,
-                channel="RABBITMQ",
-                message="Task dispatched to RabbitMQ successfully",
-                response={"accepted": True, "message": "Task dispatched to RabbitMQ successfully"},
-            )
+            return _accepted()
 
         elog(
             "warning",
@@ -92,10 +114,33 @@ class ExecutionTaskDispatcher:
             outcome="failed",
             channel="RABBITMQ",
         )
-        return DispatchResult(
-            success=False,
-            channel="RABBITMQ",
-            message="Failed to dispatch task to RabbitMQ",
-            response={"accepted": False, "message": "Failed to dispatch task to RabbitMQ"},
-            error="Failed to send task to RabbitMQ",
-        )
+        return _rejected()
+
+
+def _manager_unavailable() -> DispatchResult:
+    return DispatchResult(
+        success=False,
+        channel="RABBITMQ",
+        message="RabbitMQ manager not available",
+        response={"accepted": False, "message": "RabbitMQ manager not available"},
+        error="RabbitMQ manager not available",
+    )
+
+
+def _accepted() -> DispatchResult:
+    return DispatchResult(
+        success=True,
+        channel="RABBITMQ",
+        message="Task dispatched to RabbitMQ successfully",
+        response={"accepted": True, "message": "Task dispatched to RabbitMQ successfully"},
+    )
+
+
+def _rejected() -> DispatchResult:
+    return DispatchResult(
+        success=False,
+        channel="RABBITMQ",
+        message="Failed to dispatch task to RabbitMQ",
+        response={"accepted": False, "message": "Failed to dispatch task to RabbitMQ"},
+        error="Failed to send task to RabbitMQ",
+    )
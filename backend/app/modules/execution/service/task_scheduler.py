@@ -83,6 +83,17 @@ class ExecutionTaskScheduler:
             node=ExecutionNode.SCHEDULER_TICK.value,
         ):
             try:
+                if getattr(task, "max_parallel_cases", 1) > 1:
+                    dispatched = await self._dispatch_service.fill_parallel_slots(task)
+                    elog(
+                        "info",
+                        ExecutionNode.SCHEDULER_TICK,
+                        "dispatched due parallel execution task",
+                        outcome="started",
+                        planned_at=str(task.planned_at),
+                        dispatched_count=dispatched,
+                    )
+                    return 1
                 command = await self._dispatch_service.build_task_dispatch_command(task, 0)
                 elog(
                     "info",
@@ -7,6 +7,7 @@ from __future__ import annotations
 from fastapi import HTTPException
 
 from app.modules.execution_plan.domain.exceptions import (
+    DispatchJobNotFoundError,
     ExecutionPlanError,
     ItemNotFoundError,
     PlanNotFoundError,
@@ -18,7 +19,7 @@ from app.shared.domain.exceptions import PermissionDeniedError
 
 def handle_service_error(exc: Exception) -> None:
     """统一处理领域异常为 HTTP 错误，无返回值（总是 raise）。"""
-    if isinstance(exc, (PlanNotFoundError, ItemNotFoundError, ResultNotFoundError)):
+    if isinstance(exc, (PlanNotFoundError, ItemNotFoundError, ResultNotFoundError, DispatchJobNotFoundError)):
         raise HTTPException(status_code=404, detail=str(exc))
     if isinstance(exc, PermissionDeniedError):
         raise HTTPException(status_code=403, detail=str(exc))
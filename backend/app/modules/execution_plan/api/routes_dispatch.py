@@ -1,10 +1,10 @@
 """Execution plan dispatch and rerun routes."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 
-from app.modules.execution_plan.api._route_support import WRITE_DEP, get_user_id
+from app.modules.execution_plan.api._route_support import READ_DEP, WRITE_DEP, get_user_id
 from app.modules.execution_plan.api.dependencies import PlanCommandServiceDep
 from app.modules.execution_plan.api.exception_handler import handle_service_error
 from app.modules.execution_plan.schemas.execution_plan import (
@@ -88,8 +88,9 @@ async def rerun_plan_item(
 
 @router.post(
     "/items/batch-dispatch",
-    response_model=APIResponse[List[Dict[str, Any]]],
-    summary="批量下发自动化用例",
+    response_model=APIResponse[Dict[str, Any]],
+    status_code=202,
+    summary="批量下发自动化用例（后台任务）",
     dependencies=WRITE_DEP,
 )
 async def batch_dispatch_items(
@@ -98,10 +99,53 @@ async def batch_dispatch_items(
     current_user: Dict[str, Any] = Depends(get_current_user),
 ):
     try:
-        results = await command_service.batch_dispatch(
+        job = await command_service.batch_dispatch(
             request=request,
             actor_id=get_user_id(current_user),
         )
-        return APIResponse(data=results)
+        return APIResponse(data=job)
+    except Exception as exc:
+        handle_service_error(exc)
+
+
+@router.get(
+    "/items/batch-dispatch/{job_id}",
+    response_model=APIResponse[Dict[str, Any]],
+    summary="查询批量下发进度",
+    dependencies=READ_DEP,
+)
+async def get_batch_dispatch_job(
+    job_id: str,
+    command_service: PlanCommandServiceDep,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+):
+    try:
+        job = await command_service.get_batch_dispatch_job(
+            job_id=job_id,
+            actor_id=get_user_id(current_user),
+        )
+        return APIResponse(data=job)
+    except Exception as exc:
+        handle_service_error(exc)
+
+
+@router.post(
+    "/items/batch-dispatch/{job_id}/resume",
+    response_model=APIResponse[Dict[str, Any]],
+    status_code=202,
+    summary="续跑失败或中断的批量下发任务",
+    dependencies=WRITE_DEP,
+)
+async def resume_batch_dispatch_job(
+    job_id: str,
+    command_service: PlanCommandServiceDep,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+):
+    try:
+        job = await command_service.resume_batch_dispatch_job(
+            job_id=job_id,
+            actor_id=get_user_id(current_user),
+        )
+        return APIResponse(data=job)
     except Exception as exc:
         handle_service_error(exc)
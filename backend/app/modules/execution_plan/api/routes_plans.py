@@ -26,8 +26,12 @@ async def list_plans(
     status: Optional[str] = Query(None, description="按状态筛选: active|done"),
     page: int = Query(1, ge=1, description="页码，从 1 开始"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入后忽略 page"),
 ):
-    plans = await query_service.list_plans(status=status, page=page, page_size=page_size)
+    try:
+        plans = await query_service.list_plans(status=status, page=page, page_size=page_size, cursor=cursor)
+    except Exception as exc:
+        handle_service_error(exc)
     return APIResponse(data=plans)
 
 
@@ -1,8 +1,9 @@
 """Execution plan result routes."""
 
+from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.modules.execution_plan.api._route_support import READ_DEP, WRITE_DEP, get_user_id
 from app.modules.execution_plan.api.dependencies import PlanCommandServiceDep, PlanQueryServiceDep
@@ -10,9 +11,31 @@ from app.modules.execution_plan.api.exception_handler import handle_service_erro
 from app.modules.execution_plan.schemas.execution_plan import SubmitManualResultRequest
 from app.shared.api.schemas.base import APIResponse
 from app.shared.auth import get_current_user
+from app.shared.export import ExportColumn, ExportFormat, build_export_response
 
 router = APIRouter()
 
+PLAN_RESULT_EXPORT_COLUMNS = (
+    ExportColumn("item_id", "条目ID"),
+    ExportColumn("case_id", "用例编号"),
+    ExportColumn("case_title", "用例标题"),
+    ExportColumn("ref_type", "用例类型"),
+    ExportColumn("component", "组件"),
+    ExportColumn("priority", "优先级"),
+    ExportColumn("assignee_name", "执行人"),
+    ExportColumn("status", "执行状态"),
+    ExportColumn("result_source", "结果来源"),
+    ExportColumn("passed", "是否通过"),
+    ExportColumn("severity", "严重程度"),
+    ExportColumn("bug_id", "缺陷单号"),
+    ExportColumn("actual", "实际结果"),
+    ExportColumn("notes", "备注"),
+    ExportColumn("actual_duration", "实际耗时"),
+    ExportColumn("executed_by_name", "回填人"),
+    ExportColumn("executed_at", "执行时间"),
+    ExportColumn("execution_task_id", "自动化任务ID"),
+)
+
 
 @router.post(
     "/items/{item_id}/result",
@@ -66,3 +89,26 @@ async def get_case_execution_stats(
     current_user: Dict[str, Any] = Depends(get_current_user),
 ):
     return APIResponse(data=await query_service.get_case_execution_stats(case_id))
+
+
+@router.get(
+    "/plans/{plan_id}/results/export",
+    summary="流式导出执行计划结果",
+    dependencies=READ_DEP,
+)
+async def export_plan_results(
+    plan_id: str,
+    query_service: PlanQueryServiceDep,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+):
+    try:
+        chunks = await query_service.export_plan_results(plan_id)
+    except Exception as exc:
+        handle_service_error(exc)
+    return build_export_response(
+        export_format,
+        PLAN_RESULT_EXPORT_COLUMNS,
+        chunks,
+        filename=f"{plan_id}-results-{datetime.now():%Y%m%d%H%M%S}",
+    )
@@ -5,29 +5,48 @@
 """
 from __future__ import annotations
 
+import asyncio
+import uuid
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from beanie.odm.operators.find.comparison import In as InOp
+from pymongo import UpdateOne
 
 from app.modules.execution_plan.application.ports import (
     ExecutionDispatchPort,
+    PlanDispatchTarget,
     PlanNotificationPort,
 )
 from app.modules.execution_plan.domain.constants import PlanItemStatus, ResultSource
+from app.modules.execution_plan.domain.exceptions import (
+    DispatchJobNotFoundError,
+    ItemNotFoundError,
+    PlanNotFoundError,
+)
 from app.modules.execution_plan.repository.models import (
     ExecutionPlanChangeLogDoc,
+    ExecutionPlanDispatchJobDoc,
     ExecutionPlanDoc,
     ExecutionPlanItemDoc,
     ManualExecutionResultDoc,
 )
-from app.modules.execution_plan.schemas.execution_plan import DispatchConfig
+from app.modules.execution_plan.schemas.execution_plan import BatchDispatchRequest, DispatchConfig
 from app.modules.execution_plan.service.execution_plan_service import ExecutionPlanService
 from app.shared.core.logger import log as logger
 from app.shared.domain.exceptions import PermissionDeniedError
 from app.shared.service import SequenceIdService
 
+# 批量派发每块条目数：每块一次整批落库/下发并更新一次任务进度
+BATCH_DISPATCH_CHUNK_SIZE = 50
+# RUNNING 派发任务超过该时长没有心跳（进程退出等），允许接管续跑
+BATCH_DISPATCH_STALE_SECONDS = 300
+# 执行中的派发任务按该间隔刷新 updated_at
+BATCH_DISPATCH_HEARTBEAT_SECONDS = 60
+
+_pending_dispatch_jobs: set[asyncio.Task] = set()
+
 
 class PlanCommandService:
     """执行计划写操作编排。
@@ -81,7 +100,7 @@ class PlanCommandService:
         actor_id: str,
     ) -> Dict[str, Any]:
         """添加条目到计划，并通知被指派人。"""
-        await self._ensure_plan_manager(plan_id, actor_id)
+        plan = await self._ensure_plan_manager(plan_id, actor_id)
         if not items_data:
             raise ValueError("items 不能为空")
 
@@ -124,6 +143,7 @@ class PlanCommandService:
                 priority=snapshot.get("priority", ""),
                 assignee_id=assignee_id,
                 order_no=int(order_no),
+                project_ids=list(plan.project_ids or []),
             )
             await item_doc.insert()
 
@@ -501,30 +521,245 @@ class PlanCommandService:
         self,
         request: Any,
         actor_id: str,
-    ) -> List[Dict[str, Any]]:
-        """批量派发自动化用例。"""
+    ) -> Dict[str, Any]:
+        """登记批量派发任务并在后台执行，立即返回任务句柄。
+
+        逐条进度通过 get_batch_dispatch_job 查询；条目校验失败或下发失败只影响该条目。
+        """
         if not request.item_ids:
             raise ValueError("item_ids 不能为空")
-        results: List[Dict[str, Any]] = []
-        for item_id in request.item_ids:
-            from app.modules.execution_plan.schemas.execution_plan import PlanItemDispatchRequest
-            item_dispatch = PlanItemDispatchRequest(
-                agent_id=request.agent_id,
-                schedule_type=request.schedule_type,
-                planned_at=request.planned_at,
-                category=request.category,
-                project_tag=request.project_tag,
-                pytest_options=request.pytest_options,
-                timeout=request.timeout,
-                parameters=dict(request.parameters),
-            )
-            data = await self.dispatch_plan_item(
-                item_id=item_id,
-                request=item_dispatch,
-                actor_id=actor_id,
+        item_ids = list(dict.fromkeys(request.item_ids))
+        job = ExecutionPlanDispatchJobDoc(
+            job_id=f"EPD-{uuid.uuid4().hex[:16]}",
+            created_by=actor_id,
+            params=request.model_dump(exclude={"item_ids"}),
+            total=len(item_ids),
+            items=[
+                {"item_id": item_id, "status": "queued", "task_id": None, "error": None}
+                for item_id in item_ids
+            ],
+        )
+        await job.insert()
+        self._start_dispatch_job(job)
+        return self._dispatch_job_to_dict(job)
+
+    async def get_batch_dispatch_job(self, job_id: str, actor_id: str) -> Dict[str, Any]:
+        """查询批量派发任务进度，仅提交人与管理员可见。"""
+        return self._dispatch_job_to_dict(await self._get_dispatch_job(job_id, actor_id))
+
+    async def resume_batch_dispatch_job(self, job_id: str, actor_id: str) -> Dict[str, Any]:
+        """接管失败或心跳超时的批量派发任务，只继续处理仍为 queued 的条目。"""
+        job = await self._get_dispatch_job(job_id, actor_id)
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=BATCH_DISPATCH_STALE_SECONDS)
+        # 条件更新认领任务：并发接管只有一个能命中，心跳仍在刷新的任务不会被重复启动
+        claimed = await ExecutionPlanDispatchJobDoc.get_pymongo_collection().update_one(
+            {
+                "job_id": job_id,
+                "$or": [
+                    {"status": "FAILED"},
+                    {"status": "RUNNING", "updated_at": {"$lt": stale_before}},
+                ],
+            },
+            {"$set": {"status": "PENDING", "error": None, "finished_at": None, "updated_at": now}},
+        )
+        if claimed.matched_count == 0:
+            raise ValueError(f"批量派发任务当前状态不可续跑: {job.status}")
+        job.status = "PENDING"
+        job.error = None
+        job.finished_at = None
+        self._start_dispatch_job(job)
+        logger.info("[DISPATCH] batch job={} resumed by actor={}", job_id, actor_id)
+        return self._dispatch_job_to_dict(job)
+
+    async def _get_dispatch_job(self, job_id: str, actor_id: str) -> ExecutionPlanDispatchJobDoc:
+        job = await ExecutionPlanDispatchJobDoc.find_one({"job_id": job_id})
+        if job is None:
+            raise DispatchJobNotFoundError(job_id)
+        if job.created_by != actor_id and not await self._plan_service.is_admin_user(actor_id):
+            raise PermissionDeniedError("没有权限查看该批量派发任务")
+        return job
+
+    def _start_dispatch_job(self, job: ExecutionPlanDispatchJobDoc) -> None:
+        task = asyncio.get_running_loop().create_task(self._run_dispatch_job(job))
+        _pending_dispatch_jobs.add(task)
+        task.add_done_callback(_pending_dispatch_jobs.discard)
+
+    async def _run_dispatch_job(self, job: ExecutionPlanDispatchJobDoc) -> None:
+        """后台执行批量派发：一次查出全部条目，按块整批下发，最后每个计划只刷新一次状态。"""
+        job.status = "RUNNING"
+        job.started_at = job.started_at or datetime.now(timezone.utc)
+        await job.save()
+        heartbeat = asyncio.get_running_loop().create_task(self._dispatch_job_heartbeat(job))
+        request = BatchDispatchRequest(**job.params)
+        dispatched_plan_ids: set[str] = set()
+        try:
+            ready = await self._validate_dispatch_items(job)
+            await job.save()
+            for start in range(0, len(ready), BATCH_DISPATCH_CHUNK_SIZE):
+                chunk = ready[start:start + BATCH_DISPATCH_CHUNK_SIZE]
+                results = await self._dispatch_port.dispatch_tasks(
+                    actor_id=job.created_by,
+                    targets=[self._dispatch_target(item, request) for _, item in chunk],
+                )
+                dispatched: List[tuple[Dict[str, Any], ExecutionPlanItemDoc]] = []
+                for (entry, item), data in zip(chunk, results):
+                    if data.get("error"):
+                        self._fail_dispatch_entry(job, entry, data["error"])
+                        continue
+                    self._mark_plan_item_dispatched(item, task_id=data.get("task_id", "?"), request=request)
+                    entry.update(status="dispatched", task_id=item.execution_task_id)
+                    job.dispatched_count += 1
+                    dispatched.append((entry, item))
+                    dispatched_plan_ids.add(item.plan_id)
+                lost = await self._save_dispatched_items([item for _, item in dispatched])
+                for entry, _ in dispatched:
+                    if entry["item_id"] in lost:
+                        await self._revoke_dispatched_entry(job, entry)
+                await job.save()
+        except Exception as exc:
+            logger.warning("[DISPATCH] batch job={} failed: {}", job.job_id, exc)
+            job.status = "FAILED"
+            job.error = str(exc)
+        else:
+            job.status = "SUCCEEDED"
+        finally:
+            heartbeat.cancel()
+        for plan_id in sorted(dispatched_plan_ids):
+            await self._plan_service.refresh_plan_status(plan_id)
+        job.finished_at = datetime.now(timezone.utc)
+        await job.save()
+        logger.info(
+            "[DISPATCH] batch job={} status={} dispatched={} failed={} actor={}",
+            job.job_id, job.status, job.dispatched_count, job.failed_count, job.created_by,
+        )
+
+    @staticmethod
+    async def _dispatch_job_heartbeat(job: ExecutionPlanDispatchJobDoc) -> None:
+        """派发期间定期刷新 updated_at，接管据此区分存活任务与中断任务。"""
+        while True:
+            await asyncio.sleep(BATCH_DISPATCH_HEARTBEAT_SECONDS)
+            try:
+                await ExecutionPlanDispatchJobDoc.get_pymongo_collection().update_one(
+                    {"job_id": job.job_id, "status": "RUNNING"},
+                    {"$set": {"updated_at": datetime.now(timezone.utc)}},
+                )
+            except Exception as exc:
+                logger.warning("[DISPATCH] batch job={} heartbeat failed: {}", job.job_id, exc)
+
+    async def _revoke_dispatched_entry(self, job: ExecutionPlanDispatchJobDoc, entry: Dict[str, Any]) -> None:
+        """条目在校验后已被其他请求下发：撤销本次创建的任务，避免同一条目重复执行。"""
+        try:
+            await self._dispatch_port.cancel_task(entry["task_id"])
+        except Exception as exc:
+            logger.warning("[DISPATCH] revoke task={} failed: {}", entry["task_id"], exc)
+        job.dispatched_count -= 1
+        self._fail_dispatch_entry(job, entry, "条目已被其他请求下发")
+
+    async def _validate_dispatch_items(
+        self,
+        job: ExecutionPlanDispatchJobDoc,
+    ) -> List[tuple[Dict[str, Any], ExecutionPlanItemDoc]]:
+        """一次查询全部条目并按单条下发的规则校验，不合格的条目直接记为失败。"""
+        # 续跑时已下发或已失败的条目不再处理
+        queued = [entry for entry in job.items if entry["status"] == "queued"]
+        items = await ExecutionPlanItemDoc.find(
+            InOp(ExecutionPlanItemDoc.item_id, [entry["item_id"] for entry in queued]),
+            ExecutionPlanItemDoc.is_deleted == False,  # noqa: E712
+        ).to_list()
+        item_map = {item.item_id: item for item in items}
+        managed: Dict[str, bool] = {}
+        for plan_id in {item.plan_id for item in items}:
+            try:
+                plan = await self._plan_service.get_plan_or_raise(plan_id)
+            except PlanNotFoundError:
+                managed[plan_id] = False
+                continue
+            managed[plan_id] = await self._is_plan_manager(plan, job.created_by)
+
+        ready: List[tuple[Dict[str, Any], ExecutionPlanItemDoc]] = []
+        for entry in queued:
+            item = item_map.get(entry["item_id"])
+            if item is None:
+                self._fail_dispatch_entry(job, entry, str(ItemNotFoundError(entry["item_id"])))
+            elif item.assignee_id != job.created_by and not managed.get(item.plan_id):
+                self._fail_dispatch_entry(job, entry, "没有权限操作该计划条目")
+            elif item.ref_type != "auto":
+                self._fail_dispatch_entry(job, entry, "仅自动化条目支持计划内下发")
+            elif item.status != PlanItemStatus.PENDING.value:
+                self._fail_dispatch_entry(job, entry, f"仅 pending 状态的条目可下发，当前状态: {item.status}")
+            else:
+                ready.append((entry, item))
+        return ready
+
+    @staticmethod
+    def _dispatch_target(item: ExecutionPlanItemDoc, request: Any) -> PlanDispatchTarget:
+        return PlanDispatchTarget(
+            item_id=item.item_id,
+            case_id=item.case_id,
+            plan_id=item.plan_id,
+            agent_id=request.agent_id,
+            schedule_type=request.schedule_type,
+            planned_at=request.planned_at,
+            category=request.category,
+            project_tag=request.project_tag,
+            pytest_options=dict(request.pytest_options),
+            timeout=request.timeout,
+            parameters=dict(request.parameters),
+        )
+
+    @staticmethod
+    def _fail_dispatch_entry(job: ExecutionPlanDispatchJobDoc, entry: Dict[str, Any], error: str) -> None:
+        entry.update(status="failed", error=error)
+        job.failed_count += 1
+
+    @staticmethod
+    async def _save_dispatched_items(items: List[ExecutionPlanItemDoc]) -> set[str]:
+        """一次 bulk_write 写回本块已下发条目的任务关联与状态，返回未能写入的条目 ID。
+
+        只更新仍为 pending 的条目：校验之后被单条下发或其他批量任务抢先下发的条目不会被覆盖。
+        """
+        if not items:
+            return set()
+        expected = {item.item_id: item.execution_task_id for item in items}
+        now = datetime.now(timezone.utc)
+        result = await ExecutionPlanItemDoc.get_pymongo_collection().bulk_write([
+            UpdateOne(
+                {"item_id": item.item_id, "status": PlanItemStatus.PENDING.value},
+                {"$set": {
+                    "execution_task_id": item.execution_task_id,
+                    "status": item.status,
+                    "result_source": item.result_source,
+                    "dispatch_config": item.dispatch_config.model_dump(),
+                    "updated_at": now,
+                }},
             )
-            results.append(data)
-        return results
+            for item in items
+        ], ordered=False)
+        if result.matched_count == len(items):
+            return set()
+        # 部分条目未命中：重新读取，找出没有绑定到本次任务的条目
+        current = await ExecutionPlanItemDoc.find(
+            InOp(ExecutionPlanItemDoc.item_id, list(expected)),
+        ).to_list()
+        bound = {item.item_id: item.execution_task_id for item in current}
+        return {item_id for item_id, task_id in expected.items() if bound.get(item_id) != task_id}
+
+    @staticmethod
+    def _dispatch_job_to_dict(job: ExecutionPlanDispatchJobDoc) -> Dict[str, Any]:
+        return {
+            "job_id": job.job_id,
+            "status": job.status,
+            "total": job.total,
+            "dispatched_count": job.dispatched_count,
+            "failed_count": job.failed_count,
+            "items": [dict(entry) for entry in job.items],
+            "error": job.error,
+            "created_by": job.created_by,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
 
     # ─────────────────────────────────────────────────────────────────
     #  收纳箱（Archive）
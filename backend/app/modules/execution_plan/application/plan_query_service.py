@@ -5,7 +5,7 @@
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from app.modules.execution_plan.service.execution_plan_service import ExecutionPlanService
 
@@ -27,9 +27,12 @@ class PlanQueryService:
         status: Optional[str] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """获取执行计划列表（分页）。"""
-        return await self._plan_service.list_plans(status=status, page=page, page_size=page_size)
+        return await self._plan_service.list_plans(
+            status=status, page=page, page_size=page_size, cursor=cursor,
+        )
 
     async def get_plan(self, plan_id: str) -> Dict[str, Any]:
         """获取执行计划详情（含条目列表）。"""
@@ -67,3 +70,7 @@ class PlanQueryService:
     async def get_case_execution_stats(self, case_id: str) -> Dict[str, Any]:
         """获取测试用例的执行统计。"""
         return await self._plan_service.get_case_execution_stats(case_id)
+
+    async def export_plan_results(self, plan_id: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """获取计划结果导出的分块迭代器；计划不存在时抛出 PlanNotFoundError。"""
+        return await self._plan_service.export_plan_results(plan_id)
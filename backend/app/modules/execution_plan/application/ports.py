@@ -6,14 +6,30 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 # ═══════════════════════════════════════════════════════════════════════
 #  执行派发端口
 # ═══════════════════════════════════════════════════════════════════════
 
+@dataclass
+class PlanDispatchTarget:
+    """批量派发中的单个计划条目及其下发参数（字段含义同 dispatch_task）。"""
+    item_id: str
+    case_id: str
+    plan_id: str
+    agent_id: Optional[str] = None
+    schedule_type: str = "IMMEDIATE"
+    planned_at: Any = None
+    category: Optional[str] = None
+    project_tag: Optional[str] = None
+    pytest_options: Dict[str, Any] = field(default_factory=dict)
+    timeout: Optional[int] = None
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
 class ExecutionDispatchPort(ABC):
     """执行任务派发端口。
 
@@ -43,6 +59,37 @@ class ExecutionDispatchPort(ABC):
     ) -> Dict[str, Any]:
         """派发执行任务，返回包含 task_id 的结果字典。"""
 
+    async def dispatch_tasks(
+        self,
+        *,
+        actor_id: str,
+        targets: List[PlanDispatchTarget],
+    ) -> List[Dict[str, Any]]:
+        """批量派发，按输入顺序返回结果；失败的条目返回 {"error": 原因}，不影响其余条目。
+
+        默认实现逐条调用 dispatch_task，适配器可覆盖为整批落库与下发。
+        """
+        results: List[Dict[str, Any]] = []
+        for target in targets:
+            try:
+                results.append(await self.dispatch_task(
+                    item_id=target.item_id,
+                    case_id=target.case_id,
+                    plan_id=target.plan_id,
+                    actor_id=actor_id,
+                    agent_id=target.agent_id,
+                    schedule_type=target.schedule_type,
+                    planned_at=target.planned_at,
+                    category=target.category,
+                    project_tag=target.project_tag,
+                    pytest_options=dict(target.pytest_options),
+                    timeout=target.timeout,
+                    parameters=dict(target.parameters),
+                ))
+            except Exception as exc:
+                results.append({"error": str(exc)})
+        return results
+
     @abstractmethod
     async def cancel_task(self, task_id: str) -> bool:
         """取消（软删除）执行任务，返回是否成功。"""
@@ -138,6 +185,11 @@ class UserQueryPort(ABC):
         """判断用户是否拥有 ADMIN 角色。"""
         ...
 
+    @abstractmethod
+    async def get_user_names(self, user_ids: list[str]) -> Dict[str, str]:
+        """批量查询用户显示名称，返回 {user_id: username}。"""
+        ...
+
 
 # ═══════════════════════════════════════════════════════════════════════
 #  执行结果统计端口
@@ -26,3 +26,10 @@ class ResultNotFoundError(ExecutionPlanError):
 
     def __init__(self, item_id: str):
         super().__init__(f"条目 ID={item_id} 尚无手工回填结果")
+
+
+class DispatchJobNotFoundError(ExecutionPlanError):
+    """批量派发任务不存在。"""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"批量派发任务 ID={job_id} 不存在")
@@ -8,12 +8,16 @@ from app.modules.execution_plan.repository.models.execution_plan import (
 from app.modules.execution_plan.repository.models.change_log import (
     ExecutionPlanChangeLogDoc,
 )
+from app.modules.execution_plan.repository.models.dispatch_job import (
+    ExecutionPlanDispatchJobDoc,
+)
 
 DOCUMENT_MODELS = [
     ExecutionPlanDoc,
     ExecutionPlanItemDoc,
     ManualExecutionResultDoc,
     ExecutionPlanChangeLogDoc,
+    ExecutionPlanDispatchJobDoc,
 ]
 
 __all__ = [
@@ -21,6 +25,7 @@ __all__ = [
     "ExecutionPlanItemDoc",
     "ManualExecutionResultDoc",
     "ExecutionPlanChangeLogDoc",
+    "ExecutionPlanDispatchJobDoc",
     "DOCUMENT_MODELS",
 ]
 
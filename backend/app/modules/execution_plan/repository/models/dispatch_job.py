@@ -0,0 +1,37 @@
+"""执行计划批量派发任务模型。"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.shared.core.document_mixins import TimestampedDocumentMixin
+
+
+class ExecutionPlanDispatchJobDoc(Document, TimestampedDocumentMixin):
+    """批量派发任务，记录下发参数与逐条进度。"""
+
+    job_id: str = Field(..., description="派发任务句柄")
+    created_by: str = Field(..., description="提交人 user_id")
+    params: Dict[str, Any] = Field(default_factory=dict, description="除 item_ids 外的批量下发参数")
+    status: str = Field(default="PENDING", description="任务状态（PENDING/RUNNING/SUCCEEDED/FAILED）")
+    total: int = Field(default=0, description="条目总数")
+    dispatched_count: int = Field(default=0, description="已下发条目数")
+    failed_count: int = Field(default=0, description="失败条目数")
+    items: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="逐条进度（item_id/status: queued|dispatched|failed/task_id/error）",
+    )
+    error: Optional[str] = Field(None, description="任务级失败原因")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理结束时间")
+
+    class Settings:
+        name = "execution_plan_dispatch_jobs"
+        indexes = [
+            IndexModel("job_id", unique=True),
+            IndexModel([("created_by", ASCENDING), ("created_at", DESCENDING)]),
+        ]
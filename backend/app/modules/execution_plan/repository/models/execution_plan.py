@@ -32,6 +32,8 @@ class ExecutionPlanDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMix
             *ProjectRelatedMixin.Settings.indexes,
             IndexModel("plan_id", unique=True),
             IndexModel([("status", ASCENDING), ("updated_at", DESCENDING)]),
+            # keyset 分页：未删除计划按 (updated_at, _id) 倒序翻页
+            IndexModel([("is_deleted", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
 
@@ -54,6 +56,9 @@ class ExecutionPlanItemDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumen
     result_id: Optional[str] = Field(None, description="关联手工结果 ID")
     result_source: Optional[str] = Field(None, description="结果来源: manual|auto")
     archived_at: Optional[datetime] = Field(None, description="归档时间，null=未归档")
+    project_ids: List[str] = Field(
+        default_factory=list, description="写入时从所属计划复制的项目 ID，供项目看板按索引查询"
+    )
 
     class Settings:
         name = "execution_plan_items"
@@ -63,6 +68,13 @@ class ExecutionPlanItemDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumen
             IndexModel([("plan_id", ASCENDING), ("order_no", ASCENDING)]),
             IndexModel([("assignee_id", ASCENDING), ("status", ASCENDING), ("updated_at", DESCENDING)]),
             IndexModel("execution_task_id"),
+            # 项目阻塞项：按 (项目, 状态) 等值定位后按 updated_at 倒序取前 N 条
+            IndexModel([
+                ("project_ids", ASCENDING),
+                ("is_deleted", ASCENDING),
+                ("status", ASCENDING),
+                ("updated_at", DESCENDING),
+            ]),
         ]
 
 
@@ -7,7 +7,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from beanie.odm.operators.find.comparison import In as InOp
 
@@ -27,8 +27,21 @@ from app.modules.execution_plan.repository.models import (
     ExecutionPlanItemDoc,
     ManualExecutionResultDoc,
 )
+from app.modules.project.domain.constants import STATS_SECTION_COUNTS, STATS_SECTION_PLAN_ITEMS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
 from app.shared.core.logger import log as logger
-from app.shared.service import BaseService, SequenceIdService
+from app.shared.export import EXPORT_CHUNK_SIZE, iter_cursor_chunks
+from app.shared.service import BaseService, KeysetSort, SequenceIdService
+
+# 结果导出使用的条目字段与手工结果字段
+_RESULT_EXPORT_ITEM_FIELDS = (
+    "item_id", "case_id", "case_title", "ref_type", "component", "priority",
+    "assignee_id", "status", "result_id", "result_source", "execution_task_id",
+)
+_RESULT_EXPORT_RESULT_FIELDS = (
+    "passed", "severity", "bug_id", "actual", "notes", "actual_duration", "executed_at",
+)
+_PLAN_LIST_SORT = KeysetSort("updated_at", descending=True)
 
 
 class ExecutionPlanService(BaseService):
@@ -78,10 +91,13 @@ class ExecutionPlanService(BaseService):
         status: Optional[str] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """分页查询执行计划列表（含每计划的条目计数与进度）。
 
         只加载当前页计划对应的 items，避免全量加载。
+        传入 `cursor` 时按 `(updated_at, _id)` keyset 翻页并忽略 `page`，
+        返回的 `next_cursor` 为下一页游标（已到末尾时为 None）。
         """
         filters = [ExecutionPlanDoc.is_deleted == False]  # noqa: E712
         if status:
@@ -89,13 +105,9 @@ class ExecutionPlanService(BaseService):
 
         total = await ExecutionPlanDoc.find(*filters).count()
         skip = (page - 1) * page_size
-        docs = (
-            await ExecutionPlanDoc.find(*filters)
-            .sort("-updated_at")
-            .skip(skip)
-            .limit(page_size)
-            .to_list()
-        )
+        docs = await _PLAN_LIST_SORT.paginate(
+            ExecutionPlanDoc.find(*filters), limit=page_size, offset=skip, cursor=cursor,
+        ).to_list()
         logger.debug("[CRUD] list_plans status={} page={} page_size={} count={}", status, page, page_size, len(docs))
 
         # 只加载当前页 plan_ids 对应的条目，按 plan_id 分组，避免 N+1 查询
@@ -121,6 +133,7 @@ class ExecutionPlanService(BaseService):
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": _PLAN_LIST_SORT.next_cursor(docs, page_size),
         }
 
     async def create_plan(self, data: Dict[str, Any], actor_id: str) -> Dict[str, Any]:
@@ -179,6 +192,7 @@ class ExecutionPlanService(BaseService):
             ExecutionPlanItemDoc.plan_id == plan_id,
             ExecutionPlanItemDoc.is_deleted == False,  # noqa: E712
         ).update({"$set": {"is_deleted": True}})
+        schedule_project_stats_refresh(doc.project_ids, STATS_SECTION_COUNTS, STATS_SECTION_PLAN_ITEMS)
         logger.info("[CRUD] delete_plan plan_id={}", plan_id)
 
     # ─────────────────────────────────────────────────────────────────
@@ -386,6 +400,41 @@ class ExecutionPlanService(BaseService):
             raise ResultNotFoundError(item_id)
         return self.result_to_dict(result_doc)
 
+    async def export_plan_results(
+        self,
+        plan_id: str,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """校验计划存在后返回结果导出的分块迭代器（条目 + 手工结果 + 人员姓名）。"""
+        await self.get_plan_or_raise(plan_id)
+        return self._iter_plan_result_rows(plan_id, chunk_size)
+
+    async def _iter_plan_result_rows(
+        self,
+        plan_id: str,
+        chunk_size: int,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        # 每块只批量查一次结果、一次用户名，条目只投影导出字段
+        async for rows in iter_cursor_chunks(
+            ExecutionPlanItemDoc.get_pymongo_collection(),
+            {"plan_id": plan_id, "is_deleted": False},
+            projection={field: 1 for field in _RESULT_EXPORT_ITEM_FIELDS} | {"_id": 0},
+            sort=[("order_no", 1)],
+            chunk_size=chunk_size,
+        ):
+            result_ids = {row["result_id"] for row in rows if row.get("result_id")}
+            results = await self._batch_load_results(result_ids)
+            user_names = await self._ensure_user_query().get_user_names(
+                [row.get("assignee_id") for row in rows]
+                + [result.get("executed_by") for result in results.values()]
+            )
+            for row in rows:
+                result = results.get(row.get("result_id")) or {}
+                row.update({field: result.get(field) for field in _RESULT_EXPORT_RESULT_FIELDS})
+                row["assignee_name"] = user_names.get(row.get("assignee_id"))
+                row["executed_by_name"] = user_names.get(result.get("executed_by"))
+            yield rows
+
     async def get_case_execution_stats(self, case_id: str) -> Dict[str, Any]:
         """获取测试用例的执行统计（手工 + 自动化）。"""
         # 查询手工结果
@@ -517,6 +566,8 @@ class ExecutionPlanService(BaseService):
                 plan_doc.status = PlanStatus.ACTIVE.value
         if plan_doc.status != original_status:
             await plan_doc.save()
+        # 条目增删与状态变化都会走到这里，顺带刷新所属项目看板的计划条目统计
+        schedule_project_stats_refresh(plan_doc.project_ids, STATS_SECTION_PLAN_ITEMS)
 
     async def resolve_case_snapshot(self, ref_type: str, case_id: str) -> Dict[str, Any]:
         """通过端口解析用例快照，消除对 test_specs repository 的直接依赖。"""
@@ -625,6 +676,7 @@ class ExecutionPlanService(BaseService):
             "bug_id": doc.bug_id,
             "actual_duration": doc.actual_duration,
             "attachments": list(doc.attachments),
+            "executed_by": doc.executed_by,
             "executed_at": doc.executed_at,
         }
 
@@ -15,14 +15,16 @@ class PendingNotificationDoc(Document, TimestampedDocumentMixin):
     """待发送通知批次，持久化到 MongoDB 以支持进程重启恢复。
 
     同用户同类型的通知在 batch_window 内累积为一条记录，
-    scheduled_at 到期后发送并标记为 sent。
+    scheduled_at 到期后由某个实例以租约 claim（sending），发送后标记为 sent。
     """
 
     user_id: Indexed(str) = Field(..., description="目标用户 ID")
     notify_type: Indexed(str) = Field(..., description="通知类型，用于聚合分组")
     items: list[dict[str, str]] = Field(default_factory=list, description="待发送通知项列表，每项包含 title 和 content")
     scheduled_at: datetime = Field(..., description="计划发送时间")
-    status: str = Field(default="pending", description="pending / sent / failed")
+    status: str = Field(default="pending", description="pending / sending / sent / failed")
+    claim_owner: Optional[str] = Field(default=None, description="正在发送该批次的实例标识")
+    lease_until: Optional[datetime] = Field(default=None, description="发送租约到期时间，过期后可被重新 claim")
     sent_at: Optional[datetime] = Field(default=None, description="实际发送时间")
     error_msg: Optional[str] = Field(default=None, description="发送失败时的错误信息")
 
@@ -36,6 +38,12 @@ class PendingNotificationDoc(Document, TimestampedDocumentMixin):
                 expireAfterSeconds=7 * 24 * 60 * 60,  # 7 天后自动清理已发送记录
                 partialFilterExpression={"status": "sent"},
             ),
+            IndexModel(
+                [("user_id", 1), ("notify_type", 1)],
+                name="uniq_pending_batch",
+                unique=True,
+                partialFilterExpression={"status": "pending"},  # 同用户同类型只允许一个 pending 批次，保证 upsert 原子
+            ),
         ]
 
     @classmethod
@@ -0,0 +1,125 @@
+"""通知聚合批次的发送调度器。
+
+单个后台循环 + 最小堆取代"每个 (user, type) 一个 asyncio.Task"的计时器：
+
+- 本进程写入通知后把批次的计划发送时间压入堆，窗口被重置时旧堆项惰性失效；
+- 到期后回调 flush，由 flush 通过 `PendingNotificationDoc` 上的租约 claim 批次，多实例下只有一个实例发送；
+- 每隔 `SCAN_INTERVAL_SECONDS` 扫描一次数据库，接管其他实例写入或已退出实例遗留的批次（含过期租约）。
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable
+
+from app.shared.core.logger import log as logger
+
+SCAN_INTERVAL_SECONDS = 30
+
+BatchKey = tuple[str, str]
+FlushCallback = Callable[[BatchKey], Awaitable[None]]
+ScanCallback = Callable[[datetime], Awaitable[Iterable[tuple[BatchKey, datetime]]]]
+
+
+class NotificationFlushScheduler:
+    """按计划发送时间驱动批次 flush 的单循环调度器。"""
+
+    def __init__(
+        self,
+        flush: FlushCallback,
+        scan: ScanCallback,
+        scan_interval_seconds: float = SCAN_INTERVAL_SECONDS,
+    ) -> None:
+        self._flush = flush
+        self._scan = scan
+        self._scan_interval_seconds = scan_interval_seconds
+        self._heap: list[tuple[datetime, BatchKey]] = []
+        # 每个批次最新的计划发送时间；与之不一致的堆项已失效
+        self._due_at: dict[BatchKey, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._next_scan_at: datetime | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._next_scan_at = None
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def schedule(self, key: BatchKey, due_at: datetime) -> None:
+        """登记（或重置）批次的计划发送时间。"""
+        if self._due_at.get(key) == due_at:
+            return
+        self._due_at[key] = due_at
+        heapq.heappush(self._heap, (due_at, key))
+        if self._heap[0] == (due_at, key):
+            self._wakeup.set()
+
+    def pop_due(self, now: datetime) -> list[BatchKey]:
+        """弹出所有已到期且仍有效的批次。"""
+        due: list[BatchKey] = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, key = heapq.heappop(self._heap)
+            if self._due_at.get(key) != due_at:
+                continue
+            del self._due_at[key]
+            due.append(key)
+        return due
+
+    def next_due_at(self) -> datetime | None:
+        while self._heap and self._due_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def run_once(self, now: datetime) -> None:
+        """执行一轮：到期扫描数据库，flush 已到期批次。"""
+        if self._next_scan_at is None or now >= self._next_scan_at:
+            for key, due_at in await self._scan(now):
+                self.schedule(key, due_at)
+            self._next_scan_at = now + timedelta(seconds=self._scan_interval_seconds)
+        due = self.pop_due(now)
+        if due:
+            await asyncio.gather(*(self._flush_safely(key) for key in due))
+
+    async def _flush_safely(self, key: BatchKey) -> None:
+        try:
+            await self._flush(key)
+        except Exception as exc:  # noqa: BLE001 - 单个批次失败不能中断调度循环
+            logger.warning("通知批次发送失败，等待租约过期后重试: key={}, error={}", key, exc)
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.run_once(now)
+            except Exception as exc:  # noqa: BLE001 - 数据库暂不可用时下一轮重试
+                logger.warning("通知调度循环异常: {}", exc)
+                self._next_scan_at = now + timedelta(seconds=self._scan_interval_seconds)
+            self._wakeup.clear()
+            await self._sleep_until_next()
+
+    async def _sleep_until_next(self) -> None:
+        now = datetime.now(timezone.utc)
+        deadlines = [at for at in (self.next_due_at(), self._next_scan_at) if at is not None]
+        timeout = max((min(deadlines) - now).total_seconds(), 0.0) if deadlines else None
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
@@ -8,23 +8,37 @@
 通过光圈 Bot 向用户推送即时通知。
 
 持久化：待发送通知批次存储在 MongoDB 的 pending_notifications 集合中，
-支持进程重启后恢复未发送批次。
+支持进程重启后恢复未发送批次；发送前通过租约 claim，多实例下每个批次只发送一次。
 """
 from __future__ import annotations
 
 import asyncio
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
-import httpx
+from beanie import UpdateResponse
+from pymongo.errors import DuplicateKeyError
 
-from app.modules.auth.repository.models.rbac import UserDoc
+from app.modules.auth.user_directory import UserDirectory
 from app.modules.notification.constants import NotificationTemplates, NotificationTitles
 from app.modules.notification.repository.models.pending_notification import PendingNotificationDoc
+from app.modules.notification.scheduler import SCAN_INTERVAL_SECONDS, NotificationFlushScheduler
 from app.shared.config.settings import get_settings
 from app.shared.core.logger import log as logger
 
+if TYPE_CHECKING:
+    import httpx
+
+
+# 批次租约：claim 后在此时间内完成发送，超时未完成（实例退出等）时由任一实例重新 claim
+FLUSH_LEASE_SECONDS = 120
+# 每轮数据库扫描最多接管的批次数
+MAX_SCAN_BATCHES = 500
+# 光圈 Bot 并发请求上限（同时也是连接池大小）
+BOT_SEND_CONCURRENCY = 8
+
 
 @dataclass
 class _PendingItem:
@@ -35,26 +49,29 @@ class _PendingItem:
 
 @dataclass
 class _PendingBatch:
-    """一个用户的同类型待发送批次（内存中的运行时状态）。"""
+    """一个用户的同类型待发送批次（已 claim 的发送快照）。"""
     user_id: str
     notify_type: str
     items: list[_PendingItem] = field(default_factory=list)
-    timer_task: asyncio.Task[None] | None = None
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 class NotificationService:
     """通知服务。
 
     核心流程：
-    1. notify_by_user_id → 写入 MongoDB 待发送表，重置内存计时器
-    2. 窗口到期 → _delayed_flush → 从 MongoDB 读取 → _do_flush → HTTP 发送
-    3. 应用启动 → recover_pending → 恢复未发送批次并创建计时器
-    4. 应用关闭 → flush_all → 立即发送所有待处理批次
+    1. notify_by_user_id → 原子 `$push`/`$set` upsert 待发送批次，把计划发送时间登记到调度器
+    2. 窗口到期 → 调度器回调 _flush_batch → 租约 claim 批次 → _do_flush → HTTP 发送 → 标记 sent
+    3. 应用启动 → recover_pending → 启动调度循环，首轮扫描接管未发送批次
+    4. 应用关闭 → flush_all → 停止调度循环并立即发送所有待处理批次
+
+    多实例部署时每个实例各自运行调度循环，批次通过 `PendingNotificationDoc` 上的租约保证只发送一次。
     """
 
-    # 内存中的计时器状态（key -> batch），实际数据在 MongoDB 中
-    _keyed_batches: ClassVar[dict[tuple[str, str], _PendingBatch]] = {}
+    # 进程内唯一的调度循环与实例标识
+    _scheduler: ClassVar[NotificationFlushScheduler | None] = None
+    _owner: ClassVar[str] = uuid.uuid4().hex
+    _http_client: ClassVar[httpx.AsyncClient | None] = None
+    _send_semaphore: ClassVar[asyncio.Semaphore | None] = None
 
     # ========== 公开接口 ==========
 
@@ -79,154 +96,133 @@ class NotificationService:
         if not settings.notification.enabled:
             return
 
-        key = (user_id, notify_type)
         now = datetime.now(timezone.utc)
         scheduled_at = now + timedelta(seconds=settings.notification.batch_window_seconds)
-
-        # 查找或创建 MongoDB 中的 pending 记录
-        doc = await PendingNotificationDoc.find_one(
-            PendingNotificationDoc.user_id == user_id,
-            PendingNotificationDoc.notify_type == notify_type,
-            PendingNotificationDoc.status == "pending",
-        )
-
-        if doc is None:
-            # 创建新记录
-            doc = PendingNotificationDoc(
-                user_id=user_id,
-                notify_type=notify_type,
-                items=[{"title": title, "content": content}],
-                scheduled_at=scheduled_at,
-                status="pending",
-            )
-            await doc.insert()
-        else:
-            # 追加通知项并更新计划发送时间
-            doc.items.append({"title": title, "content": content})
-            doc.scheduled_at = scheduled_at
-            await doc.save()
-
-        # 管理内存中的计时器
-        batch = cls._keyed_batches.get(key)
-        if batch is None:
-            batch = _PendingBatch(user_id=user_id, notify_type=notify_type)
-            cls._keyed_batches[key] = batch
-        else:
-            # 重置旧计时器
-            if batch.timer_task and not batch.timer_task.done():
-                batch.timer_task.cancel()
-                try:
-                    await batch.timer_task
-                except asyncio.CancelledError:
-                    pass
-
-        batch.items = [_PendingItem(**item) for item in doc.items]
-        batch.timer_task = asyncio.create_task(
-            cls._delayed_flush(user_id, notify_type, settings.notification.batch_window_seconds)
-        )
+        await cls._append_item(user_id, notify_type, {"title": title, "content": content}, scheduled_at, now)
+        cls._get_scheduler().schedule((user_id, notify_type), scheduled_at)
 
     @classmethod
     async def recover_pending(cls) -> None:
-        """启动时恢复所有未发送的 pending 批次。"""
+        """启动调度循环；首轮扫描会接管未发送批次（含其他实例遗留的过期租约）。"""
         settings = get_settings()
         if not settings.notification.enabled:
             return
-
-        docs = await PendingNotificationDoc.find(
-            PendingNotificationDoc.status == "pending",
-        ).to_list()
-
-        if not docs:
-            return
-
-        logger.info("恢复 {} 个待发送通知批次", len(docs))
-        now = datetime.now(timezone.utc)
-
-        for doc in docs:
-            key = (doc.user_id, doc.notify_type)
-            batch = _PendingBatch(
-                user_id=doc.user_id,
-                notify_type=doc.notify_type,
-                items=[_PendingItem(**item) for item in doc.items],
-            )
-            cls._keyed_batches[key] = batch
-
-            # 计算剩余延迟时间
-            remaining_seconds = max(0, (doc.scheduled_at - now).total_seconds())
-            batch.timer_task = asyncio.create_task(
-                cls._delayed_flush(doc.user_id, doc.notify_type, int(remaining_seconds))
-            )
-            logger.debug(
-                "恢复通知批次: user_id={}, notify_type={}, 剩余 {} 秒",
-                doc.user_id, doc.notify_type, remaining_seconds,
-            )
+        cls._get_scheduler().start()
 
     @classmethod
     async def flush_all(cls) -> None:
         """立即发送所有待处理批次。应用关闭时调用。"""
-        # 从 MongoDB 读取所有 pending 记录
+        scheduler, cls._scheduler = cls._scheduler, None
+        if scheduler is not None:
+            await scheduler.stop()
+
         docs = await PendingNotificationDoc.find(
             PendingNotificationDoc.status == "pending",
         ).to_list()
+        if docs:
+            logger.info("刷新所有待处理通知，共 {} 个批次", len(docs))
+            for key in dict.fromkeys((doc.user_id, doc.notify_type) for doc in docs):
+                await cls._flush_batch(key, force=True)
+        await cls._close_http_client()
 
-        if not docs:
-            return
+    # ========== 内部方法 ==========
 
-        logger.info("刷新所有待处理通知，共 {} 个批次", len(docs))
+    @classmethod
+    def _get_scheduler(cls) -> NotificationFlushScheduler:
+        if cls._scheduler is None:
+            cls._scheduler = NotificationFlushScheduler(flush=cls._flush_batch, scan=cls._scan_batches)
+        if not cls._scheduler.running:
+            cls._scheduler.start()
+        return cls._scheduler
 
-        for doc in docs:
-            key = (doc.user_id, doc.notify_type)
-            batch = cls._keyed_batches.get(key)
-            if batch and batch.timer_task and not batch.timer_task.done():
-                batch.timer_task.cancel()
-                try:
-                    await batch.timer_task
-                except asyncio.CancelledError:
-                    pass
+    @staticmethod
+    async def _append_item(
+        user_id: str,
+        notify_type: str,
+        item: dict[str, str],
+        scheduled_at: datetime,
+        now: datetime,
+    ) -> None:
+        """原子追加通知项并重置计划发送时间；不存在 pending 批次时创建。"""
+        collection = PendingNotificationDoc.get_pymongo_collection()
+        update = {
+            "$push": {"items": item},
+            "$set": {"scheduled_at": scheduled_at, "updated_at": now},
+            "$setOnInsert": {"created_at": now, "sent_at": None, "error_msg": None},
+        }
+        query = {"user_id": user_id, "notify_type": notify_type, "status": "pending"}
+        try:
+            await collection.update_one(query, update, upsert=True)
+        except DuplicateKeyError:
+            # 并发 upsert 时唯一索引只允许一条 pending 批次，失败方重试后命中已存在的批次
+            await collection.update_one(query, update, upsert=True)
 
-            batch = _PendingBatch(
-                user_id=doc.user_id,
-                notify_type=doc.notify_type,
-                items=[_PendingItem(**item) for item in doc.items],
-            )
-            await cls._do_flush(doc.user_id, doc.notify_type, batch)
-            cls._keyed_batches.pop(key, None)
+    @staticmethod
+    def _claimable_filter(now: datetime, force: bool = False) -> dict[str, Any]:
+        pending: dict[str, Any] = {"status": "pending"}
+        if not force:
+            pending["scheduled_at"] = {"$lte": now}
+        return {"$or": [pending, {"status": "sending", "lease_until": {"$lt": now}}]}
 
-    # ========== 内部方法 ==========
+    @classmethod
+    async def _scan_batches(cls, now: datetime) -> list[tuple[tuple[str, str], datetime]]:
+        """返回下一轮扫描前将到期的批次，以及租约已过期需要重新发送的批次。"""
+        horizon = now + timedelta(seconds=SCAN_INTERVAL_SECONDS)
+        docs = await PendingNotificationDoc.find({
+            "$or": [
+                {"status": "pending", "scheduled_at": {"$lte": horizon}},
+                {"status": "sending", "lease_until": {"$lt": now}},
+            ],
+        }).sort("scheduled_at").limit(MAX_SCAN_BATCHES).to_list()
+        return [
+            ((doc.user_id, doc.notify_type), doc.scheduled_at if doc.status == "pending" else now)
+            for doc in docs
+        ]
 
     @classmethod
-    async def _delayed_flush(cls, user_id: str, notify_type: str, delay_seconds: int) -> None:
-        """延迟窗口到期后发送聚合通知。"""
-        key = (user_id, notify_type)
-        try:
-            await asyncio.sleep(delay_seconds)
-        except asyncio.CancelledError:
-            return  # 计时器被新通知重置，正常退出
-
-        async with cls._get_flush_lock(key):
-            # 从 MongoDB 读取最新状态
-            doc = await PendingNotificationDoc.find_one(
-                PendingNotificationDoc.user_id == user_id,
-                PendingNotificationDoc.notify_type == notify_type,
-                PendingNotificationDoc.status == "pending",
-            )
+    async def _claim_batch(
+        cls,
+        key: tuple[str, str],
+        now: datetime,
+        force: bool = False,
+    ) -> PendingNotificationDoc | None:
+        """以租约原子 claim 一个可发送批次；已被其他实例 claim 或窗口被重置时返回 None。"""
+        user_id, notify_type = key
+        return await PendingNotificationDoc.find_one({
+            "user_id": user_id,
+            "notify_type": notify_type,
+            **cls._claimable_filter(now, force),
+        }).update(
+            {"$set": {
+                "status": "sending",
+                "claim_owner": cls._owner,
+                "lease_until": now + timedelta(seconds=FLUSH_LEASE_SECONDS),
+            }},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    @classmethod
+    async def _flush_batch(cls, key: tuple[str, str], force: bool = False) -> None:
+        """claim 并发送指定用户、类型下所有可发送的批次。"""
+        user_id, notify_type = key
+        while True:
+            doc = await cls._claim_batch(key, datetime.now(timezone.utc), force)
             if doc is None:
-                cls._keyed_batches.pop(key, None)
                 return
-
             batch = _PendingBatch(
                 user_id=user_id,
                 notify_type=notify_type,
                 items=[_PendingItem(**item) for item in doc.items],
             )
             await cls._do_flush(user_id, notify_type, batch)
-
-            # 标记为已发送
-            doc.status = "sent"
-            doc.sent_at = datetime.now(timezone.utc)
-            await doc.save()
-
-            cls._keyed_batches.pop(key, None)
+            await PendingNotificationDoc.find_one({"_id": doc.id, "claim_owner": cls._owner}).update(
+                {"$set": {
+                    "status": "sent",
+                    "sent_at": datetime.now(timezone.utc),
+                    "claim_owner": None,
+                    "lease_until": None,
+                }},
+            )
 
     @classmethod
     async def _do_flush(cls, user_id: str, notify_type: str, batch: _PendingBatch) -> None:
@@ -234,8 +230,9 @@ class NotificationService:
         if not batch.items:
             return
 
-        # 发送期做用户校验（而非积累期），避免用户在窗口内退订/修改 itcode 后仍收到通知
-        user = await UserDoc.find_one({"user_id": user_id})
+        # 发送期做用户校验（而非积累期），避免用户在窗口内退订/修改 itcode 后仍收到通知；
+        # 失效广播可能尚未送达本实例（或 Redis 不可用），这里跳过缓存读取最新用户文档
+        user = await UserDirectory.get(user_id, fresh=True)
         if user is None:
             return
         if not user.subscribe_notifications:
@@ -268,14 +265,17 @@ class NotificationService:
             notify_type=notify_type,
         )
 
-    @staticmethod
+    @classmethod
     async def _send_to_bot(
+        cls,
         itcode: str,
         title: str,
         content: str,
         notify_type: str,
     ) -> None:
-        """向光圈 Bot 发送 HTTP 请求。"""
+        """通过共享连接池向光圈 Bot 发送 HTTP 请求，并发数受 BOT_SEND_CONCURRENCY 限制。"""
+        import httpx
+
         settings = get_settings()
         conf = settings.notification.guangquan
         payload = {
@@ -285,14 +285,15 @@ class NotificationService:
             "title": title,
             "content": content,
         }
+        client, semaphore = cls._get_http_client(conf.timeout_sec)
         try:
-            async with httpx.AsyncClient(timeout=conf.timeout_sec) as client:
+            async with semaphore:
                 resp = await client.post(conf.api_url, json=payload)
-                resp.raise_for_status()
-                logger.info(
-                    "通知发送成功: target={}, title={}, code={}",
-                    itcode, title, resp.status_code,
-                )
+            resp.raise_for_status()
+            logger.info(
+                "通知发送成功: target={}, title={}, code={}",
+                itcode, title, resp.status_code,
+            )
         except httpx.RequestError as exc:
             logger.error(
                 "通知发送失败(网络): target={}, title={}, error={}",
@@ -305,9 +306,24 @@ class NotificationService:
             )
 
     @classmethod
-    def _get_flush_lock(cls, key: tuple[str, str]) -> asyncio.Lock:
-        """获取指定 key 的 flush 锁，不存在则复用 batch 上的锁或创建新的。"""
-        batch = cls._keyed_batches.get(key)
-        if batch is not None:
-            return batch.lock
-        return asyncio.Lock()
+    def _get_http_client(cls, timeout_sec: float) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        import httpx
+
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = httpx.AsyncClient(
+                timeout=timeout_sec,
+                limits=httpx.Limits(
+                    max_connections=BOT_SEND_CONCURRENCY,
+                    max_keepalive_connections=BOT_SEND_CONCURRENCY,
+                ),
+            )
+        if cls._send_semaphore is None:
+            cls._send_semaphore = asyncio.Semaphore(BOT_SEND_CONCURRENCY)
+        return cls._http_client, cls._send_semaphore
+
+    @classmethod
+    async def _close_http_client(cls) -> None:
+        client, cls._http_client = cls._http_client, None
+        cls._send_semaphore = None
+        if client is not None:
+            await client.aclose()
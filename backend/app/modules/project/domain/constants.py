@@ -26,3 +26,18 @@ PROJECT_RELATED_MODEL_PATHS: List[Tuple[str, str]] = [
     ("app.modules.execution.repository.models", "ExecutionTaskDoc"),
     ("app.modules.workflow.repository.models", "BusWorkItemDoc"),
 ]
+
+# ── 冗余 project_ids 的派生集合（路径, 类名） ──────────────────────
+# 写入时从所属实体（工作项 / 执行计划）复制 project_ids，看板按 (project_ids, 时间) 索引直接查询，
+# 不再 $lookup 关联上级集合。只参与删除清理与回填，不计入项目统计。
+PROJECT_DENORMALIZED_MODEL_PATHS: List[Tuple[str, str]] = [
+    ("app.modules.workflow.repository.models", "BusFlowLogDoc"),
+    ("app.modules.execution_plan.repository.models", "ExecutionPlanItemDoc"),
+]
+
+# ── 项目看板统计汇总分区 ──────────────────────────────────────────
+# 写路径只重算受影响的分区：实体计数 / 执行任务进度 / 计划条目通过率与人员分布。
+STATS_SECTION_COUNTS = "counts"
+STATS_SECTION_TASKS = "tasks"
+STATS_SECTION_PLAN_ITEMS = "plan_items"
+STATS_SECTIONS: Tuple[str, ...] = (STATS_SECTION_COUNTS, STATS_SECTION_TASKS, STATS_SECTION_PLAN_ITEMS)
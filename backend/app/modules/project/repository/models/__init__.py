@@ -1,11 +1,14 @@
 from app.modules.project.repository.models.project import ProjectDoc
+from app.modules.project.repository.models.stats_rollup import ProjectStatsRollupDoc
 
 DOCUMENT_MODELS = [
     ProjectDoc,
+    ProjectStatsRollupDoc,
 ]
 
 __all__ = [
     "ProjectDoc",
+    "ProjectStatsRollupDoc",
     "DOCUMENT_MODELS",
 ]
 
@@ -0,0 +1,27 @@
+"""项目看板统计汇总文档模型。"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+
+class ProjectStatsRollupDoc(Document):
+    """每个项目一条的看板统计汇总，看板只读这一条文档。"""
+
+    project_id: str = Field(..., description="项目 ID")
+    stats: Dict[str, Any] = Field(default_factory=dict, description="ProjectStatsResponse 字段快照")
+    reconciled_at: Optional[datetime] = Field(None, description="最近一次全量重算时间")
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), description="最近一次（分区或全量）刷新时间"
+    )
+
+    class Settings:
+        name = "project_stats_rollups"
+        indexes = [
+            IndexModel("project_id", unique=True),
+        ]
@@ -2,13 +2,16 @@
 
 import importlib
 
-from app.modules.project.domain.constants import PROJECT_RELATED_MODEL_PATHS
+from app.modules.project.domain.constants import (
+    PROJECT_DENORMALIZED_MODEL_PATHS,
+    PROJECT_RELATED_MODEL_PATHS,
+)
 from app.shared.core.logger import log as logger
 
 
-def get_related_models() -> list[type]:
+def _load_models(paths: list[tuple[str, str]]) -> list[type]:
     models = []
-    for module_path, class_name in PROJECT_RELATED_MODEL_PATHS:
+    for module_path, class_name in paths:
         try:
             module = importlib.import_module(module_path)
             models.append(getattr(module, class_name))
@@ -17,6 +20,14 @@ def get_related_models() -> list[type]:
     return models
 
 
+def get_related_models() -> list[type]:
+    return _load_models(PROJECT_RELATED_MODEL_PATHS)
+
+
+def get_denormalized_models() -> list[type]:
+    return _load_models(PROJECT_DENORMALIZED_MODEL_PATHS)
+
+
 def find_model(related: list[type], name: str) -> type:
     for model in related:
         if model.__name__ == name:
@@ -1,8 +1,14 @@
 """Project dashboard statistics, blockers, and activity queries."""
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 
+from app.modules.project.domain.constants import (
+    STATS_SECTION_COUNTS,
+    STATS_SECTION_PLAN_ITEMS,
+    STATS_SECTION_TASKS,
+    STATS_SECTIONS,
+)
 from app.modules.project.schemas.project import (
     AssigneeDistribution,
     BlockerItemResponse,
@@ -26,17 +32,25 @@ async def _count_for_project(model, project_id: str, extra_filters: Optional[lis
     return await model.find(_make_project_filter(project_id, extra_filters)).count()
 
 
+_TASK_DONE_STATUSES = {"FINISHED", "SUCCESS", "DONE"}
+_TASK_RUNNING_STATUSES = {"RUNNING", "DISPATCHED"}
+_TASK_FAILED_STATUSES = {"FAILED", "ERROR"}
+
+
 async def _compute_task_breakdown(task_cls, project_id: str) -> ExecutionTaskBreakdown:
-    total = await _count_for_project(task_cls, project_id)
-    done = await _count_for_project(
-        task_cls, project_id, [{"overall_status": {"$in": ["FINISHED", "SUCCESS", "DONE"]}}]
-    )
-    running = await _count_for_project(
-        task_cls, project_id, [{"overall_status": {"$in": ["RUNNING", "DISPATCHED"]}}]
-    )
-    failed = await _count_for_project(
-        task_cls, project_id, [{"overall_status": {"$in": ["FAILED", "ERROR"]}}]
-    )
+    # 一次按 overall_status 分组，代替按状态分别 count
+    pipeline = [
+        {"$match": _make_project_filter(project_id)},
+        {"$group": {"_id": "$overall_status", "count": {"$sum": 1}}},
+    ]
+    counts = {
+        result.get("_id"): result.get("count", 0)
+        for result in await task_cls.aggregate(pipeline, projection_model=None).to_list()
+    }
+    total = sum(counts.values())
+    done = sum(counts.get(status, 0) for status in _TASK_DONE_STATUSES)
+    running = sum(counts.get(status, 0) for status in _TASK_RUNNING_STATUSES)
+    failed = sum(counts.get(status, 0) for status in _TASK_FAILED_STATUSES)
     pending = total - done - running - failed
     progress = round(done / total * 100, 1) if total > 0 else 0.0
     return ExecutionTaskBreakdown(
@@ -54,18 +68,7 @@ async def _fetch_assignee_distribution(project_id: str) -> List[AssigneeDistribu
         from app.modules.execution_plan.repository.models import ExecutionPlanItemDoc
 
         pipeline = [
-            {"$lookup": {
-                "from": "execution_plans",
-                "localField": "plan_id",
-                "foreignField": "plan_id",
-                "as": "plan",
-            }},
-            {"$unwind": "$plan"},
-            {"$match": {
-                "plan.project_ids": {"$in": [project_id]},
-                "plan.is_deleted": False,
-                "is_deleted": False,
-            }},
+            {"$match": {"project_ids": project_id, "is_deleted": False}},
             {"$group": {
                 "_id": "$assignee_id",
                 "item_count": {"$sum": 1},
@@ -99,18 +102,7 @@ async def _compute_pass_rates(project_id: str) -> tuple[StatsBreakdown, StatsBre
         from app.modules.execution_plan.repository.models import ExecutionPlanItemDoc
 
         pipeline = [
-            {"$lookup": {
-                "from": "execution_plans",
-                "localField": "plan_id",
-                "foreignField": "plan_id",
-                "as": "plan",
-            }},
-            {"$unwind": "$plan"},
-            {"$match": {
-                "plan.project_ids": {"$in": [project_id]},
-                "plan.is_deleted": False,
-                "is_deleted": False,
-            }},
+            {"$match": {"project_ids": project_id, "is_deleted": False}},
             {"$group": {
                 "_id": "$ref_type",
                 "total": {"$sum": 1},
@@ -136,39 +128,61 @@ async def _compute_pass_rates(project_id: str) -> tuple[StatsBreakdown, StatsBre
     return manual, auto
 
 
+async def _compute_counts_section(project_id: str) -> Dict[str, Any]:
+    related = get_related_models()
+    test_case_count = await _count_for_project(find_model(related, "TestCaseDoc"), project_id)
+    requirement_count = await _count_for_project(find_model(related, "TestRequirementDoc"), project_id)
+    return {
+        "test_case_count": test_case_count,
+        "auto_case_count": await _count_for_project(find_model(related, "AutomationTestCaseDoc"), project_id),
+        "requirement_count": requirement_count,
+        "plan_count": await _count_for_project(find_model(related, "ExecutionPlanDoc"), project_id),
+        "coverage_rate": (
+            round(test_case_count / requirement_count * 100, 1)
+            if requirement_count > 0 else 0.0
+        ),
+    }
+
+
+async def _compute_tasks_section(project_id: str) -> Dict[str, Any]:
+    task = await _compute_task_breakdown(find_model(get_related_models(), "ExecutionTaskDoc"), project_id)
+    return {"task": task.model_dump(), "task_progress": task.progress}
+
+
+async def _compute_plan_items_section(project_id: str) -> Dict[str, Any]:
+    manual_pass, auto_pass = await _compute_pass_rates(project_id)
+    distribution = await _fetch_assignee_distribution(project_id)
+    return {
+        "manual_pass": manual_pass.model_dump(),
+        "auto_pass": auto_pass.model_dump(),
+        "assignee_distribution": [entry.model_dump() for entry in distribution],
+    }
+
+
+_SECTION_COMPUTERS: Dict[str, Callable[[str], Awaitable[Dict[str, Any]]]] = {
+    STATS_SECTION_COUNTS: _compute_counts_section,
+    STATS_SECTION_TASKS: _compute_tasks_section,
+    STATS_SECTION_PLAN_ITEMS: _compute_plan_items_section,
+}
+
+
 class ProjectDashboardService:
     DEFAULT_BLOCKER_LIMIT = 20
     DEFAULT_ACTIVITY_LIMIT = 20
 
+    @staticmethod
+    async def compute_stats_sections(project_id: str, sections: Iterable[str]) -> Dict[str, Any]:
+        """从源集合重算指定分区，返回 ProjectStatsResponse 的对应字段。"""
+        fields: Dict[str, Any] = {}
+        for section in sections:
+            fields.update(await _SECTION_COMPUTERS[section](project_id))
+        return fields
+
     @staticmethod
     async def get_project_stats(project_id: str) -> ProjectStatsResponse:
-        related = get_related_models()
-        test_case_count = await _count_for_project(find_model(related, "TestCaseDoc"), project_id)
-        auto_case_count = await _count_for_project(
-            find_model(related, "AutomationTestCaseDoc"), project_id
-        )
-        requirement_count = await _count_for_project(
-            find_model(related, "TestRequirementDoc"), project_id
-        )
-        plan_count = await _count_for_project(find_model(related, "ExecutionPlanDoc"), project_id)
-        task = await _compute_task_breakdown(find_model(related, "ExecutionTaskDoc"), project_id)
-        manual_pass, auto_pass = await _compute_pass_rates(project_id)
-        coverage_rate = (
-            round(test_case_count / requirement_count * 100, 1)
-            if requirement_count > 0 else 0.0
-        )
-        return ProjectStatsResponse(
-            test_case_count=test_case_count,
-            auto_case_count=auto_case_count,
-            requirement_count=requirement_count,
-            plan_count=plan_count,
-            task=task,
-            task_progress=task.progress,
-            manual_pass=manual_pass,
-            auto_pass=auto_pass,
-            coverage_rate=coverage_rate,
-            assignee_distribution=await _fetch_assignee_distribution(project_id),
-        )
+        """从源集合全量计算项目统计（看板读汇总文档，见 `ProjectStatsRollupService`）。"""
+        fields = await ProjectDashboardService.compute_stats_sections(project_id, STATS_SECTIONS)
+        return ProjectStatsResponse(**fields)
 
     @staticmethod
     async def get_blockers(project_id: str) -> List[BlockerItemResponse]:
@@ -176,36 +190,28 @@ class ProjectDashboardService:
         try:
             from app.modules.execution_plan.repository.models import ExecutionPlanItemDoc
 
-            pipeline = [
-                {"$lookup": {
-                    "from": "execution_plans",
-                    "localField": "plan_id",
-                    "foreignField": "plan_id",
-                    "as": "plan",
-                }},
-                {"$unwind": "$plan"},
-                {"$match": {
-                    "plan.project_ids": {"$in": [project_id]},
-                    "plan.is_deleted": False,
+            # 条目上冗余了计划的 project_ids（删除计划时条目同步软删除），直接走 (项目, 状态, 时间) 索引
+            items = await ExecutionPlanItemDoc.find(
+                {
+                    "project_ids": project_id,
                     "is_deleted": False,
                     "$or": [
                         {"status": "fail"},
-                        {"$and": [{"status": "pending"}, {"priority": "P0"}]},
+                        {"status": "pending", "priority": "P0"},
                     ],
-                }},
-                {"$sort": {"updated_at": -1}},
-                {"$limit": ProjectDashboardService.DEFAULT_BLOCKER_LIMIT},
-            ]
-            items = await ExecutionPlanItemDoc.aggregate(pipeline, projection_model=None).to_list()
+                },
+                sort=[("updated_at", -1)],
+                limit=ProjectDashboardService.DEFAULT_BLOCKER_LIMIT,
+            ).to_list()
             blockers.extend(
                 BlockerItemResponse(
-                    id=item.get("item_id", ""),
-                    title=item.get("case_title", ""),
+                    id=item.item_id,
+                    title=item.case_title,
                     source="plan_item",
-                    assignee_id=item.get("assignee_id"),
-                    status=item.get("status", ""),
-                    priority=item.get("priority", ""),
-                    updated_at=item.get("updated_at"),
+                    assignee_id=item.assignee_id,
+                    status=item.status,
+                    priority=item.priority,
+                    updated_at=item.updated_at,
                 )
                 for item in items
             )
@@ -243,49 +249,42 @@ class ProjectDashboardService:
     ) -> List[ProjectActivityResponse]:
         activities: List[ProjectActivityResponse] = []
         try:
-            from app.modules.workflow.repository.models.business import BusFlowLogDoc
-
-            pipeline = [
-                {"$lookup": {
-                    "from": "bus_work_items",
-                    "localField": "work_item_id",
-                    "foreignField": "_id",
-                    "as": "work_item",
-                }},
-                {"$unwind": "$work_item"},
-                {"$match": {
-                    "work_item.project_ids": {"$in": [project_id]},
-                    "work_item.is_deleted": False,
-                }},
-                {"$sort": {"created_at": -1}},
-                {"$limit": limit},
-            ]
-            logs = await BusFlowLogDoc.aggregate(pipeline, projection_model=None).to_list()
-            operator_ids = {
-                entry.get("operator_id", "") for entry in logs if entry.get("operator_id")
-            }
+            from app.modules.workflow.repository.models.business import BusFlowLogDoc, BusWorkItemDoc
+
+            # 日志写入时冗余了事项的 project_ids（事项删除时摘除），按 (项目, 时间) 索引取最近 N 条
+            logs = await BusFlowLogDoc.find(
+                {"project_ids": project_id},
+                sort=[("created_at", -1)],
+                limit=limit,
+            ).to_list()
+            # 标题等展示字段仍取事项当前值：最多 limit 个事项，按 _id 批量回查
+            work_items = {}
+            item_ids = list({entry.work_item_id for entry in logs})
+            if item_ids:
+                docs = await BusWorkItemDoc.find({"_id": {"$in": item_ids}, "is_deleted": False}).to_list()
+                work_items = {doc.id: doc for doc in docs}
+            logs = [entry for entry in logs if entry.work_item_id in work_items]
+            operator_ids = {entry.operator_id for entry in logs if entry.operator_id}
             username_map: Dict[str, str] = {}
             if operator_ids:
                 try:
-                    from app.modules.auth.repository.models import UserDoc
+                    from app.modules.auth.user_directory import UserDirectory
 
-                    users = await UserDoc.find({
-                        "user_id": {"$in": list(operator_ids)}
-                    }).to_list()
-                    username_map = {user.user_id: user.username for user in users if user.username}
+                    names = await UserDirectory.get_names(operator_ids)
+                    username_map = {user_id: name for user_id, name in names.items() if name}
                 except Exception:
                     pass
 
             for entry in logs:
-                operator_id = entry.get("operator_id", "")
+                work_item = work_items[entry.work_item_id]
                 activities.append(ProjectActivityResponse(
-                    id=str(entry.get("_id", "")),
-                    time=entry.get("created_at", datetime.now(timezone.utc)),
-                    user_id=operator_id,
-                    username=username_map.get(operator_id, ""),
-                    action=entry.get("action", ""),
-                    target=entry.get("work_item", {}).get("title", ""),
-                    target_type=entry.get("work_item", {}).get("type_code", ""),
+                    id=str(entry.id),
+                    time=entry.created_at or datetime.now(timezone.utc),
+                    user_id=entry.operator_id,
+                    username=username_map.get(entry.operator_id, ""),
+                    action=entry.action,
+                    target=work_item.title,
+                    target_type=work_item.type_code,
                 ))
         except Exception as exc:
             logger.warning("获取项目动态失败: {}", exc)
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta, timezone
 from app.modules.project.domain.exceptions import ProjectNotFoundError
 from app.modules.project.repository.models.project import ProjectDoc
 from app.modules.project.schemas.project import GenerateDemoResponse
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
 
 
 class ProjectDemoService:
@@ -58,6 +59,7 @@ class ProjectDemoService:
                 assignee_id=random.choice(assignees),
                 status=status,
                 order_no=index,
+                project_ids=[project_id],
             ).insert()
             created_items += 1
 
@@ -114,6 +116,7 @@ class ProjectDemoService:
                     action=action,
                     operator_id=random.choice(operators),
                     payload={},
+                    project_ids=[project_id],
                 )
                 flow_log.created_at = now - timedelta(
                     hours=random.randint(1, 48),
@@ -122,6 +125,7 @@ class ProjectDemoService:
                 await flow_log.insert()
                 created_activities += 1
 
+        schedule_project_stats_refresh([project_id])
         return GenerateDemoResponse(
             plan_items_created=created_items,
             activities_created=created_activities,
@@ -18,9 +18,10 @@ from app.modules.project.schemas.project import (
     ProjectResponse,
     ProjectStatsResponse,
 )
-from app.modules.project.service._related_models import get_related_models
+from app.modules.project.service._related_models import get_denormalized_models, get_related_models
 from app.modules.project.service.project_dashboard_service import ProjectDashboardService
 from app.modules.project.service.project_demo_service import ProjectDemoService
+from app.modules.project.service.project_stats_rollup import ProjectStatsRollupService
 from app.shared.core.logger import log as logger
 from app.shared.service.base import BaseService
 
@@ -36,9 +37,9 @@ class UserNameResolverPort(ABC):
 class _DefaultUserNameResolver(UserNameResolverPort):
     async def resolve_username(self, user_id: str) -> Optional[str]:
         try:
-            from app.modules.auth.repository.models import UserDoc
+            from app.modules.auth.user_directory import UserDirectory
 
-            user = await UserDoc.find_one({"user_id": user_id})
+            user = await UserDirectory.get(user_id)
             return user.username if user else None
         except Exception:
             return None
@@ -55,12 +56,12 @@ async def _batch_resolve_owners(owner_ids: set[str]) -> Dict[str, OwnerBrief]:
     if not owner_ids:
         return {}
     try:
-        from app.modules.auth.repository.models import UserDoc
+        from app.modules.auth.user_directory import UserDirectory
 
-        users = await UserDoc.find({"user_id": {"$in": list(owner_ids)}}).to_list()
+        users = await UserDirectory.get_many(owner_ids)
         return {
             user.user_id: OwnerBrief(user_id=user.user_id, username=user.username)
-            for user in users
+            for user in users.values()
             if user.username
         }
     except Exception as exc:
@@ -215,11 +216,23 @@ class ProjectService(BaseService):
                 }).update_many({"$pull": {"project_ids": project_id}})
             except Exception as exc:
                 logger.warning("Failed to clean project_ids from {}: {}", model.__name__, exc)
+        # 冗余集合（流转日志、计划条目）不区分软删除状态，一并摘除
+        for model in get_denormalized_models():
+            try:
+                await model.find({"project_ids": project_id}).update_many(
+                    {"$pull": {"project_ids": project_id}}
+                )
+            except Exception as exc:
+                logger.warning("Failed to clean project_ids from {}: {}", model.__name__, exc)
+        try:
+            await ProjectStatsRollupService.delete(project_id)
+        except Exception as exc:
+            logger.warning("Failed to delete stats rollup of {}: {}", project_id, exc)
         logger.info("Project deleted: {}", project_id)
 
     @staticmethod
     async def get_project_stats(project_id: str) -> ProjectStatsResponse:
-        return await ProjectDashboardService.get_project_stats(project_id)
+        return await ProjectStatsRollupService.get_stats(project_id)
 
     @staticmethod
     async def get_blockers(project_id: str) -> List[BlockerItemResponse]:
@@ -0,0 +1,131 @@
+"""项目看板统计汇总（rollup）维护。
+
+看板统计按项目缓存为一条 `ProjectStatsRollupDoc`，看板只读这一条文档：
+- 写路径（任务事件入库、计划条目变化、实体删除）在写入之后调用 `schedule_project_stats_refresh`，
+  后台只重算受影响的分区并 `$set` 对应字段，不等待、不影响业务写入结果；
+- 汇总距上次全量重算超过 `ROLLUP_RECONCILE_SECONDS` 时，读取方照常返回现有汇总，同时在后台全量对账，
+  漏掉的写路径或并发刷新造成的偏差最多滞留这么久；
+- 项目还没有汇总（看板从未打开过）时，首次读取同步全量计算并落库。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from app.modules.project.domain.constants import STATS_SECTIONS
+from app.modules.project.repository.models import ProjectStatsRollupDoc
+from app.modules.project.schemas.project import ProjectStatsResponse
+from app.modules.project.service.project_dashboard_service import ProjectDashboardService
+from app.shared.core.logger import log as logger
+
+# 汇总的最大全量对账间隔（秒）
+ROLLUP_RECONCILE_SECONDS = 600
+
+# 持有后台刷新任务引用，避免任务在完成前被 GC 回收
+_pending_rollup_tasks: set[asyncio.Task] = set()
+# 正在后台全量对账的项目，避免并发读取重复触发
+_reconciling_projects: set[str] = set()
+
+
+def _rollup_available() -> bool:
+    """Beanie 未初始化汇总模型时（如独立脚本、单元测试）跳过汇总维护。"""
+    try:
+        ProjectStatsRollupDoc.get_pymongo_collection()
+    except Exception:
+        return False
+    return True
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Mongo 读回的时间默认不带时区
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class ProjectStatsRollupService:
+    """项目统计汇总的读取与刷新。"""
+
+    @staticmethod
+    async def get_stats(project_id: str) -> ProjectStatsResponse:
+        rollup = await ProjectStatsRollupDoc.find_one({"project_id": project_id})
+        reconciled_at = _as_utc(rollup.reconciled_at) if rollup else None
+        if reconciled_at is None:
+            fields = await ProjectStatsRollupService.refresh(project_id, STATS_SECTIONS)
+            return ProjectStatsResponse(**fields)
+        if datetime.now(timezone.utc) - reconciled_at > timedelta(seconds=ROLLUP_RECONCILE_SECONDS):
+            _schedule_reconcile(project_id)
+        return ProjectStatsResponse(**rollup.stats)
+
+    @staticmethod
+    async def refresh(project_id: str, sections: Iterable[str]) -> dict[str, Any]:
+        """重算指定分区并写回汇总，覆盖全部分区时记为一次全量对账。"""
+        sections = tuple(dict.fromkeys(sections))
+        fields = await ProjectDashboardService.compute_stats_sections(project_id, sections)
+        now = datetime.now(timezone.utc)
+        update: dict[str, Any] = {f"stats.{key}": value for key, value in fields.items()}
+        update["updated_at"] = now
+        if set(STATS_SECTIONS) <= set(sections):
+            update["reconciled_at"] = now
+        await ProjectStatsRollupDoc.get_pymongo_collection().update_one(
+            {"project_id": project_id}, {"$set": update}, upsert=True
+        )
+        return fields
+
+    @staticmethod
+    async def delete(project_id: str) -> None:
+        await ProjectStatsRollupDoc.find({"project_id": project_id}).delete()
+
+
+async def _refresh_in_background(project_ids: list[str], sections: tuple[str, ...]) -> None:
+    for project_id in project_ids:
+        try:
+            # 没有汇总的项目不预先计算，首次打开看板时再全量计算
+            if await ProjectStatsRollupDoc.find_one({"project_id": project_id}) is None:
+                continue
+            await ProjectStatsRollupService.refresh(project_id, sections)
+        except Exception as exc:
+            logger.warning(
+                "项目统计汇总刷新失败: project_id={} sections={} error={}", project_id, sections, exc
+            )
+
+
+async def _reconcile_in_background(project_id: str) -> None:
+    try:
+        await ProjectStatsRollupService.refresh(project_id, STATS_SECTIONS)
+    except Exception as exc:
+        logger.warning("项目统计汇总对账失败: project_id={} error={}", project_id, exc)
+    finally:
+        _reconciling_projects.discard(project_id)
+
+
+def _spawn(coro) -> bool:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return False
+    task = loop.create_task(coro)
+    _pending_rollup_tasks.add(task)
+    task.add_done_callback(_pending_rollup_tasks.discard)
+    return True
+
+
+def _schedule_reconcile(project_id: str) -> None:
+    if project_id in _reconciling_projects:
+        return
+    if _spawn(_reconcile_in_background(project_id)):
+        _reconciling_projects.add(project_id)
+
+
+def schedule_project_stats_refresh(project_ids: Iterable[Optional[str]], *sections: str) -> None:
+    """在后台重算指定项目汇总的分区（不等待），未指定分区时全量重算。
+
+    必须在业务写入之后调用，后台任务会重新读取源集合。
+    """
+    unique_ids = list(dict.fromkeys(str(value) for value in project_ids if value))
+    if not unique_ids or not _rollup_available():
+        return
+    _spawn(_refresh_in_background(unique_ids, tuple(sections) or STATS_SECTIONS))
@@ -0,0 +1,7 @@
+from app.modules.search.api.routes import router
+
+from app.shared.api.router_registry import register_router
+
+register_router(router, prefix="/api/v1", tags=["Search"])
+
+__all__ = ["router"]
@@ -0,0 +1,16 @@
+"""全局搜索 API 依赖注入。"""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.modules.search.application import GlobalSearchService
+
+
+def get_global_search_service() -> GlobalSearchService:
+    return GlobalSearchService()
+
+
+GlobalSearchServiceDep = Annotated[GlobalSearchService, Depends(get_global_search_service)]
@@ -0,0 +1,48 @@
+"""全局搜索 API 路由。"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.modules.search.api.dependencies import GlobalSearchServiceDep
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.search.schemas.search import SearchPageResponse
+from app.shared.api.schemas.base import APIResponse
+from app.shared.auth import require_permission
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get(
+    "",
+    response_model=APIResponse[SearchPageResponse],
+    summary="全局搜索",
+    dependencies=[Depends(require_permission("search:global"))],
+)
+async def global_search(
+    service: GlobalSearchServiceDep,
+    q: str = Query(..., min_length=1, max_length=100, description="关键词，支持中文与英文混合"),
+    types: Optional[List[SearchEntityType]] = Query(None, description="实体类型，可重复传入；为空时搜索全部"),
+    project_id: Optional[str] = Query(None, description="按项目筛选"),
+    state: Optional[str] = Query(None, description="按状态筛选"),
+    sub_type: Optional[str] = Query(None, description="按子类型筛选（工作项类型/需求分类/用例分类/框架）"),
+    owner_id: Optional[str] = Query(None, description="按负责人筛选"),
+    creator_id: Optional[str] = Query(None, description="按创建人筛选"),
+    limit: int = Query(20, ge=1, le=100, description="返回数量限制"),
+    offset: int = Query(0, ge=0, description="分页偏移"),
+) -> APIResponse[SearchPageResponse]:
+    """按相关度搜索需求、测试用例、自动化用例与工作项。"""
+    result = await service.search(
+        q,
+        entity_types=[entity_type.value for entity_type in types or []],
+        project_id=project_id,
+        state=state,
+        sub_type=sub_type,
+        owner_id=owner_id,
+        creator_id=creator_id,
+        limit=limit,
+        offset=offset,
+    )
+    return APIResponse(data=SearchPageResponse(**result))
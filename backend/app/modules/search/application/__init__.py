@@ -0,0 +1,14 @@
+"""全局搜索应用层公共导出。"""
+
+from .indexer import SearchIndexer, schedule_search_refresh
+from .search_service import GlobalSearchService
+from .sources import SearchSource, get_search_source, get_search_sources
+
+__all__ = [
+    "GlobalSearchService",
+    "SearchIndexer",
+    "SearchSource",
+    "get_search_source",
+    "get_search_sources",
+    "schedule_search_refresh",
+]
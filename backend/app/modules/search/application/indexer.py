@@ -0,0 +1,148 @@
+"""搜索索引维护：增量刷新与全量重建。
+
+写路径在业务写入（事务提交）之后调用 `schedule_search_refresh`，
+索引刷新在后台任务中按 ID 重新读取源文档：
+- 源文档存在且未删除 → upsert 索引条目；
+- 源文档不存在或已软删除 → 删除索引条目。
+刷新失败只记录日志，不影响业务写入结果，可通过全量重建脚本修复。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from pymongo import DeleteOne, UpdateOne
+
+from app.modules.search.application.sources import get_search_source
+from app.modules.search.domain.entry import SearchEntry
+from app.modules.search.repository.models import SearchIndexDoc, SearchIndexStateDoc
+from app.shared.core.logger import log
+
+# 已完成全量构建的实体类型（进程内正向缓存，重建开始时清除）
+_ready_entity_types: set[str] = set()
+# 持有后台刷新任务引用，避免任务在完成前被 GC 回收
+_pending_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _entry_to_update(entry: SearchEntry, indexed_at: datetime) -> UpdateOne:
+    weights = entry.term_weights()
+    return UpdateOne(
+        {"entity_type": entry.entity_type, "entity_id": entry.entity_id},
+        {
+            "$set": {
+                "title": entry.title,
+                "snippet": entry.short_snippet(),
+                "terms": list(weights),
+                "weights": weights,
+                "state": entry.state,
+                "sub_type": entry.sub_type,
+                "owner_id": entry.owner_id,
+                "creator_id": entry.creator_id,
+                "project_ids": entry.project_ids,
+                "source_updated_at": entry.source_updated_at,
+                "indexed_at": indexed_at,
+            },
+        },
+        upsert=True,
+    )
+
+
+def _index_available() -> bool:
+    """Beanie 未初始化搜索模型时（如独立脚本、单元测试）跳过索引维护。"""
+    try:
+        SearchIndexDoc.get_pymongo_collection()
+    except Exception:
+        return False
+    return True
+
+
+class SearchIndexer:
+    """搜索索引写入器。"""
+
+    async def refresh(self, entity_type: str, ids: Iterable[str]) -> int:
+        """按 ID 增量刷新索引条目，返回写入操作数。"""
+        unique_ids = list(dict.fromkeys(str(value) for value in ids if value))
+        if not unique_ids:
+            return 0
+
+        entries = await get_search_source(entity_type).load_entries(unique_ids)
+        indexed_at = datetime.now(timezone.utc)
+        operations: list[Any] = [_entry_to_update(entry, indexed_at) for entry in entries]
+        present_ids = {entry.entity_id for entry in entries}
+        operations.extend(
+            DeleteOne({"entity_type": entity_type, "entity_id": entity_id})
+            for entity_id in unique_ids
+            if entity_id not in present_ids
+        )
+        await SearchIndexDoc.get_pymongo_collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def rebuild(self, entity_type: str) -> int:
+        """全量重建某类实体的索引，完成后标记为 ready，返回条目数。"""
+        _ready_entity_types.discard(entity_type)
+        collection = SearchIndexDoc.get_pymongo_collection()
+        started_at = datetime.now(timezone.utc)
+        entry_count = 0
+
+        async for entries in get_search_source(entity_type).iter_entries():
+            indexed_at = datetime.now(timezone.utc)
+            await collection.bulk_write(
+                [_entry_to_update(entry, indexed_at) for entry in entries],
+                ordered=False,
+            )
+            entry_count += len(entries)
+
+        # 本轮未触达的条目对应已删除的源文档
+        await collection.delete_many({"entity_type": entity_type, "indexed_at": {"$lt": started_at}})
+        await SearchIndexStateDoc.get_pymongo_collection().update_one(
+            {"entity_type": entity_type},
+            {
+                "$set": {
+                    "ready": True,
+                    "entry_count": entry_count,
+                    "rebuilt_at": datetime.now(timezone.utc),
+                },
+            },
+            upsert=True,
+        )
+        _ready_entity_types.add(entity_type)
+        return entry_count
+
+    @staticmethod
+    async def is_ready(entity_type: str) -> bool:
+        """索引是否已完成全量构建，可以承接该类实体的查询。"""
+        if entity_type in _ready_entity_types:
+            return True
+        if not _index_available():
+            return False
+        state = await SearchIndexStateDoc.find_one({"entity_type": entity_type})
+        if state is None or not state.ready:
+            return False
+        _ready_entity_types.add(entity_type)
+        return True
+
+
+async def _refresh_in_background(entity_type: str, ids: list[str]) -> None:
+    try:
+        await SearchIndexer().refresh(entity_type, ids)
+    except Exception as exc:
+        log.warning("search: 索引刷新失败 type={} ids={} err={}", entity_type, ids, exc)
+
+
+def schedule_search_refresh(entity_type: str, ids: Iterable[str | None]) -> None:
+    """在后台刷新指定实体的索引条目（不等待）。
+
+    必须在业务写入提交之后调用，后台任务会重新读取源文档。
+    """
+    unique_ids = list(dict.fromkeys(str(value) for value in ids if value))
+    if not unique_ids or not _index_available():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_refresh_in_background(entity_type, unique_ids))
+    _pending_refresh_tasks.add(task)
+    task.add_done_callback(_pending_refresh_tasks.discard)
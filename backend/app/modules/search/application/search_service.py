@@ -0,0 +1,131 @@
+"""全局搜索查询服务。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from app.modules.search.application.indexer import SearchIndexer
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.search.domain.tokenizer import query_terms
+from app.modules.search.repository.models import SearchIndexDoc
+
+
+class GlobalSearchService:
+    """基于倒排索引的全局搜索。
+
+    查询关键字与索引使用同一套分词规则，所有检索词必须全部命中（`$all`），
+    按检索词权重之和排序，同分时按源文档更新时间倒序。
+    """
+
+    def __init__(self, indexer: SearchIndexer | None = None) -> None:
+        self._indexer = indexer or SearchIndexer()
+
+    @staticmethod
+    def _build_match(
+        terms: list[str],
+        entity_types: list[str],
+        project_id: str | None,
+        state: str | None,
+        sub_type: str | None,
+        owner_id: str | None,
+        creator_id: str | None,
+    ) -> dict[str, Any]:
+        match: dict[str, Any] = {"terms": {"$all": terms}}
+        if len(entity_types) == 1:
+            match["entity_type"] = entity_types[0]
+        else:
+            match["entity_type"] = {"$in": entity_types}
+        if project_id:
+            match["project_ids"] = project_id
+        if state:
+            match["state"] = state
+        if sub_type:
+            match["sub_type"] = sub_type
+
+        # owner 和 creator 与工作项列表保持一致，采用 OR 语义。
+        or_conditions = []
+        if owner_id is not None:
+            or_conditions.append({"owner_id": owner_id})
+        if creator_id is not None:
+            or_conditions.append({"creator_id": creator_id})
+        if or_conditions:
+            match["$or"] = or_conditions
+        return match
+
+    async def search(
+        self,
+        keyword: str,
+        entity_types: list[str] | None = None,
+        project_id: str | None = None,
+        state: str | None = None,
+        sub_type: str | None = None,
+        owner_id: str | None = None,
+        creator_id: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """执行排序分页搜索，返回 {items, total, limit, offset}。"""
+        page: dict[str, Any] = {"items": [], "total": 0, "limit": limit, "offset": offset}
+        terms = query_terms(keyword)
+        if not terms:
+            return page
+
+        supported_types = {entity_type.value for entity_type in SearchEntityType}
+        requested_types = list(dict.fromkeys(entity_types or [])) or sorted(supported_types)
+        unsupported = [entity_type for entity_type in requested_types if entity_type not in supported_types]
+        if unsupported:
+            raise ValueError(f"unsupported search entity types: {unsupported}")
+
+        match = self._build_match(terms, requested_types, project_id, state, sub_type, owner_id, creator_id)
+        score = {"$add": [{"$ifNull": [f"$weights.{term}", 0]} for term in terms]}
+        pipeline = [
+            {"$match": match},
+            {
+                "$facet": {
+                    "items": [
+                        {"$addFields": {"score": score}},
+                        {"$sort": {"score": -1, "source_updated_at": -1, "_id": 1}},
+                        {"$skip": offset},
+                        {"$limit": limit},
+                        {"$project": {"_id": 0, "terms": 0, "weights": 0, "indexed_at": 0}},
+                    ],
+                    "total": [{"$count": "count"}],
+                }
+            },
+        ]
+        results = await SearchIndexDoc.aggregate(pipeline, projection_model=None).to_list()
+        if not results:
+            return page
+
+        facet = results[0]
+        page["items"] = facet.get("items", [])
+        total = facet.get("total") or [{}]
+        page["total"] = total[0].get("count", 0)
+        return page
+
+    async def search_entity_ids(
+        self,
+        entity_type: str,
+        keyword: str,
+        *,
+        state: str | None = None,
+        sub_type: str | None = None,
+        owner_id: str | None = None,
+        creator_id: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[str] | None:
+        """按相关度返回单类实体的 ID 列表；索引未就绪时返回 None，由调用方回退原有查询。"""
+        if not await self._indexer.is_ready(entity_type):
+            return None
+        page = await self.search(
+            keyword,
+            entity_types=[entity_type],
+            state=state,
+            sub_type=sub_type,
+            owner_id=owner_id,
+            creator_id=creator_id,
+            limit=limit,
+            offset=offset,
+        )
+        return [item["entity_id"] for item in page["items"]]
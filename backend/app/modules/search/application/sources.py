@@ -0,0 +1,187 @@
+"""搜索数据源：描述每类实体如何从源集合读取并投影为索引条目。
+
+源文档模型通过 (模块路径, 类名) 延迟加载，搜索模块不直接依赖其他模块的 repository。
+新增可搜索实体时只需在 `_SEARCH_SOURCES` 中追加一项。
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from beanie import PydanticObjectId
+
+from app.modules.search.domain.constants import REBUILD_BATCH_SIZE, SearchEntityType
+from app.modules.search.domain.entry import SearchEntry
+
+
+def _join(values: list[str] | None) -> str:
+    return " ".join(str(value) for value in values or [] if value)
+
+
+def _build_work_item_entry(doc: Any) -> SearchEntry:
+    return SearchEntry(
+        entity_type=SearchEntityType.WORK_ITEM.value,
+        entity_id=str(doc.id),
+        title=doc.title,
+        fields=[(doc.content, 1.0), (doc.req_id, 2.0)],
+        snippet=doc.content,
+        state=doc.current_state,
+        sub_type=doc.type_code,
+        owner_id=doc.current_owner_id,
+        creator_id=doc.creator_id,
+        project_ids=list(doc.project_ids or []),
+        source_updated_at=doc.updated_at,
+    )
+
+
+def _build_requirement_entry(doc: Any) -> SearchEntry:
+    return SearchEntry(
+        entity_type=SearchEntityType.REQUIREMENT.value,
+        entity_id=doc.req_id,
+        title=doc.title,
+        fields=[
+            (doc.req_id, 2.0),
+            (_join(doc.tags), 2.0),
+            (doc.description, 1.0),
+            (doc.acceptance_criteria, 1.0),
+            (doc.risk_points, 0.5),
+        ],
+        snippet=doc.description,
+        sub_type=doc.category,
+        owner_id=doc.tpm_owner_id,
+        project_ids=list(doc.project_ids or []),
+        source_updated_at=doc.updated_at,
+    )
+
+
+def _build_test_case_entry(doc: Any) -> SearchEntry:
+    steps = [
+        " ".join(filter(None, [step.name, step.action, step.expected]))
+        for step in doc.steps or []
+    ]
+    return SearchEntry(
+        entity_type=SearchEntityType.TEST_CASE.value,
+        entity_id=doc.case_id,
+        title=doc.title,
+        fields=[
+            (doc.case_id, 2.0),
+            (_join(doc.tags), 2.0),
+            (_join(doc.catalog_path), 1.0),
+            (doc.pre_condition, 1.0),
+            (doc.post_condition, 1.0),
+            (" ".join(steps), 0.5),
+        ],
+        snippet=doc.pre_condition or (steps[0] if steps else None),
+        sub_type=doc.test_category,
+        owner_id=doc.owner_id,
+        project_ids=list(doc.project_ids or []),
+        source_updated_at=doc.updated_at,
+    )
+
+
+def _build_automation_case_entry(doc: Any) -> SearchEntry:
+    return SearchEntry(
+        entity_type=SearchEntityType.AUTOMATION_TEST_CASE.value,
+        entity_id=doc.auto_case_id,
+        title=doc.name,
+        fields=[
+            (doc.auto_case_id, 2.0),
+            (_join(doc.tags), 2.0),
+            (doc.script_name, 1.5),
+            (doc.description, 1.0),
+            (doc.script_path, 0.5),
+        ],
+        snippet=doc.description or doc.script_path,
+        state=doc.status,
+        sub_type=doc.framework,
+        project_ids=list(doc.project_ids or []),
+        source_updated_at=doc.updated_at,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SearchSource:
+    """一类可搜索实体的数据源描述。"""
+    entity_type: str
+    module_path: str
+    class_name: str
+    id_field: str
+    build_entry: Callable[[Any], SearchEntry]
+
+    def model(self) -> Any:
+        return getattr(importlib.import_module(self.module_path), self.class_name)
+
+    def _id_values(self, ids: list[str]) -> list[Any]:
+        if self.id_field != "_id":
+            return list(ids)
+        return [PydanticObjectId(value) for value in ids if PydanticObjectId.is_valid(value)]
+
+    async def load_entries(self, ids: list[str]) -> list[SearchEntry]:
+        """读取指定 ID 的未删除源文档；不存在或已删除的 ID 不会出现在结果中。"""
+        values = self._id_values(ids)
+        if not values:
+            return []
+        docs = await self.model().find({self.id_field: {"$in": values}, "is_deleted": False}).to_list()
+        return [self.build_entry(doc) for doc in docs]
+
+    async def iter_entries(self, batch_size: int = REBUILD_BATCH_SIZE) -> AsyncIterator[list[SearchEntry]]:
+        """按 `_id` 游标分批遍历全部未删除源文档，用于全量重建。"""
+        model = self.model()
+        last_id = None
+        while True:
+            query: dict[str, Any] = {"is_deleted": False}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = await model.find(query).sort("_id").limit(batch_size).to_list()
+            if not docs:
+                return
+            yield [self.build_entry(doc) for doc in docs]
+            last_id = docs[-1].id
+
+
+_SEARCH_SOURCES: dict[str, SearchSource] = {
+    source.entity_type: source
+    for source in (
+        SearchSource(
+            entity_type=SearchEntityType.WORK_ITEM.value,
+            module_path="app.modules.workflow.repository.models",
+            class_name="BusWorkItemDoc",
+            id_field="_id",
+            build_entry=_build_work_item_entry,
+        ),
+        SearchSource(
+            entity_type=SearchEntityType.REQUIREMENT.value,
+            module_path="app.modules.test_specs.repository.models",
+            class_name="TestRequirementDoc",
+            id_field="req_id",
+            build_entry=_build_requirement_entry,
+        ),
+        SearchSource(
+            entity_type=SearchEntityType.TEST_CASE.value,
+            module_path="app.modules.test_specs.repository.models",
+            class_name="TestCaseDoc",
+            id_field="case_id",
+            build_entry=_build_test_case_entry,
+        ),
+        SearchSource(
+            entity_type=SearchEntityType.AUTOMATION_TEST_CASE.value,
+            module_path="app.modules.test_specs.repository.models",
+            class_name="AutomationTestCaseDoc",
+            id_field="auto_case_id",
+            build_entry=_build_automation_case_entry,
+        ),
+    )
+}
+
+
+def get_search_source(entity_type: str) -> SearchSource:
+    source = _SEARCH_SOURCES.get(entity_type)
+    if source is None:
+        raise ValueError(f"unsupported search entity type: {entity_type}")
+    return source
+
+
+def get_search_sources() -> list[SearchSource]:
+    return list(_SEARCH_SOURCES.values())
@@ -0,0 +1,12 @@
+"""全局搜索领域层：分词规则与索引条目。"""
+from .constants import SearchEntityType
+from .entry import SearchEntry
+from .tokenizer import build_term_weights, query_terms, tokenize
+
+__all__ = [
+    "SearchEntityType",
+    "SearchEntry",
+    "build_term_weights",
+    "query_terms",
+    "tokenize",
+]
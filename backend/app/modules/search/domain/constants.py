@@ -0,0 +1,19 @@
+"""全局搜索模块常量定义。"""
+
+from __future__ import annotations
+
+from enum import Enum
+
+
+class SearchEntityType(str, Enum):
+    """可被全局搜索索引的实体类型。"""
+    WORK_ITEM = "work_item"
+    REQUIREMENT = "requirement"
+    TEST_CASE = "test_case"
+    AUTOMATION_TEST_CASE = "automation_test_case"
+
+
+# 搜索结果摘要最大长度
+SNIPPET_MAX_LENGTH = 160
+# 全量重建时每批读取的源文档数量
+REBUILD_BATCH_SIZE = 500
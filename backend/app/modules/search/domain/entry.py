@@ -0,0 +1,34 @@
+"""搜索索引条目领域对象。"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.modules.search.domain.constants import SNIPPET_MAX_LENGTH
+from app.modules.search.domain.tokenizer import build_term_weights
+
+
+@dataclass(slots=True)
+class SearchEntry:
+    """由源文档投影出的可检索条目，与具体存储结构无关。"""
+    entity_type: str
+    entity_id: str
+    title: str
+    fields: list[tuple[str | None, float]] = field(default_factory=list)
+    snippet: str | None = None
+    state: str | None = None
+    sub_type: str | None = None
+    owner_id: str | None = None
+    creator_id: str | None = None
+    project_ids: list[str] = field(default_factory=list)
+    source_updated_at: datetime | None = None
+
+    def term_weights(self) -> dict[str, float]:
+        return build_term_weights(self.title, self.fields)
+
+    def short_snippet(self) -> str:
+        text = " ".join((self.snippet or "").split())
+        if len(text) <= SNIPPET_MAX_LENGTH:
+            return text
+        return text[:SNIPPET_MAX_LENGTH].rstrip() + "…"
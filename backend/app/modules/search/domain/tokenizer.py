@@ -0,0 +1,87 @@
+"""全局搜索分词规则。
+
+MongoDB `$text` 的默认分词器不会切分中文，这里采用与查询端一致的轻量规则：
+- 连续的 CJK 字符切成二元组（bigram），单字片段保留为单字；
+- 拉丁字母和数字按非字母数字字符切分为整词并统一小写；
+- 标题额外索引 CJK 单字与英文词前缀，支持短关键字和输入联想式检索。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Iterable
+
+_CJK_CHARS = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_CHARS}]+|[0-9a-z]+")
+_CJK_PATTERN = re.compile(rf"[{_CJK_CHARS}]")
+
+# 标题英文词的前缀长度范围
+PREFIX_MIN_LENGTH = 2
+PREFIX_MAX_LENGTH = 16
+# 单个条目最多保留的检索词数量，避免超长正文撑大索引文档
+MAX_TERMS_PER_ENTRY = 512
+# 单次查询最多参与匹配的检索词数量
+MAX_QUERY_TERMS = 16
+
+
+def _is_cjk(segment: str) -> bool:
+    return bool(_CJK_PATTERN.match(segment))
+
+
+def tokenize(text: str | None) -> list[str]:
+    """将文本切分为检索词，保持出现顺序（可能重复）。"""
+    if not text:
+        return []
+    terms: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        segment = match.group()
+        if not _is_cjk(segment):
+            terms.append(segment)
+        elif len(segment) == 1:
+            terms.append(segment)
+        else:
+            terms.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+    return terms
+
+
+def _title_expansions(title: str) -> set[str]:
+    """标题额外索引的检索词：CJK 单字和英文词前缀。"""
+    expansions: set[str] = set()
+    for match in _TOKEN_PATTERN.finditer(title.lower()):
+        segment = match.group()
+        if _is_cjk(segment):
+            expansions.update(segment)
+            continue
+        upper = min(len(segment), PREFIX_MAX_LENGTH)
+        expansions.update(segment[:size] for size in range(PREFIX_MIN_LENGTH, upper))
+    return expansions
+
+
+def query_terms(keyword: str) -> list[str]:
+    """将查询关键字切分为去重后的检索词，查询端与索引端共用同一套规则。"""
+    return list(dict.fromkeys(tokenize(keyword)))[:MAX_QUERY_TERMS]
+
+
+def build_term_weights(
+    title: str,
+    fields: Iterable[tuple[str | None, float]],
+    *,
+    title_weight: float = 3.0,
+    expansion_weight: float = 1.0,
+) -> dict[str, float]:
+    """计算条目的检索词权重。
+
+    每个字段的词频按 `1 + log(tf)` 衰减后乘以字段权重累加，
+    避免长正文中的高频词压过标题命中。
+    """
+    weights: Counter[str] = Counter()
+    for text, weight in [(title, title_weight), *fields]:
+        for term, count in Counter(tokenize(text)).items():
+            weights[term] += weight * (1.0 + math.log(count))
+    for term in _title_expansions(title or ""):
+        weights[term] += expansion_weight
+
+    top_terms = weights.most_common(MAX_TERMS_PER_ENTRY)
+    return {term: round(weight, 4) for term, weight in top_terms}
@@ -0,0 +1,13 @@
+"""全局搜索文档模型注册。"""
+from __future__ import annotations
+
+from app.modules.search.repository.models.search_index import SearchIndexDoc, SearchIndexStateDoc
+
+__all__ = ["SearchIndexDoc", "SearchIndexStateDoc", "DOCUMENT_MODELS"]
+
+DOCUMENT_MODELS = [SearchIndexDoc, SearchIndexStateDoc]
+
+from app.shared.infrastructure.document_registry import register_document_model
+
+for _model in DOCUMENT_MODELS:
+    register_document_model(_model)
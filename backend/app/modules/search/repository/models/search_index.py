@@ -0,0 +1,55 @@
+"""全局搜索倒排索引文档模型。"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+class SearchIndexDoc(Document):
+    """搜索索引条目：每个源实体一条，`terms` 为多键倒排索引。"""
+
+    entity_type: str = Field(..., description="实体类型（work_item/requirement/test_case/automation_test_case）")
+    entity_id: str = Field(..., description="实体业务 ID（工作项为 ObjectId 字符串）")
+    title: str = Field(..., description="标题")
+    snippet: str = Field(default="", description="结果摘要")
+    terms: List[str] = Field(default_factory=list, description="检索词列表")
+    weights: Dict[str, float] = Field(default_factory=dict, description="检索词权重（用于相关度排序）")
+    state: Optional[str] = Field(None, description="状态（工作项流转状态/自动化用例状态）")
+    sub_type: Optional[str] = Field(None, description="子类型（工作项类型/需求分类/用例分类/框架）")
+    owner_id: Optional[str] = Field(None, description="负责人")
+    creator_id: Optional[str] = Field(None, description="创建人")
+    project_ids: List[str] = Field(default_factory=list, description="关联项目 ID 列表")
+    source_updated_at: Optional[datetime] = Field(None, description="源文档更新时间")
+    indexed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "search_index"
+        indexes = [
+            IndexModel([("entity_type", ASCENDING), ("entity_id", ASCENDING)], unique=True),
+            IndexModel([("terms", ASCENDING), ("entity_type", ASCENDING)]),
+            IndexModel("project_ids"),
+            IndexModel([("entity_type", ASCENDING), ("source_updated_at", DESCENDING)]),
+        ]
+
+
+class SearchIndexStateDoc(Document):
+    """按实体类型记录索引是否已完成全量构建。
+
+    只有 ready 的实体类型才会由索引承接查询，否则调用方继续走原有查询路径。
+    """
+
+    entity_type: str = Field(..., description="实体类型")
+    ready: bool = Field(default=False, description="是否已完成全量构建")
+    entry_count: int = Field(default=0, description="最近一次全量构建写入的条目数")
+    rebuilt_at: Optional[datetime] = Field(None, description="最近一次全量构建完成时间")
+
+    class Settings:
+        name = "search_index_state"
+        indexes = [
+            IndexModel("entity_type", unique=True),
+        ]
@@ -0,0 +1,6 @@
+from .search import SearchHitResponse, SearchPageResponse
+
+__all__ = [
+    "SearchHitResponse",
+    "SearchPageResponse",
+]
@@ -0,0 +1,33 @@
+"""全局搜索 API 响应模型。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchHitResponse(BaseModel):
+    """单条搜索结果。"""
+
+    entity_type: str = Field(description="实体类型")
+    entity_id: str = Field(description="实体 ID（工作项为 ObjectId，其余为业务编号）")
+    title: str = Field(description="标题")
+    snippet: str = Field(default="", description="结果摘要")
+    score: float = Field(description="相关度得分")
+    state: Optional[str] = Field(default=None, description="状态")
+    sub_type: Optional[str] = Field(default=None, description="子类型")
+    owner_id: Optional[str] = Field(default=None, description="负责人")
+    creator_id: Optional[str] = Field(default=None, description="创建人")
+    project_ids: List[str] = Field(default_factory=list, description="关联项目")
+    source_updated_at: Optional[datetime] = Field(default=None, description="源数据更新时间")
+
+
+class SearchPageResponse(BaseModel):
+    """搜索结果分页。"""
+
+    items: List[SearchHitResponse] = Field(description="结果列表（按相关度排序）")
+    total: int = Field(description="命中总数")
+    limit: int = Field(description="分页大小")
+    offset: int = Field(description="分页偏移")
@@ -1,5 +1,25 @@
-from app.modules.system_config.api import router
-from app.modules.system_config.repository.models import DOCUMENT_MODELS
-from app.modules.system_config.service import ConfigService
+"""系统配置模块。
+
+导出对象按需加载：业务代码只依赖 `system_config.service` 时，不会连带导入 API 路由（含 AI 路由依赖）。
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "router": "app.modules.system_config.api",
+    "DOCUMENT_MODELS": "app.modules.system_config.repository.models",
+    "ConfigService": "app.modules.system_config.service",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ["router", "DOCUMENT_MODELS", "ConfigService"]
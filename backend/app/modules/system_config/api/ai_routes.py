@@ -1,14 +1,25 @@
-"""AI 辅助工具路由（润色、步骤分析等）"""
+"""AI 辅助工具路由（润色、步骤分析等）
+
+步骤分析、用例生成、用例评审另提供 `/stream` 后缀的 SSE 版本，逐段推送模型输出。
+"""
 from __future__ import annotations
 
 import json
-from typing import Any
+import time
+from typing import Any, Callable
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
 
 from app.modules.system_config.constants.ai import POLISH_SYSTEM_PROMPT
+from app.modules.test_specs.application.case_retrieval import (
+    DEFAULT_PROMPT_TOKEN_BUDGET,
+    DEFAULT_TOP_K,
+    retrieve_relevant_cases,
+)
 from app.shared.ai.client import AIClient
+from app.shared.ai.embedding import EmbeddingService
 from app.shared.ai.prompts import (
     GENERATE_CASES_SYSTEM_PROMPT,
     GENERATE_CASES_USER_TEMPLATE,
@@ -25,6 +36,62 @@ from app.shared.core.logger import log
 router = APIRouter(prefix="/ai", tags=["AI Tools"])
 
 
+# ═══════════════════════════════════════════════════════════════════════
+#  SSE 流式输出
+# ═══════════════════════════════════════════════════════════════════════
+
+def _sse_event(event: str, payload: Any) -> dict[str, str]:
+    return {"event": event, "data": json.dumps(payload, ensure_ascii=False)}
+
+
+def _stream_json_response(
+    *,
+    endpoint: str,
+    system_prompt: str,
+    user_content: str,
+    temperature: float,
+    route: str,
+    array_key: str,
+    build_result: Callable[[dict[str, Any]], BaseModel],
+    build_item: Callable[[Any], Any] | None = None,
+    use_cache: bool = True,
+) -> EventSourceResponse:
+    """以 SSE 推送流式 AI 调用。
+
+    事件依次为：`token`（文本增量 `{"text": ...}`）、`item`（`array_key` 数组中新生成完的元素）、
+    `result`（与非流式端点 `data` 相同结构的完整结果）；失败时推送 `error`（`{"status", "detail"}`）后结束。
+    请求参数错误、资源不存在等在建立流之前以普通 HTTP 错误返回。
+    """
+
+    async def _events():
+        client = AIClient.get_instance()
+        try:
+            async for kind, payload in client.stream_chat_completion_json(
+                system_prompt,
+                user_content,
+                array_key=array_key,
+                temperature=temperature,
+                route=route,
+                use_cache=use_cache,
+            ):
+                if kind == "token":
+                    yield _sse_event("token", {"text": payload})
+                elif kind == "item":
+                    yield _sse_event("item", build_item(payload) if build_item else payload)
+                else:
+                    yield _sse_event("result", build_result(payload).model_dump())
+        except RuntimeError as e:
+            yield _sse_event("error", {"status": 503, "detail": str(e)})
+        except json.JSONDecodeError as e:
+            log.error("AI {} stream JSON parse failed: {}", endpoint, e)
+            yield _sse_event("error", {"status": 502, "detail": f"AI 返回格式错误: {e}"})
+        except Exception as e:
+            log.error("AI {} stream failed: {}", endpoint, e)
+            yield _sse_event("error", {"status": 502, "detail": f"AI 调用失败: {e}"})
+
+    return EventSourceResponse(_events())
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  文本润色
 # ═══════════════════════════════════════════════════════════════════════
@@ -50,6 +117,7 @@ async def polish_text(request: PolishRequest):
             system_prompt=POLISH_SYSTEM_PROMPT,
             user_content=text,
             temperature=0.3,
+            route="test_specs.polish",
         )
         log.info("AI polish: {} chars -> {} chars", len(text), len(polished))
         return APIResponse(data=PolishResponse(polished=polished.strip()))
@@ -91,18 +159,12 @@ class StepAnalysisResult(BaseModel):
     summary: str = Field(default="", description="整体评价")
 
 
-@router.post("/analyze-steps", response_model=APIResponse[StepAnalysisResult])
-async def analyze_test_steps(request: AnalyzeStepsRequest):
-    """AI 分析测试用例步骤的完整性和质量。
-
-    前端 TestCaseStepEditorV2 组件调用此端点，传入用例步骤数据，
-    返回评分 + 问题列表 + 整体评价。
-    """
+def _build_step_analysis_prompt(request: AnalyzeStepsRequest) -> str:
     if not request.steps:
         raise HTTPException(status_code=400, detail="steps 不能为空")
 
     steps_json = json.dumps(request.steps, ensure_ascii=False, indent=2)
-    user_content = STEP_ANALYSIS_USER_TEMPLATE.format(
+    return STEP_ANALYSIS_USER_TEMPLATE.format(
         title=request.title or "（未提供标题）",
         category=request.category or "（未提供）",
         pre_condition=request.pre_condition or "（无）",
@@ -111,12 +173,43 @@ async def analyze_test_steps(request: AnalyzeStepsRequest):
         steps_json=steps_json,
     )
 
+
+def _to_step_analysis_result(raw: dict[str, Any], step_count: int) -> StepAnalysisResult:
+    issues: list[StepAnalysisIssue] = []
+    for item in raw.get("issues", []):
+        issues.append(StepAnalysisIssue(
+            stepIndex=int(item.get("stepIndex", 0)),
+            severity=str(item.get("severity", "suggestion")),
+            category=str(item.get("category", "completeness")),
+            field=item.get("field"),
+            message=str(item.get("message", "")),
+            proposedValue=item.get("proposedValue"),
+        ))
+
+    return StepAnalysisResult(
+        score=int(raw.get("score", 0)),
+        totalSteps=int(raw.get("totalSteps", step_count)),
+        issues=issues,
+        summary=str(raw.get("summary", "")),
+    )
+
+
+@router.post("/analyze-steps", response_model=APIResponse[StepAnalysisResult])
+async def analyze_test_steps(request: AnalyzeStepsRequest):
+    """AI 分析测试用例步骤的完整性和质量。
+
+    前端 TestCaseStepEditorV2 组件调用此端点，传入用例步骤数据，
+    返回评分 + 问题列表 + 整体评价。
+    """
+    user_content = _build_step_analysis_prompt(request)
+
     client = AIClient.get_instance()
     try:
         raw = await client.chat_completion_json(
             system_prompt=STEP_ANALYSIS_SYSTEM_PROMPT,
             user_content=user_content,
             temperature=0.2,
+            route="test_specs.analyze_steps",
         )
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
@@ -127,35 +220,30 @@ async def analyze_test_steps(request: AnalyzeStepsRequest):
         log.error("AI analyze-steps failed: {}", e)
         raise HTTPException(status_code=502, detail=f"AI 调用失败: {e}")
 
-    score = int(raw.get("score", 0))
-    total_steps = int(raw.get("totalSteps", len(request.steps)))
-    summary = str(raw.get("summary", ""))
-
-    issues: list[StepAnalysisIssue] = []
-    for item in raw.get("issues", []):
-        issues.append(StepAnalysisIssue(
-            stepIndex=int(item.get("stepIndex", 0)),
-            severity=str(item.get("severity", "suggestion")),
-            category=str(item.get("category", "completeness")),
-            field=item.get("field"),
-            message=str(item.get("message", "")),
-            proposedValue=item.get("proposedValue"),
-        ))
-
-    result = StepAnalysisResult(
-        score=score,
-        totalSteps=total_steps,
-        issues=issues,
-        summary=summary,
-    )
+    result = _to_step_analysis_result(raw, len(request.steps))
 
     log.info(
         "AI analyze-steps: steps={} score={} issues={}",
-        len(request.steps), score, len(issues),
+        len(request.steps), result.score, len(result.issues),
     )
     return APIResponse(data=result)
 
 
+@router.post("/analyze-steps/stream")
+async def analyze_test_steps_stream(request: AnalyzeStepsRequest):
+    """`/analyze-steps` 的 SSE 版本：逐段推送模型输出，每条问题生成完即推送 item 事件。"""
+    user_content = _build_step_analysis_prompt(request)
+    return _stream_json_response(
+        endpoint="analyze-steps",
+        system_prompt=STEP_ANALYSIS_SYSTEM_PROMPT,
+        user_content=user_content,
+        temperature=0.2,
+        route="test_specs.analyze_steps",
+        array_key="issues",
+        build_result=lambda raw: _to_step_analysis_result(raw, len(request.steps)),
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  需求→用例生成
 # ═══════════════════════════════════════════════════════════════════════
@@ -184,6 +272,9 @@ class GenerateCasesResponse(BaseModel):
     """用例生成响应。"""
     cases: list[GeneratedCaseDraft] = Field(default_factory=list)
     reason: str = Field(default="", description="如果未生成用例，说明原因")
+    related_case_ids: list[str] = Field(default_factory=list, description="作为去重参考放入 prompt 的已有用例")
+    retrieval_ms: int = Field(default=0, description="相关用例检索耗时（毫秒）")
+    llm_ms: int = Field(default=0, description="LLM 调用耗时（毫秒）")
 
 
 class GenerateCasesRequest(BaseModel):
@@ -198,13 +289,13 @@ class GenerateCasesRequest(BaseModel):
     max_cases: int = Field(default=5, ge=1, le=20, description="最大生成用例数")
 
 
-@router.post("/generate-cases", response_model=APIResponse[GenerateCasesResponse])
-async def generate_cases(request: GenerateCasesRequest):
-    """AI 根据测试需求自动生成测试用例草稿。
+# 生成用例时放入 prompt 的已有相关用例数量与 token 预算（仅用于提示模型避免重复）
+GENERATE_RELATED_TOP_K = 10
+GENERATE_RELATED_TOKEN_BUDGET = 1500
 
-    输入需求 ID 或需求文本，AI 生成测试用例草稿列表，
-    前端可编辑后批量保存。
-    """
+
+async def _prepare_generate_prompt(request: GenerateCasesRequest) -> tuple[str, list[dict[str, Any]], int]:
+    """组装生成用例的 prompt，返回 (user_content, 相关用例, 检索耗时毫秒)。"""
     if not request.requirement_id and not request.requirement_text:
         raise HTTPException(status_code=400, detail="requirement_id 或 requirement_text 至少提供一个")
 
@@ -215,6 +306,8 @@ async def generate_cases(request: GenerateCasesRequest):
     acceptance_criteria = ""
     key_parameters = ""
     risk_points = ""
+    tags: list[str] = []
+    requirement_vector: list[float] | None = None
 
     if request.requirement_id:
         from app.modules.test_specs.repository.models.requirement import TestRequirementDoc
@@ -232,10 +325,35 @@ async def generate_cases(request: GenerateCasesRequest):
         if doc.key_parameters:
             key_parameters = json.dumps(doc.key_parameters, ensure_ascii=False, indent=2)
         risk_points = doc.risk_points or ""
+        tags = list(doc.tags or [])
+        requirement_vector = doc.embedding
     else:
         description = request.requirement_text or ""
         title = "（用户提供的文本需求）"
 
+    retrieval_started = time.perf_counter()
+    related_cases: list[dict[str, Any]] = []
+    try:
+        retrieval = await retrieve_relevant_cases(
+            EmbeddingService.build_requirement_text(
+                title,
+                description=description,
+                acceptance_criteria=acceptance_criteria,
+                category=category,
+                tags=tags,
+                risk_points=risk_points,
+            ),
+            query_vector=requirement_vector,
+            top_k=GENERATE_RELATED_TOP_K,
+            token_budget=GENERATE_RELATED_TOKEN_BUDGET,
+        )
+        if retrieval.strategy == "semantic":
+            related_cases = retrieval.cases
+    except Exception as e:
+        # 相关用例只是去重参考，检索失败不影响生成
+        log.warning("AI generate-cases: 相关用例检索失败: {}", e)
+    retrieval_ms = int((time.perf_counter() - retrieval_started) * 1000)
+
     user_content = GENERATE_CASES_USER_TEMPLATE.format(
         title=title,
         priority=priority,
@@ -244,15 +362,51 @@ async def generate_cases(request: GenerateCasesRequest):
         acceptance_criteria=acceptance_criteria or "（无）",
         key_parameters=key_parameters or "（无）",
         risk_points=risk_points or "（无）",
+        related_cases=json.dumps(related_cases, ensure_ascii=False, indent=2) if related_cases else "（无）",
         max_cases=request.max_cases,
     )
+    return user_content, related_cases, retrieval_ms
+
+
+def _to_generated_case(item: dict[str, Any]) -> GeneratedCaseDraft:
+    steps = []
+    for s in item.get("steps", []):
+        steps.append(GeneratedCaseStep(
+            step_id=str(s.get("step_id", f"step-{len(steps)+1}")),
+            name=str(s.get("name", "")),
+            action=str(s.get("action", "")),
+            expected=str(s.get("expected", "")),
+        ))
+    return GeneratedCaseDraft(
+        title=str(item.get("title", "")),
+        priority=str(item.get("priority", "P2")),
+        test_category=str(item.get("test_category", "functional")),
+        pre_condition=str(item.get("pre_condition", "")),
+        post_condition=str(item.get("post_condition", "")),
+        steps=steps,
+        tags=[str(t) for t in item.get("tags", [])],
+        rationale=str(item.get("rationale", "")),
+    )
+
+
+@router.post("/generate-cases", response_model=APIResponse[GenerateCasesResponse])
+async def generate_cases(request: GenerateCasesRequest):
+    """AI 根据测试需求自动生成测试用例草稿。
+
+    输入需求 ID 或需求文本，AI 生成测试用例草稿列表，
+    前端可编辑后批量保存。
+    """
+    user_content, related_cases, retrieval_ms = await _prepare_generate_prompt(request)
 
     client = AIClient.get_instance()
+    llm_started = time.perf_counter()
     try:
         raw = await client.chat_completion_json(
             system_prompt=GENERATE_CASES_SYSTEM_PROMPT,
             user_content=user_content,
             temperature=0.4,
+            route="test_specs.generate_cases",
+            use_cache=False,
         )
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
@@ -263,34 +417,50 @@ async def generate_cases(request: GenerateCasesRequest):
         log.error("AI generate-cases failed: {}", e)
         raise HTTPException(status_code=502, detail=f"AI 调用失败: {e}")
 
-    cases: list[GeneratedCaseDraft] = []
-    for item in raw.get("cases", []):
-        steps = []
-        for s in item.get("steps", []):
-            steps.append(GeneratedCaseStep(
-                step_id=str(s.get("step_id", f"step-{len(steps)+1}")),
-                name=str(s.get("name", "")),
-                action=str(s.get("action", "")),
-                expected=str(s.get("expected", "")),
-            ))
-        cases.append(GeneratedCaseDraft(
-            title=str(item.get("title", "")),
-            priority=str(item.get("priority", "P2")),
-            test_category=str(item.get("test_category", "functional")),
-            pre_condition=str(item.get("pre_condition", "")),
-            post_condition=str(item.get("post_condition", "")),
-            steps=steps,
-            tags=[str(t) for t in item.get("tags", [])],
-            rationale=str(item.get("rationale", "")),
-        ))
-
+    cases = [_to_generated_case(item) for item in raw.get("cases", [])]
     reason = str(raw.get("reason", ""))
+    llm_ms = int((time.perf_counter() - llm_started) * 1000)
 
     log.info(
-        "AI generate-cases: req={} max={} generated={}",
-        request.requirement_id or "text", request.max_cases, len(cases),
+        "AI generate-cases: req={} max={} generated={} related={} retrieval_ms={} llm_ms={}",
+        request.requirement_id or "text", request.max_cases, len(cases), len(related_cases),
+        retrieval_ms, llm_ms,
+    )
+    return APIResponse(data=GenerateCasesResponse(
+        cases=cases,
+        reason=reason,
+        related_case_ids=[item["case_id"] for item in related_cases],
+        retrieval_ms=retrieval_ms,
+        llm_ms=llm_ms,
+    ))
+
+
+@router.post("/generate-cases/stream")
+async def generate_cases_stream(request: GenerateCasesRequest):
+    """`/generate-cases` 的 SSE 版本：每条用例草稿生成完即推送 item 事件，前端可逐条展示。"""
+    user_content, related_cases, retrieval_ms = await _prepare_generate_prompt(request)
+    llm_started = time.perf_counter()
+
+    def _build_result(raw: dict[str, Any]) -> GenerateCasesResponse:
+        return GenerateCasesResponse(
+            cases=[_to_generated_case(item) for item in raw.get("cases", [])],
+            reason=str(raw.get("reason", "")),
+            related_case_ids=[item["case_id"] for item in related_cases],
+            retrieval_ms=retrieval_ms,
+            llm_ms=int((time.perf_counter() - llm_started) * 1000),
+        )
+
+    return _stream_json_response(
+        endpoint="generate-cases",
+        system_prompt=GENERATE_CASES_SYSTEM_PROMPT,
+        user_content=user_content,
+        temperature=0.4,
+        route="test_specs.generate_cases",
+        use_cache=False,
+        array_key="cases",
+        build_item=lambda item: _to_generated_case(item).model_dump(),
+        build_result=_build_result,
     )
-    return APIResponse(data=GenerateCasesResponse(cases=cases, reason=reason))
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -318,13 +488,7 @@ class ReviewCaseResponse(BaseModel):
     summary: str = Field(default="")
 
 
-@router.post("/review-case", response_model=APIResponse[ReviewCaseResponse])
-async def review_case(request: ReviewCaseRequest):
-    """AI 评审单条测试用例。
-
-    从完整性、清晰度、可追溯性、可执行性四个维度评审，
-    返回评分 + verdict + 缺失场景 + 优先级建议。
-    """
+async def _build_review_prompt(request: ReviewCaseRequest) -> str:
     from app.modules.test_specs.repository.models.test_case import TestCaseDoc
 
     doc = await TestCaseDoc.find_one(
@@ -343,7 +507,7 @@ async def review_case(request: ReviewCaseRequest):
             "expected": s.expected,
         })
 
-    user_content = REVIEW_CASE_USER_TEMPLATE.format(
+    return REVIEW_CASE_USER_TEMPLATE.format(
         title=doc.title or "（无标题）",
         case_id=request.case_id,
         priority=doc.priority or "未指定",
@@ -356,12 +520,41 @@ async def review_case(request: ReviewCaseRequest):
         steps_json=json.dumps(steps, ensure_ascii=False, indent=2),
     )
 
+
+def _to_review_result(raw: dict[str, Any]) -> ReviewCaseResponse:
+    dimensions: dict[str, ReviewDimension] = {}
+    for dim_name, dim_data in (raw.get("dimensions") or {}).items():
+        dimensions[dim_name] = ReviewDimension(
+            score=int(dim_data.get("score", 0)),
+            issues=[str(i) for i in dim_data.get("issues", [])],
+        )
+
+    return ReviewCaseResponse(
+        score=int(raw.get("score", 0)),
+        verdict=str(raw.get("verdict", "needs_revision")),
+        dimensions=dimensions,
+        missing_scenarios=[str(s) for s in raw.get("missing_scenarios", [])],
+        priority_suggestion=str(raw.get("priority_suggestion", "保持不变")),
+        summary=str(raw.get("summary", "")),
+    )
+
+
+@router.post("/review-case", response_model=APIResponse[ReviewCaseResponse])
+async def review_case(request: ReviewCaseRequest):
+    """AI 评审单条测试用例。
+
+    从完整性、清晰度、可追溯性、可执行性四个维度评审，
+    返回评分 + verdict + 缺失场景 + 优先级建议。
+    """
+    user_content = await _build_review_prompt(request)
+
     client = AIClient.get_instance()
     try:
         raw = await client.chat_completion_json(
             system_prompt=REVIEW_CASE_SYSTEM_PROMPT,
             user_content=user_content,
             temperature=0.3,
+            route="test_specs.review_case",
         )
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
@@ -372,21 +565,7 @@ async def review_case(request: ReviewCaseRequest):
         log.error("AI review-case failed: {}", e)
         raise HTTPException(status_code=502, detail=f"AI 调用失败: {e}")
 
-    dimensions: dict[str, ReviewDimension] = {}
-    for dim_name, dim_data in (raw.get("dimensions") or {}).items():
-        dimensions[dim_name] = ReviewDimension(
-            score=int(dim_data.get("score", 0)),
-            issues=[str(i) for i in dim_data.get("issues", [])],
-        )
-
-    result = ReviewCaseResponse(
-        score=int(raw.get("score", 0)),
-        verdict=str(raw.get("verdict", "needs_revision")),
-        dimensions=dimensions,
-        missing_scenarios=[str(s) for s in raw.get("missing_scenarios", [])],
-        priority_suggestion=str(raw.get("priority_suggestion", "保持不变")),
-        summary=str(raw.get("summary", "")),
-    )
+    result = _to_review_result(raw)
 
     log.info(
         "AI review-case: case={} score={} verdict={}",
@@ -395,6 +574,21 @@ async def review_case(request: ReviewCaseRequest):
     return APIResponse(data=result)
 
 
+@router.post("/review-case/stream")
+async def review_case_stream(request: ReviewCaseRequest):
+    """`/review-case` 的 SSE 版本：逐段推送模型输出，每条缺失场景生成完即推送 item 事件。"""
+    user_content = await _build_review_prompt(request)
+    return _stream_json_response(
+        endpoint="review-case",
+        system_prompt=REVIEW_CASE_SYSTEM_PROMPT,
+        user_content=user_content,
+        temperature=0.3,
+        route="test_specs.review_case",
+        array_key="missing_scenarios",
+        build_result=_to_review_result,
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  智能用例选择
 # ═══════════════════════════════════════════════════════════════════════
@@ -405,6 +599,7 @@ class RecommendCasesRequest(BaseModel):
     change_description: str = Field(..., description="变更描述/commit range")
     case_ids: list[str] = Field(default_factory=list, description="候选用例 ID 列表（可选，留空则查全部）")
     max_recommend: int = Field(default=20, ge=1, le=100, description="最大推荐数")
+    top_k: int = Field(default=DEFAULT_TOP_K, ge=1, le=200, description="语义检索后送入模型的候选用例上限")
 
 
 class RecommendedCase(BaseModel):
@@ -426,54 +621,48 @@ class RecommendCasesResponse(BaseModel):
     excluded: list[ExcludedCase] = Field(default_factory=list)
     coverage_note: str = Field(default="")
     estimated_runtime_min: int = Field(default=0)
+    candidate_count: int = Field(default=0, description="检索范围内的用例总数")
+    retrieved_count: int = Field(default=0, description="检索后送入模型的用例数")
+    retrieval_strategy: str = Field(default="", description="semantic / fallback")
+    retrieval_ms: int = Field(default=0, description="候选用例检索耗时（毫秒）")
+    llm_ms: int = Field(default=0, description="LLM 调用耗时（毫秒）")
 
 
 @router.post("/recommend-cases", response_model=APIResponse[RecommendCasesResponse])
 async def recommend_cases(request: RecommendCasesRequest):
     """AI 根据变更范围推荐应执行的测试用例。
 
-    输入变更描述和候选用例列表，AI 返回推荐用例（含理由和优先级顺序）
-    以及被排除的用例（含排除理由）。
+    先用已存储的用例向量检索与变更描述最相关的 top-k 候选（按 token 预算截断），
+    再由 AI 返回推荐用例（含理由和优先级顺序）以及被排除的用例（含排除理由）。
     """
-    from app.modules.test_specs.repository.models.test_case import TestCaseDoc
-
-    if request.case_ids:
-        docs = await TestCaseDoc.find(
-            TestCaseDoc.case_id.in_(request.case_ids),
-            TestCaseDoc.is_deleted == False,  # noqa: E712
-        ).to_list()
-    else:
-        docs = await TestCaseDoc.find(
-            TestCaseDoc.is_deleted == False,  # noqa: E712
-        ).to_list()
+    retrieval_started = time.perf_counter()
+    retrieval = await retrieve_relevant_cases(
+        request.change_description,
+        case_ids=request.case_ids or None,
+        top_k=request.top_k,
+        token_budget=DEFAULT_PROMPT_TOKEN_BUDGET,
+    )
+    retrieval_ms = int((time.perf_counter() - retrieval_started) * 1000)
 
-    if not docs:
+    if not retrieval.cases:
         raise HTTPException(status_code=404, detail="没有找到候选用例")
 
-    cases_summary = []
-    for d in docs[:100]:
-        cases_summary.append({
-            "case_id": d.case_id,
-            "title": d.title,
-            "priority": d.priority or "P2",
-            "test_category": d.test_category or "",
-            "tags": d.tags or [],
-        })
-
     user_content = RECOMMEND_CASES_USER_TEMPLATE.format(
         project_id=request.project_id or "未指定",
         change_description=request.change_description,
-        total_cases=len(docs),
-        cases_json=json.dumps(cases_summary, ensure_ascii=False, indent=2),
+        total_cases=len(retrieval.cases),
+        cases_json=json.dumps(retrieval.cases, ensure_ascii=False, indent=2),
         failure_stats="（暂无历史失败统计，请基于用例信息推荐）",
     )
 
     client = AIClient.get_instance()
+    llm_started = time.perf_counter()
     try:
         raw = await client.chat_completion_json(
             system_prompt=RECOMMEND_CASES_SYSTEM_PROMPT,
             user_content=user_content,
             temperature=0.4,
+            route="test_specs.recommend_cases",
         )
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
@@ -483,6 +672,7 @@ async def recommend_cases(request: RecommendCasesRequest):
     except Exception as e:
         log.error("AI recommend-cases failed: {}", e)
         raise HTTPException(status_code=502, detail=f"AI 调用失败: {e}")
+    llm_ms = int((time.perf_counter() - llm_started) * 1000)
 
     recommended = []
     for item in raw.get("recommended", [])[:request.max_recommend]:
@@ -505,10 +695,17 @@ async def recommend_cases(request: RecommendCasesRequest):
         excluded=excluded,
         coverage_note=str(raw.get("coverage_note", "")),
         estimated_runtime_min=int(raw.get("estimated_runtime_min", 0)),
+        candidate_count=retrieval.candidate_count,
+        retrieved_count=len(retrieval.cases),
+        retrieval_strategy=retrieval.strategy,
+        retrieval_ms=retrieval_ms,
+        llm_ms=llm_ms,
     )
 
     log.info(
-        "AI recommend-cases: project={} candidates={} recommended={} excluded={}",
-        request.project_id, len(docs), len(recommended), len(excluded),
+        "AI recommend-cases: project={} candidates={} retrieved={} strategy={} tokens={} "
+        "recommended={} excluded={} retrieval_ms={} llm_ms={}",
+        request.project_id, retrieval.candidate_count, len(retrieval.cases), retrieval.strategy,
+        retrieval.prompt_tokens, len(recommended), len(excluded), retrieval_ms, llm_ms,
     )
     return APIResponse(data=result)
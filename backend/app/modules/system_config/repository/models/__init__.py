@@ -1,8 +1,12 @@
-from app.modules.system_config.repository.models.config import SystemConfigDoc, SystemConfigHistoryDoc
+from app.modules.system_config.repository.models.config import (
+    SystemConfigDoc,
+    SystemConfigHistoryDoc,
+    SystemConfigVersionDoc,
+)
 
-DOCUMENT_MODELS = [SystemConfigDoc, SystemConfigHistoryDoc]
+DOCUMENT_MODELS = [SystemConfigDoc, SystemConfigHistoryDoc, SystemConfigVersionDoc]
 
-__all__ = ["SystemConfigDoc", "SystemConfigHistoryDoc", "DOCUMENT_MODELS"]
+__all__ = ["SystemConfigDoc", "SystemConfigHistoryDoc", "SystemConfigVersionDoc", "DOCUMENT_MODELS"]
 
 from app.shared.infrastructure.document_registry import register_document_model
 
@@ -60,3 +60,17 @@ class SystemConfigHistoryDoc(Document):
             "config_key",
             "changed_at",
         ]
+
+
+class SystemConfigVersionDoc(Document):
+    """运行时配置版本号（单文档）
+
+    每次写入运行时配置后自增，各实例据此判断本地配置快照是否过期。
+    """
+
+    scope: Indexed(str, unique=True) = "runtime"  # 版本作用域，目前只有 runtime
+    version: int = 0  # 单调递增的配置版本号
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "system_config_versions"
@@ -1,3 +1,4 @@
-from app.modules.system_config.service.config_service import ConfigService, ConfigCache, ConfigValidator
+from app.modules.system_config.service.config_service import ConfigService, ConfigValidator
+from app.modules.system_config.service.config_snapshot import ConfigSnapshot, ConfigSnapshotStore
 
-__all__ = ["ConfigService", "ConfigCache", "ConfigValidator"]
+__all__ = ["ConfigService", "ConfigSnapshot", "ConfigSnapshotStore", "ConfigValidator"]
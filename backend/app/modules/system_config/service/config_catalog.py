@@ -40,6 +40,7 @@ RUNTIME_CONFIG_DESCRIPTIONS: dict[str, str] = {
     "minio.bucket": "MinIO 存储桶名称",
     "minio.secure": "是否使用 HTTPS 连接 MinIO",
     "minio.presigned_url_expires_seconds": "预签名下载地址有效期（秒）",
+    "minio.multipart_part_size": "附件流式上传分片大小（字节）",
     "jwt.secret_key": "用户令牌签名密钥",
     "jwt.algorithm": "用户令牌签名算法",
     "jwt.expire_minutes": "用户令牌有效期（分钟）",
@@ -50,6 +51,7 @@ RUNTIME_CONFIG_DESCRIPTIONS: dict[str, str] = {
     "execution.kafka_worker_agent_id": "Kafka Worker 代理标识",
     "execution.kafka_worker_heartbeat_ttl_sec": "Kafka Worker 心跳有效期（秒）",
     "execution.kafka_worker_heartbeat_interval_sec": "Kafka Worker 心跳间隔（秒）",
+    "execution.agent_registry_refresh_sec": "执行代理负载注册表刷新间隔（秒）",
     "redis.sentinel_hosts": "Redis Sentinel 地址列表",
     "redis.master_name": "Redis 主节点名称",
     "redis.username": "Redis 用户名",
@@ -10,12 +10,25 @@ import asyncio
 import json
 import time
 from datetime import datetime
+from types import MappingProxyType
 from typing import Any, Optional
 
-from app.modules.system_config.repository.models import SystemConfigDoc, SystemConfigHistoryDoc
+from pymongo import ReturnDocument
+
+from app.modules.system_config.repository.models import (
+    SystemConfigDoc,
+    SystemConfigHistoryDoc,
+    SystemConfigVersionDoc,
+)
 from app.modules.system_config.constants.ai_analysis import AI_ANALYSIS_PROMPT_CONFIGS
 from app.modules.system_config.schemas import AIConfig
 from app.modules.system_config.service.config_catalog import RUNTIME_CONFIG_DESCRIPTIONS
+from app.modules.system_config.service.config_snapshot import (
+    CONFIG_VERSION_SCOPE,
+    ConfigSnapshot,
+    ConfigSnapshotStore,
+    publish_config_changed,
+)
 from app.shared.config import RuntimeSettings, get_environment, get_settings, install_runtime_settings
 from app.shared.core.logger import log
 
@@ -94,37 +107,6 @@ def _runtime_config_templates() -> list[dict[str, Any]]:
     ]
 
 
-class ConfigCache:
-    """配置缓存管理器"""
-
-    _cache: dict[str, tuple[Any, float]] = {}
-    _lock = asyncio.Lock()
-    _ttl: float = 300
-
-    @classmethod
-    async def get(cls, key: str) -> Optional[Any]:
-        async with cls._lock:
-            if key in cls._cache:
-                value, ts = cls._cache[key]
-                if time.time() - ts < cls._ttl:
-                    return value
-                del cls._cache[key]
-            return None
-
-    @classmethod
-    async def set(cls, key: str, value: Any) -> None:
-        async with cls._lock:
-            cls._cache[key] = (value, time.time())
-
-    @classmethod
-    async def invalidate(cls, key: Optional[str] = None) -> None:
-        async with cls._lock:
-            if key is None:
-                cls._cache.clear()
-            elif key in cls._cache:
-                del cls._cache[key]
-
-
 class ConfigService:
     """MongoDB 运行时配置服务。"""
 
@@ -179,26 +161,77 @@ class ConfigService:
 
     @staticmethod
     async def get_config(key: str) -> Any:
-        """Get a required MongoDB configuration value with a short cache."""
+        """Get a required MongoDB configuration value from the current snapshot."""
         if not ConfigService._is_runtime_config_key(key):
             raise ValueError(f"未知运行配置项: {key}")
 
-        cached = await ConfigCache.get(key)
-        if cached is not None:
-            return cached
+        snapshot = await ConfigSnapshotStore.get(ConfigService._load_snapshot)
+        return snapshot.lookup(key)
 
-        doc = await SystemConfigDoc.find_one(SystemConfigDoc.config_key == key)
-        if doc is None or not doc.is_active:
-            raise RuntimeError(f"运行配置缺失或未启用: {key}")
+    @staticmethod
+    async def current_version() -> int:
+        doc = await SystemConfigVersionDoc.find_one(SystemConfigVersionDoc.scope == CONFIG_VERSION_SCOPE)
+        return doc.version if doc else 0
 
-        expected_type = ConfigService._DEFAULTS_MAP[key]["config_type"]
-        if doc.config_type != expected_type:
-            raise RuntimeError(
-                f"运行配置类型错误: {key} 应为 {expected_type}，实际为 {doc.config_type}"
-            )
-        value = ConfigService._parse_value_strict(doc.config_value, expected_type)
-        await ConfigCache.set(key, value)
-        return value
+    @staticmethod
+    async def _load_snapshot(previous: ConfigSnapshot | None) -> ConfigSnapshot:
+        """加载运行时配置快照；版本号未变化时只为旧快照续期。"""
+        version = await ConfigService.current_version()
+        now = ConfigSnapshotStore.now()
+        if (
+            previous is not None
+            and previous.version == version
+            and version >= ConfigSnapshotStore.latest_version()
+        ):
+            return previous.renewed(now)
+
+        # 先读版本号再读配置：期间若有写入，读到的配置只会比版本号新，下一次广播会再触发加载。
+        docs = await SystemConfigDoc.find(
+            {"config_key": {"$in": list(ConfigService._DEFAULTS_MAP)}, "is_active": True}
+        ).to_list()
+        by_key = {doc.config_key: doc for doc in docs}
+        categories: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        for key, template in ConfigService._DEFAULTS_MAP.items():
+            doc = by_key.get(key)
+            if doc is None:
+                continue
+            expected_type = template["config_type"]
+            if doc.config_type != expected_type:
+                errors[key] = f"运行配置类型错误: {key} 应为 {expected_type}，实际为 {doc.config_type}"
+                continue
+            try:
+                value = ConfigService._parse_value_strict(doc.config_value, expected_type)
+            except (TypeError, ValueError):
+                errors[key] = f"运行配置值无法解析为 {expected_type}: {key}"
+                continue
+            categories.setdefault(key.split(".", 1)[0], {})[key] = value
+
+        return ConfigSnapshot(
+            version=version,
+            categories=MappingProxyType({
+                name: MappingProxyType(values) for name, values in categories.items()
+            }),
+            errors=MappingProxyType(errors),
+            loaded_at=now,
+        )
+
+    @staticmethod
+    async def _announce_change(keys: list[str]) -> int:
+        """自增配置版本号，使本实例快照失效并广播给其他实例。"""
+        version_doc = await SystemConfigVersionDoc.get_pymongo_collection().find_one_and_update(
+            {"scope": CONFIG_VERSION_SCOPE},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        version = version_doc["version"]
+        ConfigSnapshotStore.mark_stale(version)
+        try:
+            publish_config_changed(version, keys)
+        except Exception as exc:
+            log.warning("配置变更广播失败，其他实例将在快照过期后感知: {}", exc)
+        return version
 
     @staticmethod
     async def get_config_by_key(config_key: str) -> Optional[SystemConfigDoc]:
@@ -238,8 +271,9 @@ class ConfigService:
     async def get_ai_config() -> dict[str, Any]:
         """获取 AI 相关配置（用于 LLM 调用）。"""
         config = AIConfig()
+        snapshot = await ConfigSnapshotStore.get(ConfigService._load_snapshot)
         for key, field in ConfigService._AI_CONFIG_MAPPING.items():
-            value = await ConfigService.get_config(key)
+            value = snapshot.lookup(key)
             if value is not None:
                 setattr(config, field, value)
         return config.model_dump()
@@ -334,6 +368,17 @@ class ConfigService:
         remark: Optional[str] = None,
     ) -> SystemConfigDoc:
         """设置运行时配置值（自动记录历史，明文存储）。"""
+        doc = await ConfigService._write_config(key, value, changed_by, remark)
+        await ConfigService._announce_change([key])
+        return doc
+
+    @staticmethod
+    async def _write_config(
+        key: str,
+        value: Any,
+        changed_by: Optional[str],
+        remark: Optional[str],
+    ) -> SystemConfigDoc:
         if not ConfigService._is_runtime_config_key(key):
             raise ValueError(f"配置项不属于运行时配置，不能写入 MongoDB: {key}")
 
@@ -367,7 +412,6 @@ class ConfigService:
             )
 
         await (doc.save() if doc.id else doc.insert())
-        await ConfigCache.invalidate(key)
         return doc
 
     @staticmethod
@@ -376,19 +420,21 @@ class ConfigService:
         changed_by: Optional[str] = None,
         remark: Optional[str] = None,
     ) -> int:
-        """批量更新运行时配置。"""
-        count = 0
+        """批量更新运行时配置，全部写入后只自增一次版本号。"""
+        changed_keys: list[str] = []
         for item in items:
             key, value = item.get("config_key"), item.get("config_value")
             if key and value is not None:
-                await ConfigService.set_config(key, value, changed_by, remark)
-                count += 1
-        return count
+                await ConfigService._write_config(key, value, changed_by, remark)
+                changed_keys.append(key)
+        if changed_keys:
+            await ConfigService._announce_change(changed_keys)
+        return len(changed_keys)
 
     @staticmethod
     async def reload_config(key: Optional[str] = None) -> None:
-        """热加载配置（清除缓存）。"""
-        await ConfigCache.invalidate(key)
+        """热加载配置：自增版本号，所有实例在下一次读取时重新加载快照。"""
+        await ConfigService._announce_change([key] if key else [])
 
     @staticmethod
     async def import_configs(
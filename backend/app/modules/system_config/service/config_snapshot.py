@@ -0,0 +1,148 @@
+"""运行时配置快照。
+
+读路径不加锁：整份运行时配置按分类解析成不可变快照，`ConfigService.get_config` 只做一次字典查找。
+快照携带 MongoDB 中的配置版本号（`SystemConfigVersionDoc`），以下情况之一才重新加载：
+
+- 本实例写入配置后自增了版本号，或收到其他实例经 Redis Pub/Sub 广播的新版本号；
+- 快照超过 `SNAPSHOT_MAX_AGE_SECONDS`（Redis 不可用时的兜底），此时先比对版本号，未变化只续期。
+
+重新加载由一把锁串行化，并发的读请求只会触发一次 MongoDB 查询，新快照整体替换旧快照。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Mapping
+
+from app.shared.core.logger import log
+
+CONFIG_CHANGED_EVENT = "system_config.changed"
+CONFIG_VERSION_SCOPE = "runtime"
+SNAPSHOT_MAX_AGE_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """某一版本的运行时配置，按分类组织；errors 记录缺失或无效的配置项。"""
+
+    version: int
+    categories: Mapping[str, Mapping[str, Any]]
+    errors: Mapping[str, str]
+    loaded_at: float
+
+    def category(self, name: str) -> Mapping[str, Any]:
+        return self.categories.get(name, {})
+
+    def lookup(self, key: str) -> Any:
+        values = self.category(key.split(".", 1)[0])
+        if key in values:
+            return values[key]
+        raise RuntimeError(self.errors.get(key) or f"运行配置缺失或未启用: {key}")
+
+    def renewed(self, loaded_at: float) -> ConfigSnapshot:
+        return replace(self, loaded_at=loaded_at)
+
+
+SnapshotLoader = Callable[[ConfigSnapshot | None], Awaitable[ConfigSnapshot]]
+
+
+class ConfigSnapshotStore:
+    """进程内当前配置快照的持有者。"""
+
+    _snapshot: ConfigSnapshot | None = None
+    # 已知的最新配置版本（本实例写入或其他实例广播），可能由 Redis 订阅线程更新
+    _latest_version: int = 0
+    _reload_lock = asyncio.Lock()
+    _max_age: float = SNAPSHOT_MAX_AGE_SECONDS
+    _clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    @classmethod
+    def now(cls) -> float:
+        return cls._clock()
+
+    @classmethod
+    def current(cls) -> ConfigSnapshot | None:
+        """返回仍然有效的快照；过期或已知有更新版本时返回 None。"""
+        snapshot = cls._snapshot
+        if snapshot is None or snapshot.version < cls._latest_version:
+            return None
+        if cls._clock() - snapshot.loaded_at >= cls._max_age:
+            return None
+        return snapshot
+
+    @classmethod
+    def latest_version(cls) -> int:
+        return cls._latest_version
+
+    @classmethod
+    async def get(cls, loader: SnapshotLoader) -> ConfigSnapshot:
+        snapshot = cls.current()
+        if snapshot is not None:
+            return snapshot
+        async with cls._reload_lock:
+            snapshot = cls.current()
+            if snapshot is None:
+                snapshot = await loader(cls._snapshot)
+                cls._snapshot = snapshot
+                cls.mark_stale(snapshot.version)
+        return snapshot
+
+    @classmethod
+    def mark_stale(cls, version: int) -> None:
+        """记录已知的最新版本；低于该版本的快照在下次读取时重新加载。"""
+        if version > cls._latest_version:
+            cls._latest_version = version
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._snapshot = None
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._snapshot = None
+        cls._latest_version = 0
+
+
+def build_config_changed_message(version: int, keys: list[str]) -> str:
+    return json.dumps(
+        {"event": CONFIG_CHANGED_EVENT, "version": version, "keys": keys},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def handle_config_event(message: str) -> None:
+    """Redis 订阅回调：收到配置变更广播时标记本地快照过期（在订阅线程中执行）。"""
+    try:
+        payload = json.loads(message)
+    except (TypeError, ValueError):
+        return
+    if not isinstance(payload, dict) or payload.get("event") != CONFIG_CHANGED_EVENT:
+        return
+    try:
+        ConfigSnapshotStore.mark_stale(int(payload["version"]))
+    except (KeyError, TypeError, ValueError):
+        log.warning("忽略格式错误的配置变更广播: {}", message)
+
+
+def publish_config_changed(version: int, keys: list[str]) -> None:
+    """向其他实例广播配置版本；Redis 未初始化时跳过，由快照最大存活时间兜底。"""
+    import app.shared.redis.service as redis_service
+
+    if redis_service.redis_conn is None:
+        return
+    redis_service.publish_event(build_config_changed_message(version, keys))
+
+
+def start_config_change_listener() -> bool:
+    """订阅 Redis 事件频道以接收其他实例的配置变更；Redis 未初始化时返回 False。"""
+    import app.shared.redis.service as redis_service
+
+    if redis_service.redis_conn is None:
+        log.warning("Redis 未初始化，配置变更只能依靠快照过期（{} 秒）感知", SNAPSHOT_MAX_AGE_SECONDS)
+        return False
+    redis_service.subscribe_events(handle_config_event)
+    return True
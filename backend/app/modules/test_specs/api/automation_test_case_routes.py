@@ -2,9 +2,10 @@
 
 from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.modules.test_specs.schemas import (
+    AutomationReportJobResponse,
     AutomationTestCaseReportResponse,
     AutomationTestCaseResponse,
     CreateAutomationTestCaseRequest,
@@ -14,6 +15,7 @@ from app.modules.test_specs.schemas import (
 from app.modules.test_specs.service import AutomationTestCaseService
 from app.shared.api.schemas.base import APIResponse
 from app.shared.auth import require_permission
+from app.shared.service import CREATED_AT_DESC, CURSOR_HEADER, InvalidCursorError
 
 router = APIRouter(prefix="/automation-test-cases", tags=["AutomationTestCases"])
 
@@ -56,7 +58,7 @@ async def report_automation_test_case_metadata(
     request: ReportAutomationCaseMetadataRequest,
     service: AutomationTestCaseServiceDep,
 ):
-    """免 RBAC 接收测试框架批量上报的用例配置，并逐条落库。"""
+    """免 RBAC 接收测试框架批量上报的用例配置，批量对账后落库。"""
     try:
         data = await service.report_automation_test_case_metadata(request.model_dump())
         return APIResponse(data=data)
@@ -64,6 +66,41 @@ async def report_automation_test_case_metadata(
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+@router.post(
+    "/report/jobs",
+    response_model=APIResponse[AutomationReportJobResponse],
+    status_code=202,
+    summary="异步上报自动化测试用例配置元数据",
+)
+async def submit_automation_report_job(
+    request: ReportAutomationCaseMetadataRequest,
+    service: AutomationTestCaseServiceDep,
+):
+    """免 RBAC 接收大批量上报，后台对账并立即返回任务句柄。"""
+    try:
+        data = await service.submit_report_job(request.model_dump())
+        return APIResponse(data=data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get(
+    "/report/jobs/{report_id}",
+    response_model=APIResponse[AutomationReportJobResponse],
+    summary="查询异步上报任务状态",
+)
+async def get_automation_report_job(
+    report_id: str,
+    service: AutomationTestCaseServiceDep,
+):
+    """按任务句柄查询异步上报的处理状态与结果汇总。"""
+    try:
+        data = await service.get_report_job(report_id)
+        return APIResponse(data=data)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="automation report job not found")
+
+
 @router.get(
     "",
     response_model=APIResponse[List[AutomationTestCaseResponse]],
@@ -72,6 +109,7 @@ async def report_automation_test_case_metadata(
 )
 async def list_automation_test_cases(
     service: AutomationTestCaseServiceDep,
+    response: Response,
     framework: Optional[str] = Query(None),
     automation_type: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
@@ -81,19 +119,27 @@ async def list_automation_test_cases(
     linkable_for_case_id: Optional[str] = Query(None, description="只返回未关联或已关联到该手工用例的自动化用例"),
     limit: int = Query(20, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
     """分页查询自动化测试用例列表。"""
-    data = await service.list_automation_test_cases(
-        framework=framework,
-        automation_type=automation_type,
-        status=status,
-        maintainer_id=maintainer_id,
-        linked_manual_case_id=linked_manual_case_id,
-        q=q,
-        linkable_for_case_id=linkable_for_case_id,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        data = await service.list_automation_test_cases(
+            framework=framework,
+            automation_type=automation_type,
+            status=status,
+            maintainer_id=maintainer_id,
+            linked_manual_case_id=linked_manual_case_id,
+            q=q,
+            linkable_for_case_id=linkable_for_case_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = CREATED_AT_DESC.next_cursor(data, limit)
+    if next_cursor:
+        response.headers[CURSOR_HEADER] = next_cursor
     return APIResponse(data=data)
 
 
@@ -1,5 +1,5 @@
 """测试用例评论 API 路由"""
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
@@ -12,6 +12,7 @@ from app.modules.test_specs.schemas.comment import (
 from app.modules.test_specs.service.comment_service import TestCaseCommentService
 from app.shared.api.schemas.base import APIResponse
 from app.shared.auth import get_current_user, require_permission
+from app.shared.service import CREATED_AT_DESC, InvalidCursorError
 
 router = APIRouter(prefix="/test-cases/{case_id}/comments", tags=["TestCases"])
 
@@ -34,10 +35,18 @@ async def list_comments(
     comment_service: CommentServiceDep,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入后忽略 offset"),
 ):
-    docs, total = await comment_service.list_comments(case_id, limit=limit, offset=offset)
+    try:
+        docs, total = await comment_service.list_comments(case_id, limit=limit, offset=offset, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     items = [CommentResponse(comment_id=str(doc.id), **doc.model_dump(exclude={'id'})) for doc in docs]
-    return APIResponse(data=CommentListResponse(items=items, total=total))
+    return APIResponse(data=CommentListResponse(
+        items=items,
+        total=total,
+        next_cursor=CREATED_AT_DESC.next_cursor(docs, limit),
+    ))
 
 
 @router.post(
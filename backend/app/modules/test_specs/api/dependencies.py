@@ -12,7 +12,13 @@ from app.modules.test_specs.application import (
     TestSpecsWorkflowProjectionHook,
     WorkflowServicesAdapter,
 )
-from app.modules.test_specs.service import CatalogService, LabService, RequirementService, TestCaseService
+from app.modules.test_specs.service import (
+    CatalogService,
+    LabService,
+    RequirementService,
+    SpecImportService,
+    TestCaseService,
+)
 from app.modules.workflow.application import (
     OperationContext,
     WorkflowCommandService,
@@ -66,6 +72,17 @@ def get_test_case_service(
 TestCaseServiceDep = Annotated[TestCaseService, Depends(get_test_case_service)]
 
 
+def get_import_service(
+    workflow_mutation_service: WorkflowMutationServiceDep,
+) -> SpecImportService:
+    return SpecImportService(
+        workflow_gateway=WorkflowServicesAdapter(mutation_service=workflow_mutation_service),
+    )
+
+
+SpecImportServiceDep = Annotated[SpecImportService, Depends(get_import_service)]
+
+
 def get_lab_service() -> LabService:
     return LabService()
 
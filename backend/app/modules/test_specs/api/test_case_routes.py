@@ -1,16 +1,19 @@
 """测试用例 API 路由"""
 import json
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.modules.test_specs.api.dependencies import (
+    SpecImportServiceDep,
     TestCaseCommandServiceDep,
     TestCaseQueryServiceDep,
     TestCaseServiceDep,
     build_operation_context,
 )
 from app.modules.test_specs.application import (
+    BatchCreateTestCasesCommand,
     CreateTestCaseCommand,
     DeleteTestCaseCommand,
     LinkAutomationCaseCommand,
@@ -18,8 +21,12 @@ from app.modules.test_specs.application import (
 )
 from app.modules.test_specs.domain.exceptions import TestCaseNotFoundError
 from app.modules.test_specs.schemas import (
+    BatchCreateTestCasesRequest,
+    BatchCreateTestCasesResponse,
     BatchUpdateCasesRequest,
+    CreateImportJobRequest,
     CreateTestCaseRequest,
+    ImportJobResponse,
     LinkAutomationCaseRequest,
     TestCaseChangeLogListResponse,
     TestCaseResponse,
@@ -27,9 +34,46 @@ from app.modules.test_specs.schemas import (
 )
 from app.shared.api.schemas.base import APIResponse
 from app.shared.auth import get_current_user, require_permission
+from app.shared.export import ExportColumn, ExportFormat, build_export_response
+from app.shared.service import CREATED_AT_DESC, CURSOR_HEADER, InvalidCursorError
 
 router = APIRouter(prefix="/test-cases", tags=["TestCases"])
 
+TEST_CASE_EXPORT_COLUMNS = (
+    ExportColumn("case_id", "用例编号"),
+    ExportColumn("title", "用例名称"),
+    ExportColumn("status", "状态"),
+    ExportColumn("priority", "优先级"),
+    ExportColumn("lab_id", "Lab"),
+    ExportColumn("catalog_path_key", "目录"),
+    ExportColumn("ref_req_id", "关联需求"),
+    ExportColumn("owner_name", "责任人"),
+    ExportColumn("reviewer_name", "评审人"),
+    ExportColumn("auto_dev_name", "自动化开发"),
+    ExportColumn("current_owner_name", "当前处理人"),
+    ExportColumn("test_category", "测试分类"),
+    ExportColumn("risk_level", "风险等级"),
+    ExportColumn("tags", "标签"),
+    ExportColumn("is_active", "是否有效"),
+    ExportColumn("linked_auto_case_id", "关联自动化用例"),
+    ExportColumn("estimated_duration_sec", "预估耗时(秒)"),
+    ExportColumn("created_at", "创建时间"),
+    ExportColumn("updated_at", "更新时间"),
+)
+
+
+def _parse_json_list(value: Optional[str], name: str) -> Optional[list[str]]:
+    """解析 JSON 数组格式的查询参数，格式错误时返回 400。"""
+    if not value:
+        return None
+    try:
+        parsed = json.loads(value)
+        if not isinstance(parsed, list):
+            raise ValueError(f"{name} 必须是 JSON 数组")
+    except (json.JSONDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return parsed
+
 
 @router.get(
     "/governance-stats",
@@ -91,6 +135,33 @@ async def create_test_case(
         raise HTTPException(status_code=404, detail="requirement not found")
 
 
+@router.post(
+    "/batch",
+    response_model=APIResponse[BatchCreateTestCasesResponse],
+    summary="批量创建测试用例",
+    dependencies=[Depends(require_permission("test_cases:write"))],
+)
+async def batch_create_test_cases(
+    request: BatchCreateTestCasesRequest,
+    command_service: TestCaseCommandServiceDep,
+    current_user=Depends(get_current_user),
+):
+    """逐行返回创建结果；某一行失败不影响其他行（同一事务块整体失败时该块各行均记为失败）。"""
+    results = await command_service.create_test_cases(
+        build_operation_context(current_user),
+        BatchCreateTestCasesCommand(items=[item.model_dump() for item in request.items]),
+    )
+    succeeded = sum(1 for item in results if item["success"])
+    return APIResponse(
+        data=BatchCreateTestCasesResponse(
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=results,
+        )
+    )
+
+
 @router.get(
     "/governance",
     response_model=APIResponse[dict],
@@ -125,14 +196,116 @@ async def list_test_case_change_logs(
     command_service: TestCaseCommandServiceDep,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入后忽略 offset"),
 ):
     try:
-        data = await command_service.list_change_logs(case_id, limit=limit, offset=offset)
+        data = await command_service.list_change_logs(case_id, limit=limit, offset=offset, cursor=cursor)
         return APIResponse(data=data)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     except KeyError:
         raise HTTPException(status_code=404, detail="test case not found")
 
 
+@router.get(
+    "/export",
+    summary="流式导出测试用例",
+    dependencies=[Depends(require_permission("test_cases:read"))],
+)
+async def export_test_cases(
+    query_service: TestCaseQueryServiceDep,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    ref_req_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    owner_id: Optional[str] = Query(None),
+    reviewer_id: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    lab_id: Optional[str] = Query(None),
+    catalog_prefix: Optional[str] = Query(None, description="JSON 数组，目录前缀"),
+    tags: Optional[str] = Query(None, description="JSON 数组，包含指定 Tag"),
+    missing_fields: Optional[str] = Query(None, description="逗号分隔，如 lab_id,catalog_path,tags,auto_link"),
+):
+    """按列表相同的过滤条件导出全部用例（csv / ndjson / xlsx），不分页。"""
+    chunks = query_service.export_test_cases(
+        [column.key for column in TEST_CASE_EXPORT_COLUMNS],
+        ref_req_id=ref_req_id,
+        status=status,
+        owner_id=owner_id,
+        reviewer_id=reviewer_id,
+        priority=priority,
+        is_active=is_active,
+        lab_id=lab_id,
+        catalog_prefix=_parse_json_list(catalog_prefix, "catalog_prefix"),
+        tags=_parse_json_list(tags, "tags"),
+        missing_fields=missing_fields,
+    )
+    return build_export_response(
+        export_format,
+        TEST_CASE_EXPORT_COLUMNS,
+        chunks,
+        filename=f"test-cases-{datetime.now():%Y%m%d%H%M%S}",
+    )
+
+
+@router.post(
+    "/import/jobs",
+    response_model=APIResponse[ImportJobResponse],
+    status_code=202,
+    summary="提交测试用例批量导入任务",
+    dependencies=[Depends(require_permission("test_cases:write"))],
+)
+async def submit_test_case_import_job(
+    request: CreateImportJobRequest,
+    service: SpecImportServiceDep,
+    current_user=Depends(get_current_user),
+):
+    """按已上传的 csv / ndjson / xlsx 文件分块导入用例，立即返回任务句柄。"""
+    try:
+        data = await service.submit_import_job(
+            "test_case",
+            request.file_id,
+            str(current_user["user_id"]),
+            defaults=request.defaults,
+        )
+        return APIResponse(data=data)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import file not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get(
+    "/import/jobs/{job_id}",
+    response_model=APIResponse[ImportJobResponse],
+    summary="查询测试用例批量导入任务",
+    dependencies=[Depends(require_permission("test_cases:read"))],
+)
+async def get_test_case_import_job(job_id: str, service: SpecImportServiceDep):
+    """返回导入进度、成功/失败条数与行级错误。"""
+    try:
+        return APIResponse(data=await service.get_import_job(job_id, "test_case"))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import job not found")
+
+
+@router.post(
+    "/import/jobs/{job_id}/resume",
+    response_model=APIResponse[ImportJobResponse],
+    status_code=202,
+    summary="续传测试用例批量导入任务",
+    dependencies=[Depends(require_permission("test_cases:write"))],
+)
+async def resume_test_case_import_job(job_id: str, service: SpecImportServiceDep):
+    """从已提交的行继续执行失败或中断的导入任务。"""
+    try:
+        return APIResponse(data=await service.resume_import_job(job_id, "test_case"))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import job not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
 @router.get(
     "/{case_id}",
     response_model=APIResponse[TestCaseResponse],
@@ -158,6 +331,7 @@ async def get_test_case(
 )
 async def list_test_cases(
     query_service: TestCaseQueryServiceDep,
+    response: Response,
     ref_req_id: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     owner_id: Optional[str] = Query(None),
@@ -170,39 +344,29 @@ async def list_test_cases(
     missing_fields: Optional[str] = Query(None, description="逗号分隔，如 lab_id,catalog_path,tags,auto_link"),
     limit: int = Query(20, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
-    parsed_prefix: Optional[list[str]] = None
-    if catalog_prefix:
-        try:
-            parsed_prefix = json.loads(catalog_prefix)
-            if not isinstance(parsed_prefix, list):
-                raise ValueError("catalog_prefix 必须是 JSON 数组")
-        except (json.JSONDecodeError, ValueError) as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
-
-    parsed_tags: Optional[list[str]] = None
-    if tags:
-        try:
-            parsed_tags = json.loads(tags)
-            if not isinstance(parsed_tags, list):
-                raise ValueError("tags 必须是 JSON 数组")
-        except (json.JSONDecodeError, ValueError) as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
-
-    data = await query_service.list_test_cases(
-        ref_req_id=ref_req_id,
-        status=status,
-        owner_id=owner_id,
-        reviewer_id=reviewer_id,
-        priority=priority,
-        is_active=is_active,
-        lab_id=lab_id,
-        catalog_prefix=parsed_prefix,
-        tags=parsed_tags,
-        missing_fields=missing_fields,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        data = await query_service.list_test_cases(
+            ref_req_id=ref_req_id,
+            status=status,
+            owner_id=owner_id,
+            reviewer_id=reviewer_id,
+            priority=priority,
+            is_active=is_active,
+            lab_id=lab_id,
+            catalog_prefix=_parse_json_list(catalog_prefix, "catalog_prefix"),
+            tags=_parse_json_list(tags, "tags"),
+            missing_fields=missing_fields,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = CREATED_AT_DESC.next_cursor(data, limit)
+    if next_cursor:
+        response.headers[CURSOR_HEADER] = next_cursor
     return APIResponse(data=data)
 
 
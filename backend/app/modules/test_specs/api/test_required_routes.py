@@ -1,11 +1,13 @@
 """测试需求 API 路由"""
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.modules.test_specs.api.dependencies import (
     RequirementCommandServiceDep,
     RequirementQueryServiceDep,
+    SpecImportServiceDep,
     build_operation_context,
 )
 from app.modules.test_specs.application import (
@@ -14,17 +16,41 @@ from app.modules.test_specs.application import (
     UpdateRequirementCommand,
 )
 from app.modules.test_specs.domain.exceptions import RequirementNotFoundError
+from app.modules.test_specs.domain.policies import can_create_requirement
 from app.modules.test_specs.schemas import (
+    CreateImportJobRequest,
     CreateRequirementRequest,
+    ImportJobResponse,
     RequirementResponse,
     UpdateRequirementRequest,
 )
 from app.modules.workflow.domain.exceptions import PermissionDeniedError
 from app.shared.api.schemas.base import APIResponse
 from app.shared.auth import get_current_user, require_permission
+from app.shared.export import ExportColumn, ExportFormat, build_export_response
+from app.shared.service import CREATED_AT_DESC, CURSOR_HEADER, InvalidCursorError
 
 router = APIRouter(prefix="/requirements", tags=["Requirements"])
 
+REQUIREMENT_EXPORT_COLUMNS = (
+    ExportColumn("req_id", "需求编号"),
+    ExportColumn("title", "需求简述"),
+    ExportColumn("status", "状态"),
+    ExportColumn("priority", "优先级"),
+    ExportColumn("category", "需求分类"),
+    ExportColumn("source", "需求来源"),
+    ExportColumn("tpm_owner_name", "TPM负责人"),
+    ExportColumn("manual_dev_name", "手工用例开发"),
+    ExportColumn("auto_dev_name", "自动化开发"),
+    ExportColumn("current_owner_name", "当前处理人"),
+    ExportColumn("target_version", "目标版本"),
+    ExportColumn("planned_start_date", "计划开始日期"),
+    ExportColumn("planned_end_date", "计划结束日期"),
+    ExportColumn("case_count", "用例数"),
+    ExportColumn("tags", "标签"),
+    ExportColumn("created_at", "创建时间"),
+)
+
 
 @router.post(
     "",
@@ -50,6 +76,96 @@ async def create_requirement(
         raise HTTPException(status_code=403, detail=str(e))
 
 
+@router.get(
+    "/export",
+    summary="流式导出测试需求",
+    dependencies=[Depends(require_permission("requirements:read"))],
+)
+async def export_requirements(
+    query_service: RequirementQueryServiceDep,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    status: Optional[str] = Query(None),
+    tpm_owner_id: Optional[str] = Query(None),
+    manual_dev_id: Optional[str] = Query(None),
+    auto_dev_id: Optional[str] = Query(None),
+):
+    """按列表相同的过滤条件导出全部需求（csv / ndjson / xlsx），不分页。"""
+    chunks = query_service.export_requirements(
+        [column.key for column in REQUIREMENT_EXPORT_COLUMNS],
+        status=status,
+        tpm_owner_id=tpm_owner_id,
+        manual_dev_id=manual_dev_id,
+        auto_dev_id=auto_dev_id,
+    )
+    return build_export_response(
+        export_format,
+        REQUIREMENT_EXPORT_COLUMNS,
+        chunks,
+        filename=f"requirements-{datetime.now():%Y%m%d%H%M%S}",
+    )
+
+
+@router.post(
+    "/import/jobs",
+    response_model=APIResponse[ImportJobResponse],
+    status_code=202,
+    summary="提交测试需求批量导入任务",
+    dependencies=[Depends(require_permission("requirements:write"))],
+)
+async def submit_requirement_import_job(
+    request: CreateImportJobRequest,
+    service: SpecImportServiceDep,
+    current_user=Depends(get_current_user),
+):
+    """按已上传的 csv / ndjson / xlsx 文件分块导入需求，立即返回任务句柄。"""
+    context = build_operation_context(current_user)
+    if not can_create_requirement({"actor_id": context.actor_id, "role_ids": context.role_ids}):
+        raise HTTPException(status_code=403, detail="permission denied: create requirement")
+    try:
+        data = await service.submit_import_job(
+            "requirement",
+            request.file_id,
+            context.actor_id,
+            defaults=request.defaults,
+        )
+        return APIResponse(data=data)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import file not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get(
+    "/import/jobs/{job_id}",
+    response_model=APIResponse[ImportJobResponse],
+    summary="查询测试需求批量导入任务",
+    dependencies=[Depends(require_permission("requirements:read"))],
+)
+async def get_requirement_import_job(job_id: str, service: SpecImportServiceDep):
+    """返回导入进度、成功/失败条数与行级错误。"""
+    try:
+        return APIResponse(data=await service.get_import_job(job_id, "requirement"))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import job not found")
+
+
+@router.post(
+    "/import/jobs/{job_id}/resume",
+    response_model=APIResponse[ImportJobResponse],
+    status_code=202,
+    summary="续传测试需求批量导入任务",
+    dependencies=[Depends(require_permission("requirements:write"))],
+)
+async def resume_requirement_import_job(job_id: str, service: SpecImportServiceDep):
+    """从已提交的行继续执行失败或中断的导入任务。"""
+    try:
+        return APIResponse(data=await service.resume_import_job(job_id, "requirement"))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="import job not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
 @router.get(
     "/{req_id}",
     response_model=APIResponse[RequirementResponse],
@@ -75,21 +191,30 @@ async def get_requirement(
 )
 async def list_requirements(
     query_service: RequirementQueryServiceDep,
+    response: Response,
     status: Optional[str] = Query(None),
     tpm_owner_id: Optional[str] = Query(None),
     manual_dev_id: Optional[str] = Query(None),
     auto_dev_id: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
-    data = await query_service.list_requirements(
-        status=status,
-        tpm_owner_id=tpm_owner_id,
-        manual_dev_id=manual_dev_id,
-        auto_dev_id=auto_dev_id,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        data = await query_service.list_requirements(
+            status=status,
+            tpm_owner_id=tpm_owner_id,
+            manual_dev_id=manual_dev_id,
+            auto_dev_id=auto_dev_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = CREATED_AT_DESC.next_cursor(data, limit)
+    if next_cursor:
+        response.headers[CURSOR_HEADER] = next_cursor
     return APIResponse(data=data)
 
 
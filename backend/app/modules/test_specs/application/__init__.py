@@ -3,6 +3,7 @@
 from .commands import (
     AssignRequirementOwnersCommand,
     AssignTestCaseOwnersCommand,
+    BatchCreateTestCasesCommand,
     CreateRequirementCommand,
     CreateTestCaseCommand,
     DeleteRequirementCommand,
@@ -21,6 +22,7 @@ from .workflow_projection_hook import TestSpecsWorkflowProjectionHook
 __all__ = [
     "AssignRequirementOwnersCommand",
     "AssignTestCaseOwnersCommand",
+    "BatchCreateTestCasesCommand",
     "CreateRequirementCommand",
     "CreateTestCaseCommand",
     "DeleteRequirementCommand",
@@ -0,0 +1,206 @@
+"""
+测试用例语义检索
+
+AI 推荐/生成用例前的检索阶段：用 `TestCaseDoc.embedding` 为查询文本挑出最相关的 top-k 用例，
+只投影 prompt 需要的字段，并按 token 预算截断，避免 prompt 随用例库规模线性增长。
+
+- 第一次查询只投影 `case_id + embedding`，按游标每 `SCORING_BATCH_SIZE` 条一批读取全部候选，
+  余弦相似度在线程池中逐批计算（安装了 numpy 时整批矩阵运算），不阻塞事件循环；
+  跨批次只用最小堆保留当前 top-k，内存只与批大小和 top-k 有关，候选不做截断；
+- 第二次查询只为 top-k 用例投影标题、优先级等 prompt 字段；
+- 查询向量生成失败或用例都没有向量时，回落为按库内顺序取前 top-k 条。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from app.modules.test_specs.repository.models import TestCaseDoc
+from app.shared.ai.embedding import EmbeddingService
+from app.shared.ai.token_budget import take_within_budget
+from app.shared.core.logger import log
+from app.shared.export import iter_cursor_chunks
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy 未安装时退回纯 Python 计算
+    np = None
+
+DEFAULT_TOP_K = 50
+DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+# 打分阶段每批从游标读取的候选数，决定检索时向量的常驻内存上限
+SCORING_BATCH_SIZE = 1000
+_VECTOR_PROJECTION = {"case_id": 1, "embedding": 1, "_id": 0}
+
+
+class _CasePromptView(BaseModel):
+    """prompt 阶段投影：只取模型需要看到的字段。"""
+    case_id: str
+    title: str = ""
+    priority: Optional[str] = None
+    test_category: Optional[str] = None
+    tags: list[str] = Field(default_factory=list)
+
+
+@dataclass
+class CaseRetrievalResult:
+    """检索结果：按相关度排序、已截断到 token 预算内的 prompt 条目。"""
+
+    cases: list[dict[str, Any]]
+    candidate_count: int
+    strategy: str
+    prompt_tokens: int
+
+
+def cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
+    dot = sum(a * b for a, b in zip(left, right))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return dot / norm if norm else 0.0
+
+
+def _similarity_scores(query_vector: Sequence[float], embeddings: list[Sequence[float]]) -> list[float]:
+    """批量计算余弦相似度：有 numpy 时整批矩阵运算，否则逐条计算。"""
+    if np is None:
+        return [cosine_similarity(query_vector, embedding) for embedding in embeddings]
+    matrix = np.asarray(embeddings, dtype=np.float64)
+    query = np.asarray(query_vector, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    dots = matrix @ query
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0).tolist()
+
+
+def _prompt_item(view: Any) -> dict[str, Any]:
+    return {
+        "case_id": view.case_id,
+        "title": view.title,
+        "priority": view.priority or "P2",
+        "test_category": view.test_category or "",
+        "tags": view.tags or [],
+    }
+
+
+def _render_item(item: dict[str, Any]) -> str:
+    return json.dumps(item, ensure_ascii=False)
+
+
+async def _embed_query(query_text: str) -> list[float] | None:
+    if not query_text.strip():
+        return None
+    try:
+        return await EmbeddingService.embed_text(query_text)
+    except Exception as e:
+        log.warning("case retrieval: 查询向量生成失败，回落到非语义候选: {}", e)
+        return None
+
+
+class _CaseRanker:
+    """跨批次增量排序：堆里只保留当前 top-k 语义命中，内存与候选总量无关。"""
+
+    def __init__(self, query_vector: Sequence[float] | None, top_k: int) -> None:
+        self._query = list(query_vector) if query_vector else None
+        self._top_k = top_k
+        # (score, -index, case_id) 最小堆：同分时先出现的用例优先保留
+        self._heap: list[tuple[float, int, str]] = []
+        self._unembedded: list[str] = []
+        self._leading: list[str] = []
+        self.candidate_count = 0
+
+    def add(self, rows: Sequence[tuple[str, Sequence[float] | None]]) -> None:
+        start = self.candidate_count
+        self.candidate_count += len(rows)
+        top_k = self._top_k
+        if top_k <= 0:
+            return
+        if len(self._leading) < top_k:
+            self._leading.extend(case_id for case_id, _embedding in rows[: top_k - len(self._leading)])
+        if not self._query:
+            return
+        dim = len(self._query)
+        comparable: list[tuple[int, str, Sequence[float]]] = []
+        for offset, (case_id, embedding) in enumerate(rows):
+            if embedding and len(embedding) == dim:
+                comparable.append((start + offset, case_id, embedding))
+            elif not embedding and len(self._unembedded) < top_k:
+                self._unembedded.append(case_id)
+        if not comparable:
+            return
+        scores = _similarity_scores(self._query, [embedding for _i, _c, embedding in comparable])
+        for score, (index, case_id, _embedding) in zip(scores, comparable):
+            entry = (score, -index, case_id)
+            if len(self._heap) < top_k:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def result(self) -> tuple[list[str], str]:
+        if self._heap:
+            ranked = [case_id for _score, _index, case_id in sorted(self._heap, reverse=True)]
+            if len(ranked) < self._top_k:
+                # 尚未生成向量的新用例排在语义命中之后，避免被完全排除
+                ranked.extend(self._unembedded)
+            return ranked[: self._top_k], "semantic"
+        return list(self._leading), "fallback"
+
+
+def rank_case_ids(
+    query_vector: Sequence[float] | None,
+    vectors: Sequence[Any],
+    top_k: int,
+) -> tuple[list[str], str]:
+    """按与查询向量的余弦相似度排序；没有可比较的向量时保持原顺序。"""
+    ranker = _CaseRanker(query_vector, top_k)
+    ranker.add([(view.case_id, view.embedding) for view in vectors])
+    return ranker.result()
+
+
+async def retrieve_relevant_cases(
+    query_text: str,
+    *,
+    query_vector: Sequence[float] | None = None,
+    case_ids: Sequence[str] | None = None,
+    top_k: int = DEFAULT_TOP_K,
+    token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+) -> CaseRetrievalResult:
+    """为查询挑选最相关的用例，返回可直接序列化进 prompt 的条目。"""
+    base_query: dict[str, Any] = {"is_deleted": False}
+    if case_ids:
+        base_query["case_id"] = {"$in": list(case_ids)}
+
+    vector = query_vector or await _embed_query(query_text)
+    ranker = _CaseRanker(vector, top_k)
+    async for rows in iter_cursor_chunks(
+        TestCaseDoc.get_pymongo_collection(),
+        base_query,
+        projection=_VECTOR_PROJECTION,
+        sort=[("created_at", -1)],
+        chunk_size=SCORING_BATCH_SIZE,
+    ):
+        batch = [(row["case_id"], row.get("embedding")) for row in rows]
+        # 打分是 CPU 密集计算，放到线程池避免阻塞事件循环
+        await asyncio.to_thread(ranker.add, batch)
+    ranked_ids, strategy = ranker.result()
+    candidate_count = ranker.candidate_count
+    if not ranked_ids:
+        return CaseRetrievalResult(
+            cases=[], candidate_count=candidate_count, strategy=strategy, prompt_tokens=0,
+        )
+
+    views = await TestCaseDoc.find(
+        {"case_id": {"$in": ranked_ids}, "is_deleted": False},
+    ).project(_CasePromptView).to_list()
+    by_id = {view.case_id: view for view in views}
+    ordered = [_prompt_item(by_id[case_id]) for case_id in ranked_ids if case_id in by_id]
+    kept, used = take_within_budget(ordered, token_budget, _render_item)
+    return CaseRetrievalResult(
+        cases=kept,
+        candidate_count=candidate_count,
+        strategy=strategy,
+        prompt_tokens=used,
+    )
@@ -1,7 +1,7 @@
 """测试规范应用层命令对象。"""
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -79,6 +79,12 @@ class CreateTestCaseCommand:
     payload: Dict[str, Any]
 
 
+@dataclass
+class BatchCreateTestCasesCommand:
+    """批量创建测试用例命令。"""
+    items: List[Dict[str, Any]]
+
+
 @dataclass
 class UpdateTestCaseCommand:
     """更新测试用例命令。"""
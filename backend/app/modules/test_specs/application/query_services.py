@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
 from app.modules.test_specs.service import RequirementService, TestCaseService
 
@@ -24,6 +24,7 @@ class RequirementQueryService:
         auto_dev_id: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> list[dict]:
         return await self._requirement_service.list_requirements(
             status=status,
@@ -32,8 +33,12 @@ class RequirementQueryService:
             auto_dev_id=auto_dev_id,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
+    def export_requirements(self, fields: list[str], **filters: Any) -> AsyncIterator[list[dict]]:
+        return self._requirement_service.export_requirements(fields, **filters)
+
 
 class TestCaseQueryService:
     """Test case read-side queries."""
@@ -58,6 +63,7 @@ class TestCaseQueryService:
         missing_fields: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> list[dict]:
         return await self._test_case_service.list_test_cases(
             ref_req_id=ref_req_id,
@@ -72,6 +78,7 @@ class TestCaseQueryService:
             missing_fields=missing_fields,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
     async def list_governance_cases(
@@ -87,3 +94,6 @@ class TestCaseQueryService:
             limit=limit,
             offset=offset,
         )
+
+    def export_test_cases(self, fields: list[str], **filters: Any) -> AsyncIterator[list[dict]]:
+        return self._test_case_service.export_test_cases(fields, **filters)
@@ -7,6 +7,7 @@ from app.modules.test_specs.application._workflow_command_support import (
 )
 from app.modules.test_specs.application.commands import (
     AssignTestCaseOwnersCommand,
+    BatchCreateTestCasesCommand,
     LinkAutomationCaseCommand,
     MoveTestCaseToRequirementCommand,
     CreateTestCaseCommand,
@@ -86,6 +87,20 @@ class TestCaseCommandService:
         )
         return result
 
+    async def create_test_cases(
+        self,
+        context: OperationContext,
+        command: BatchCreateTestCasesCommand,
+    ) -> list[dict]:
+        """批量创建；CREATE 变更记录随用例在同一事务内写入。"""
+        items = []
+        for item in command.items:
+            payload = deepcopy(item)
+            if not str(payload.get("owner_id") or "").strip():
+                payload["owner_id"] = context.actor_id
+            items.append(payload)
+        return await self._test_case_service.create_test_cases(items, operator_id=context.actor_id)
+
     async def update_test_case(
         self,
         context: OperationContext,
@@ -269,6 +284,7 @@ class TestCaseCommandService:
         case_id: str,
         limit: int = 20,
         offset: int = 0,
+        cursor: str | None = None,
     ) -> dict:
         await self._test_case_service.get_test_case(case_id)
-        return await self._change_log_service.list_logs(case_id, limit=limit, offset=offset)
+        return await self._change_log_service.list_logs(case_id, limit=limit, offset=offset, cursor=cursor)
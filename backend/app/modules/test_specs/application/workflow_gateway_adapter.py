@@ -41,6 +41,13 @@ class WorkflowServicesAdapter(WorkflowItemGateway, WorkflowStatusQueryPort):
             session=session,
         )
 
+    async def create_work_items(
+        self,
+        items: list[dict[str, object]],
+        session: AsyncClientSession | None = None,
+    ) -> list[str | None]:
+        return await self._mutation_service.create_items(items, session=session)
+
     async def get_work_item_by_id(self, item_id: str) -> dict[str, object] | None:
         if self._query_service is None:
             raise RuntimeError("query_service is required to load work items")
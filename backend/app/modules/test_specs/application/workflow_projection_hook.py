@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
 from app.modules.test_specs.repository.models import TestCaseDoc, TestRequirementDoc
 
 
@@ -49,6 +51,10 @@ class TestSpecsWorkflowProjectionHook:
 
         projection_doc.is_deleted = True
         await projection_doc.save()
+        if type_code == "REQUIREMENT":
+            schedule_search_refresh(SearchEntityType.REQUIREMENT.value, [projection_doc.req_id])
+        else:
+            schedule_search_refresh(SearchEntityType.TEST_CASE.value, [projection_doc.case_id])
 
     @staticmethod
     async def _find_projection_doc(work_item_id: str, type_code: str) -> Any | None:
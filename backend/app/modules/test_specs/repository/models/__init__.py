@@ -13,6 +13,8 @@ from .automation_test_case import (
     ReportMetaModel,
     ScriptRefModel,
 )
+from .automation_report_job import AutomationReportJobDoc
+from .import_job import TestSpecImportJobDoc
 
 __all__ = [
     "TestRequirementDoc",
@@ -29,6 +31,8 @@ __all__ = [
     "CodeSnapshotModel",
     "ReportMetaModel",
     "ConfigFieldModel",
+    "AutomationReportJobDoc",
+    "TestSpecImportJobDoc",
     "DOCUMENT_MODELS",
 ]
 
@@ -40,6 +44,8 @@ DOCUMENT_MODELS = [
     TestCaseChangeLogDoc,
     TestCaseCommentDoc,
     AutomationTestCaseDoc,
+    AutomationReportJobDoc,
+    TestSpecImportJobDoc,
 ]
 
 from app.shared.infrastructure.document_registry import register_document_model
@@ -0,0 +1,32 @@
+"""
+需求与用例定义层 - 自动化元数据异步上报任务模型
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+from pydantic import Field
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+
+from app.shared.core.document_mixins import TimestampedDocumentMixin
+
+
+class AutomationReportJobDoc(Document, TimestampedDocumentMixin):
+    """自动化测试框架异步上报任务，记录批量对账的进度与结果。"""
+    __test__ = False
+
+    report_id: str = Field(..., description="上报任务句柄")
+    status: str = Field(default="PENDING", description="任务状态（PENDING/RUNNING/SUCCEEDED/FAILED）")
+    total_cases: int = Field(default=0, description="请求中 case 总数")
+    result: Optional[Dict[str, Any]] = Field(None, description="对账结果（不含逐条明细）")
+    error: Optional[str] = Field(None, description="失败原因")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理结束时间")
+
+    class Settings:
+        name = "automation_report_jobs"
+        indexes = [
+            IndexModel([("report_id", ASCENDING)], unique=True),
+            IndexModel("status"),
+            IndexModel("created_at"),
+        ]
@@ -74,6 +74,7 @@ class AutomationTestCaseDoc(Document, TimestampedDocumentMixin, SoftDeleteDocume
     param_spec: List[ConfigFieldModel] = Field(default_factory=list, description="参数定义")
     tags: List[str] = Field(default_factory=list, description="标签")
     report_meta: ReportMetaModel = Field(default_factory=ReportMetaModel, description="精简后的上报补充信息")
+    report_fingerprint: Optional[str] = Field(None, description="最近一次上报的内容指纹（commit_id + param_spec）")
 
     class Settings:
         name = "automation_test_cases"
@@ -91,6 +92,8 @@ class AutomationTestCaseDoc(Document, TimestampedDocumentMixin, SoftDeleteDocume
             IndexModel([("auto_case_id", ASCENDING), ("updated_at", DESCENDING)]),
             IndexModel("created_at"),
             IndexModel([("tags", ASCENDING), ("created_at", DESCENDING)]),
+            # keyset 分页：未删除数据按 (created_at, _id) 倒序翻页
+            IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
 
@@ -0,0 +1,39 @@
+"""
+需求与用例定义层 - 批量导入任务模型
+"""
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+
+from pydantic import Field
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+
+from app.shared.core.document_mixins import TimestampedDocumentMixin
+
+
+class TestSpecImportJobDoc(Document, TimestampedDocumentMixin):
+    """用例/需求批量导入任务，记录续传位置、进度与行级错误。"""
+    __test__ = False
+
+    job_id: str = Field(..., description="导入任务句柄")
+    entity_type: str = Field(..., description="导入对象（test_case/requirement）")
+    file_id: str = Field(..., description="导入文件附件 ID")
+    file_format: str = Field(..., description="文件格式（csv/ndjson/xlsx）")
+    defaults: Dict[str, Any] = Field(default_factory=dict, description="文件中未填写时使用的默认字段")
+    created_by: str = Field(..., description="提交人")
+    status: str = Field(default="PENDING", description="任务状态（PENDING/RUNNING/SUCCEEDED/FAILED）")
+    processed_rows: int = Field(default=0, description="已提交的数据行数（续传位置）")
+    created_count: int = Field(default=0, description="成功创建条数")
+    failed_count: int = Field(default=0, description="失败行数")
+    errors: List[Dict[str, Any]] = Field(default_factory=list, description="行级错误（row/message，最多保留前若干条）")
+    error: Optional[str] = Field(None, description="任务级失败原因")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理结束时间")
+
+    class Settings:
+        name = "test_spec_import_jobs"
+        indexes = [
+            IndexModel([("job_id", ASCENDING)], unique=True),
+            IndexModel("status"),
+            IndexModel("created_at"),
+        ]
@@ -72,6 +72,8 @@ class TestRequirementDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentM
             IndexModel([("tpm_owner_id", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel([("workflow_item_id", ASCENDING), ("is_deleted", ASCENDING)]),
             IndexModel([("category", ASCENDING), ("priority", ASCENDING)]),
+            # keyset 分页：未删除数据按 (created_at, _id) 倒序翻页
+            IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
 
@@ -95,6 +95,8 @@ class TestCaseDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMixin, P
             IndexModel([("linked_auto_case_id", ASCENDING)], sparse=True),
             IndexModel([("ref_req_id", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel("created_at"),
+            # keyset 分页：未删除数据按 (created_at, _id) 倒序翻页
+            IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
 
@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from beanie import Document, before_event, Insert, Save
 from pydantic import Field
-from pymongo import ASCENDING, IndexModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class TestCaseChangeLogDoc(Document):
@@ -25,9 +25,11 @@ class TestCaseChangeLogDoc(Document):
     class Settings:
         name = "test_case_change_logs"
         indexes = [
-            IndexModel([("case_id", ASCENDING), ("created_at", ASCENDING)]),
+            # 版本号分配依赖该唯一索引：并发取到同一版本号时后写入者失败重试
             IndexModel(
                 [("case_id", ASCENDING), ("revision_no", ASCENDING)],
                 unique=True,
             ),
+            # keyset 分页：按 (revision_no, _id) 倒序翻页
+            IndexModel([("case_id", ASCENDING), ("revision_no", DESCENDING), ("_id", DESCENDING)]),
         ]
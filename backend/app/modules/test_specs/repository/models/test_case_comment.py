@@ -28,5 +28,5 @@ class TestCaseCommentDoc(Document):
     class Settings:
         name = "test_case_comments"
         indexes = [
-            IndexModel([("case_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("case_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
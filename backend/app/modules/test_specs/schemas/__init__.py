@@ -10,14 +10,23 @@ from .comment import (
     CreateCommentRequest,
     UpdateCommentRequest,
 )
+from .import_job import (
+    CreateImportJobRequest,
+    ImportJobResponse,
+    ImportRowErrorResponse,
+)
 from .requirement import (
     CreateRequirementRequest,
     UpdateRequirementRequest,
     RequirementResponse,
 )
 from .test_case import (
+    AutomationReportJobResponse,
     AutomationTestCaseReportResponse,
     AutomationTestCaseResponse,
+    BatchCreateTestCaseItemResult,
+    BatchCreateTestCasesRequest,
+    BatchCreateTestCasesResponse,
     BatchUpdateCasesRequest,
     CreateAutomationTestCaseRequest,
     CreateTestCaseRequest,
@@ -33,8 +42,12 @@ __all__ = [
     "CreateRequirementRequest",
     "UpdateRequirementRequest",
     "RequirementResponse",
+    "AutomationReportJobResponse",
     "AutomationTestCaseReportResponse",
     "AutomationTestCaseResponse",
+    "BatchCreateTestCaseItemResult",
+    "BatchCreateTestCasesRequest",
+    "BatchCreateTestCasesResponse",
     "BatchUpdateCasesRequest",
     "CreateAutomationTestCaseRequest",
     "ReportAutomationCaseMetadataRequest",
@@ -50,4 +63,7 @@ __all__ = [
     "UpdateCommentRequest",
     "CommentResponse",
     "CommentListResponse",
+    "CreateImportJobRequest",
+    "ImportJobResponse",
+    "ImportRowErrorResponse",
 ]
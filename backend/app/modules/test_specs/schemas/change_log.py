@@ -26,3 +26,4 @@ class TestCaseChangeLogResponse(BaseModel):
 class TestCaseChangeLogListResponse(BaseModel):
     items: List[TestCaseChangeLogResponse]
     total: int
+    next_cursor: Optional[str] = None
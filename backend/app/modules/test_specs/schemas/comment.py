@@ -34,3 +34,4 @@ class CommentListResponse(BaseModel):
     """评论列表响应"""
     items: list[CommentResponse]
     total: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,37 @@
+"""批量导入任务 Schema"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CreateImportJobRequest(BaseModel):
+    """提交批量导入任务请求体；导入文件需先通过附件接口上传。"""
+    file_id: str = Field(..., description="导入文件的附件 ID（csv / ndjson / xlsx）")
+    defaults: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="文件中未填写时使用的默认字段（如 lab_id、ref_req_id、tpm_owner_id）",
+    )
+
+
+class ImportRowErrorResponse(BaseModel):
+    row: int = Field(..., description="数据行序号（从 1 开始，不含表头）")
+    message: str = Field(..., description="失败原因")
+
+
+class ImportJobResponse(BaseModel):
+    """批量导入任务响应体。"""
+    job_id: str = Field(..., description="导入任务句柄")
+    entity_type: str = Field(..., description="导入对象（test_case/requirement）")
+    file_id: str = Field(..., description="导入文件附件 ID")
+    file_format: str = Field(..., description="文件格式")
+    status: str = Field(..., description="任务状态（PENDING/RUNNING/SUCCEEDED/FAILED）")
+    processed_rows: int = Field(..., description="已处理的数据行数")
+    created_count: int = Field(..., description="成功创建条数")
+    failed_count: int = Field(..., description="失败行数")
+    errors: List[ImportRowErrorResponse] = Field(default_factory=list, description="行级错误（最多前 200 条）")
+    error: Optional[str] = Field(None, description="任务级失败原因，可修复后续传")
+    created_by: str = Field(..., description="提交人")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理结束时间")
+    created_at: datetime = Field(..., description="提交时间")
@@ -146,6 +146,30 @@ class TestCaseResponse(BaseModel):
     updated_at: datetime = Field(..., description="更新时间")
 
 
+class BatchCreateTestCasesRequest(BaseModel):
+    """批量创建测试用例请求体，每行字段与单条创建一致。"""
+    items: List[CreateTestCaseRequest] = Field(..., min_length=1, max_length=500, description="待创建的用例")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchCreateTestCaseItemResult(BaseModel):
+    """批量创建中单行的结果"""
+    index: int = Field(..., description="对应请求 items 中的下标")
+    success: bool
+    case_id: Optional[str] = None
+    data: Optional[TestCaseResponse] = None
+    error: Optional[str] = None
+
+
+class BatchCreateTestCasesResponse(BaseModel):
+    """批量创建测试用例响应"""
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchCreateTestCaseItemResult]
+
+
 class LinkAutomationCaseRequest(BaseModel):
     """测试用例关联自动化用例请求体"""
     auto_case_id: str = Field(..., description="自动化用例库 ID")
@@ -233,13 +257,27 @@ class AutomationTestCaseResponse(BaseModel):
 
 class AutomationTestCaseReportItemResponse(AutomationTestCaseResponse):
     """单条自动化用例上报结果。"""
+    unchanged: bool = Field(False, description="内容指纹未变化，本次未写库")
 
 
 class AutomationTestCaseReportResponse(BaseModel):
     """自动化测试用例批量上报响应体。"""
     total_cases: int = Field(..., description="请求中 case 总数")
     saved_count: int = Field(..., description="成功写入或更新的 case 数量")
+    unchanged_count: int = Field(0, description="内容指纹未变化而跳过写入的 case 数量")
     linked_count: int = Field(..., description="成功自动关联到平台测试用例的数量")
     conflict_count: int = Field(..., description="自动关联冲突数量")
     summary: Dict[str, Any] = Field(default_factory=dict, description="原样返回的汇总信息")
     cases: List[AutomationTestCaseReportItemResponse] = Field(default_factory=list, description="逐条处理结果")
+
+
+class AutomationReportJobResponse(BaseModel):
+    """自动化元数据异步上报任务响应体。"""
+    report_id: str = Field(..., description="上报任务句柄")
+    status: str = Field(..., description="任务状态（PENDING/RUNNING/SUCCEEDED/FAILED）")
+    total_cases: int = Field(..., description="请求中 case 总数")
+    result: Optional[Dict[str, Any]] = Field(None, description="对账结果汇总（不含逐条明细）")
+    error: Optional[str] = Field(None, description="失败原因")
+    started_at: Optional[datetime] = Field(None, description="开始处理时间")
+    finished_at: Optional[datetime] = Field(None, description="处理结束时间")
+    created_at: datetime = Field(..., description="提交时间")
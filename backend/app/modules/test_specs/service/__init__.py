@@ -3,6 +3,7 @@ from .automation_test_case_service import AutomationTestCaseService
 from .catalog_service import CatalogService
 from .change_log_service import TestCaseChangeLogService
 from .comment_service import TestCaseCommentService
+from .import_service import SpecImportService
 from .lab_service import LabService
 from .requirement_service import RequirementService
 from .test_case_service import TestCaseService
@@ -12,6 +13,7 @@ __all__ = [
     "CatalogService",
     "LabService",
     "RequirementService",
+    "SpecImportService",
     "TestCaseChangeLogService",
     "TestCaseCommentService",
     "TestCaseService",
@@ -4,7 +4,18 @@ from typing import Any, Awaitable, Callable, Iterable
 
 from pymongo import AsyncMongoClient
 
-from app.modules.test_specs.service._workflow_status_support import get_workflow_states
+from app.modules.project.domain.constants import STATS_SECTION_COUNTS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.test_specs.domain.field_diff import TRACKED_FIELDS, compute_field_changes
+from app.modules.test_specs.repository.models import TestCaseChangeLogDoc, TestCaseDoc
+from app.modules.test_specs.service._workflow_status_support import (
+    DEFAULT_PROJECTED_STATUS,
+    get_workflow_details_by_item_ids,
+    get_workflow_states,
+    load_user_names,
+)
 
 
 async def load_workflow_states_for_entities(
@@ -64,6 +75,45 @@ def apply_workflow_details_projection(
     return result
 
 
+async def project_export_rows(
+    rows: list[dict[str, Any]],
+    *,
+    id_field: str,
+    user_fields: Iterable[str] = (),
+) -> list[dict[str, Any]]:
+    """为一块导出行（游标原始 dict）补齐工作流状态与人员姓名。
+
+    每块只查一次工作项、一次用户：`user_fields` 中的 `xxx_id` 字段补出 `xxx_name`，
+    查不到时保留文档中已有的冗余姓名。
+    """
+    user_fields = tuple(user_fields)
+    workflow_id_map = {
+        str(row["workflow_item_id"]): row[id_field]
+        for row in rows
+        if row.get("workflow_item_id") and row.get(id_field)
+    }
+    workflow_details = await get_workflow_details_by_item_ids(workflow_id_map, resolve_user_names=False)
+    user_names = await load_user_names(
+        [row.get(field) for row in rows for field in user_fields]
+        + [
+            details.get(field)
+            for details in workflow_details.values()
+            for field in ("creator", "current_owner")
+        ]
+    )
+    for row in rows:
+        details = workflow_details.get(row.get(id_field), {})
+        row["status"] = details.get("status", DEFAULT_PROJECTED_STATUS)
+        row["creator"] = details.get("creator")
+        row["current_owner"] = details.get("current_owner")
+        row["creator_name"] = user_names.get(row["creator"])
+        row["current_owner_name"] = user_names.get(row["current_owner"])
+        for field in user_fields:
+            name_field = f"{field.removesuffix('_id')}_name"
+            row[name_field] = user_names.get(row.get(field)) or row.get(name_field)
+    return rows
+
+
 def ensure_safe_generic_update(
     *,
     data: dict[str, Any],
@@ -106,6 +156,7 @@ async def workflow_aware_soft_delete(
         await extra_guard()
     doc.is_deleted = True
     await doc.save()
+    schedule_project_stats_refresh(getattr(doc, "project_ids", None) or [], STATS_SECTION_COUNTS)
 
 
 async def create_with_workflow_transaction(
@@ -121,6 +172,8 @@ async def create_with_workflow_transaction(
     prepare_payload: Callable[[dict[str, Any], Any], Awaitable[None]] | None = None,
     # 冗余字段回填：将业务 ID 写入 BusWorkItemDoc，避免后续跨集合查询
     redundant_fields: dict[str, str] | None = None,
+    # 事务提交后刷新搜索索引：(实体类型, payload 中的业务 ID 字段)
+    search_entity: tuple[str, str] | None = None,
 ) -> dict[str, Any]:
     """Create business entity and workflow item in one transaction."""
     async with client.start_session() as session:
@@ -156,5 +209,50 @@ async def create_with_workflow_transaction(
 
             result = enrich_result(doc)
             if hasattr(result, "__await__"):
-                return await result
-            return result
+                result = await result
+
+    schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [payload["workflow_item_id"]])
+    if search_entity is not None:
+        entity_type, id_field = search_entity
+        schedule_search_refresh(entity_type, [payload.get(id_field)])
+    return result
+
+
+def build_test_case_creation_log(
+    doc: Any,
+    operator_id: str | None,
+    default_remark: str | None = None,
+) -> TestCaseChangeLogDoc:
+    """新建用例的 CREATE 变更记录：revision_no=1，变更为全部跟踪字段的初始值。"""
+    snapshot = {field: getattr(doc, field, None) for field in TRACKED_FIELDS}
+    return TestCaseChangeLogDoc(
+        case_id=doc.case_id,
+        revision_no=1,
+        action="CREATE",
+        operator_id=operator_id or doc.owner_id or "system",
+        changes=compute_field_changes(None, snapshot),
+        remark=doc.change_log or default_remark,
+    )
+
+
+async def insert_created_test_cases(
+    docs: list[Any],
+    *,
+    catalog_service: Any,
+    session: Any,
+    operator_id: str | None,
+    default_remark: str | None = None,
+) -> None:
+    """在调用方事务内批量写入新建用例：用例与 CREATE 变更记录各一次 insert_many，并登记目录段。
+
+    批量创建与批量导入共用，两条路径写出的用例、变更记录与目录计数保持一致。
+    """
+    await TestCaseDoc.insert_many(docs, session=session)
+    await TestCaseChangeLogDoc.insert_many(
+        [build_test_case_creation_log(doc, operator_id, default_remark) for doc in docs],
+        session=session,
+    )
+    await catalog_service.register_paths_bulk(
+        [(doc.lab_id, doc.catalog_path) for doc in docs],
+        session=session,
+    )
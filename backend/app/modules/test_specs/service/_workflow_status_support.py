@@ -9,13 +9,12 @@ DEFAULT_PROJECTED_STATUS = "未开始"
 
 async def _enrich_user_names(data: Dict[str, Any]) -> None:
     """根据 creator / current_owner 的 user_id 查询并填充显示名称。"""
-    from app.modules.auth.repository.models.rbac import UserDoc
+    from app.modules.auth.user_directory import UserDirectory
 
     user_ids = [uid for uid in [data.get("creator"), data.get("current_owner")] if uid]
     if not user_ids:
         return
-    users = await UserDoc.find({"user_id": {"$in": user_ids}}).to_list()
-    user_map = {u.user_id: u.username for u in users}
+    user_map = await UserDirectory.get_names(user_ids)
     if data.get("creator"):
         data["creator_name"] = user_map.get(data["creator"])
     if data.get("current_owner"):
@@ -71,6 +70,13 @@ async def get_workflow_states(docs: Iterable[Any], key_attr: str) -> Dict[str, s
     return {k: v["status"] for k, v in details.items()}
 
 
+async def load_user_names(user_ids: Iterable[Optional[str]]) -> Dict[str, str]:
+    """批量查询用户显示名称，返回 user_id 到 username 的映射。"""
+    from app.modules.auth.user_directory import UserDirectory
+
+    return await UserDirectory.get_names(user_ids)
+
+
 async def get_workflow_details(docs: Iterable[Any], key_attr: str) -> Dict[str, Dict[str, Any]]:
     """批量读取工作流详情，返回业务主键到工作流详情的映射。
 
@@ -83,7 +89,18 @@ async def get_workflow_details(docs: Iterable[Any], key_attr: str) -> Dict[str,
         entity_id = getattr(doc, key_attr, None)
         if workflow_id and entity_id:
             workflow_id_map[str(workflow_id)] = entity_id
+    return await get_workflow_details_by_item_ids(workflow_id_map)
+
 
+async def get_workflow_details_by_item_ids(
+    workflow_id_map: Dict[str, str],
+    *,
+    resolve_user_names: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """按 workflow_item_id -> entity_id 映射批量读取工作流详情。
+
+    `resolve_user_names=False` 时不查用户名，由调用方与其他人员字段合并成一次查询。
+    """
     if not workflow_id_map:
         return {}
 
@@ -99,7 +116,6 @@ async def get_workflow_details(docs: Iterable[Any], key_attr: str) -> Dict[str,
     }
 
     result: Dict[str, Dict[str, Any]] = {}
-    all_user_ids: set[str] = set()
     for workflow_id, entity_id in workflow_id_map.items():
         work_item = work_item_by_id.get(workflow_id)
         if work_item:
@@ -108,17 +124,12 @@ async def get_workflow_details(docs: Iterable[Any], key_attr: str) -> Dict[str,
                 "creator": work_item.creator_id,
                 "current_owner": work_item.current_owner_id,
             }
-            if work_item.creator_id:
-                all_user_ids.add(work_item.creator_id)
-            if work_item.current_owner_id:
-                all_user_ids.add(work_item.current_owner_id)
 
     # 批量查询用户名称
-    if all_user_ids:
-        from app.modules.auth.repository.models.rbac import UserDoc
-
-        users = await UserDoc.find({"user_id": {"$in": list(all_user_ids)}}).to_list()
-        user_map = {u.user_id: u.username for u in users}
+    if resolve_user_names:
+        user_map = await load_user_names(
+            uid for details in result.values() for uid in (details["creator"], details["current_owner"])
+        )
         for details in result.values():
             if details.get("creator"):
                 details["creator_name"] = user_map.get(details["creator"])
@@ -1,11 +1,25 @@
 """自动化测试用例库服务。"""
 
+import asyncio
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
+import json
 import re
 from typing import Any, Dict, List, Optional
+import uuid
 
+from beanie import PydanticObjectId
+from beanie.odm.utils.dump import get_dict
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.modules.project.domain.constants import STATS_SECTION_COUNTS
+from app.modules.project.service.project_stats_rollup import schedule_project_stats_refresh
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
 from app.modules.test_specs.repository.models import (
+    AutomationReportJobDoc,
     AutomationTestCaseDoc,
     CodeSnapshotModel,
     ConfigFieldModel,
@@ -13,7 +27,12 @@ from app.modules.test_specs.repository.models import (
     ScriptRefModel,
     TestCaseDoc,
 )
-from app.shared.service import BaseService, SequenceIdService
+from app.shared.core.logger import log
+from app.shared.domain.exceptions import ConflictError
+from app.shared.service import CREATED_AT_DESC, BaseService, SequenceIdService
+
+# 持有后台上报任务的强引用，避免任务在完成前被回收
+_pending_report_jobs: set[asyncio.Task] = set()
 
 
 class AutomationTestCaseService(BaseService):
@@ -78,10 +97,12 @@ class AutomationTestCaseService(BaseService):
             for key, value in payload.items():
                 setattr(existing, key, value)
             await existing.save()
+            schedule_search_refresh(SearchEntityType.AUTOMATION_TEST_CASE.value, [existing.auto_case_id])
             return self._doc_to_dict(existing)
 
         doc = AutomationTestCaseDoc(**payload)
         await doc.insert()
+        schedule_search_refresh(SearchEntityType.AUTOMATION_TEST_CASE.value, [doc.auto_case_id])
         return self._doc_to_dict(doc)
 
     async def get_automation_test_case(self, auto_case_id: str) -> Dict[str, Any]:
@@ -114,8 +135,9 @@ class AutomationTestCaseService(BaseService):
         linkable_for_case_id: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """分页查询自动化测试用例列表。"""
+        """分页查询自动化测试用例列表；传入 `cursor` 时按 `(created_at, _id)` keyset 翻页。"""
         mongo_query = self._build_list_filter(
             framework=framework,
             automation_type=automation_type,
@@ -125,13 +147,9 @@ class AutomationTestCaseService(BaseService):
             q=q,
             linkable_for_case_id=linkable_for_case_id,
         )
-        docs = await (
-            AutomationTestCaseDoc.find(mongo_query)
-            .sort("-created_at")
-            .skip(offset)
-            .limit(limit)
-            .to_list()
-        )
+        docs = await CREATED_AT_DESC.paginate(
+            AutomationTestCaseDoc.find(mongo_query), limit=limit, offset=offset, cursor=cursor,
+        ).to_list()
         return [self._doc_to_dict(doc) for doc in docs]
 
     async def delete_automation_test_case(self, doc_id: str) -> None:
@@ -144,6 +162,8 @@ class AutomationTestCaseService(BaseService):
             raise KeyError("automation test case not found")
         doc.is_deleted = True
         await doc.save()
+        schedule_search_refresh(SearchEntityType.AUTOMATION_TEST_CASE.value, [doc.auto_case_id])
+        schedule_project_stats_refresh(doc.project_ids, STATS_SECTION_COUNTS)
 
     async def update_tags(self, auto_case_id: str, tags: List[str]) -> Dict[str, Any]:
         """更新自动化用例标签（全量替换）。"""
@@ -155,51 +175,172 @@ class AutomationTestCaseService(BaseService):
             raise KeyError("automation test case not found")
         doc.tags = tags
         await doc.save()
+        schedule_search_refresh(SearchEntityType.AUTOMATION_TEST_CASE.value, [auto_case_id])
         return self._doc_to_dict(doc)
 
     async def report_automation_test_case_metadata(
         self,
         payload: Dict[str, Any],
     ) -> Dict[str, Any]:
-        """接收自动化测试框架批量上报的用例配置元数据并逐条 upsert。"""
+        """接收自动化测试框架批量上报的用例配置元数据，批量对账后一次写入。
+
+        - 已有记录通过一次 `$in` 查询预取；
+        - 内容指纹（commit_id + param_spec）未变化的 case 不写库，仅返回现有记录；
+        - 新 case 的业务编号一次性预留，关联的手工用例一次查询；
+        - 新增与更新合并为一次无序 bulk_write。
+        同一次上报中重复的 linked_manual_case_id 以最后一条为准。
+        """
         cases, summary = self._extract_report_payload(payload)
+        latest: Dict[str, Dict[str, Any]] = {}
+        for metadata in cases:
+            latest[self._extract_manual_case_id(metadata)] = metadata
+        manual_case_ids = list(latest)
 
-        results: List[Dict[str, Any]] = []
-        linked_count = 0
-        conflict_count = 0
+        existing_docs = await AutomationTestCaseDoc.find(
+            {"linked_manual_case_id": {"$in": manual_case_ids}, "is_deleted": False},
+        ).to_list()
+        existing_by_manual_id = {doc.linked_manual_case_id: doc for doc in existing_docs}
 
-        for metadata in cases:
-            linked_manual_case_id = self._extract_manual_case_id(metadata)
-            existing = await AutomationTestCaseDoc.find_one(
-                {"linked_manual_case_id": linked_manual_case_id, "is_deleted": False},
-            )
+        new_ids = iter(await self._generate_auto_case_ids(
+            sum(1 for case_id in manual_case_ids if case_id not in existing_by_manual_id)
+        ))
+        now = datetime.now(timezone.utc)
+        operations: List[Any] = []
+        reported: List[tuple[AutomationTestCaseDoc, bool]] = []
+        # InsertOne 在 operations 中的下标 -> (linked_manual_case_id, doc_data)，写入冲突时据此改为更新
+        inserted_at: Dict[int, tuple[str, Dict[str, Any]]] = {}
+        for linked_manual_case_id, metadata in latest.items():
             doc_data = self._build_report_doc_data(linked_manual_case_id, metadata, summary)
+            fingerprint = doc_data["report_fingerprint"] = self._report_fingerprint(doc_data)
+            existing = existing_by_manual_id.get(linked_manual_case_id)
+            if existing is None:
+                doc = AutomationTestCaseDoc(auto_case_id=next(new_ids), **doc_data)
+                doc.id = PydanticObjectId()
+                inserted_at[len(operations)] = (linked_manual_case_id, doc_data)
+                operations.append(InsertOne(self._to_mongo(doc)))
+                reported.append((doc, False))
+                continue
+            if fingerprint and fingerprint == getattr(existing, "report_fingerprint", None):
+                reported.append((existing, True))
+                continue
+            operations.append(self._report_update_operation(existing, doc_data, now))
+            reported.append((existing, False))
 
-            if existing:
-                self._apply_updates(existing, doc_data, doc_data.keys())
-                await existing.save()
-                result = await self._finalize_report_result(existing, metadata)
-            else:
-                doc_data["auto_case_id"] = await self._generate_auto_case_id()
-                doc = AutomationTestCaseDoc(**doc_data)
-                await doc.insert()
-                result = await self._finalize_report_result(doc, metadata)
-
-            if result.get("linked"):
-                linked_count += 1
-            if result.get("conflict"):
-                conflict_count += 1
+        if operations:
+            try:
+                await AutomationTestCaseDoc.get_pymongo_collection().bulk_write(operations, ordered=False)
+            except BulkWriteError as exc:
+                resolved = await self._resolve_report_conflicts(exc, inserted_at, now)
+                reported = [
+                    (resolved.get(doc.linked_manual_case_id, doc), unchanged) for doc, unchanged in reported
+                ]
+
+        linked_case_ids = await self._find_linked_case_ids(manual_case_ids)
+        results: List[Dict[str, Any]] = []
+        for doc, unchanged in reported:
+            result = self._doc_to_dict(doc)
+            result.update(self._build_link_result(doc.linked_manual_case_id, linked_case_ids))
+            result["unchanged"] = unchanged
             results.append(result)
 
+        schedule_search_refresh(
+            SearchEntityType.AUTOMATION_TEST_CASE.value,
+            [result.get("auto_case_id") for result in results if not result["unchanged"]],
+        )
         return {
             "total_cases": len(cases),
-            "saved_count": len(results),
-            "linked_count": linked_count,
-            "conflict_count": conflict_count,
+            "saved_count": len(operations),
+            "unchanged_count": len(results) - len(operations),
+            "linked_count": sum(1 for result in results if result.get("linked")),
+            "conflict_count": sum(1 for result in results if result.get("conflict")),
             "summary": summary,
             "cases": results,
         }
 
+    def _report_update_operation(
+        self,
+        existing: AutomationTestCaseDoc,
+        doc_data: Dict[str, Any],
+        now: datetime,
+    ) -> UpdateOne:
+        self._apply_updates(existing, doc_data, doc_data.keys())
+        existing.updated_at = now
+        fields = self._to_mongo(existing)
+        return UpdateOne(
+            {"_id": existing.id},
+            {"$set": {key: fields.get(key) for key in [*doc_data, "updated_at"]}},
+        )
+
+    async def _resolve_report_conflicts(
+        self,
+        exc: BulkWriteError,
+        inserted_at: Dict[int, tuple[str, Dict[str, Any]]],
+        now: datetime,
+    ) -> Dict[str, AutomationTestCaseDoc]:
+        """处理无序 bulk_write 中因唯一键冲突失败的新增行。
+
+        并发上报可能已为同一手工用例写入记录：重读这些记录并改为更新，返回
+        linked_manual_case_id -> 记录。仍找不到对应记录（如业务编号冲突）时抛出 ConflictError；
+        非唯一键错误原样抛出。
+        """
+        errors = exc.details.get("writeErrors", [])
+        duplicate_inserts = [
+            error for error in errors if error.get("code") == 11000 and error.get("index") in inserted_at
+        ]
+        if not errors or len(duplicate_inserts) != len(errors):
+            raise exc
+        conflicted = dict(inserted_at[error["index"]] for error in errors)
+        docs = await AutomationTestCaseDoc.find(
+            {"linked_manual_case_id": {"$in": list(conflicted)}, "is_deleted": False},
+        ).to_list()
+        resolved = {doc.linked_manual_case_id: doc for doc in docs}
+        missing = [manual_case_id for manual_case_id in conflicted if manual_case_id not in resolved]
+        if missing:
+            raise ConflictError(f"自动化用例上报写入冲突: {', '.join(missing)}") from exc
+        log.warning("自动化用例上报与并发写入冲突，改为更新已有记录: {}", list(conflicted))
+        operations = [
+            self._report_update_operation(resolved[manual_case_id], doc_data, now)
+            for manual_case_id, doc_data in conflicted.items()
+        ]
+        try:
+            await AutomationTestCaseDoc.get_pymongo_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as retry_exc:
+            raise ConflictError(f"自动化用例上报写入冲突: {', '.join(conflicted)}") from retry_exc
+        return resolved
+
+    async def submit_report_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """创建异步上报任务并在后台执行批量对账，立即返回任务句柄。"""
+        cases, _summary = self._extract_report_payload(payload)
+        job = AutomationReportJobDoc(report_id=f"ATR-{uuid.uuid4().hex[:16]}", total_cases=len(cases))
+        await job.insert()
+        task = asyncio.get_running_loop().create_task(self._run_report_job(job, deepcopy(payload)))
+        _pending_report_jobs.add(task)
+        task.add_done_callback(_pending_report_jobs.discard)
+        return self._doc_to_dict(job)
+
+    async def get_report_job(self, report_id: str) -> Dict[str, Any]:
+        """按句柄查询异步上报任务。"""
+        job = await AutomationReportJobDoc.find_one({"report_id": report_id})
+        if not job:
+            raise KeyError("automation report job not found")
+        return self._doc_to_dict(job)
+
+    async def _run_report_job(self, job: AutomationReportJobDoc, payload: Dict[str, Any]) -> None:
+        job.status = "RUNNING"
+        job.started_at = datetime.now(timezone.utc)
+        await job.save()
+        try:
+            result = await self.report_automation_test_case_metadata(payload)
+        except Exception as exc:
+            log.warning("自动化元数据异步上报失败 report_id={} err={}", job.report_id, exc)
+            job.status = "FAILED"
+            job.error = str(exc)
+        else:
+            job.status = "SUCCEEDED"
+            job.result = {key: value for key, value in result.items() if key != "cases"}
+        job.finished_at = datetime.now(timezone.utc)
+        await job.save()
+
     @staticmethod
     def _build_report_doc_data(
         linked_manual_case_id: str,
@@ -298,45 +439,39 @@ class AutomationTestCaseService(BaseService):
         """将参数定义标准化为 ConfigFieldModel，保证新建/更新路径一致。"""
         return [field if isinstance(field, ConfigFieldModel) else ConfigFieldModel(**field) for field in param_spec]
 
-    async def _finalize_report_result(
-        self,
-        auto_doc: AutomationTestCaseDoc,
-        metadata: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """在自动化用例落库后，尽力回链测试用例并返回结果。"""
-        link_result = await self._try_link_test_case(auto_doc, metadata)
-        result = self._doc_to_dict(auto_doc)
-        result.update(link_result)
-        return result
+    @staticmethod
+    def _report_fingerprint(doc_data: Dict[str, Any]) -> Optional[str]:
+        """上报内容指纹：commit_id + 规范化 param_spec；没有 commit_id 时无法判断是否变化。"""
+        commit_id = doc_data["code_snapshot"].commit_id
+        if not commit_id:
+            return None
+        param_spec = [field.model_dump(mode="json", by_alias=True) for field in doc_data["param_spec"]]
+        content = json.dumps([commit_id, param_spec], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-    async def _try_link_test_case(
-        self,
-        auto_doc: AutomationTestCaseDoc,
-        metadata: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """根据唯一关联键查找是否存在已关联的平台测试用例。"""
-        linked_manual_case_id = auto_doc.linked_manual_case_id
-        if not linked_manual_case_id:
-            return {
-                "linked": False,
-                "linked_case_id": None,
-                "conflict": False,
-                "conflict_message": None,
-            }
-
-        case_doc = await TestCaseDoc.find_one(
-            {"case_id": linked_manual_case_id, "is_deleted": False},
-        )
-        if not case_doc:
-            return {
-                "linked": False,
-                "linked_case_id": None,
-                "conflict": False,
-                "conflict_message": None,
-            }
+    @staticmethod
+    def _to_mongo(doc: AutomationTestCaseDoc) -> Dict[str, Any]:
+        """按 Beanie 写库时的编码规则序列化文档，供 pymongo 批量写入使用。"""
+        return get_dict(doc, to_db=True, keep_nulls=doc.get_settings().keep_nulls)
+
+    @staticmethod
+    async def _find_linked_case_ids(manual_case_ids: List[str]) -> set[str]:
+        """一次查询返回存在的平台测试用例编号。"""
+        case_ids = [case_id for case_id in manual_case_ids if case_id]
+        if not case_ids:
+            return set()
+        case_docs = await TestCaseDoc.find(
+            {"case_id": {"$in": case_ids}, "is_deleted": False},
+        ).to_list()
+        return {case_doc.case_id for case_doc in case_docs}
+
+    @staticmethod
+    def _build_link_result(linked_manual_case_id: Optional[str], linked_case_ids: set[str]) -> Dict[str, Any]:
+        """根据唯一关联键判断是否存在已关联的平台测试用例。"""
+        linked = bool(linked_manual_case_id) and linked_manual_case_id in linked_case_ids
         return {
-            "linked": True,
-            "linked_case_id": case_doc.case_id,
+            "linked": linked,
+            "linked_case_id": linked_manual_case_id if linked else None,
             "conflict": False,
             "conflict_message": None,
         }
@@ -348,3 +483,12 @@ class AutomationTestCaseService(BaseService):
         counter_key = f"automation_test_case:{year}"
         next_seq = await SequenceIdService().next(counter_key)
         return f"{prefix}{str(next_seq).zfill(5)}"
+
+    async def _generate_auto_case_ids(self, count: int) -> List[str]:
+        """一次预留 count 个自动化用例编号。"""
+        if count <= 0:
+            return []
+        year = datetime.now().year
+        prefix = f"ATC-{year}-"
+        seqs = await SequenceIdService().next_many(f"automation_test_case:{year}", count)
+        return [f"{prefix}{str(seq).zfill(5)}" for seq in seqs]
@@ -1,7 +1,11 @@
 """Catalog path helpers: segments, suggestions, tree, breadcrumbs."""
 from __future__ import annotations
 
-from typing import Any
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from pymongo import UpdateOne
 
 from app.modules.test_specs.domain.catalog_path import build_catalog_path_key, normalize_catalog_path
 from app.modules.test_specs.domain.exceptions import LabNotFoundError
@@ -45,6 +49,42 @@ class CatalogService:
             segment_name = normalized[depth]
             await self._adjust_segment(lab_id, parent_path, segment_name, delta)
 
+    async def register_paths_bulk(
+        self,
+        paths: Iterable[tuple[str, list[str]]],
+        session: Any = None,
+    ) -> int:
+        """批量登记 (lab_id, catalog_path)：同一段的引用计数先在内存中合并，再一次 bulk_write 累加。
+
+        返回写入的段数；用于批量导入，避免逐条用例、逐段 find_one + save。
+        """
+        deltas: Counter[tuple[str, tuple[str, ...], str]] = Counter()
+        for lab_id, catalog_path in paths:
+            normalized = self.normalize_path_segments(catalog_path)
+            for depth, segment_name in enumerate(normalized):
+                deltas[(lab_id, tuple(normalized[:depth]), segment_name)] += 1
+        if not deltas:
+            return 0
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"lab_id": lab_id, "parent_path": list(parent_path), "segment_name": segment_name},
+                {
+                    "$inc": {"usage_count": delta},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"created_at": now},
+                },
+                upsert=True,
+            )
+            for (lab_id, parent_path, segment_name), delta in deltas.items()
+        ]
+        await TestCatalogSegmentDoc.get_pymongo_collection().bulk_write(
+            operations,
+            ordered=False,
+            session=session,
+        )
+        return len(operations)
+
     async def _adjust_segment(
         self,
         lab_id: str,
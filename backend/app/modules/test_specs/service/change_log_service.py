@@ -1,11 +1,25 @@
-"""测试用例变更记录服务"""
+"""测试用例变更记录服务
+
+- 版本号：取 `(case_id, revision_no)` 唯一索引上的最大值 +1 后直接插入，
+  并发写入撞上唯一索引时重新取号重试，不会产生重复版本号；
+- 分页：按 `(revision_no, _id)` 倒序，传入 `cursor` 时走 keyset；
+- 操作人姓名：经共享的 `UserDirectory` 解析，翻页时不再重复查询 `UserDoc`。
+"""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
+
+from pymongo.errors import DuplicateKeyError
 
-from app.modules.auth.repository.models import UserDoc
+from app.modules.auth.user_directory import UserDirectory
 from app.modules.test_specs.domain.field_diff import TRACKED_FIELDS, compute_field_changes
 from app.modules.test_specs.repository.models.test_case_change_log import TestCaseChangeLogDoc
+from app.shared.core.logger import log
+from app.shared.service import KeysetSort
+
+REVISION_DESC = KeysetSort("revision_no", True)
+# 并发写同一用例时，取号后插入冲突的最大重试次数
+MAX_REVISION_RETRIES = 5
 
 
 class TestCaseChangeLogService:
@@ -32,37 +46,41 @@ class TestCaseChangeLogService:
             if not remark:
                 return
 
-        revision_no = await self._next_revision_no(case_id)
-        doc = TestCaseChangeLogDoc(
-            case_id=case_id,
-            revision_no=revision_no,
-            action=action,
-            operator_id=operator_id,
-            changes=changes,
-            remark=remark,
-        )
-        await doc.insert()
+        for attempt in range(1, MAX_REVISION_RETRIES + 1):
+            doc = TestCaseChangeLogDoc(
+                case_id=case_id,
+                revision_no=await self._next_revision_no(case_id),
+                action=action,
+                operator_id=operator_id,
+                changes=changes,
+                remark=remark,
+            )
+            try:
+                await doc.insert()
+                return
+            except DuplicateKeyError:
+                if attempt == MAX_REVISION_RETRIES:
+                    raise
+                log.debug("变更记录版本号冲突，重新取号 case={} revision={}", case_id, doc.revision_no)
 
     async def list_logs(
         self,
         case_id: str,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
+        """按版本号倒序分页；传入 `cursor` 时按 `(revision_no, _id)` keyset 翻页并忽略 offset。"""
         query = TestCaseChangeLogDoc.find(TestCaseChangeLogDoc.case_id == case_id)
         total = await query.count()
-        docs = (
-            await query.sort("-created_at")
-            .skip(offset)
-            .limit(limit)
-            .to_list()
-        )
+        docs = await REVISION_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         operator_ids = {doc.operator_id for doc in docs}
         name_map = await self._load_operator_names(operator_ids)
         items = [self._to_dict(doc, name_map.get(doc.operator_id)) for doc in docs]
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "next_cursor": REVISION_DESC.next_cursor(docs, limit)}
 
     async def _next_revision_no(self, case_id: str) -> int:
+        # 走 (case_id, revision_no) 唯一索引，只读一条
         latest = (
             await TestCaseChangeLogDoc.find(TestCaseChangeLogDoc.case_id == case_id)
             .sort("-revision_no")
@@ -75,10 +93,7 @@ class TestCaseChangeLogService:
 
     @staticmethod
     async def _load_operator_names(operator_ids: set[str]) -> dict[str, str]:
-        if not operator_ids:
-            return {}
-        users = await UserDoc.find({"user_id": {"$in": list(operator_ids)}}).to_list()
-        return {user.user_id: user.username for user in users}
+        return await UserDirectory.get_names(operator_ids)
 
     @staticmethod
     def _to_dict(doc: TestCaseChangeLogDoc, operator_name: str | None) -> dict[str, Any]:
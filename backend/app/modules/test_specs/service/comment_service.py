@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from app.modules.test_specs.repository.models.test_case_comment import TestCaseCommentDoc
+from app.shared.service import CREATED_AT_DESC
 
 
 class TestCaseCommentService:
@@ -28,16 +29,12 @@ class TestCaseCommentService:
         case_id: str,
         limit: int = 50,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> tuple[list[TestCaseCommentDoc], int]:
+        """按创建时间倒序分页；传入 `cursor` 时按 `(created_at, _id)` keyset 翻页。"""
         query = TestCaseCommentDoc.find(TestCaseCommentDoc.case_id == case_id)
         total = await query.count()
-        docs = (
-            await query
-            .sort(-TestCaseCommentDoc.created_at)
-            .skip(offset)
-            .limit(limit)
-            .to_list()
-        )
+        docs = await CREATED_AT_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         return docs, total
 
     async def get_comment(self, comment_id: str) -> Optional[TestCaseCommentDoc]:
@@ -0,0 +1,133 @@
+"""Embedding 批量回填队列。
+
+批量导入不再为每条用例/需求各起一个 embedding 任务，而是把业务 ID 放入进程内队列，
+由单个后台协程按 `EMBEDDING_BATCH_SIZE` 分批调用 `EmbeddingService.embed_texts` 并 bulk_write 回写，
+对 embedding 服务的并发始终为 1。
+
+队列不持久化：进程退出时未回填的文档 `embedding` 仍为空，可通过 `enqueue_missing` 重新扫描入队。
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Iterable
+
+from pymongo import UpdateOne
+
+from app.modules.test_specs.repository.models import TestCaseDoc, TestRequirementDoc
+from app.shared.ai.embedding import EmbeddingService
+from app.shared.core.logger import log
+
+EMBEDDING_BATCH_SIZE = 32
+
+
+def _case_text(doc: dict[str, Any]) -> str:
+    return EmbeddingService.build_case_text(
+        title=doc.get("title") or "",
+        test_category=doc.get("test_category") or "",
+        tags=doc.get("tags") or [],
+        pre_condition=doc.get("pre_condition") or "",
+        post_condition=doc.get("post_condition") or "",
+        steps=[
+            {"name": s.get("name", ""), "action": s.get("action", ""), "expected": s.get("expected", "")}
+            for s in (doc.get("steps") or [])
+        ],
+    )
+
+
+def _requirement_text(doc: dict[str, Any]) -> str:
+    return EmbeddingService.build_requirement_text(
+        title=doc.get("title") or "",
+        description=doc.get("description") or "",
+        acceptance_criteria=doc.get("acceptance_criteria") or "",
+        category=doc.get("category") or "",
+        tags=doc.get("tags") or [],
+        risk_points=doc.get("risk_points") or "",
+    )
+
+
+# entity_type -> (文档类, 业务 ID 字段, 文本拼接函数, 拼接所需字段)
+_TARGETS: dict[str, tuple[Any, str, Callable[[dict[str, Any]], str], tuple[str, ...]]] = {
+    "test_case": (
+        TestCaseDoc,
+        "case_id",
+        _case_text,
+        ("title", "test_category", "tags", "pre_condition", "post_condition", "steps"),
+    ),
+    "requirement": (
+        TestRequirementDoc,
+        "req_id",
+        _requirement_text,
+        ("title", "description", "acceptance_criteria", "category", "tags", "risk_points"),
+    ),
+}
+
+
+class EmbeddingBackfillQueue:
+    """进程内 embedding 回填队列，单协程按批消费。"""
+
+    def __init__(self, batch_size: int = EMBEDDING_BATCH_SIZE) -> None:
+        self._batch_size = batch_size
+        self._pending: dict[str, Deque[str]] = {entity_type: deque() for entity_type in _TARGETS}
+        self._worker: asyncio.Task | None = None
+
+    def pending_count(self) -> int:
+        return sum(len(ids) for ids in self._pending.values())
+
+    def enqueue(self, entity_type: str, business_ids: Iterable[str]) -> None:
+        """登记待回填的业务 ID，必要时启动后台消费协程。"""
+        self._pending[entity_type].extend(business_id for business_id in business_ids if business_id)
+        if self.pending_count() and (self._worker is None or self._worker.done()):
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+    async def enqueue_missing(self, entity_type: str, limit: int = 10000) -> int:
+        """扫描 embedding 为空的文档并入队，用于进程重启后的补偿。"""
+        doc_cls, id_field, _build_text, _fields = _TARGETS[entity_type]
+        cursor = doc_cls.get_pymongo_collection().find(
+            {"is_deleted": False, "embedding": None},
+            projection={id_field: 1},
+            limit=limit,
+        )
+        business_ids = [doc[id_field] async for doc in cursor]
+        self.enqueue(entity_type, business_ids)
+        return len(business_ids)
+
+    async def wait_idle(self) -> None:
+        if self._worker is not None:
+            await self._worker
+
+    async def _drain(self) -> None:
+        while self.pending_count():
+            for entity_type, pending in self._pending.items():
+                if not pending:
+                    continue
+                batch = [pending.popleft() for _ in range(min(self._batch_size, len(pending)))]
+                try:
+                    await self._backfill(entity_type, batch)
+                except Exception as exc:
+                    log.error("embedding: 批量回填失败 type={} count={} err={}", entity_type, len(batch), exc)
+
+    @staticmethod
+    async def _backfill(entity_type: str, business_ids: list[str]) -> int:
+        doc_cls, id_field, build_text, fields = _TARGETS[entity_type]
+        collection = doc_cls.get_pymongo_collection()
+        cursor = collection.find(
+            {id_field: {"$in": business_ids}, "embedding": None},
+            projection={id_field: 1, **{field: 1 for field in fields}},
+        )
+        docs = [doc async for doc in cursor]
+        if not docs:
+            return 0
+        vectors = await EmbeddingService.embed_texts([build_text(doc) for doc in docs])
+        operations = [
+            UpdateOne({id_field: doc[id_field]}, {"$set": {"embedding": vector}})
+            for doc, vector in zip(docs, vectors)
+            if vector
+        ]
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        log.info("embedding: 批量回填 type={} updated={}/{}", entity_type, len(operations), len(docs))
+        return len(operations)
+
+
+embedding_backfill = EmbeddingBackfillQueue()
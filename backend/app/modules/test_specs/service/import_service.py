@@ -0,0 +1,486 @@
+"""用例/需求批量导入服务
+
+逐条走 `create_test_case` 时，每条用例各占一次事务、一次序号分配、逐段目录登记和一个 embedding 任务，
+迁移上万条历史用例要数小时。批量导入按块处理（默认每块 500 行）：
+
+1. 导入文件先作为附件上传，任务按 file_id 读取，失败后可以从已提交的位置续传；
+2. 每块行数据逐行解码、用 `validate_test_case_step_fields` 校验步骤，Lab / 关联需求 / 人员按块批量查询；
+3. 业务编号用 `SequenceIdService.next_many` 按块一次预留；
+4. 同一事务内批量写入工作项、用例（或需求）、目录段计数、变更记录和任务进度，
+   进度与数据同提交，续传位置不会和已写入的数据错位；
+5. 提交后批量刷新搜索索引，embedding 交给 `embedding_backfill` 队列分批回填。
+
+行级错误（格式错误、校验失败、标题重复等）只记为该行失败，不影响同块其他行。
+"""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pydantic import ValidationError
+
+from app.modules.attachments.application import download_attachment_content, get_attachment_filename
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.test_specs.domain.test_case_step_validator import validate_test_case_step_fields
+from app.modules.test_specs.repository.models import (
+    TestCaseDoc,
+    TestLabDoc,
+    TestRequirementDoc,
+    TestSpecImportJobDoc,
+)
+from app.modules.test_specs.service._service_support import insert_created_test_cases
+from app.modules.test_specs.service._workflow_status_support import load_user_names
+from app.modules.test_specs.service.catalog_service import CatalogService
+from app.modules.test_specs.service.embedding_backfill import EmbeddingBackfillQueue, embedding_backfill
+from app.modules.workflow.application import WorkflowItemGateway
+from app.modules.workflow.repository.models.enums import WorkItemState
+from app.shared.core.logger import log
+from app.shared.core.mongo_client import get_mongo_client
+from app.shared.export import (
+    IMPORT_CHUNK_SIZE,
+    ExportFormat,
+    ImportCellKind,
+    ImportColumn,
+    ImportRow,
+    decode_import_row,
+    detect_import_format,
+    iter_import_chunks,
+)
+from app.shared.service import BaseService, SequenceIdService
+
+IMPORT_MAX_ERRORS = 200
+# RUNNING 任务超过该时长没有心跳（进程退出等），允许续传
+IMPORT_JOB_STALE_SECONDS = 300
+# 执行中的任务按该间隔刷新 updated_at，下载大文件或单块耗时较长时也不会被判定为中断
+IMPORT_JOB_HEARTBEAT_SECONDS = 60
+IMPORT_ENTITY_TYPES = ("test_case", "requirement")
+_SEARCH_ENTITY_TYPES = {
+    "test_case": SearchEntityType.TEST_CASE.value,
+    "requirement": SearchEntityType.REQUIREMENT.value,
+}
+
+TEST_CASE_IMPORT_COLUMNS = (
+    ImportColumn("title", "用例名称"),
+    ImportColumn("lab_id", "Lab"),
+    ImportColumn("catalog_path", "目录", ImportCellKind.PATH),
+    ImportColumn("ref_req_id", "关联需求"),
+    ImportColumn("priority", "优先级"),
+    ImportColumn("owner_id", "责任人ID"),
+    ImportColumn("reviewer_id", "评审人ID"),
+    ImportColumn("auto_dev_id", "自动化开发ID"),
+    ImportColumn("test_category", "测试分类"),
+    ImportColumn("risk_level", "风险等级"),
+    ImportColumn("tags", "标签", ImportCellKind.LIST),
+    ImportColumn("is_active", "是否有效", ImportCellKind.BOOL),
+    ImportColumn("is_destructive", "是否破坏性", ImportCellKind.BOOL),
+    ImportColumn("estimated_duration_sec", "预估耗时(秒)", ImportCellKind.INT),
+    ImportColumn("version", "版本号", ImportCellKind.INT),
+    ImportColumn("change_log", "变更说明"),
+    ImportColumn("pre_condition", "前置条件"),
+    ImportColumn("post_condition", "后置条件"),
+    ImportColumn("failure_analysis", "失败分析"),
+    ImportColumn("confidentiality", "保密等级"),
+    ImportColumn("visibility_scope", "可见范围"),
+    ImportColumn("required_env", "环境要求", ImportCellKind.JSON),
+    ImportColumn("custom_fields", "自定义字段", ImportCellKind.JSON),
+    ImportColumn("steps", "执行步骤", ImportCellKind.JSON),
+    ImportColumn("cleanup_steps", "清理步骤", ImportCellKind.JSON),
+)
+
+REQUIREMENT_IMPORT_COLUMNS = (
+    ImportColumn("title", "需求简述"),
+    ImportColumn("description", "需求描述"),
+    ImportColumn("category", "需求分类"),
+    ImportColumn("source", "需求来源"),
+    ImportColumn("priority", "优先级"),
+    ImportColumn("tags", "标签", ImportCellKind.LIST),
+    ImportColumn("acceptance_criteria", "验收标准"),
+    ImportColumn("baseline_version", "基线版本"),
+    ImportColumn("target_version", "目标版本"),
+    ImportColumn("target_components", "目标组件", ImportCellKind.LIST),
+    ImportColumn("firmware_version", "固件版本"),
+    ImportColumn("key_parameters", "关键参数", ImportCellKind.JSON),
+    ImportColumn("risk_points", "风险点"),
+    ImportColumn("tpm_owner_id", "TPM负责人ID"),
+    ImportColumn("manual_dev_id", "手工用例开发ID"),
+    ImportColumn("auto_dev_id", "自动化开发ID"),
+    ImportColumn("planned_start_date", "计划开始日期"),
+    ImportColumn("planned_end_date", "计划结束日期"),
+)
+
+_pending_import_jobs: set[asyncio.Task] = set()
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+    return str(exc)
+
+
+class _ChunkResult:
+    """单块处理结果：待写入的文档与行级错误。"""
+
+    def __init__(self) -> None:
+        self.rows: list[tuple[int, Any, dict[str, Any]]] = []
+        self.errors: list[dict[str, Any]] = []
+
+    def fail(self, row_number: int, message: str) -> None:
+        self.errors.append({"row": row_number, "message": message})
+
+
+class SpecImportService(BaseService):
+    """测试用例 / 测试需求批量导入任务。"""
+
+    def __init__(
+        self,
+        workflow_gateway: WorkflowItemGateway,
+        catalog_service: CatalogService | None = None,
+        backfill_queue: EmbeddingBackfillQueue | None = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> None:
+        self._workflow_gateway = workflow_gateway
+        self._catalog_service = catalog_service or CatalogService()
+        self._backfill_queue = backfill_queue or embedding_backfill
+        self._chunk_size = chunk_size
+
+    # ── 任务管理 ──────────────────────────────────────────
+
+    async def submit_import_job(
+        self,
+        entity_type: str,
+        file_id: str,
+        created_by: str,
+        defaults: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """登记导入任务并在后台执行，立即返回任务句柄。"""
+        if entity_type not in IMPORT_ENTITY_TYPES:
+            raise ValueError(f"unsupported import entity type: {entity_type}")
+        filename = await get_attachment_filename(file_id)
+        if filename is None:
+            raise KeyError("import file not found")
+        file_format = detect_import_format(filename)
+        job = TestSpecImportJobDoc(
+            job_id=f"IMP-{uuid.uuid4().hex[:16]}",
+            entity_type=entity_type,
+            file_id=file_id,
+            file_format=file_format.value,
+            defaults=dict(defaults or {}),
+            created_by=created_by,
+        )
+        await job.insert()
+        self._start(job)
+        return self._doc_to_dict(job)
+
+    async def get_import_job(self, job_id: str, entity_type: str | None = None) -> Dict[str, Any]:
+        return self._doc_to_dict(await self._get_job(job_id, entity_type))
+
+    async def resume_import_job(self, job_id: str, entity_type: str | None = None) -> Dict[str, Any]:
+        """从已提交的位置继续执行失败或中断的任务。"""
+        job = await self._get_job(job_id, entity_type)
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+        # 条件更新认领任务：并发续传只有一个能命中，心跳仍在刷新的 RUNNING 任务不会被重复启动
+        claimed = await TestSpecImportJobDoc.get_pymongo_collection().update_one(
+            {
+                "_id": job.id,
+                "$or": [
+                    {"status": "FAILED"},
+                    {"status": "RUNNING", "updated_at": {"$lt": stale_before}},
+                ],
+            },
+            {"$set": {"status": "PENDING", "error": None, "finished_at": None,
+                      "updated_at": datetime.now(timezone.utc)}},
+        )
+        if claimed.matched_count == 0:
+            raise ValueError(f"import job is not resumable in status {job.status}")
+        job.status = "PENDING"
+        job.error = None
+        job.finished_at = None
+        self._start(job)
+        return self._doc_to_dict(job)
+
+    @staticmethod
+    async def _get_job(job_id: str, entity_type: str | None) -> TestSpecImportJobDoc:
+        job = await TestSpecImportJobDoc.find_one({"job_id": job_id})
+        if not job or (entity_type and job.entity_type != entity_type):
+            raise KeyError("import job not found")
+        return job
+
+    def _start(self, job: TestSpecImportJobDoc) -> None:
+        task = asyncio.get_running_loop().create_task(self._run_import_job(job))
+        _pending_import_jobs.add(task)
+        task.add_done_callback(_pending_import_jobs.discard)
+
+    async def _run_import_job(self, job: TestSpecImportJobDoc) -> None:
+        job.status = "RUNNING"
+        job.started_at = job.started_at or datetime.now(timezone.utc)
+        await job.save()
+        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(job))
+        columns = TEST_CASE_IMPORT_COLUMNS if job.entity_type == "test_case" else REQUIREMENT_IMPORT_COLUMNS
+        try:
+            with tempfile.TemporaryFile() as source:
+                await download_attachment_content(job.file_id, source)
+                source.seek(0)
+                chunks = iter_import_chunks(
+                    source,
+                    ExportFormat(job.file_format),
+                    columns,
+                    chunk_size=self._chunk_size,
+                    skip_rows=job.processed_rows,
+                )
+                while (rows := await asyncio.to_thread(next, chunks, None)) is not None:
+                    await self._import_chunk(job, rows)
+        except Exception as exc:
+            log.warning("批量导入失败 job_id={} processed={} err={}", job.job_id, job.processed_rows, exc)
+            job.status = "FAILED"
+            job.error = str(exc)
+        else:
+            job.status = "SUCCEEDED"
+        finally:
+            heartbeat.cancel()
+        job.finished_at = datetime.now(timezone.utc)
+        await job.save()
+
+    @staticmethod
+    async def _heartbeat(job: TestSpecImportJobDoc) -> None:
+        """任务执行期间定期刷新 updated_at，续传据此区分存活任务与中断任务。"""
+        while True:
+            await asyncio.sleep(IMPORT_JOB_HEARTBEAT_SECONDS)
+            try:
+                await TestSpecImportJobDoc.get_pymongo_collection().update_one(
+                    {"_id": job.id, "status": "RUNNING"},
+                    {"$set": {"updated_at": datetime.now(timezone.utc)}},
+                )
+            except Exception as exc:
+                log.warning("批量导入心跳失败 job_id={} err={}", job.job_id, exc)
+
+    # ── 分块导入 ──────────────────────────────────────────
+
+    async def _import_chunk(self, job: TestSpecImportJobDoc, rows: list[ImportRow]) -> None:
+        if job.entity_type == "test_case":
+            result = await self._prepare_case_chunk(job, rows)
+        else:
+            result = await self._prepare_requirement_chunk(job, rows)
+
+        created_ids: list[str] = []
+        work_item_ids: list[str] = []
+        async with get_mongo_client().start_session() as session:
+            async with await session.start_transaction():
+                if result.rows:
+                    if job.entity_type == "test_case":
+                        created_ids, work_item_ids = await self._persist_cases(job, result, session)
+                    else:
+                        created_ids, work_item_ids = await self._persist_requirements(result, session)
+                progress = self._progress_update(job, rows[-1].row_number, len(created_ids), result.errors)
+                await TestSpecImportJobDoc.get_pymongo_collection().update_one(
+                    {"_id": job.id},
+                    progress,
+                    session=session,
+                )
+
+        # 提交成功后再同步内存中的任务状态，事务失败时续传位置保持不变
+        job.processed_rows = rows[-1].row_number
+        job.created_count += len(created_ids)
+        job.failed_count += len(result.errors)
+        job.errors = (job.errors + result.errors)[:IMPORT_MAX_ERRORS]
+        if created_ids:
+            search_type = _SEARCH_ENTITY_TYPES[job.entity_type]
+            schedule_search_refresh(SearchEntityType.WORK_ITEM.value, work_item_ids)
+            schedule_search_refresh(search_type, created_ids)
+            self._backfill_queue.enqueue(job.entity_type, created_ids)
+        log.info(
+            "批量导入进度 job_id={} processed={} created={} failed={}",
+            job.job_id, job.processed_rows, job.created_count, job.failed_count,
+        )
+
+    @staticmethod
+    def _progress_update(
+        job: TestSpecImportJobDoc,
+        processed_rows: int,
+        created: int,
+        errors: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        update: dict[str, Any] = {
+            "$set": {"processed_rows": processed_rows, "updated_at": datetime.now(timezone.utc)},
+            "$inc": {"created_count": created, "failed_count": len(errors)},
+        }
+        room = IMPORT_MAX_ERRORS - len(job.errors)
+        if errors and room > 0:
+            update["$push"] = {"errors": {"$each": errors[:room]}}
+        return update
+
+    async def _allocate_ids(self, prefix: str, counter_name: str, count: int) -> list[str]:
+        year = datetime.now().year
+        seqs = await SequenceIdService().next_many(f"{counter_name}:{year}", count)
+        return [f"{prefix}-{year}-{str(seq).zfill(5)}" for seq in seqs]
+
+    def _decode_rows(
+        self,
+        job: TestSpecImportJobDoc,
+        rows: list[ImportRow],
+        columns: tuple[ImportColumn, ...],
+        result: _ChunkResult,
+    ) -> list[tuple[int, dict[str, Any]]]:
+        # 默认值只接受导入列，避免覆盖编号、工作流等系统字段
+        keys = {column.key for column in columns}
+        defaults = {key: value for key, value in job.defaults.items() if key in keys}
+        decoded: list[tuple[int, dict[str, Any]]] = []
+        for row in rows:
+            if row.error:
+                result.fail(row.row_number, row.error)
+                continue
+            if not row.values:
+                continue
+            try:
+                decoded.append((row.row_number, {**defaults, **decode_import_row(row.values, columns)}))
+            except ValueError as exc:
+                result.fail(row.row_number, str(exc))
+        return decoded
+
+    async def _prepare_case_chunk(self, job: TestSpecImportJobDoc, rows: list[ImportRow]) -> _ChunkResult:
+        result = _ChunkResult()
+        decoded = self._decode_rows(job, rows, TEST_CASE_IMPORT_COLUMNS, result)
+
+        lab_ids = {str(payload.get("lab_id") or "").strip() for _, payload in decoded}
+        active_labs = {
+            lab.lab_id
+            for lab in await TestLabDoc.find({"lab_id": {"$in": sorted(lab_ids - {""})}}).to_list()
+            if lab.is_active
+        }
+        req_ids = sorted({payload["ref_req_id"] for _, payload in decoded if payload.get("ref_req_id")})
+        requirements: dict[str, str | None] = {}
+        if req_ids:
+            found = await TestRequirementDoc.find({"req_id": {"$in": req_ids}, "is_deleted": False}).to_list()
+            requirements = {req.req_id: req.workflow_item_id for req in found}
+
+        for row_number, payload in decoded:
+            try:
+                payload = validate_test_case_step_fields(payload)
+                lab_id = str(payload.get("lab_id") or "").strip()
+                catalog_path = self._catalog_service.normalize_path_segments(
+                    payload.get("catalog_path") or [],
+                )
+                if not lab_id or not catalog_path:
+                    raise ValueError("lab_id 与 catalog_path 为必填项")
+                if lab_id not in active_labs:
+                    raise ValueError(f"Lab {lab_id} 不存在或未启用")
+                ref_req_id = payload.get("ref_req_id")
+                if ref_req_id and ref_req_id not in requirements:
+                    raise ValueError(f"requirement not found: {ref_req_id}")
+                payload.update(
+                    lab_id=lab_id,
+                    catalog_path=catalog_path,
+                    catalog_path_key=self._catalog_service.build_path_key(catalog_path),
+                    owner_id=payload.get("owner_id") or job.created_by,
+                )
+                # 编号在通过校验后按块统一预留，这里先占位完成模型校验
+                doc = TestCaseDoc(case_id="", **payload)
+            except ValueError as exc:
+                result.fail(row_number, _error_message(exc))
+                continue
+            work_item = {
+                "type_code": "TEST_CASE",
+                "title": doc.title,
+                "content": doc.pre_condition or doc.post_condition or doc.title,
+                "creator_id": doc.owner_id or doc.reviewer_id or "system",
+                "parent_item_id": requirements.get(ref_req_id) if ref_req_id else None,
+                "initial_state": WorkItemState.DEVELOPING.value,
+            }
+            result.rows.append((row_number, doc, work_item))
+        return result
+
+    async def _prepare_requirement_chunk(
+        self,
+        job: TestSpecImportJobDoc,
+        rows: list[ImportRow],
+    ) -> _ChunkResult:
+        result = _ChunkResult()
+        decoded = self._decode_rows(job, rows, REQUIREMENT_IMPORT_COLUMNS, result)
+        user_fields = ("tpm_owner_id", "manual_dev_id", "auto_dev_id")
+        user_names = await load_user_names(
+            [job.created_by] + [payload.get(field) for _, payload in decoded for field in user_fields],
+        )
+
+        for row_number, payload in decoded:
+            payload["tpm_owner_id"] = payload.get("tpm_owner_id") or job.created_by
+            for field in user_fields:
+                if payload.get(field):
+                    payload[f"{field[:-3]}_name"] = user_names.get(payload[field])
+            try:
+                doc = TestRequirementDoc(req_id="", **payload)
+            except ValueError as exc:
+                result.fail(row_number, _error_message(exc))
+                continue
+            work_item = {
+                "type_code": "REQUIREMENT",
+                "title": doc.title,
+                "content": doc.description or doc.title,
+                "creator_id": doc.tpm_owner_id,
+                "parent_item_id": None,
+            }
+            result.rows.append((row_number, doc, work_item))
+        return result
+
+    async def _create_work_items(self, result: _ChunkResult, session: Any) -> list[tuple[Any, str]]:
+        """批量创建工作项并回填到文档；同类型同标题已存在的行记为失败。"""
+        item_ids = await self._workflow_gateway.create_work_items(
+            [work_item for _, _, work_item in result.rows],
+            session=session,
+        )
+        created: list[tuple[Any, str]] = []
+        for (row_number, doc, work_item), item_id in zip(result.rows, item_ids):
+            if item_id is None:
+                result.fail(row_number, f"已存在相同标题的{work_item['type_code']}: {work_item['title']}")
+                continue
+            created.append((doc, item_id))
+        return created
+
+    async def _persist_cases(
+        self,
+        job: TestSpecImportJobDoc,
+        result: _ChunkResult,
+        session: Any,
+    ) -> tuple[list[str], list[str]]:
+        case_ids = await self._allocate_ids("TC", "test_case", len(result.rows))
+        for (_, doc, _), case_id in zip(result.rows, case_ids):
+            doc.case_id = case_id
+        created = await self._create_work_items(result, session)
+        if not created:
+            return [], []
+        docs = []
+        for doc, item_id in created:
+            doc.workflow_item_id = item_id
+            docs.append(doc)
+        await insert_created_test_cases(
+            docs,
+            catalog_service=self._catalog_service,
+            session=session,
+            operator_id=job.created_by,
+            default_remark=f"批量导入 {job.job_id}",
+        )
+        return [doc.case_id for doc in docs], [doc.workflow_item_id for doc in docs]
+
+    async def _persist_requirements(
+        self,
+        result: _ChunkResult,
+        session: Any,
+    ) -> tuple[list[str], list[str]]:
+        req_ids = await self._allocate_ids("TR", "test_requirement", len(result.rows))
+        for (_, doc, work_item), req_id in zip(result.rows, req_ids):
+            doc.req_id = req_id
+            # 将 req_id 冗余写入 BusWorkItemDoc，与单条创建一致
+            work_item["req_id"] = req_id
+        created = await self._create_work_items(result, session)
+        if not created:
+            return [], []
+        docs = []
+        for doc, item_id in created:
+            doc.workflow_item_id = item_id
+            docs.append(doc)
+        await TestRequirementDoc.insert_many(docs, session=session)
+        return [doc.req_id for doc in docs], [doc.workflow_item_id for doc in docs]
@@ -12,15 +12,18 @@
 """
 import asyncio
 from copy import deepcopy
-from typing import Dict, Any, Optional, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import date, datetime
 from pymongo import AsyncMongoClient
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
 from app.modules.test_specs.repository.models import TestRequirementDoc, TestCaseDoc
 from app.modules.test_specs.service._service_support import (
     apply_workflow_details_projection,
     create_with_workflow_transaction,
     ensure_safe_generic_update,
     load_workflow_states_for_entities,
+    project_export_rows,
     workflow_aware_soft_delete,
 )
 from app.modules.test_specs.service._workflow_status_support import (
@@ -31,9 +34,13 @@ from app.modules.test_specs.service._workflow_status_support import (
 from app.modules.workflow.application import WorkflowItemGateway, WorkflowStatusQueryPort
 from app.shared.core.logger import log as logger
 from app.shared.core.mongo_client import get_mongo_client
-from app.shared.service import BaseService, SequenceIdService
+from app.shared.export import EXPORT_CHUNK_SIZE, iter_cursor_chunks
+from app.shared.service import CREATED_AT_DESC, BaseService, SequenceIdService
 from app.shared.ai.embedding import EmbeddingService
 
+# 导出时补出姓名的人员字段（xxx_id -> xxx_name）
+_EXPORT_USER_FIELDS = ("tpm_owner_id", "manual_dev_id", "auto_dev_id")
+
 
 class RequirementService(BaseService):
     """测试需求 CRUD 服务（异步）"""
@@ -171,37 +178,30 @@ class RequirementService(BaseService):
             raise KeyError("requirement not found")
         return await self._enrich_requirement_status(self._doc_to_dict(doc))
 
-    async def list_requirements(
+    async def _build_list_conditions(
         self,
         status: Optional[str] = None,
         tpm_owner_id: Optional[str] = None,
         manual_dev_id: Optional[str] = None,
         auto_dev_id: Optional[str] = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        """分页查询需求列表，支持按状态/角色负责人过滤。
+    ) -> Optional[List[Dict[str, Any]]]:
+        """构建列表/导出共用的过滤条件（AND 关系）；状态下没有任何工作项时返回 None。
 
         Phase 3B重构：状态过滤从工作流源查询，确保单一真实来源。
-
-        说明：
-        - 默认只查询未逻辑删除数据（is_deleted=False）。
-        - 各过滤条件采用 AND 关系叠加。
-        - 状态过滤通过工作流查询实现，其他条件在业务文档上过滤。
         """
         # Phase 3B: 先从业务文档查询非状态条件
-        query = TestRequirementDoc.find({"is_deleted": False})
-        if tpm_owner_id:
-            query = query.find(TestRequirementDoc.tpm_owner_id == tpm_owner_id)
-        if manual_dev_id:
-            query = query.find(TestRequirementDoc.manual_dev_id == manual_dev_id)
-        if auto_dev_id:
-            query = query.find(TestRequirementDoc.auto_dev_id == auto_dev_id)
-
-        workflow_details: Dict[str, Dict[str, Any]] = {}
+        conditions: List[Dict[str, Any]] = [{"is_deleted": False}]
+        for field, value in (
+            ("tpm_owner_id", tpm_owner_id),
+            ("manual_dev_id", manual_dev_id),
+            ("auto_dev_id", auto_dev_id),
+        ):
+            if value:
+                conditions.append({field: value})
+
         if status:
             if status == DEFAULT_PROJECTED_STATUS:
-                query = query.find(
+                conditions.append(
                     {
                         "$or": [
                             {"workflow_item_id": None},
@@ -213,18 +213,48 @@ class RequirementService(BaseService):
             else:
                 workflow_item_ids = await self._get_workflow_item_ids_by_status(status)
                 if not workflow_item_ids:
-                    return []
-                query = query.find({"workflow_item_id": {"$in": workflow_item_ids}})
+                    return None
+                conditions.append({"workflow_item_id": {"$in": workflow_item_ids}})
+        return conditions
 
-        docs = await query.sort("-created_at").skip(offset).limit(limit).to_list()
+    async def list_requirements(
+        self,
+        status: Optional[str] = None,
+        tpm_owner_id: Optional[str] = None,
+        manual_dev_id: Optional[str] = None,
+        auto_dev_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """分页查询需求列表，支持按状态/角色负责人过滤。
+
+        说明：
+        - 默认只查询未逻辑删除数据（is_deleted=False）。
+        - 各过滤条件采用 AND 关系叠加。
+        - 状态过滤通过工作流查询实现，其他条件在业务文档上过滤。
+        - 传入 `cursor` 时按 `(created_at, _id)` keyset 翻页并忽略 `offset`。
+        """
+        conditions = await self._build_list_conditions(
+            status=status,
+            tpm_owner_id=tpm_owner_id,
+            manual_dev_id=manual_dev_id,
+            auto_dev_id=auto_dev_id,
+        )
+        if conditions is None:
+            return []
+        query = TestRequirementDoc.find(conditions[0])
+        for condition in conditions[1:]:
+            query = query.find(condition)
+
+        docs = await CREATED_AT_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
 
         # Phase 3B: 转换时确保使用工作流状态作为真实来源
         if not docs:
             return []
 
-        if not workflow_details:
-            req_ids = [doc.req_id for doc in docs]
-            workflow_details = await self._get_workflow_details_for_requirements(req_ids)
+        req_ids = [doc.req_id for doc in docs]
+        workflow_details = await self._get_workflow_details_for_requirements(req_ids)
         return apply_workflow_details_projection(
             docs=docs,
             id_getter=lambda doc: doc.req_id,
@@ -232,6 +262,27 @@ class RequirementService(BaseService):
             workflow_details=workflow_details,
         )
 
+    async def export_requirements(
+        self,
+        fields: List[str],
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        **filters: Any,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """按与列表相同的过滤条件游标遍历全部需求，逐块产出补齐状态与人员姓名的行。"""
+        conditions = await self._build_list_conditions(**filters)
+        if conditions is None:
+            return
+        projection = {field: 1 for field in (*fields, "req_id", "workflow_item_id", *_EXPORT_USER_FIELDS)}
+        projection["_id"] = 0
+        async for rows in iter_cursor_chunks(
+            TestRequirementDoc.get_pymongo_collection(),
+            conditions[0] if len(conditions) == 1 else {"$and": conditions},
+            projection=projection,
+            sort=[("created_at", -1)],
+            chunk_size=chunk_size,
+        ):
+            yield await project_export_rows(rows, id_field="req_id", user_fields=_EXPORT_USER_FIELDS)
+
     async def _get_workflow_item_ids_by_status(self, status: str) -> list[str]:
         return await self._workflow_gateway.list_work_item_ids_by_state(status)
 
@@ -273,6 +324,7 @@ class RequirementService(BaseService):
         self._apply_updates(doc, data, self._UPDATABLE_FIELDS)
         await doc.save()
         asyncio.create_task(self._refresh_embedding(req_id, doc))
+        schedule_search_refresh(SearchEntityType.REQUIREMENT.value, [req_id])
         return await self._enrich_requirement_status(self._doc_to_dict(doc))
 
     async def assign_owners(self, req_id: str, tpm_owner_id: str | None = None, manual_dev_id: str | None = None, auto_dev_id: str | None = None) -> Dict[str, Any]:
@@ -322,6 +374,7 @@ class RequirementService(BaseService):
                 setattr(doc, attr_name, name_map.get(uid))
 
         await doc.save()
+        schedule_search_refresh(SearchEntityType.REQUIREMENT.value, [req_id])
         return await self._enrich_requirement_status(self._doc_to_dict(doc))
 
     async def delete_requirement(self, req_id: str) -> None:
@@ -352,6 +405,7 @@ class RequirementService(BaseService):
             workflow_error_message="delete requirement through workflow-aware path only",
             extra_guard=_ensure_no_related_cases,
         )
+        schedule_search_refresh(SearchEntityType.REQUIREMENT.value, [req_id])
 
     async def _create_requirement_with_transaction(
         self,
@@ -383,6 +437,7 @@ class RequirementService(BaseService):
             enrich_result=lambda doc: self._enrich_requirement_status(self._doc_to_dict(doc)),
             # 将 req_id 冗余写入 BusWorkItemDoc，避免 serialize_work_item 跨集合查询
             redundant_fields={"req_id": "req_id"},
+            search_entity=(SearchEntityType.REQUIREMENT.value, "req_id"),
         )
 
     @staticmethod
@@ -436,14 +491,6 @@ class RequirementService(BaseService):
     @staticmethod
     async def _resolve_user_names(user_ids: List[str]) -> Dict[str, str | None]:
         """批量查询用户 ID → 用户名映射。"""
-        from app.modules.auth.repository.models import UserDoc
-        from beanie.operators import In as InOp
-
-        if not user_ids:
-            return {}
-
-        users = await UserDoc.find(
-            InOp(UserDoc.user_id, user_ids),
-        ).to_list()
+        from app.modules.auth.user_directory import UserDirectory
 
-        return {u.user_id: u.username for u in users}
+        return await UserDirectory.get_names(user_ids)
@@ -8,6 +8,7 @@
 2. 与需求文档的关联验证
 3. 与自动化测试用例的关联管理
 4. 分布式ID生成（基于MongoDB计数器）
+5. 批量创建（`create_test_cases`）：编号一次预留，分块事务内批量写入
 
 一致性策略：
 - 事务模式（唯一模式）：
@@ -19,11 +20,15 @@
 import asyncio
 from copy import deepcopy
 import re
-from typing import Dict, Any, Optional, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 from pymongo import AsyncMongoClient
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.test_specs.domain.exceptions import LabNotFoundError, TestSpecsError
 from app.modules.test_specs.repository.models import (
     TestCaseDoc,
+    TestLabDoc,
     TestRequirementDoc,
     AutomationTestCaseDoc,
 )
@@ -31,7 +36,9 @@ from app.modules.test_specs.service._service_support import (
     apply_workflow_status_projection,
     create_with_workflow_transaction,
     ensure_safe_generic_update,
+    insert_created_test_cases,
     load_workflow_states_for_entities,
+    project_export_rows,
     workflow_aware_soft_delete,
 )
 from app.modules.test_specs.service._workflow_status_support import (
@@ -39,6 +46,7 @@ from app.modules.test_specs.service._workflow_status_support import (
     enrich_projected_status,
 )
 from app.modules.test_specs.service.catalog_service import CatalogService
+from app.modules.test_specs.service.embedding_backfill import EmbeddingBackfillQueue, embedding_backfill
 from app.modules.workflow.application import WorkflowItemGateway
 from app.modules.workflow.repository.models.enums import WorkItemState
 from app.modules.attachments.repository.models import AttachmentDoc
@@ -46,10 +54,23 @@ from app.modules.test_specs.domain.repositories import TestCaseRepositoryProtoco
 from app.modules.test_specs.domain.test_case_step_validator import validate_test_case_step_fields
 from app.modules.test_specs.repository.test_case_repository import TestCaseRepository
 from app.shared.core.mongo_client import get_mongo_client
-from app.shared.service import BaseService, SequenceIdService
+from app.shared.export import EXPORT_CHUNK_SIZE, iter_cursor_chunks
+from app.shared.service import CREATED_AT_DESC, BaseService, SequenceIdService
 from app.shared.ai.embedding import EmbeddingService
 from app.shared.core.logger import log
 
+# 导出时补出姓名的人员字段（xxx_id -> xxx_name）
+_EXPORT_USER_FIELDS = ("owner_id", "reviewer_id", "auto_dev_id")
+# 批量创建时每个事务写入的用例数
+BATCH_CREATE_CHUNK_SIZE = 100
+
+
+def _row_error(exc: Exception) -> str:
+    # KeyError 的 str() 会带引号，与单条接口的 detail 保持一致
+    if isinstance(exc, KeyError) and exc.args:
+        return str(exc.args[0])
+    return str(exc)
+
 
 class TestCaseService(BaseService):
     """测试用例 CRUD 服务（异步）"""
@@ -95,9 +116,11 @@ class TestCaseService(BaseService):
         workflow_gateway: WorkflowItemGateway,
         catalog_service: CatalogService | None = None,
         case_repository: TestCaseRepositoryProtocol | None = None,
+        backfill_queue: EmbeddingBackfillQueue | None = None,
     ) -> None:
         self._workflow_gateway = workflow_gateway
         self._catalog_service = catalog_service or CatalogService()
+        self._backfill_queue = backfill_queue or embedding_backfill
         # 依赖仓储协议而非具体 Beanie Document，便于单测注入 Mock
         self._case_repo = case_repository or TestCaseRepository()
 
@@ -206,6 +229,57 @@ class TestCaseService(BaseService):
                 log.warning("embedding: 触发异步刷新失败 case={} err={}", result["data"].get("case_id"), e)
         return result
 
+    async def create_test_cases(
+        self,
+        items: List[Dict[str, Any]],
+        operator_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """批量创建测试用例，返回与入参顺序一致的逐行结果。
+
+        校验规则与 `create_test_case` 一致。通过校验的行一次预留编号，再按 `BATCH_CREATE_CHUNK_SIZE`
+        分块：每块一个事务，批量写入工作项、用例、CREATE 变更记录和目录段计数。
+        行级错误（校验失败、需求不存在、标题重复）只影响该行；块事务失败时该块剩余行整体记为失败。
+        embedding 交给 `embedding_backfill` 队列分批生成。
+        """
+        client = self._get_mongo_client_or_none()
+        if client is None:
+            raise RuntimeError("MongoDB客户端未初始化，无法创建测试用例")
+
+        results: List[Dict[str, Any]] = [
+            {"index": index, "success": False, "case_id": None, "data": None, "error": None}
+            for index in range(len(items))
+        ]
+        prepared = await self._prepare_batch_payloads(items, results)
+        for (_, payload), case_id in zip(prepared, await self._generate_case_ids(len(prepared))):
+            payload["case_id"] = case_id
+
+        for start in range(0, len(prepared), BATCH_CREATE_CHUNK_SIZE):
+            chunk = prepared[start:start + BATCH_CREATE_CHUNK_SIZE]
+            try:
+                created = await self._create_test_case_chunk(client, chunk, operator_id, results)
+            except Exception as exc:
+                log.warning("批量创建用例事务失败 rows={} err={}", len(chunk), exc)
+                for index, _ in chunk:
+                    results[index]["error"] = results[index]["error"] or _row_error(exc)
+                continue
+            if not created:
+                continue
+
+            docs = [doc for _, doc in created]
+            rows = apply_workflow_status_projection(
+                docs=docs,
+                id_getter=lambda doc: doc.case_id,
+                to_dict=self._doc_to_dict,
+                workflow_states={doc.case_id: WorkItemState.DEVELOPING.value for doc in docs},
+            )
+            for (index, doc), row in zip(created, rows):
+                results[index].update(success=True, case_id=doc.case_id, data=row)
+            case_ids = [doc.case_id for doc in docs]
+            schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [doc.workflow_item_id for doc in docs])
+            schedule_search_refresh(SearchEntityType.TEST_CASE.value, case_ids)
+            self._backfill_queue.enqueue("test_case", case_ids)
+        return results
+
     async def get_test_case(self, case_id: str) -> Dict[str, Any]:
         """根据case_id获取单个测试用例"""
         doc = await self._get_active_case(case_id)
@@ -216,7 +290,7 @@ class TestCaseService(BaseService):
         doc = await self._get_active_case(case_id)
         return self._doc_to_dict(doc)
 
-    async def list_test_cases(
+    async def _build_list_conditions(
             self,
             ref_req_id: Optional[str] = None,
             status: Optional[str] = None,
@@ -228,10 +302,8 @@ class TestCaseService(BaseService):
             catalog_prefix: Optional[List[str]] = None,
             tags: Optional[List[str]] = None,
             missing_fields: Optional[str] = None,
-            limit: int = 20,
-            offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        """分页查询测试用例列表，支持多种过滤条件。
+    ) -> Optional[List[Dict[str, Any]]]:
+        """构建列表/导出共用的过滤条件（AND 关系）；状态下没有任何工作项时返回 None。
 
         Phase 3B重构：状态过滤从工作流源查询，确保单一真实来源。
         """
@@ -276,23 +348,63 @@ class TestCaseService(BaseService):
                 ).to_list()
                 work_item_ids = [str(wi.id) for wi in work_items]
                 if not work_item_ids:
-                    return []
+                    return None
                 mongo_query["workflow_item_id"] = {"$in": work_item_ids}
 
-        query = TestCaseDoc.find(mongo_query)
-        if ref_req_id:
-            query = query.find(TestCaseDoc.ref_req_id == ref_req_id)
-        if owner_id:
-            query = query.find(TestCaseDoc.owner_id == owner_id)
-        if reviewer_id:
-            query = query.find(TestCaseDoc.reviewer_id == reviewer_id)
-        if priority:
-            query = query.find(TestCaseDoc.priority == priority)
+        conditions = [mongo_query]
+        for field, value in (
+            ("ref_req_id", ref_req_id),
+            ("owner_id", owner_id),
+            ("reviewer_id", reviewer_id),
+            ("priority", priority),
+        ):
+            if value:
+                conditions.append({field: value})
         if is_active is not None:
-            query = query.find(TestCaseDoc.is_active == is_active)
+            conditions.append({"is_active": is_active})
+        return conditions
 
-        # 统一分页查询（status 与非 status 均走 DB 端 skip/limit，避免全量加载）
-        docs = await query.sort("-created_at").skip(offset).limit(limit).to_list()
+    async def list_test_cases(
+            self,
+            ref_req_id: Optional[str] = None,
+            status: Optional[str] = None,
+            owner_id: Optional[str] = None,
+            reviewer_id: Optional[str] = None,
+            priority: Optional[str] = None,
+            is_active: Optional[bool] = None,
+            lab_id: Optional[str] = None,
+            catalog_prefix: Optional[List[str]] = None,
+            tags: Optional[List[str]] = None,
+            missing_fields: Optional[str] = None,
+            limit: int = 20,
+            offset: int = 0,
+            cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """分页查询测试用例列表，支持多种过滤条件。
+
+        传入 `cursor` 时按 `(created_at, _id)` keyset 翻页并忽略 `offset`，
+        下一页游标由调用方用 `CREATED_AT_DESC.next_cursor` 从结果生成。
+        """
+        conditions = await self._build_list_conditions(
+            ref_req_id=ref_req_id,
+            status=status,
+            owner_id=owner_id,
+            reviewer_id=reviewer_id,
+            priority=priority,
+            is_active=is_active,
+            lab_id=lab_id,
+            catalog_prefix=catalog_prefix,
+            tags=tags,
+            missing_fields=missing_fields,
+        )
+        if conditions is None:
+            return []
+        query = TestCaseDoc.find(conditions[0])
+        for condition in conditions[1:]:
+            query = query.find(condition)
+
+        # 统一分页查询（status 与非 status 均走 DB 端分页，避免全量加载）
+        docs = await CREATED_AT_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         if not docs:
             return []
 
@@ -306,6 +418,31 @@ class TestCaseService(BaseService):
             workflow_states=workflow_states,
         )
 
+    async def export_test_cases(
+            self,
+            fields: List[str],
+            chunk_size: int = EXPORT_CHUNK_SIZE,
+            **filters: Any,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """按与列表相同的过滤条件游标遍历全部用例，逐块产出补齐状态与人员姓名的行。
+
+        只投影导出需要的字段；工作流状态与用户名按块批量查询，不再逐页调用
+        `_get_workflow_states_for_test_cases` 重新查一遍用例。
+        """
+        conditions = await self._build_list_conditions(**filters)
+        if conditions is None:
+            return
+        projection = {field: 1 for field in (*fields, "case_id", "workflow_item_id", *_EXPORT_USER_FIELDS)}
+        projection["_id"] = 0
+        async for rows in iter_cursor_chunks(
+            TestCaseDoc.get_pymongo_collection(),
+            conditions[0] if len(conditions) == 1 else {"$and": conditions},
+            projection=projection,
+            sort=[("created_at", -1)],
+            chunk_size=chunk_size,
+        ):
+            yield await project_export_rows(rows, id_field="case_id", user_fields=_EXPORT_USER_FIELDS)
+
     async def list_governance_cases(
         self,
         q: Optional[str] = None,
@@ -394,6 +531,7 @@ class TestCaseService(BaseService):
         self._apply_updates(doc, update_payload, self._UPDATABLE_FIELDS)
         await doc.save()
         asyncio.create_task(self._refresh_embedding(doc))
+        schedule_search_refresh(SearchEntityType.TEST_CASE.value, [case_id])
         return await self._enrich_test_case_status(self._doc_to_dict(doc))
 
     async def delete_test_case(self, case_id: str) -> None:
@@ -411,6 +549,7 @@ class TestCaseService(BaseService):
             workflow_item_id=doc.workflow_item_id,
             workflow_error_message="delete test case through workflow-aware path only",
         )
+        schedule_search_refresh(SearchEntityType.TEST_CASE.value, [case_id])
 
     async def link_automation_case(
             self,
@@ -488,6 +627,7 @@ class TestCaseService(BaseService):
             doc.auto_dev_id = auto_dev_id
 
         await doc.save()
+        schedule_search_refresh(SearchEntityType.TEST_CASE.value, [case_id])
         return await self._enrich_test_case_status(self._doc_to_dict(doc))
 
     async def move_to_requirement(self, case_id: str, target_req_id: str) -> Dict[str, Any]:
@@ -539,6 +679,7 @@ class TestCaseService(BaseService):
         逐条更新，单条失败不影响其他，返回部分失败报告。
         """
         updated_count = 0
+        updated_ids: List[str] = []
         failures: List[Dict[str, str]] = []
 
         for case_id in case_ids:
@@ -578,9 +719,12 @@ class TestCaseService(BaseService):
                 self._apply_updates(doc, update_data, self._UPDATABLE_FIELDS)
                 await doc.save()
                 updated_count += 1
+                updated_ids.append(case_id)
             except Exception as exc:
                 failures.append({"case_id": case_id, "reason": str(exc)})
 
+        schedule_search_refresh(SearchEntityType.TEST_CASE.value, updated_ids)
+
         return {
             "updated_count": updated_count,
             "failed_count": len(failures),
@@ -686,8 +830,113 @@ class TestCaseService(BaseService):
             workflow_item_factory=_workflow_item_factory,
             enrich_result=lambda doc: self._enrich_test_case_status(self._doc_to_dict(doc)),
             prepare_payload=_prepare_payload,
+            search_entity=(SearchEntityType.TEST_CASE.value, "case_id"),
         )
 
+    async def _prepare_batch_payloads(
+        self,
+        items: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+    ) -> List[tuple[int, Dict[str, Any]]]:
+        """逐行校验步骤与目录字段，Lab 一次批量查询；失败的行直接写入 results。"""
+        lab_ids = {str(item.get("lab_id") or "").strip() for item in items}
+        labs = {
+            lab.lab_id: lab
+            for lab in await TestLabDoc.find({"lab_id": {"$in": sorted(lab_ids - {""})}}).to_list()
+        }
+        prepared: List[tuple[int, Dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            try:
+                payload = validate_test_case_step_fields(deepcopy(item))
+                lab_id = str(payload.get("lab_id") or "").strip()
+                if not lab_id or not payload.get("catalog_path"):
+                    raise ValueError("lab_id 与 catalog_path 为必填项")
+                lab = labs.get(lab_id)
+                if lab is None:
+                    raise LabNotFoundError(lab_id)
+                if not lab.is_active:
+                    raise ValueError(f"Lab {lab_id} 未启用")
+                catalog_path = self._catalog_service.normalize_path_segments(payload["catalog_path"])
+                payload.update(
+                    lab_id=lab_id,
+                    catalog_path=catalog_path,
+                    catalog_path_key=self._catalog_service.build_path_key(catalog_path),
+                )
+                # 编号在全部行校验后统一预留，这里先占位完成模型校验
+                TestCaseDoc(**{**payload, "case_id": ""})
+            except (ValueError, TestSpecsError) as exc:
+                results[index]["error"] = _row_error(exc)
+                continue
+            prepared.append((index, payload))
+        return prepared
+
+    async def _create_test_case_chunk(
+        self,
+        client: AsyncMongoClient,
+        chunk: List[tuple[int, Dict[str, Any]]],
+        operator_id: Optional[str],
+        results: List[Dict[str, Any]],
+    ) -> List[tuple[int, TestCaseDoc]]:
+        """在一个事务内写入一块用例，返回成功写入的 (行号, 文档)。"""
+        async with client.start_session() as session:
+            async with await session.start_transaction():
+                req_ids = sorted({payload["ref_req_id"] for _, payload in chunk if payload.get("ref_req_id")})
+                requirements: Dict[str, Optional[str]] = {}
+                if req_ids:
+                    found = await TestRequirementDoc.find(
+                        {"req_id": {"$in": req_ids}, "is_deleted": False},
+                        session=session,
+                    ).to_list()
+                    requirements = {req.req_id: req.workflow_item_id for req in found}
+
+                rows: List[tuple[int, TestCaseDoc, Dict[str, Any]]] = []
+                for index, payload in chunk:
+                    ref_req_id = payload.get("ref_req_id")
+                    try:
+                        if ref_req_id and ref_req_id not in requirements:
+                            raise KeyError("requirement not found")
+                        if payload.get("attachments"):
+                            payload["attachments"] = await self._validate_and_enrich_attachments(
+                                payload["attachments"],
+                                session=session,
+                            )
+                        doc = TestCaseDoc(**payload)
+                    except (KeyError, ValueError) as exc:
+                        results[index]["error"] = _row_error(exc)
+                        continue
+                    rows.append((index, doc, {
+                        "type_code": "TEST_CASE",
+                        "title": doc.title,
+                        "content": doc.pre_condition or doc.post_condition or doc.title,
+                        "creator_id": doc.owner_id or doc.reviewer_id or "system",
+                        "parent_item_id": requirements.get(ref_req_id) if ref_req_id else None,
+                        "initial_state": WorkItemState.DEVELOPING.value,
+                    }))
+                if not rows:
+                    return []
+
+                item_ids = await self._workflow_gateway.create_work_items(
+                    [work_item for _, _, work_item in rows],
+                    session=session,
+                )
+                created: List[tuple[int, TestCaseDoc]] = []
+                for (index, doc, work_item), item_id in zip(rows, item_ids):
+                    if item_id is None:
+                        results[index]["error"] = f"已存在相同标题的TEST_CASE: {work_item['title']}"
+                        continue
+                    doc.workflow_item_id = item_id
+                    created.append((index, doc))
+                if not created:
+                    return []
+
+                await insert_created_test_cases(
+                    [doc for _, doc in created],
+                    catalog_service=self._catalog_service,
+                    session=session,
+                    operator_id=operator_id,
+                )
+        return created
+
     @staticmethod
     def _get_mongo_client_or_none() -> Optional[AsyncMongoClient]:
         """获取MongoDB客户端，如果未初始化则返回None"""
@@ -811,6 +1060,14 @@ class TestCaseService(BaseService):
 
         return f"{prefix}{str(next_seq).zfill(5)}"
 
+    async def _generate_case_ids(self, count: int) -> List[str]:
+        """一次计数器更新预留 count 个连续编号，格式同 `_generate_case_id`。"""
+        if count <= 0:
+            return []
+        year = datetime.now().year
+        seqs = await SequenceIdService().next_many(f"test_case:{year}", count)
+        return [f"TC-{year}-{str(seq).zfill(5)}" for seq in seqs]
+
     # ── Embedding 自动生成 ──────────────────────────────────
 
     @staticmethod
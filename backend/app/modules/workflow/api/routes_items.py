@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.modules.workflow.api.dependencies import (
     WorkflowCommandServiceDep,
@@ -10,14 +10,21 @@ from app.modules.workflow.api.dependencies import (
     build_operation_context,
 )
 from app.modules.workflow.application import CreateWorkItemCommand
+from app.modules.workflow.domain.rules import normalize_sort
 from app.modules.workflow.schemas.work_item import CreateWorkItemRequest, WorkItemResponse
 from app.shared.api.schemas.base import APIResponse
 from app.shared.api.schemas.error import ErrorResponse
 from app.shared.auth import get_current_user, require_permission
+from app.shared.service import CREATED_AT_DESC, CURSOR_HEADER, InvalidCursorError, KeysetSort
 
 router = APIRouter()
 
 
+def _set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[CURSOR_HEADER] = next_cursor
+
+
 @router.post(
     "/",
     response_model=APIResponse[WorkItemResponse],
@@ -53,16 +60,21 @@ async def create_work_item(
 )
 async def list_work_items(
     service: WorkflowQueryServiceDep,
+    response: Response,
     type_code: Optional[str] = Query(None, description="按类型筛选"),
     state: Optional[str] = Query(None, description="按状态筛选"),
     owner_id: Optional[str] = Query(None, description="按当前处理人筛选"),
     creator_id: Optional[str] = Query(None, description="按创建人筛选"),
     limit: int = Query(20, ge=1, le=100, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="分页偏移"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
-    return APIResponse(
-        data=await service.list_items(type_code, state, owner_id, creator_id, limit, offset)
-    )
+    try:
+        data = await service.list_items(type_code, state, owner_id, creator_id, limit, offset, cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    _set_next_cursor(response, CREATED_AT_DESC.next_cursor(data, limit))
+    return APIResponse(data=data)
 
 
 @router.get(
@@ -73,6 +85,7 @@ async def list_work_items(
 )
 async def list_work_items_sorted(
     service: WorkflowQueryServiceDep,
+    response: Response,
     type_code: Optional[str] = Query(None, description="按类型筛选"),
     state: Optional[str] = Query(None, description="按状态筛选"),
     owner_id: Optional[str] = Query(None, description="按当前处理人筛选"),
@@ -81,12 +94,17 @@ async def list_work_items_sorted(
     offset: int = Query(0, ge=0, description="分页偏移"),
     order_by: str = Query("created_at", description="排序字段: created_at/updated_at/title"),
     direction: str = Query("desc", description="排序方向: asc/desc"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
-    return APIResponse(
-        data=await service.list_items_sorted(
-            type_code, state, owner_id, creator_id, limit, offset, order_by, direction
+    try:
+        data = await service.list_items_sorted(
+            type_code, state, owner_id, creator_id, limit, offset, order_by, direction, cursor
         )
-    )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    keyset = KeysetSort.parse(normalize_sort(order_by, direction))
+    _set_next_cursor(response, keyset.next_cursor(data, limit))
+    return APIResponse(data=data)
 
 
 @router.get(
@@ -97,6 +115,7 @@ async def list_work_items_sorted(
 )
 async def search_work_items(
     service: WorkflowQueryServiceDep,
+    response: Response,
     keyword: str = Query(..., min_length=2, max_length=100, description="关键词，搜索标题和内容"),
     type_code: Optional[str] = Query(None, description="按类型筛选"),
     state: Optional[str] = Query(None, description="按状态筛选"),
@@ -104,10 +123,16 @@ async def search_work_items(
     creator_id: Optional[str] = Query(None, description="按创建人筛选"),
     limit: int = Query(20, ge=1, le=100, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="分页偏移"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值，传入后忽略 offset"),
 ):
-    return APIResponse(
-        data=await service.search_items(keyword, type_code, state, owner_id, creator_id, limit, offset)
-    )
+    try:
+        data, next_cursor = await service.search_items_page(
+            keyword, type_code, state, owner_id, creator_id, limit, offset, cursor
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    _set_next_cursor(response, next_cursor)
+    return APIResponse(data=data)
 
 
 @router.get(
@@ -8,6 +8,7 @@ from app.modules.workflow.api.dependencies import (
     build_operation_context,
 )
 from app.modules.workflow.application import (
+    BatchTransitionWorkItemsCommand,
     DeleteWorkItemCommand,
     ReassignWorkItemCommand,
     TransitionWorkItemCommand,
@@ -21,6 +22,8 @@ from app.modules.workflow.domain.exceptions import (
 from app.modules.workflow.schemas.work_item import (
     AvailableTransitionResponse,
     AvailableTransitionsResponse,
+    BatchTransitionRequest,
+    BatchTransitionResponse,
     DeleteWorkItemData,
     TransitionLogResponse,
     TransitionRequest,
@@ -97,6 +100,36 @@ async def transition_work_item(
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+@router.post(
+    "/transitions/batch",
+    response_model=APIResponse[BatchTransitionResponse],
+    summary="批量执行状态流转",
+    dependencies=[Depends(require_permission("work_items:transition"))],
+)
+async def batch_transition_work_items(
+    request: BatchTransitionRequest,
+    command_service: WorkflowCommandServiceDep,
+    current_user=Depends(get_current_user),
+):
+    results = await command_service.transition_work_items(
+        build_operation_context(current_user),
+        BatchTransitionWorkItemsCommand(
+            work_item_ids=request.item_ids,
+            action=request.action,
+            form_data=request.form_data,
+        ),
+    )
+    succeeded = sum(1 for result in results if result["success"])
+    return APIResponse(
+        data=BatchTransitionResponse(
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=results,
+        )
+    )
+
+
 @router.post(
     "/{item_id}/reassign",
     response_model=APIResponse[WorkItemResponse],
@@ -1,4 +1,5 @@
 from .commands import (
+    BatchTransitionWorkItemsCommand,
     CreateWorkItemCommand,
     DeleteWorkItemCommand,
     ReassignWorkItemCommand,
@@ -7,10 +8,12 @@ from .commands import (
 from .contexts import OperationContext
 from .ports import WorkflowItemGateway, WorkflowMutationHook, WorkflowStatusQueryPort
 from .query_service import WorkflowQueryService
+from .state_machine_store import WorkflowStateMachineStore
 from .mutation_service import WorkflowMutationService
 from .workflow_command_service import WorkflowCommandService
 
 __all__ = [
+    "BatchTransitionWorkItemsCommand",
     "CreateWorkItemCommand",
     "DeleteWorkItemCommand",
     "WorkflowQueryService",
@@ -20,5 +23,6 @@ __all__ = [
     "WorkflowItemGateway",
     "WorkflowCommandService",
     "WorkflowMutationHook",
+    "WorkflowStateMachineStore",
     "WorkflowStatusQueryPort",
 ]
@@ -17,6 +17,13 @@ class TransitionWorkItemCommand:
     form_data: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class BatchTransitionWorkItemsCommand:
+    work_item_ids: list[str]
+    action: str
+    form_data: dict[str, Any] = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class ReassignWorkItemCommand:
     work_item_id: str
@@ -1,29 +1,46 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any
 
 from beanie import PydanticObjectId
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, UpdateOne
 from pymongo.asynchronous.client_session import AsyncClientSession
 from pymongo.errors import DuplicateKeyError
 
-from app.modules.workflow.application.common import get_work_item_doc, insert_doc, save_doc, serialize_work_item
+from app.modules.search.application import schedule_search_refresh
+from app.modules.search.domain.constants import SearchEntityType
+from app.modules.workflow.application.common import (
+    docs_to_dicts,
+    get_work_item_doc,
+    insert_doc,
+    save_doc,
+    serialize_work_item,
+)
+from app.modules.workflow.application.state_machine_store import WorkflowStateMachineStore
 from app.modules.workflow.domain.exceptions import (
     InvalidTransitionError,
     PermissionDeniedError,
+    WorkflowError,
     WorkItemNotFoundError,
 )
-from app.modules.workflow.domain.policies import can_delete_work_item, can_reassign, can_transition
+from app.modules.workflow.domain.policies import can_delete_work_item, can_reassign
 from app.modules.workflow.domain.rules import build_process_payload, ensure_required_fields, resolve_owner
 from app.modules.workflow.repository.models import (
     BusFlowLogDoc,
     BusWorkItemDoc,
-    SysWorkflowConfigDoc,
     WorkItemState,
 )
 from app.shared.core.logger import log as logger
 from app.shared.core.mongo_client import get_mongo_client
 
+# 批量流转每个事务处理的事项数：整块一次 bulk_write + insert_many，块之间互不影响
+BATCH_TRANSITION_CHUNK_SIZE = 200
+
+
+def _failed_transition(work_item_id: str, error: str) -> dict[str, Any]:
+    return {"work_item_id": work_item_id, "success": False, "error": error}
+
 
 class WorkflowMutationService:
     """工作流写操作服务。
@@ -98,6 +115,9 @@ class WorkflowMutationService:
             )
             await new_item.insert(session=session)
             logger.success(f"业务事项创建成功: ID={new_item.id}, state={new_item.current_state}")
+            # 事务内创建时由调用方在提交后刷新搜索索引
+            if session is None:
+                schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [str(new_item.id)])
             return await serialize_work_item(new_item)
         except DuplicateKeyError as exc:
             logger.warning(f"业务事项并发创建冲突(type_code={type_code}, title={title}): {exc}")
@@ -106,6 +126,67 @@ class WorkflowMutationService:
             logger.error(f"创建业务事项失败: {exc}")
             raise
 
+    async def create_items(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncClientSession | None = None,
+    ) -> list[str | None]:
+        """批量创建工作项（批量导入使用），返回与入参顺序一致的工作项 ID。
+
+        每个条目包含 type_code/title/content/creator_id，可选 parent_item_id/initial_state/req_id。
+        同类型下已存在或本批内重复的标题不创建，对应位置返回 None，由调用方记为行级失败。
+        """
+        if not items:
+            return []
+        titles_by_type: dict[str, set[str]] = {}
+        for item in items:
+            titles_by_type.setdefault(item["type_code"], set()).add(item["title"])
+        taken: set[tuple[str, str]] = set()
+        collection = BusWorkItemDoc.get_pymongo_collection()
+        for type_code, titles in titles_by_type.items():
+            cursor = collection.find(
+                {"type_code": type_code, "title": {"$in": list(titles)}, "is_deleted": False},
+                projection={"title": 1},
+                session=session,
+            )
+            taken.update((type_code, doc["title"]) async for doc in cursor)
+
+        item_ids: list[str | None] = []
+        new_items: list[BusWorkItemDoc] = []
+        for item in items:
+            key = (item["type_code"], item["title"])
+            if key in taken:
+                item_ids.append(None)
+                continue
+            taken.add(key)
+            parent_item_id = item.get("parent_item_id")
+            start_state = (item.get("initial_state") or WorkItemState.DRAFT.value).strip().upper()
+            # 预先分配 ObjectId：insert_many 不会回填文档 ID
+            new_item = BusWorkItemDoc(
+                id=PydanticObjectId(),
+                type_code=item["type_code"],
+                title=item["title"],
+                content=item["content"],
+                parent_item_id=(
+                    PydanticObjectId(parent_item_id)
+                    if parent_item_id and PydanticObjectId.is_valid(parent_item_id)
+                    else None
+                ),
+                creator_id=item["creator_id"],
+                current_owner_id=item["creator_id"],
+                current_state=start_state,
+                req_id=item.get("req_id"),
+            )
+            new_items.append(new_item)
+            item_ids.append(str(new_item.id))
+
+        if new_items:
+            await BusWorkItemDoc.insert_many(new_items, session=session)
+            logger.success(f"批量创建业务事项: created={len(new_items)}, skipped={len(items) - len(new_items)}")
+            if session is None:
+                schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [str(doc.id) for doc in new_items])
+        return item_ids
+
     async def handle_transition(
         self,
         work_item_id: str,
@@ -128,7 +209,7 @@ class WorkflowMutationService:
         try:
             async with client.start_session() as session:
                 async with await session.start_transaction():
-                    return await self._handle_transition_core(
+                    result = await self._handle_transition_core(
                         work_item_id=work_item_id,
                         action=action,
                         operator_id=operator_id,
@@ -141,6 +222,8 @@ class WorkflowMutationService:
                 logger.error("MongoDB 部署不支持事务，已拒绝执行非原子状态流转")
                 raise RuntimeError("workflow transition requires MongoDB transaction support") from exc
             raise
+        schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [work_item_id])
+        return result
 
     async def _handle_transition_core(
         self,
@@ -157,18 +240,16 @@ class WorkflowMutationService:
             logger.error(f"流转失败: 未找到业务事项 ID={work_item_id}")
             raise WorkItemNotFoundError(work_item_id)
 
-        # 按 type_code + 当前状态 + action 查找允许的流转配置。
-        config_doc = await SysWorkflowConfigDoc.find_one(
-            {"type_code": item_doc.type_code, "from_state": item_doc.current_state, "action": action},
-            session=session,
-        )
+        # 按 type_code + 当前状态 + action 在编译好的状态机中查找允许的流转规则。
+        machine = await WorkflowStateMachineStore.get()
+        config_doc = machine.transition(item_doc.type_code, item_doc.current_state, action)
         if not config_doc:
             logger.error(f"流转失败: 非法操作。当前状态 {item_doc.current_state} 不支持动作 {action}")
             raise InvalidTransitionError(item_doc.current_state, action)
 
         # 先做权限校验，再做字段校验和状态变更。
         actor = {"actor_id": operator_id, "role_ids": actor_role_ids or []}
-        if not can_transition(actor, item_doc, config_doc):
+        if not machine.permits(actor, item_doc, config_doc):
             raise PermissionDeniedError(operator_id, "transition")
 
         # 校验流转所需表单字段，并组装审计/流程处理载荷。
@@ -196,6 +277,7 @@ class WorkflowMutationService:
             action=action,
             operator_id=operator_id,
             payload=process_payload,
+            project_ids=list(item_doc.project_ids or []),
         )
         await insert_doc(log_entry, session=session)
 
@@ -211,6 +293,146 @@ class WorkflowMutationService:
             "work_item": item_dict,
         }
 
+    async def handle_transitions(
+        self,
+        work_item_ids: list[str],
+        action: str,
+        operator_id: str,
+        form_data: dict[str, Any],
+        actor_role_ids: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """批量执行同一动作的状态流转，按入参顺序返回每个工作项的结果。
+
+        按 `BATCH_TRANSITION_CHUNK_SIZE` 分块，每块一个事务：整块工作项查一次、按内存状态机逐项校验，
+        状态更新走一次 `bulk_write`，流转日志走一次 `insert_many`。
+        单个工作项校验失败（不存在、非法流转、无权限、缺字段）只记为该项失败；
+        某块写入失败时整块回滚、整块记为失败，不影响其他块。
+        """
+        unique_ids = list(dict.fromkeys(work_item_ids))
+        logger.info(f"开始批量状态流转: count={len(unique_ids)}, action={action}, operator={operator_id}")
+        client = self.get_mongo_client_or_none()
+        if client is None:
+            logger.error("MongoDB 客户端未初始化，无法执行原子状态流转")
+            raise RuntimeError("workflow transition requires initialized MongoDB client")
+
+        results: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(unique_ids), BATCH_TRANSITION_CHUNK_SIZE):
+            chunk = unique_ids[start:start + BATCH_TRANSITION_CHUNK_SIZE]
+            try:
+                async with client.start_session() as session:
+                    async with await session.start_transaction():
+                        chunk_results = await self._handle_transitions_core(
+                            work_item_ids=chunk,
+                            action=action,
+                            operator_id=operator_id,
+                            form_data=form_data,
+                            actor_role_ids=actor_role_ids,
+                            session=session,
+                        )
+            except Exception as exc:
+                if self.is_transaction_not_supported(exc):
+                    logger.error("MongoDB 部署不支持事务，已拒绝执行非原子状态流转")
+                    raise RuntimeError("workflow transition requires MongoDB transaction support") from exc
+                logger.error(f"批量状态流转写入失败，本块已回滚: count={len(chunk)}, error={exc}")
+                chunk_results = [_failed_transition(item_id, str(exc)) for item_id in chunk]
+            results.update((result["work_item_id"], result) for result in chunk_results)
+
+        succeeded_ids = [item_id for item_id in unique_ids if results[item_id]["success"]]
+        if succeeded_ids:
+            schedule_search_refresh(SearchEntityType.WORK_ITEM.value, succeeded_ids)
+        logger.success(f"批量状态流转完成: succeeded={len(succeeded_ids)}, total={len(unique_ids)}")
+        return [results[item_id] for item_id in unique_ids]
+
+    async def _handle_transitions_core(
+        self,
+        work_item_ids: list[str],
+        action: str,
+        operator_id: str,
+        form_data: dict[str, Any],
+        actor_role_ids: list[str] | None,
+        session: AsyncClientSession | None,
+    ) -> list[dict[str, Any]]:
+        object_ids = [PydanticObjectId(item_id) for item_id in work_item_ids if PydanticObjectId.is_valid(item_id)]
+        item_docs = await BusWorkItemDoc.find(
+            {"_id": {"$in": object_ids}, "is_deleted": False}, session=session
+        ).to_list()
+        items_by_id = {str(doc.id): doc for doc in item_docs}
+        machine = await WorkflowStateMachineStore.get()
+
+        actor = {"actor_id": operator_id, "role_ids": actor_role_ids or []}
+        now = datetime.now(timezone.utc)
+        results: dict[str, dict[str, Any]] = {}
+        updates: list[UpdateOne] = []
+        log_entries: list[BusFlowLogDoc] = []
+        moved_docs: list[BusWorkItemDoc] = []
+        for item_id in work_item_ids:
+            item_doc = items_by_id.get(item_id)
+            try:
+                if item_doc is None:
+                    raise WorkItemNotFoundError(item_id)
+                config_doc = machine.transition(item_doc.type_code, item_doc.current_state, action)
+                if config_doc is None:
+                    raise InvalidTransitionError(item_doc.current_state, action)
+                if not machine.permits(actor, item_doc, config_doc):
+                    raise PermissionDeniedError(operator_id, "transition")
+                ensure_required_fields(config_doc.required_fields, form_data)
+                new_owner_id = resolve_owner(
+                    strategy=config_doc.target_owner_strategy,
+                    work_item=item_doc.model_dump(),
+                    form_data=form_data,
+                )
+            except WorkflowError as exc:
+                results[item_id] = _failed_transition(item_id, str(exc))
+                continue
+
+            old_state = item_doc.current_state
+            # 以读到的状态为条件更新，与并发流转冲突时匹配数不足，整块回滚
+            updates.append(UpdateOne(
+                {"_id": item_doc.id, "current_state": old_state, "is_deleted": False},
+                {"$set": {
+                    "current_state": config_doc.to_state,
+                    "current_owner_id": new_owner_id,
+                    "updated_at": now,
+                }},
+            ))
+            log_entries.append(BusFlowLogDoc(
+                work_item_id=item_doc.id,
+                from_state=old_state,
+                to_state=config_doc.to_state,
+                action=action,
+                operator_id=operator_id,
+                payload=build_process_payload(config_doc.required_fields, form_data),
+                project_ids=list(item_doc.project_ids or []),
+            ))
+            item_doc.current_state = config_doc.to_state
+            item_doc.current_owner_id = new_owner_id
+            item_doc.updated_at = now
+            moved_docs.append(item_doc)
+            results[item_id] = {
+                "work_item_id": item_id,
+                "success": True,
+                "from_state": old_state,
+                "to_state": config_doc.to_state,
+                "action": action,
+                "operator_id": operator_id,
+                "new_owner_id": new_owner_id,
+                "error": None,
+            }
+
+        if updates:
+            write_result = await BusWorkItemDoc.get_pymongo_collection().bulk_write(
+                updates, ordered=False, session=session
+            )
+            if write_result.matched_count != len(updates):
+                raise RuntimeError(
+                    f"并发流转冲突: expected={len(updates)}, matched={write_result.matched_count}"
+                )
+            await BusFlowLogDoc.insert_many(log_entries, session=session)
+
+        for item_dict in await docs_to_dicts(moved_docs):
+            results[item_dict["id"]]["work_item"] = item_dict
+        return [results[item_id] for item_id in work_item_ids]
+
     async def delete_item(
         self,
         item_id: str,
@@ -229,7 +451,7 @@ class WorkflowMutationService:
         try:
             async with client.start_session() as session:
                 async with await session.start_transaction():
-                    return await self._delete_item_core(
+                    deleted = await self._delete_item_core(
                         item_id=item_id,
                         operator_id=operator_id,
                         actor_role_ids=actor_role_ids,
@@ -240,6 +462,8 @@ class WorkflowMutationService:
                 logger.error("MongoDB 部署不支持事务，已拒绝执行非原子删除")
                 raise RuntimeError("workflow delete requires MongoDB transaction support") from exc
             raise
+        schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [item_id])
+        return deleted
 
     async def _delete_item_core(
         self,
@@ -271,6 +495,10 @@ class WorkflowMutationService:
         # 这里采用软删除，保留历史数据和流转痕迹。
         item_doc.is_deleted = True
         await save_doc(item_doc, session=session)
+        # 已删除事项的流转不再出现在项目动态中：摘掉日志上冗余的项目归属，审计轨迹本身保留。
+        await BusFlowLogDoc.find(
+            {"work_item_id": item_doc.id, "project_ids": {"$ne": []}}, session=session
+        ).update_many({"$set": {"project_ids": []}}, session=session)
         logger.success(f"事项 ID={item_id} 已逻辑删除")
         return True
 
@@ -309,9 +537,11 @@ class WorkflowMutationService:
             action="REASSIGN",
             operator_id=operator_id,
             payload=payload,
+            project_ids=list(item_doc.project_ids or []),
         )
         await log_entry.insert()
 
         item_doc.current_owner_id = target_owner_id
         await item_doc.save()
+        schedule_search_refresh(SearchEntityType.WORK_ITEM.value, [item_id])
         return await serialize_work_item(item_doc)
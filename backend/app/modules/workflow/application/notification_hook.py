@@ -22,12 +22,33 @@ class WorkflowNotificationHook:
         Args:
             transition_result: 包含 new_owner_id、work_item（含 title/type_code）等字段。
         """
+        notice = self._transition_notice(transition_result)
+        if notice is None:
+            return
+        asyncio.create_task(NotificationService.notify_by_user_id(**notice))
+
+    async def after_transitions(self, transition_results: list[dict[str, Any]]) -> None:
+        """批量流转后，在一个后台任务里依次通知各新负责人（同一负责人的通知由通知服务聚合）。"""
+        notices = [
+            notice for notice in map(self._transition_notice, transition_results) if notice is not None
+        ]
+        if not notices:
+            return
+        asyncio.create_task(self._notify_all(notices))
+
+    @staticmethod
+    async def _notify_all(notices: list[dict[str, Any]]) -> None:
+        for notice in notices:
+            await NotificationService.notify_by_user_id(**notice)
+
+    @staticmethod
+    def _transition_notice(transition_result: dict[str, Any]) -> dict[str, Any] | None:
         operator_id = transition_result.get("operator_id")
         new_owner_id = transition_result.get("new_owner_id")
         work_item = transition_result.get("work_item", {})
 
         if not new_owner_id or new_owner_id == operator_id:
-            return
+            return None
 
         title = work_item.get("title", "")
         type_code = work_item.get("type_code", "")
@@ -36,16 +57,14 @@ class WorkflowNotificationHook:
             "[NOTIFY] transition 后通知新负责人: user_id={}, item={}",
             new_owner_id, title,
         )
-        asyncio.create_task(
-            NotificationService.notify_by_user_id(
-                user_id=new_owner_id,
-                title=NotificationTitles.WORKFLOW_TRANSITION,
-                content=NotificationTemplates.WORKFLOW_TRANSITION.format(
-                    type_code=type_code, title=title,
-                ),
-                notify_type=NotificationTypes.WORKFLOW_ITEM_TRANSITION,
-            )
-        )
+        return {
+            "user_id": new_owner_id,
+            "title": NotificationTitles.WORKFLOW_TRANSITION,
+            "content": NotificationTemplates.WORKFLOW_TRANSITION.format(
+                type_code=type_code, title=title,
+            ),
+            "notify_type": NotificationTypes.WORKFLOW_ITEM_TRANSITION,
+        }
 
     async def after_reassign(self, reassign_result: dict[str, Any]) -> None:
         """重新分配后，通知新的负责人。
@@ -28,6 +28,16 @@ class WorkflowMutationHook(Protocol):
         """
         ...
 
+    async def after_transitions(self, transition_results: list[dict[str, Any]]) -> None:
+        """批量状态流转完成后触发一次。
+
+        Args:
+            transition_results: 成功流转的结果列表，每项字段同 after_transition。
+
+        未实现该方法的钩子会对每个结果逐个调用 after_transition。
+        """
+        ...
+
     async def after_reassign(self, reassign_result: dict[str, Any]) -> None:
         """重新分配完成后触发。
 
@@ -57,6 +67,12 @@ class WorkflowItemGateway(Protocol):
         session: AsyncClientSession | None = None,
     ) -> dict[str, Any]: ...
 
+    async def create_work_items(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncClientSession | None = None,
+    ) -> list[str | None]: ...
+
     async def get_work_item_by_id(self, item_id: str) -> dict[str, Any] | None: ...
 
 
@@ -6,14 +6,16 @@ from typing import Any
 from beanie import PydanticObjectId
 from pymongo.errors import OperationFailure
 
+from app.modules.search.application import GlobalSearchService
+from app.modules.search.domain.constants import SearchEntityType
 from app.modules.workflow.application.common import (
     base_item_query,
     docs_to_dicts,
     serialize_work_item,
     validate_object_id,
 )
+from app.modules.workflow.application.state_machine_store import WorkflowStateMachineStore
 from app.modules.workflow.domain.exceptions import WorkItemNotFoundError
-from app.modules.workflow.domain.policies import can_transition
 from app.modules.workflow.domain.rules import normalize_sort
 from app.modules.workflow.repository.models import (
     BusFlowLogDoc,
@@ -23,9 +25,13 @@ from app.modules.workflow.repository.models import (
     SysWorkTypeDoc,
 )
 from app.shared.core.logger import log as logger
+from app.shared.service import CREATED_AT_DESC, KeysetSort, decode_offset_cursor, encode_offset_cursor
 
 
 class WorkflowQueryService:
+    def __init__(self, search_service: GlobalSearchService | None = None) -> None:
+        self._search_service = search_service or GlobalSearchService()
+
     async def get_work_types(self) -> list[dict[str, Any]]:
         docs = await SysWorkTypeDoc.find_all().to_list()
         return [doc.model_dump() for doc in docs]
@@ -51,9 +57,10 @@ class WorkflowQueryService:
         creator_id: str | None = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: str | None = None,
     ) -> list[dict[str, Any]]:
         query = base_item_query(type_code, state, owner_id, creator_id)
-        docs = await query.sort("-created_at").skip(offset).limit(limit).to_list()
+        docs = await CREATED_AT_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         return await docs_to_dicts(docs)
 
     async def list_items_sorted(
@@ -66,12 +73,14 @@ class WorkflowQueryService:
         offset: int = 0,
         order_by: str = "created_at",
         direction: str = "desc",
+        cursor: str | None = None,
     ) -> list[dict[str, Any]]:
         query = base_item_query(type_code, state, owner_id, creator_id)
-        docs = await query.sort(normalize_sort(order_by, direction)).skip(offset).limit(limit).to_list()
+        keyset = KeysetSort.parse(normalize_sort(order_by, direction))
+        docs = await keyset.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         return await docs_to_dicts(docs)
 
-    async def search_items(
+    async def search_items_page(
         self,
         keyword: str,
         type_code: str | None = None,
@@ -80,16 +89,46 @@ class WorkflowQueryService:
         creator_id: str | None = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> list[dict[str, Any]]:
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """搜索事项并返回 `(结果, 下一页游标)`。
+
+        倒排索引按相关度排序，无法 keyset，游标只携带偏移量（由索引分页，不走 Mongo skip）；
+        $text / 正则回退路径按 `(created_at, _id)` keyset 翻页。
+        """
         normalized_keyword = keyword.strip()
         if len(normalized_keyword) < 2:
             raise ValueError("keyword length must be at least 2")
+        if cursor:
+            cursor_offset = decode_offset_cursor(cursor)
+            if cursor_offset is not None:
+                offset, cursor = cursor_offset, None
+
+        # 搜索索引完成构建后由倒排索引承接（支持中文分词、按相关度排序），
+        # 否则沿用 $text / 正则回退路径；keyset 游标来自回退路径，继续走回退路径。
+        ranked_ids = None if cursor else await self._search_service.search_entity_ids(
+            SearchEntityType.WORK_ITEM.value,
+            normalized_keyword,
+            state=state,
+            sub_type=type_code,
+            owner_id=owner_id,
+            creator_id=creator_id,
+            limit=limit,
+            offset=offset,
+        )
+        if ranked_ids is not None:
+            object_ids = [PydanticObjectId(item_id) for item_id in ranked_ids]
+            docs = await base_item_query().find({"_id": {"$in": object_ids}}).to_list()
+            rank = {item_id: position for position, item_id in enumerate(ranked_ids)}
+            docs.sort(key=lambda doc: rank.get(str(doc.id), len(rank)))
+            next_cursor = encode_offset_cursor(offset + limit) if len(ranked_ids) >= limit else None
+            return await docs_to_dicts(docs), next_cursor
 
         query = base_item_query(type_code, state, owner_id, creator_id).find(
             {"$text": {"$search": normalized_keyword}}
         )
         try:
-            docs = await query.sort("-created_at").skip(offset).limit(limit).to_list()
+            docs = await CREATED_AT_DESC.paginate(query, limit=limit, offset=offset, cursor=cursor).to_list()
         except OperationFailure as exc:
             if "text index required" not in str(exc).lower():
                 raise
@@ -102,8 +141,10 @@ class WorkflowQueryService:
                     ]
                 }
             )
-            docs = await fallback_query.sort("-created_at").skip(offset).limit(limit).to_list()
-        return await docs_to_dicts(docs)
+            docs = await CREATED_AT_DESC.paginate(
+                fallback_query, limit=limit, offset=offset, cursor=cursor,
+            ).to_list()
+        return await docs_to_dicts(docs), CREATED_AT_DESC.next_cursor(docs, limit)
 
     async def get_item_by_id(self, item_id: str) -> dict[str, Any] | None:
         try:
@@ -177,14 +218,12 @@ class WorkflowQueryService:
         if not item:
             raise WorkItemNotFoundError(item_id)
 
-        # 并行查询可用流转配置（与 serialize_work_item 内部的 req_id 查询无关，
-        # 但这里只需要 item 的 type_code/current_state，可并行发起）
-        configs = await SysWorkflowConfigDoc.find(
-            SysWorkflowConfigDoc.type_code == item["type_code"],
-            SysWorkflowConfigDoc.from_state == item["current_state"],
-        ).to_list()
-        if actor is not None:
-            configs = [config for config in configs if can_transition(actor, item, config)]
+        # 可用流转直接从内存状态机读取，不再查询流转配置集合
+        machine = await WorkflowStateMachineStore.get()
+        if actor is None:
+            configs = list(machine.transitions_from(item["type_code"], item["current_state"]))
+        else:
+            configs = machine.allowed_transitions(actor, item)
 
         return {
             "item": item,
@@ -193,7 +232,7 @@ class WorkflowQueryService:
                     "action": config.action,
                     "to_state": config.to_state,
                     "target_owner_strategy": config.target_owner_strategy,
-                    "required_fields": config.required_fields,
+                    "required_fields": list(config.required_fields),
                 }
                 for config in configs
             ],
@@ -0,0 +1,101 @@
+"""进程内工作流状态机缓存。
+
+整份流程配置编译成一个 `CompiledWorkflow` 后常驻内存，读路径不查数据库：
+
+- 首次使用（或启动校验）时加载事项类型、状态、流转配置并编译；
+- 距上次版本检查超过 `STATE_MACHINE_CHECK_SECONDS` 后，读取一次 `SysWorkflowVersionDoc`，
+  版本未变只续期，变化时重新加载并整体替换（`sync_workflow.py` 同步配置后会自增版本号）。
+
+重新加载由一把锁串行化，并发请求只会触发一次加载。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable
+
+from app.modules.workflow.domain.state_machine import CompiledWorkflow, compile_workflow
+from app.modules.workflow.repository.models import (
+    SysWorkflowConfigDoc,
+    SysWorkflowStateDoc,
+    SysWorkflowVersionDoc,
+    SysWorkTypeDoc,
+)
+from app.shared.core.logger import log as logger
+
+WORKFLOW_VERSION_SCOPE = "workflow"
+STATE_MACHINE_CHECK_SECONDS = 30
+
+
+async def current_workflow_version() -> int:
+    doc = await SysWorkflowVersionDoc.find_one(SysWorkflowVersionDoc.scope == WORKFLOW_VERSION_SCOPE)
+    return doc.version if doc else 0
+
+
+class WorkflowStateMachineStore:
+    """当前编译状态机的持有者。"""
+
+    _machine: CompiledWorkflow | None = None
+    _checked_at: float = 0.0
+    _reload_lock = asyncio.Lock()
+    _max_age: float = STATE_MACHINE_CHECK_SECONDS
+    _clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    @classmethod
+    def now(cls) -> float:
+        return cls._clock()
+
+    @classmethod
+    def current(cls) -> CompiledWorkflow | None:
+        """返回仍在检查周期内的状态机；需要检查版本时返回 None。"""
+        machine = cls._machine
+        if machine is None or cls.now() - cls._checked_at >= cls._max_age:
+            return None
+        return machine
+
+    @classmethod
+    async def get(cls) -> CompiledWorkflow:
+        machine = cls.current()
+        if machine is not None:
+            return machine
+        async with cls._reload_lock:
+            machine = cls.current()
+            if machine is not None:
+                return machine
+            version = await current_workflow_version()
+            if cls._machine is not None and cls._machine.version == version:
+                cls._checked_at = cls.now()
+                return cls._machine
+            return await cls._load(version)
+
+    @classmethod
+    async def load(cls) -> CompiledWorkflow:
+        """强制重新加载并安装状态机（启动校验时调用）。"""
+        async with cls._reload_lock:
+            return await cls._load(await current_workflow_version())
+
+    @classmethod
+    async def _load(cls, version: int) -> CompiledWorkflow:
+        work_types = await SysWorkTypeDoc.find_all().to_list()
+        states = await SysWorkflowStateDoc.find_all().to_list()
+        configs = await SysWorkflowConfigDoc.find_all().to_list()
+        machine = compile_workflow(
+            configs,
+            version=version,
+            type_codes=[doc.code for doc in work_types],
+            state_codes=[doc.code for doc in states],
+        )
+        cls.install(machine)
+        logger.info("工作流状态机已加载: version={}, transitions={}", version, len(machine.transitions))
+        return machine
+
+    @classmethod
+    def install(cls, machine: CompiledWorkflow) -> None:
+        cls._machine = machine
+        cls._checked_at = cls.now()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._machine = None
+        cls._checked_at = 0.0
@@ -1,4 +1,5 @@
 from app.modules.workflow.application.commands import (
+    BatchTransitionWorkItemsCommand,
     CreateWorkItemCommand,
     DeleteWorkItemCommand,
     ReassignWorkItemCommand,
@@ -29,6 +30,21 @@ class WorkflowCommandService:
                 continue
             await method(payload)
 
+    async def _run_batch_hook(self, method_name: str, fallback_name: str, payloads: list[dict]) -> None:
+        # 钩子实现了批量方法时整批调用一次，否则退回逐条调用单条方法
+        if not payloads:
+            return
+        for hook in self._mutation_hooks:
+            method = getattr(hook, method_name, None)
+            if method is not None:
+                await method(payloads)
+                continue
+            fallback = getattr(hook, fallback_name, None)
+            if fallback is None:
+                continue
+            for payload in payloads:
+                await fallback(payload)
+
     async def get_work_item_by_id(self, item_id: str) -> dict | None:
         return await self._query_service.get_item_by_id(item_id)
 
@@ -60,6 +76,23 @@ class WorkflowCommandService:
         await self._run_hook("after_transition", result)
         return result
 
+    async def transition_work_items(
+        self,
+        context: OperationContext,
+        command: BatchTransitionWorkItemsCommand,
+    ) -> list[dict]:
+        results = await self._mutation_service.handle_transitions(
+            work_item_ids=command.work_item_ids,
+            action=command.action,
+            operator_id=context.actor_id,
+            form_data=command.form_data,
+            actor_role_ids=context.role_ids,
+        )
+        await self._run_batch_hook(
+            "after_transitions", "after_transition", [result for result in results if result["success"]]
+        )
+        return results
+
     async def reassign_work_item(
         self,
         context: OperationContext,
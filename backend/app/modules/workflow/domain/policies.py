@@ -107,6 +107,14 @@ def _matches_actor_type(actor: Any, work_item: Any, actor_type: str) -> bool:
     return False
 
 
+def normalize_role_id(role_id: Any) -> str:
+    """统一角色 ID 写法：去空白、转大写并去掉 ROLE_ 前缀。"""
+    normalized = str(role_id).strip().upper()
+    if normalized.startswith("ROLE_"):
+        return normalized[5:]
+    return normalized
+
+
 def _has_any_role(actor: Any, allowed_role_ids: Iterable[str]) -> bool:
     """
     检查参与者是否具有任何指定角色。
@@ -118,15 +126,9 @@ def _has_any_role(actor: Any, allowed_role_ids: Iterable[str]) -> bool:
     Returns:
         True如果参与者具有任何指定角色，否则False
     """
-    def normalize_role(role_id: Any) -> str:
-        normalized = str(role_id).strip().upper()
-        if normalized.startswith("ROLE_"):
-            return normalized[5:]
-        return normalized
-
     # 使用集合判交集，避免角色顺序影响判断；兼容 ROLE_QA 与 QA 两种命名。
-    actor_roles = {normalize_role(role_id) for role_id in actor_role_ids(actor)}
-    expected_roles = {normalize_role(role_id) for role_id in allowed_role_ids if str(role_id).strip()}
+    actor_roles = {normalize_role_id(role_id) for role_id in actor_role_ids(actor)}
+    expected_roles = {normalize_role_id(role_id) for role_id in allowed_role_ids if str(role_id).strip()}
     return not expected_roles.isdisjoint(actor_roles)
 
 
@@ -0,0 +1,135 @@
+"""编译后的工作流状态机。
+
+流转配置（`SysWorkflowConfigDoc`）只在运行 `scripts/init/sync_workflow.py` 时变化，
+这里把整份配置编译成不可变的内存结构，流转校验和可用动作查询都不再访问数据库：
+
+- `transitions`：按 (type_code, from_state, action) 索引的流转规则；
+- `outgoing`：按 (type_code, from_state) 索引的出边，用于列出可用动作；
+- `role_actions`：只按角色授权的规则（配置了 allowed_role_ids 且没有其他身份限制），
+  预先按 (type_code, from_state) → 归一化角色 → 动作集合建表，判断时只做集合查找。
+
+其余规则（owner_only / creator_only / allowed_actor_types / 默认）与事项身份有关，仍交给 `can_transition`。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from app.modules.workflow.domain.policies import actor_role_ids, can_transition, normalize_role_id
+
+
+@dataclass(frozen=True, slots=True)
+class TransitionRule:
+    """一条编译后的流转规则，字段与 `SysWorkflowConfigDoc` 同名，可直接传给 `can_transition`。"""
+
+    type_code: str
+    from_state: str
+    action: str
+    to_state: str
+    target_owner_strategy: str = "KEEP"
+    required_fields: tuple[str, ...] = ()
+    properties: Mapping[str, Any] = field(default_factory=dict)
+    # 非空表示该规则只按角色授权（已归一化）
+    role_ids: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledWorkflow:
+    """某一配置版本的完整状态机。"""
+
+    version: int
+    type_codes: frozenset[str]
+    state_codes: frozenset[str]
+    transitions: Mapping[tuple[str, str, str], TransitionRule]
+    outgoing: Mapping[tuple[str, str], tuple[TransitionRule, ...]]
+    role_actions: Mapping[tuple[str, str], Mapping[str, frozenset[str]]]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.type_codes and not self.state_codes and not self.transitions
+
+    def transition(self, type_code: str, from_state: str, action: str) -> TransitionRule | None:
+        return self.transitions.get((type_code, from_state, action))
+
+    def transitions_from(self, type_code: str, from_state: str) -> tuple[TransitionRule, ...]:
+        return self.outgoing.get((type_code, from_state), ())
+
+    def permits(self, actor: Any, work_item: Any, rule: TransitionRule) -> bool:
+        """判断参与者能否执行该规则，结果与 `can_transition` 一致。"""
+        if not rule.role_ids:
+            return can_transition(actor, work_item, rule)
+        granted = self.role_actions.get((rule.type_code, rule.from_state), {})
+        return any(
+            rule.action in granted.get(normalize_role_id(role_id), ())
+            for role_id in actor_role_ids(actor)
+        )
+
+    def allowed_transitions(self, actor: Any, work_item: Any) -> list[TransitionRule]:
+        """列出参与者在事项当前状态下可以执行的流转。"""
+        type_code = _read(work_item, "type_code")
+        from_state = _read(work_item, "current_state")
+        return [
+            rule for rule in self.transitions_from(type_code, from_state)
+            if self.permits(actor, work_item, rule)
+        ]
+
+
+def _read(source: Any, name: str) -> Any:
+    if isinstance(source, dict):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def _role_only_ids(properties: Mapping[str, Any]) -> frozenset[str]:
+    # 与 can_transition 的判断顺序一致：只有前面的身份限制都未配置时才按角色判断
+    if any(properties.get(key) for key in ("owner_only", "creator_only", "allowed_actor_types")):
+        return frozenset()
+    return frozenset(
+        normalize_role_id(role_id)
+        for role_id in properties.get("allowed_role_ids") or []
+        if str(role_id).strip()
+    )
+
+
+def compile_workflow(
+    configs: Iterable[Any],
+    *,
+    version: int = 0,
+    type_codes: Iterable[str] = (),
+    state_codes: Iterable[str] = (),
+) -> CompiledWorkflow:
+    """把流转配置（文档或同名字段的对象）编译成 `CompiledWorkflow`。"""
+    transitions: dict[tuple[str, str, str], TransitionRule] = {}
+    outgoing: dict[tuple[str, str], list[TransitionRule]] = {}
+    role_actions: dict[tuple[str, str], dict[str, set[str]]] = {}
+    for config in configs:
+        properties = dict(_read(config, "properties") or {})
+        rule = TransitionRule(
+            type_code=_read(config, "type_code"),
+            from_state=_read(config, "from_state"),
+            action=_read(config, "action"),
+            to_state=_read(config, "to_state"),
+            target_owner_strategy=_read(config, "target_owner_strategy") or "KEEP",
+            required_fields=tuple(_read(config, "required_fields") or ()),
+            properties=MappingProxyType(properties),
+            role_ids=_role_only_ids(properties),
+        )
+        transitions[(rule.type_code, rule.from_state, rule.action)] = rule
+        outgoing.setdefault((rule.type_code, rule.from_state), []).append(rule)
+        for role_id in rule.role_ids:
+            granted = role_actions.setdefault((rule.type_code, rule.from_state), {})
+            granted.setdefault(role_id, set()).add(rule.action)
+
+    return CompiledWorkflow(
+        version=version,
+        type_codes=frozenset(type_codes),
+        state_codes=frozenset(state_codes),
+        transitions=MappingProxyType(transitions),
+        outgoing=MappingProxyType({key: tuple(rules) for key, rules in outgoing.items()}),
+        role_actions=MappingProxyType({
+            key: MappingProxyType({role_id: frozenset(actions) for role_id, actions in granted.items()})
+            for key, granted in role_actions.items()
+        }),
+    )
@@ -17,6 +17,7 @@ from .system import (
     SysWorkTypeDoc,
     SysWorkflowStateDoc,
     SysWorkflowConfigDoc,
+    SysWorkflowVersionDoc,
 )
 
 # 业务实体模型
@@ -42,6 +43,7 @@ __all__ = [
     "SysWorkTypeDoc",
     "SysWorkflowStateDoc",
     "SysWorkflowConfigDoc",
+    "SysWorkflowVersionDoc",
     "BusWorkItemDoc",
     "BusFlowLogDoc",
     "DOCUMENT_MODELS",
@@ -51,6 +53,7 @@ DOCUMENT_MODELS = [
     SysWorkTypeDoc,
     SysWorkflowStateDoc,
     SysWorkflowConfigDoc,
+    SysWorkflowVersionDoc,
     BusWorkItemDoc,
     BusFlowLogDoc,
 ]
@@ -5,7 +5,7 @@
 - MongoDB 持久化文档模型（Document）
 - 对应的 Pydantic 响应模型（用于 API 层返回）
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 from beanie import Document, PydanticObjectId
@@ -55,6 +55,9 @@ class BusWorkItemDoc(Document, TimestampedDocumentMixin, SoftDeleteDocumentMixin
                 partialFilterExpression={"is_deleted": False},
                 name="uniq_active_type_title",
             ),
+            # keyset 分页：未删除事项按 (created_at|updated_at, _id) 翻页
+            IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("is_deleted", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
 
@@ -66,13 +69,18 @@ class BusFlowLogDoc(Document, TimestampedDocumentMixin):
     action: str = Field(..., description="触发动作")
     operator_id: str = Field(..., description="操作人ID")
     payload: Dict[str, Any] = Field(default_factory=dict, description="节点特有表单数据")
+    project_ids: List[str] = Field(
+        default_factory=list, description="写入时从事项复制的项目 ID，供项目动态按索引查询"
+    )
 
     class Settings:
         name = "bus_flow_logs"
         indexes = [
             IndexModel("work_item_id"),
             IndexModel([("work_item_id", ASCENDING), ("created_at", DESCENDING)]),
-            IndexModel("created_at")
+            IndexModel("created_at"),
+            # 项目动态：按项目倒序取最近 N 条
+            IndexModel([("project_ids", ASCENDING), ("created_at", DESCENDING)]),
         ]
 
 
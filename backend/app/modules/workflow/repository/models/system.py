@@ -1,6 +1,7 @@
 """
 系统配置模型
 """
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
 from beanie import Document
@@ -57,6 +58,22 @@ class SysWorkflowConfigDoc(Document, TimestampedDocumentMixin):
         ]
 
 
+class SysWorkflowVersionDoc(Document):
+    """流程配置版本号（单文档）
+
+    每次同步流程配置后自增，各实例据此判断内存中编译的状态机是否过期。
+    """
+    scope: str = Field(default="workflow", description="版本作用域")
+    version: int = Field(default=0, description="单调递增的配置版本号")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "sys_workflow_versions"
+        indexes = [
+            IndexModel("scope", unique=True)
+        ]
+
+
 # ========== Pydantic 响应模型 (API) ==========
 
 class SysWorkTypeModel(BaseModel):
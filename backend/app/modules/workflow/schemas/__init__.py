@@ -1,6 +1,8 @@
 """工作流模块 Pydantic Schemas"""
 from .work_item import (
     CreateWorkItemRequest,
+    BatchTransitionRequest,
+    BatchTransitionResponse,
     TransitionRequest,
     TransitionResponse,
     WorkItemResponse,
@@ -18,6 +20,8 @@ from .workflow import (
 
 __all__ = [
     "CreateWorkItemRequest",
+    "BatchTransitionRequest",
+    "BatchTransitionResponse",
     "TransitionRequest",
     "TransitionResponse",
     "WorkItemResponse",
@@ -31,6 +31,15 @@ class TransitionRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class BatchTransitionRequest(BaseModel):
+    """批量状态流转请求：对多个事项执行同一动作"""
+    item_ids: List[str] = Field(..., min_length=1, max_length=1000, description="事项ID列表")
+    action: str = Field(..., description="触发的动作，如 SUBMIT, APPROVE, REJECT 等")
+    form_data: Dict[str, Any] = Field(default_factory=dict, description="表单数据，对所有事项生效")
+
+    model_config = ConfigDict(extra="forbid")
+
+
 # ==================== Response Models ====================
 
 class WorkItemResponse(BaseModel):
@@ -77,6 +86,24 @@ class TransitionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BatchTransitionItemResult(BaseModel):
+    """批量流转中单个事项的结果"""
+    work_item_id: str
+    success: bool
+    from_state: Optional[str] = None
+    to_state: Optional[str] = None
+    new_owner_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchTransitionResponse(BaseModel):
+    """批量状态流转响应"""
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchTransitionItemResult]
+
+
 class AvailableTransitionResponse(BaseModel):
     """可执行流转动作响应"""
     action: str
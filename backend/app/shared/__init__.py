@@ -1,12 +1,26 @@
-"""共享基础设施与通用能力。"""
-
-from .kafka import (
-    KafkaProducerManager,
-    TaskMessage,
-    ResultMessage,
-    KafkaConfig,
-    load_kafka_config,
-)
+"""共享基础设施与通用能力。
+
+Kafka 相关对象按需导入，避免 `import app.shared.xxx` 时连带加载 kafka 客户端库。
+"""
+
+from typing import Any
+
+_KAFKA_EXPORTS = {
+    "KafkaProducerManager",
+    "TaskMessage",
+    "ResultMessage",
+    "KafkaConfig",
+    "load_kafka_config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _KAFKA_EXPORTS:
+        from . import kafka
+
+        return getattr(kafka, name)
+    raise AttributeError(name)
+
 
 __all__ = [
     "KafkaProducerManager",
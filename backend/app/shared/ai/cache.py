@@ -0,0 +1,238 @@
+"""AIClient 调用的响应缓存、请求合并与并发限流。
+
+- 缓存键为 (base_url, model, messages, temperature, max_tokens) 的 sha256，TTL + LRU 淘汰；
+- 相同请求正在调用时，后来者等待同一个调用结果（single-flight），不重复请求模型；
+- 全局与按路由两级信号量限制并发，超出的调用按到达顺序排队；
+- 按路由记录命中、未命中、合并、调用、失败次数以及调用耗时、排队耗时、流式首 token 耗时，
+  供 `/health/ai-metrics` 查看。
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Deque
+
+DEFAULT_CACHE_TTL_SECONDS = 300
+DEFAULT_CACHE_MAX_ENTRIES = 256
+GLOBAL_CONCURRENCY_LIMIT = 8
+DEFAULT_ROUTE_CONCURRENCY_LIMIT = 4
+# 输出较长的路由单独收紧，避免占满全局并发
+ROUTE_CONCURRENCY_LIMITS: dict[str, int] = {
+    "test_specs.generate_cases": 2,
+}
+DEFAULT_ROUTE = "default"
+
+
+def build_cache_key(
+    base_url: str,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    payload = json.dumps(
+        [base_url, model, messages, temperature, max_tokens],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """带过期时间的 LRU 缓存，只在事件循环线程内使用。"""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self._max_entries <= 0 or self._ttl_seconds <= 0:
+            return
+        self._entries[key] = (self._clock() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AICallGate:
+    """全局 + 按路由的并发闸门；信号量按等待顺序放行，超出限额的调用排队。"""
+
+    def __init__(
+        self,
+        *,
+        global_limit: int = GLOBAL_CONCURRENCY_LIMIT,
+        default_route_limit: int = DEFAULT_ROUTE_CONCURRENCY_LIMIT,
+        route_limits: dict[str, int] | None = None,
+    ) -> None:
+        self._global = asyncio.Semaphore(global_limit)
+        self._default_route_limit = default_route_limit
+        self._route_limits = dict(ROUTE_CONCURRENCY_LIMITS if route_limits is None else route_limits)
+        self._routes: dict[str, asyncio.Semaphore] = {}
+
+    def _route_semaphore(self, route: str) -> asyncio.Semaphore:
+        semaphore = self._routes.get(route)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._route_limits.get(route, self._default_route_limit))
+            self._routes[route] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self, route: str) -> AsyncIterator[None]:
+        # 先占路由名额再占全局名额，单个路由排队时不会占着全局名额
+        async with self._route_semaphore(route):
+            async with self._global:
+                yield
+
+
+@dataclass(slots=True)
+class AIRouteMetrics:
+    """单个调用路由的累计指标。"""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    calls: int = 0
+    errors: int = 0
+    latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+    queue_wait_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+    ttfb_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+
+class AICallMetricsRegistry:
+    """线程安全的 AI 调用指标登记表。"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._routes: dict[str, AIRouteMetrics] = {}
+
+    def _route(self, route: str) -> AIRouteMetrics:
+        metrics = self._routes.get(route)
+        if metrics is None:
+            metrics = self._routes[route] = AIRouteMetrics()
+        return metrics
+
+    def record_hit(self, route: str) -> None:
+        with self._lock:
+            self._route(route).hits += 1
+
+    def record_miss(self, route: str) -> None:
+        with self._lock:
+            self._route(route).misses += 1
+
+    def record_coalesced(self, route: str) -> None:
+        with self._lock:
+            self._route(route).coalesced += 1
+
+    def record_call(
+        self,
+        route: str,
+        *,
+        latency_ms: float,
+        queue_wait_ms: float,
+        failed: bool,
+        ttfb_ms: float | None = None,
+    ) -> None:
+        """记录一次实际的模型调用；流式调用额外记录首个 token 的耗时。"""
+        with self._lock:
+            metrics = self._route(route)
+            metrics.calls += 1
+            if failed:
+                metrics.errors += 1
+            metrics.latency_ms.append(latency_ms)
+            metrics.queue_wait_ms.append(queue_wait_ms)
+            if ttfb_ms is not None:
+                metrics.ttfb_ms.append(ttfb_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = [self._serialize(route, metrics) for route, metrics in self._routes.items()]
+        routes.sort(key=lambda item: item["route"])
+        hits = sum(item["hits"] for item in routes)
+        lookups = hits + sum(item["misses"] + item["coalesced"] for item in routes)
+        return {
+            "summary": {
+                "hits": hits,
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0,
+                "calls": sum(item["calls"] for item in routes),
+                "errors": sum(item["errors"] for item in routes),
+            },
+            "routes": routes,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    @staticmethod
+    def _serialize(route: str, metrics: AIRouteMetrics) -> dict:
+        latency = sorted(metrics.latency_ms)
+        queue_wait = sorted(metrics.queue_wait_ms)
+        ttfb = sorted(metrics.ttfb_ms)
+        return {
+            "route": route,
+            "hits": metrics.hits,
+            "misses": metrics.misses,
+            "coalesced": metrics.coalesced,
+            "calls": metrics.calls,
+            "errors": metrics.errors,
+            "avg_latency_ms": round(sum(latency) / len(latency), 2) if latency else 0,
+            "p95_latency_ms": _percentile(latency, 95),
+            "max_latency_ms": round(latency[-1], 2) if latency else 0,
+            "p95_queue_wait_ms": _percentile(queue_wait, 95),
+            "p50_ttfb_ms": _percentile(ttfb, 50),
+            "p95_ttfb_ms": _percentile(ttfb, 95),
+        }
+
+
+def _percentile(sorted_samples: list[float], percentile: int) -> float:
+    if not sorted_samples:
+        return 0
+    index = max(0, min(len(sorted_samples) - 1, round((percentile / 100) * (len(sorted_samples) - 1))))
+    return round(sorted_samples[index], 2)
+
+
+ai_call_metrics = AICallMetricsRegistry()
+
+
+def get_ai_call_metrics_snapshot() -> dict:
+    return ai_call_metrics.snapshot()
+
+
+def reset_ai_call_metrics() -> None:
+    ai_call_metrics.reset()
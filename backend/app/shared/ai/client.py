@@ -2,18 +2,29 @@
 
 统一管理 OpenAI 兼容客户端的创建、配置读取、重试和调用审计。
 所有业务模块的 AI 功能必须通过 AIClient 调用，不允许直接创建 OpenAI 实例。
+调用经过响应缓存、相同请求合并与并发限流，见 `app.shared.ai.cache`。
 """
 from __future__ import annotations
 
 import asyncio
 import json
 import time
-from typing import Any
-
-from openai import AsyncOpenAI
-
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from app.shared.ai.cache import (
+    DEFAULT_ROUTE,
+    AICallGate,
+    AIResponseCache,
+    ai_call_metrics,
+    build_cache_key,
+    reset_ai_call_metrics,
+)
+from app.shared.ai.streaming import JSONArrayItemParser
 from app.shared.core.logger import log
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 
 class AICallResult(dict):
     """AI 调用结果，兼容 dict 访问的同时提供属性方式。"""
@@ -34,6 +45,10 @@ class AICallResult(dict):
     def usage(self) -> dict[str, int] | None:
         return self.get("usage")
 
+    @property
+    def cached(self) -> bool:
+        return self.get("cached", False)
+
 
 class AIClient:
     """共享 AI 客户端单例。
@@ -59,6 +74,9 @@ class AIClient:
     def __init__(self) -> None:
         self._max_retries: int = 3
         self._retry_base_delay: float = 1.0
+        self._cache = AIResponseCache()
+        self._gate = AICallGate()
+        self._inflight: dict[str, asyncio.Task[AICallResult]] = {}
 
     @classmethod
     def get_instance(cls) -> AIClient:
@@ -72,6 +90,7 @@ class AIClient:
         cls._instance = None
         cls._cached_client = None
         cls._cached_config_key = None
+        reset_ai_call_metrics()
 
     async def get_config(self) -> dict[str, Any]:
         """获取当前 AI 配置。"""
@@ -79,6 +98,9 @@ class AIClient:
         return await ConfigService.get_ai_config()
 
     def _build_client(self, config: dict[str, Any]) -> AsyncOpenAI:
+        # openai SDK 导入耗时较长，首次真正调用 AI 时再加载
+        from openai import AsyncOpenAI
+
         base_url = config.get("base_url", "")
         api_key = config.get("api_key") or "ollama"
         timeout = int(config.get("timeout", 60))
@@ -110,23 +132,12 @@ class AIClient:
         self._cached_config_key = config_key
         return self._cached_client
 
-    async def chat_completion(
+    async def _prepare_call(
         self,
-        messages: list[dict[str, str]],
-        *,
-        temperature: float | None = None,
-        max_tokens: int | None = None,
-        timeout: int | None = None,
-    ) -> AICallResult:
-        """调用 LLM chat completion，带重试和审计。
-
-        Returns:
-            AICallResult 包含 content / model / elapsed_ms / usage
-
-        Raises:
-            RuntimeError: AI 未启用或配置不完整
-            Exception: LLM 调用失败（重试后）
-        """
+        temperature: float | None,
+        max_tokens: int | None,
+    ) -> tuple[AsyncOpenAI, str, str, float, int]:
+        """校验配置并解析本次调用的 (client, base_url, model, temperature, max_tokens)。"""
         config = await self.get_config()
         if not config.get("enabled", True):
             raise RuntimeError("AI 功能未启用")
@@ -142,7 +153,100 @@ class AIClient:
 
         temp = temperature if temperature is not None else float(config.get("temperature", 0.7))
         tokens = max_tokens if max_tokens is not None else int(config.get("max_tokens", 2048))
+        return client, base_url, model, temp, tokens
 
+    async def chat_completion(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        timeout: int | None = None,
+        route: str | None = None,
+        use_cache: bool = True,
+    ) -> AICallResult:
+        """调用 LLM chat completion，带缓存、合并、限流、重试和审计。
+
+        Args:
+            route: 调用来源标签，用于按路由限流和统计指标
+            use_cache: 为 False 时跳过缓存与合并（如需要每次不同输出的生成类调用）
+
+        Returns:
+            AICallResult 包含 content / model / elapsed_ms / usage / cached
+
+        Raises:
+            RuntimeError: AI 未启用或配置不完整
+            Exception: LLM 调用失败（重试后）
+        """
+        client, base_url, model, temp, tokens = await self._prepare_call(temperature, max_tokens)
+        route = route or DEFAULT_ROUTE
+
+        if not use_cache:
+            return await self._limited_call(client, model, messages, temp, tokens, route)
+
+        cache_key = build_cache_key(base_url, model, messages, temp, tokens)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            ai_call_metrics.record_hit(route)
+            return AICallResult(cached, cached=True, cache_key=cache_key)
+
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            ai_call_metrics.record_coalesced(route)
+        else:
+            ai_call_metrics.record_miss(route)
+            task = asyncio.ensure_future(self._limited_call(client, model, messages, temp, tokens, route))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        # shield：某个等待者被取消不影响同一调用的其他等待者
+        result = await asyncio.shield(task)
+        return AICallResult(result, cache_key=cache_key)
+
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task[AICallResult]) -> None:
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # 失败结果不缓存；调用 exception() 也避免所有等待者都已取消时的未取回异常告警
+        if not task.cancelled() and task.exception() is None:
+            self._cache.put(cache_key, dict(task.result()))
+
+    def invalidate_cached(self, cache_key: str | None) -> None:
+        """丢弃一条缓存（如模型输出无法解析时），下次调用重新请求模型。"""
+        if cache_key:
+            self._cache.discard(cache_key)
+
+    async def _limited_call(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        route: str,
+    ) -> AICallResult:
+        queued_at = time.monotonic()
+        async with self._gate.slot(route):
+            started = time.monotonic()
+            failed = True
+            try:
+                result = await self._call_with_retry(client, model, messages, temperature, max_tokens)
+                failed = False
+                return result
+            finally:
+                ai_call_metrics.record_call(
+                    route,
+                    latency_ms=(time.monotonic() - started) * 1000,
+                    queue_wait_ms=(started - queued_at) * 1000,
+                    failed=failed,
+                )
+
+    async def _call_with_retry(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> AICallResult:
         last_error: Exception | None = None
         for attempt in range(1, self._max_retries + 1):
             try:
@@ -150,8 +254,8 @@ class AIClient:
                 response = await client.chat.completions.create(
                     model=model,
                     messages=messages,
-                    temperature=temp,
-                    max_tokens=tokens,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
                 )
                 elapsed_ms = int((time.monotonic() - start) * 1000)
 
@@ -192,6 +296,160 @@ class AIClient:
 
         raise last_error  # type: ignore[misc]
 
+    async def stream_chat_completion(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        route: str | None = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """流式调用 LLM（`stream=True`），逐段产出模型输出的文本增量。
+
+        与 `chat_completion` 共用缓存和并发闸门：命中缓存时一次性产出完整内容；
+        完整输出后写入缓存。已开始输出后无法重试，只在建立流之前按退避策略重试。
+        """
+        client, base_url, model, temp, tokens = await self._prepare_call(temperature, max_tokens)
+        cache_key = build_cache_key(base_url, model, messages, temp, tokens) if use_cache else None
+        async for delta in self._stream_prepared(
+            client, model, messages, temp, tokens, route or DEFAULT_ROUTE, cache_key,
+        ):
+            yield delta
+
+    async def stream_chat_completion_json(
+        self,
+        system_prompt: str,
+        user_content: str,
+        *,
+        array_key: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        route: str | None = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """流式调用 LLM 并增量解析 JSON。
+
+        依次产出 `("token", 文本增量)`、`("item", array_key 数组中新闭合的元素)`，
+        最后产出 `("result", 完整解析结果)`；整体解析失败时丢弃该条缓存并抛出 JSONDecodeError。
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+        client, base_url, model, temp, tokens = await self._prepare_call(temperature, max_tokens)
+        cache_key = build_cache_key(base_url, model, messages, temp, tokens) if use_cache else None
+        parser = JSONArrayItemParser(array_key) if array_key else None
+        parts: list[str] = []
+        async for delta in self._stream_prepared(
+            client, model, messages, temp, tokens, route or DEFAULT_ROUTE, cache_key,
+        ):
+            parts.append(delta)
+            yield "token", delta
+            if parser is not None:
+                for item in parser.feed(delta):
+                    yield "item", item
+        try:
+            result = self._parse_json("".join(parts))
+        except json.JSONDecodeError:
+            self.invalidate_cached(cache_key)
+            raise
+        yield "result", result
+
+    async def _stream_prepared(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        route: str,
+        cache_key: str | None,
+    ) -> AsyncIterator[str]:
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                ai_call_metrics.record_hit(route)
+                yield cached.get("content", "")
+                return
+            ai_call_metrics.record_miss(route)
+
+        parts: list[str] = []
+        queued_at = time.monotonic()
+        async with self._gate.slot(route):
+            started = time.monotonic()
+            ttfb_ms: float | None = None
+            failed = True
+            try:
+                stream = await self._open_stream(client, model, messages, temperature, max_tokens)
+                try:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        if ttfb_ms is None:
+                            ttfb_ms = (time.monotonic() - started) * 1000
+                        parts.append(delta)
+                        yield delta
+                finally:
+                    await stream.close()
+                failed = False
+            finally:
+                ai_call_metrics.record_call(
+                    route,
+                    latency_ms=(time.monotonic() - started) * 1000,
+                    queue_wait_ms=(started - queued_at) * 1000,
+                    failed=failed,
+                    ttfb_ms=ttfb_ms,
+                )
+
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        log.info(
+            "AI stream: model={} ttfb={}ms elapsed={}ms chars={}",
+            model, int(ttfb_ms) if ttfb_ms is not None else "N/A", elapsed_ms, sum(map(len, parts)),
+        )
+        if cache_key is not None:
+            self._cache.put(cache_key, dict(AICallResult(
+                content="".join(parts),
+                model=model,
+                elapsed_ms=elapsed_ms,
+                usage=None,
+            )))
+
+    async def _open_stream(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Any:
+        last_error: Exception | None = None
+        for attempt in range(1, self._max_retries + 1):
+            try:
+                return await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                )
+            except Exception as exc:
+                last_error = exc
+                if attempt < self._max_retries:
+                    delay = self._retry_base_delay * (2 ** (attempt - 1))
+                    log.warning(
+                        "AI stream attempt {}/{} failed: {} — retrying in {:.1f}s",
+                        attempt, self._max_retries, exc, delay,
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    log.error("AI stream failed after {} attempts: {}", self._max_retries, exc)
+
+        raise last_error  # type: ignore[misc]
+
     async def simple_chat(
         self,
         system_prompt: str,
@@ -216,10 +474,20 @@ class AIClient:
     ) -> dict[str, Any]:
         """调用 LLM 并解析 JSON 响应。
 
-        自动清理 markdown 代码块标记后 json.loads。
+        自动清理 markdown 代码块标记后 json.loads；解析失败时丢弃该条缓存。
         """
-        content = await self.simple_chat(system_prompt, user_content, **kwargs)
-        return self._parse_json(content)
+        result = await self.chat_completion(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+            **kwargs,
+        )
+        try:
+            return self._parse_json(result.content)
+        except json.JSONDecodeError:
+            self.invalidate_cached(result.get("cache_key"))
+            raise
 
     @staticmethod
     def _parse_json(content: str) -> dict[str, Any]:
@@ -5,15 +5,29 @@ API 地址和模型名从系统配置热加载（ai.embedding_base_url / ai.embe
 """
 from __future__ import annotations
 
+from app.shared.core.logger import log
 
-import httpx
 
-from app.shared.core.logger import log
+DEFAULT_EMBEDDING_BASE_URL = "http://10.8.136.35:8002/v1"
+DEFAULT_EMBEDDING_MODEL = "qwen3-vl-embedding"
 
 
 class EmbeddingService:
     """Embedding 向量生成服务。"""
 
+    @staticmethod
+    async def _endpoint() -> tuple[str, str, int] | None:
+        """读取 embedding 接口配置，返回 (url, model, timeout)；未配置地址时返回 None。"""
+        from app.modules.system_config.service.config_service import ConfigService
+
+        config = await ConfigService.get_ai_config()
+        base_url = config.get("embedding_base_url", "") or DEFAULT_EMBEDDING_BASE_URL
+        if not base_url:
+            log.warning("embedding: base_url 未配置，跳过")
+            return None
+        model = config.get("embedding_model", "") or DEFAULT_EMBEDDING_MODEL
+        return f"{base_url.rstrip('/')}/embeddings", model, int(config.get("timeout", 60))
+
     @staticmethod
     async def embed_text(text: str) -> list[float] | None:
         """将单段文本转成 embedding 向量。
@@ -24,19 +38,13 @@ class EmbeddingService:
         Returns:
             384/768/1024 维向量（取决于模型），出错时返回 None
         """
-        from app.modules.system_config.service.config_service import ConfigService
-
-        config = await ConfigService.get_ai_config()
-        base_url = config.get("embedding_base_url", "") or "http://10.8.136.35:8002/v1"
-        model = config.get("embedding_model", "") or "qwen3-vl-embedding"
-
-        if not base_url:
-            log.warning("embedding: base_url 未配置，跳过")
+        endpoint = await EmbeddingService._endpoint()
+        if endpoint is None:
             return None
-
-        url = f"{base_url.rstrip('/')}/embeddings"
+        url, model, timeout = endpoint
         payload = {"input": text, "model": model}
-        timeout = int(config.get("timeout", 60))
+
+        import httpx
 
         try:
             async with httpx.AsyncClient(timeout=timeout) as client:
@@ -55,6 +63,43 @@ class EmbeddingService:
             log.error("embedding: 解析响应失败: {} — {}", e, data)
             return None
 
+    @staticmethod
+    async def embed_texts(texts: list[str]) -> list[list[float] | None]:
+        """一次请求把多段文本转成 embedding 向量（OpenAI 兼容接口的批量 input）。
+
+        Returns:
+            与入参顺序一致的向量列表；整批失败时全部为 None
+        """
+        if not texts:
+            return []
+        endpoint = await EmbeddingService._endpoint()
+        if endpoint is None:
+            return [None] * len(texts)
+        url, model, timeout = endpoint
+
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                resp = await client.post(url, json={"input": texts, "model": model})
+                resp.raise_for_status()
+                data = resp.json()
+        except Exception as e:
+            log.error("embedding: 批量 API 调用失败 count={}: {}", len(texts), e)
+            return [None] * len(texts)
+
+        vectors: list[list[float] | None] = [None] * len(texts)
+        try:
+            for position, item in enumerate(data["data"]):
+                index = item.get("index", position)
+                if 0 <= index < len(texts):
+                    vectors[index] = item["embedding"]
+        except (KeyError, TypeError, AttributeError) as e:
+            log.error("embedding: 解析批量响应失败: {}", e)
+            return [None] * len(texts)
+        log.info("embedding: 批量生成 {}/{}", sum(1 for v in vectors if v), len(texts))
+        return vectors
+
     @staticmethod
     def build_case_text(
         title: str,
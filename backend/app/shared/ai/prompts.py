@@ -105,6 +105,9 @@ GENERATE_CASES_USER_TEMPLATE = """请根据以下测试需求生成测试用例
 风险点：
 {risk_points}
 
+已有相关用例（请避免生成与之重复的用例）：
+{related_cases}
+
 请生成 {max_cases} 条测试用例草稿。"""
 
 
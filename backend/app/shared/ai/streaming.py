@@ -0,0 +1,94 @@
+"""LLM 流式输出的增量 JSON 解析。
+
+模型按 prompt 约定返回形如 `{"cases": [{...}, {...}], ...}` 的 JSON。流式调用时，
+`JSONArrayItemParser` 逐块扫描输出，顶层对象中指定数组字段的每个元素一闭合就立即解析返回，
+前端无需等整段 JSON 生成完毕即可逐条展示；完整结果仍以最终的整体解析为准。
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class JSONArrayItemParser:
+    """增量提取顶层 JSON 对象中 `array_key` 数组的元素。
+
+    只跟踪字符串/转义状态和嵌套深度，不校验整体语法；第一个 `{` 之前的内容（如 markdown 代码块标记）被忽略。
+    单个元素解析失败时跳过，不影响后续元素。
+    """
+
+    def __init__(self, array_key: str) -> None:
+        self._array_key = array_key
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        # 顶层对象中最近一个完整的字符串，遇到 `[` 时即为该数组的字段名
+        self._last_key: str | None = None
+        self._in_array = False
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> list[Any]:
+        """追加一段输出，返回本段中新闭合的数组元素。"""
+        self._text += chunk
+        items: list[Any] = []
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1:self._pos]
+                    elif self._in_array and self._depth == 2 and self._item_start == self._string_start:
+                        self._emit(text[self._item_start:self._pos + 1], items)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+                if self._in_array and self._depth == 2 and self._item_start < 0:
+                    self._item_start = self._pos
+            elif char in "{[":
+                if self._in_array and self._depth == 2 and self._item_start < 0:
+                    self._item_start = self._pos
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._last_key == self._array_key:
+                    self._in_array = True
+            elif char in "}]":
+                if self._in_array and self._depth == 2 and self._item_start >= 0:
+                    # 数组以标量元素结尾，如 `["a", 1]`
+                    self._emit(text[self._item_start:self._pos], items)
+                self._depth -= 1
+                if self._in_array:
+                    if self._depth == 1:
+                        self._in_array = False
+                    elif self._depth == 2 and self._item_start >= 0:
+                        self._emit(text[self._item_start:self._pos + 1], items)
+            elif self._in_array and self._depth == 2:
+                if char == ",":
+                    if self._item_start >= 0:
+                        self._emit(text[self._item_start:self._pos], items)
+                elif not char.isspace() and self._item_start < 0:
+                    self._item_start = self._pos
+            self._pos += 1
+        return items
+
+    def _emit(self, raw: str, items: list[Any]) -> None:
+        self._item_start = -1
+        try:
+            items.append(json.loads(raw))
+        except ValueError:
+            return
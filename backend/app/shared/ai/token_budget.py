@@ -0,0 +1,49 @@
+"""Prompt token 预算工具。
+
+不依赖具体模型的分词器，按经验估算：CJK 字符约 1 token/字，其他字符约 4 字符/token。
+估算值只用于在拼装 prompt 前控制上下文规模，宁可略微高估。
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+def _is_cjk(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x4E00 <= code <= 0x9FFF
+        or 0x3400 <= code <= 0x4DBF
+        or 0x3000 <= code <= 0x303F
+        or 0xFF00 <= code <= 0xFFEF
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本占用的 token 数。"""
+    if not text:
+        return 0
+    cjk = sum(1 for char in text if _is_cjk(char))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def take_within_budget(
+    items: Iterable[T],
+    budget_tokens: int,
+    render: Callable[[T], str],
+) -> tuple[list[T], int]:
+    """按顺序保留不超过预算的条目，返回 (保留条目, 已用 token 数)。
+
+    条目应已按重要性排序；第一个放不下的条目之后全部截断，保证截断结果是原顺序的前缀。
+    """
+    kept: list[T] = []
+    used = 0
+    for item in items:
+        cost = estimate_tokens(render(item))
+        if used + cost > budget_tokens:
+            break
+        kept.append(item)
+        used += cost
+    return kept, used
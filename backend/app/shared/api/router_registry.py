@@ -26,6 +26,7 @@ _API_MODULE_PATHS = [
     "app.modules.system_config.api",
     "app.modules.ai_analysis.api",
     "app.modules.project.api",
+    "app.modules.search.api",
 ]
 
 
@@ -2,7 +2,7 @@
 健康检查路由
 
 用于监控服务健康状态：
-- GET /health      基础健康检查（反映基础设施概况）
+- GET /health      基础健康检查（反映基础设施概况与启动耗时）
 - GET /health/ready 就绪检查（真实依赖探测，未就绪返回 503）
 - GET /health/live  存活检查
 """
@@ -14,6 +14,7 @@ from fastapi import APIRouter, Response, status
 
 from app.shared.api.schemas.base import APIResponse
 from app.shared.core.mongo_client import get_mongo_client
+from app.shared.core.startup_timing import get_startup_report
 from app.shared.infrastructure import get_infrastructure_registry
 # 运行时读取 Redis 连接，避免模块导入时绑定到未初始化的 None。
 # init_redis() 会在 lifespan 中重新赋值 app.shared.redis.service.redis_conn。
@@ -61,6 +62,8 @@ async def _build_health_payload() -> dict:
         "warnings": [],
         "components": dict(infrastructure.get("components", {})),
         "timestamp": infrastructure.get("timestamp"),
+        # 最近一次启动的分步耗时（含索引同步模式），用于排查启动变慢
+        "startup": get_startup_report(),
     }
 
 
@@ -1,6 +1,7 @@
 """Lightweight runtime metrics endpoints."""
 from __future__ import annotations
 
+from app.shared.ai.cache import get_ai_call_metrics_snapshot
 from app.shared.api.schemas.base import APIResponse
 from app.shared.observability.http_metrics import get_http_metrics_snapshot
 
@@ -13,3 +14,9 @@ router = APIRouter()
 def http_metrics():
     """Return in-process HTTP latency metrics for P0 performance triage."""
     return APIResponse(data=get_http_metrics_snapshot())
+
+
+@router.get("/ai-metrics", summary="AI 调用缓存与限流指标")
+def ai_call_metrics():
+    """Return AI call cache hit/miss, coalescing and latency metrics per route."""
+    return APIResponse(data=get_ai_call_metrics_snapshot())
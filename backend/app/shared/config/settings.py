@@ -153,6 +153,8 @@ class MinIOConfig(BaseModel):
     bucket: str = "attachments"
     secure: bool = False
     presigned_url_expires_seconds: int = 7 * 24 * 60 * 60
+    # 流式上传的分片大小（S3 要求除最后一片外不小于 5MiB），决定单个上传的内存占用上限
+    multipart_part_size: int = 8 * 1024 * 1024
 
 
 class JWTConfig(BaseModel):
@@ -192,6 +194,8 @@ class ExecutionConfig(BaseModel):
     kafka_worker_agent_id: str = "execution-kafka-worker"
     kafka_worker_heartbeat_ttl_sec: int = 30
     kafka_worker_heartbeat_interval_sec: int = 10
+    # 进程内代理负载注册表从数据库刷新的间隔，两次刷新之间靠本地预占计数补偿
+    agent_registry_refresh_sec: int = 5
 
 
 class LoggingRetentionConfig(BaseModel):
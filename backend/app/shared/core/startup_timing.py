@@ -0,0 +1,105 @@
+"""启动耗时报告。
+
+API 与 Kafka Worker 启动时用 `StartupReport.step` 包裹每个初始化步骤，
+相互独立的步骤可以放进同一个 `asyncio.gather` 并发执行，报告按实际开始/结束时间记录：
+
+    report = begin_startup_report("api")
+    await report.step("mongo_ping", client.admin.command("ping"))
+    await asyncio.gather(report.step("a", a()), report.step("b", b(), required=False))
+    report.finish()
+
+`get_startup_report()` 返回最近一次启动的报告（供 `/health` 展示）。
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, TypeVar
+
+from app.shared.core.logger import log
+
+T = TypeVar("T")
+
+STEP_OK = "ok"
+STEP_FAILED = "failed"
+
+
+@dataclass(slots=True)
+class StartupStep:
+    name: str
+    started_ms: float
+    duration_ms: float
+    status: str
+    error: str | None = None
+
+
+@dataclass
+class StartupReport:
+    service: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    steps: list[StartupStep] = field(default_factory=list)
+    details: dict[str, Any] = field(default_factory=dict)
+    total_ms: float | None = None
+    _origin: float = field(default_factory=time.perf_counter, repr=False)
+
+    def _elapsed_ms(self, since: float | None = None) -> float:
+        return (time.perf_counter() - (self._origin if since is None else since)) * 1000
+
+    async def step(self, name: str, awaitable: Awaitable[T], *, required: bool = True) -> T | None:
+        """执行并计时一个启动步骤；required=False 时失败只记录告警并返回 None。"""
+        started = time.perf_counter()
+        started_ms = round(self._elapsed_ms(), 1)
+        try:
+            result = await awaitable
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            duration_ms = round(self._elapsed_ms(started), 1)
+            self.steps.append(StartupStep(name, started_ms, duration_ms, STEP_FAILED, error))
+            if required:
+                raise
+            log.warning("启动步骤 {} 失败（非阻塞，将继续启动）: {}", name, error)
+            return None
+        self.steps.append(StartupStep(name, started_ms, round(self._elapsed_ms(started), 1), STEP_OK))
+        return result
+
+    def note(self, key: str, value: Any) -> None:
+        self.details[key] = value
+
+    def finish(self) -> float:
+        self.total_ms = round(self._elapsed_ms(), 1)
+        summary = ", ".join(f"{item.name}={item.duration_ms:.0f}ms" for item in self.steps)
+        log.info("启动完成 | service={} | total={:.0f}ms | {}", self.service, self.total_ms, summary)
+        return self.total_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "service": self.service,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": self.total_ms,
+            "steps": [
+                {
+                    "name": item.name,
+                    "started_ms": item.started_ms,
+                    "duration_ms": item.duration_ms,
+                    "status": item.status,
+                    **({"error": item.error} if item.error else {}),
+                }
+                for item in self.steps
+            ],
+            "details": dict(self.details),
+        }
+
+
+_current_report: StartupReport | None = None
+
+
+def begin_startup_report(service: str) -> StartupReport:
+    global _current_report
+    _current_report = StartupReport(service=service)
+    return _current_report
+
+
+def get_startup_report() -> dict[str, Any] | None:
+    return _current_report.as_dict() if _current_report is not None else None
@@ -0,0 +1,34 @@
+"""流式导入导出工具：游标分块读取 + CSV / NDJSON / XLSX 编码与解析。"""
+from .reader import (
+    IMPORT_CHUNK_SIZE,
+    ImportCellKind,
+    ImportColumn,
+    ImportRow,
+    decode_import_row,
+    detect_import_format,
+    iter_import_chunks,
+)
+from .stream import (
+    EXPORT_CHUNK_SIZE,
+    ExportColumn,
+    ExportFormat,
+    build_export_response,
+    iter_cursor_chunks,
+    iter_export_bytes,
+)
+
+__all__ = [
+    "EXPORT_CHUNK_SIZE",
+    "IMPORT_CHUNK_SIZE",
+    "ExportColumn",
+    "ExportFormat",
+    "ImportCellKind",
+    "ImportColumn",
+    "ImportRow",
+    "build_export_response",
+    "decode_import_row",
+    "detect_import_format",
+    "iter_cursor_chunks",
+    "iter_export_bytes",
+    "iter_import_chunks",
+]
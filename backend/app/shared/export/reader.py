@@ -0,0 +1,225 @@
+"""大文件流式导入读取。
+
+与导出对称：CSV / NDJSON / XLSX 文件逐行读取，每 `chunk_size` 行产出一块，内存占用只与块大小有关。
+表头既可以是字段名（NDJSON 导出的 key），也可以是导出文件的中文表头，导出的文件可以直接改完再导入。
+
+读取只做表头映射，不做类型转换；单元格解码（`decode_import_row`）由调用方逐行执行，
+这样一行格式错误只记为该行失败，不会中断整个文件。
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, BinaryIO, Iterator, Sequence
+
+from .stream import ExportFormat
+
+IMPORT_CHUNK_SIZE = 500
+# 单元格内列表的分隔符；目录路径按 `/` 分段，与导出的 catalog_path_key 一致
+_LIST_SEPARATORS = (",", "，", ";", "；", "\n")
+_TRUE_VALUES = {"是", "true", "yes", "y", "1"}
+_FALSE_VALUES = {"否", "false", "no", "n", "0"}
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+class ImportCellKind(str, Enum):
+    TEXT = "text"
+    INT = "int"
+    BOOL = "bool"
+    LIST = "list"
+    PATH = "path"
+    JSON = "json"
+
+
+@dataclass(frozen=True, slots=True)
+class ImportColumn:
+    """导入列：`key` 为字段名，`title` 为导出表头，`kind` 决定单元格解码方式。"""
+
+    key: str
+    title: str
+    kind: ImportCellKind = ImportCellKind.TEXT
+
+
+@dataclass(slots=True)
+class ImportRow:
+    """一行原始数据；`row_number` 为数据行序号（从 1 开始，不含表头），`error` 为读取阶段的格式错误。"""
+
+    row_number: int
+    values: dict[str, Any]
+    error: str | None = None
+
+
+def detect_import_format(filename: str) -> ExportFormat:
+    """按文件扩展名识别导入格式，不支持的扩展名抛出 ValueError。"""
+    suffix = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if suffix == "jsonl":
+        suffix = ExportFormat.NDJSON.value
+    try:
+        return ExportFormat(suffix)
+    except ValueError:
+        raise ValueError(f"不支持的导入文件格式: {filename}（仅支持 csv / ndjson / xlsx）") from None
+
+
+def _header_map(columns: Sequence[ImportColumn]) -> dict[str, str]:
+    mapping: dict[str, str] = {}
+    for column in columns:
+        mapping[column.key.lower()] = column.key
+        mapping[column.title.strip().lower()] = column.key
+    return mapping
+
+
+def _map_row(header_keys: list[str | None], values: Sequence[Any]) -> dict[str, Any]:
+    row: dict[str, Any] = {}
+    for key, value in zip(header_keys, values):
+        if key is None or value is None or value == "":
+            continue
+        row[key] = value
+    return row
+
+
+def _iter_csv_rows(file: BinaryIO, mapping: dict[str, str]) -> Iterator[ImportRow]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None) or []
+        header_keys = [mapping.get(str(title).strip().lower()) for title in header]
+        for row_number, values in enumerate(reader, start=1):
+            if any(value.strip() for value in values):
+                yield ImportRow(row_number, _map_row(header_keys, values))
+            else:
+                yield ImportRow(row_number, {})
+    finally:
+        text.detach()
+
+
+def _iter_ndjson_rows(file: BinaryIO, mapping: dict[str, str]) -> Iterator[ImportRow]:
+    row_number = 0
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield ImportRow(row_number, {}, f"JSON 格式错误: {exc}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(row_number, {}, "每行必须是 JSON 对象")
+            continue
+        keys = [mapping.get(str(key).strip().lower()) for key in data]
+        yield ImportRow(row_number, _map_row(keys, list(data.values())))
+
+
+def _iter_xlsx_rows(file: BinaryIO, mapping: dict[str, str]) -> Iterator[ImportRow]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        header_keys = [
+            mapping.get(str(title).strip().lower()) if title is not None else None for title in header
+        ]
+        for row_number, values in enumerate(rows, start=1):
+            yield ImportRow(row_number, _map_row(header_keys, values))
+    finally:
+        workbook.close()
+
+
+def iter_import_chunks(
+    file: BinaryIO,
+    import_format: ExportFormat,
+    columns: Sequence[ImportColumn],
+    *,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    skip_rows: int = 0,
+) -> Iterator[list[ImportRow]]:
+    """逐块读取导入文件（同步生成器，调用方应放到线程中推进）。
+
+    `skip_rows` 跳过前 N 个数据行，用于从上次提交的位置续传；空行也占用行号，保证续传位置稳定。
+    """
+    mapping = _header_map(columns)
+    if import_format == ExportFormat.CSV:
+        rows = _iter_csv_rows(file, mapping)
+    elif import_format == ExportFormat.NDJSON:
+        rows = _iter_ndjson_rows(file, mapping)
+    else:
+        rows = _iter_xlsx_rows(file, mapping)
+
+    chunk: list[ImportRow] = []
+    for row in rows:
+        if row.row_number <= skip_rows:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _split_list(value: Any, separators: Sequence[str]) -> list[str]:
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    text = str(value)
+    for separator in separators[1:]:
+        text = text.replace(separator, separators[0])
+    return [item.strip() for item in text.split(separators[0]) if item.strip()]
+
+
+def _decode_cell(value: Any, kind: ImportCellKind) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        # 还原导出时为防公式注入加的单引号前缀
+        if value.startswith("'") and value[1:].startswith(_FORMULA_PREFIXES):
+            value = value[1:]
+    if kind == ImportCellKind.TEXT:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return value if isinstance(value, str) else str(value)
+    if kind == ImportCellKind.INT:
+        if isinstance(value, bool):
+            raise ValueError("必须是整数")
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError("必须是整数")
+            return int(value)
+        return int(value)
+    if kind == ImportCellKind.BOOL:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+        raise ValueError("必须是 是/否")
+    if kind == ImportCellKind.LIST:
+        return _split_list(value, _LIST_SEPARATORS)
+    if kind == ImportCellKind.PATH:
+        return _split_list(value, ("/", "\\"))
+    if isinstance(value, str):
+        return json.loads(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def decode_import_row(values: dict[str, Any], columns: Sequence[ImportColumn]) -> dict[str, Any]:
+    """按列类型解码一行原始数据，出错时抛出带列名的 ValueError。"""
+    decoded: dict[str, Any] = {}
+    for column in columns:
+        if column.key not in values:
+            continue
+        try:
+            decoded[column.key] = _decode_cell(values[column.key], column.kind)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{column.title}({column.key}) 格式错误: {exc}") from None
+    return decoded
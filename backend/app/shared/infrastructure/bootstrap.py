@@ -2,13 +2,22 @@ from __future__ import annotations
 
 import importlib
 import os
-from typing import Any
+from typing import Any, Sequence
 
 from beanie import init_beanie
 
 from app.shared.infrastructure.document_registry import get_document_models
+from app.shared.infrastructure.index_fingerprint import (
+    collection_fingerprints,
+    record_fingerprints,
+    stale_collections,
+)
 from app.shared.core.logger import log
 
+INDEX_SYNC_SKIP = "skip"
+INDEX_SYNC_ALWAYS = "always"
+INDEX_SYNC_AUTO = "auto"
+
 
 # 所有需要注册 Beanie 文档模型的模块路径
 _DOCUMENT_MODULE_PATHS = [
@@ -22,6 +31,7 @@ _DOCUMENT_MODULE_PATHS = [
     "app.modules.project.repository.models",
     "app.modules.notification.repository.models",
     "app.modules.audit.repository.models",
+    "app.modules.search.repository.models",
 ]
 
 
@@ -41,62 +51,124 @@ def get_document_models_list() -> list[type[Any]]:
     return get_document_models()
 
 
+def load_document_models(module_paths: Sequence[str]) -> list[type[Any]]:
+    """只导入指定模块的 repository/models，返回其 DOCUMENT_MODELS。
+
+    供 Kafka worker 等精简启动使用：只注册实际访问的模型，不导入其余业务模块；
+    模块路径取自 `_DOCUMENT_MODULE_PATHS`，导入失败直接抛出。
+    """
+    models: list[type[Any]] = []
+    for module_path in module_paths:
+        for model in importlib.import_module(module_path).DOCUMENT_MODELS:
+            if model not in models:
+                models.append(model)
+    return models
+
+
+def _index_sync_mode() -> str:
+    """SKIP_INDEX_SYNC：1（默认）跳过索引同步，auto 按索引定义指纹决定，其余取值每次同步。
+
+    索引以 `scripts/init/sync_indexes.py` 为准；auto 需显式开启，避免多副本首次部署时同时建索引。
+    """
+    value = os.getenv("SKIP_INDEX_SYNC", "1").strip().lower()
+    if value == "1":
+        return INDEX_SYNC_SKIP
+    if value == INDEX_SYNC_AUTO:
+        return INDEX_SYNC_AUTO
+    return INDEX_SYNC_ALWAYS
+
+
 async def initialize_beanie(
     database: Any,
     *,
     skip_indexes: bool | None = None,
-) -> None:
+    document_models: Sequence[type[Any]] | None = None,
+) -> str:
+    """初始化 Beanie 并按索引同步模式处理 createIndexes，返回本次索引处理结果。
+
+    结果取值：`skipped`（按配置跳过）、`unchanged`（指纹未变化而跳过）、`synced`（已同步）、
+    `failed`（auto 模式下建索引失败，已跳过索引完成初始化，不记录指纹，下次启动重试）。
+    """
+    models = list(document_models) if document_models is not None else get_document_models_list()
     if skip_indexes is None:
-        skip_indexes = os.getenv("SKIP_INDEX_SYNC", "1") == "1"
+        mode = _index_sync_mode()
+    else:
+        mode = INDEX_SYNC_SKIP if skip_indexes else INDEX_SYNC_ALWAYS
 
-    await init_beanie(
-        database=database,
-        document_models=get_document_models_list(),
-        skip_indexes=skip_indexes,
-    )
+    fingerprints = collection_fingerprints(models) if mode != INDEX_SYNC_SKIP else {}
+    stale: list[str] = list(fingerprints)
+    if mode == INDEX_SYNC_AUTO:
+        try:
+            stale = await stale_collections(database, fingerprints)
+        except Exception as exc:
+            log.warning("读取索引指纹失败，本次全量同步索引: {}", exc)
+
+    sync = mode == INDEX_SYNC_ALWAYS or (mode == INDEX_SYNC_AUTO and bool(stale))
+    try:
+        await init_beanie(
+            database=database,
+            document_models=models,
+            skip_indexes=not sync,
+        )
+    except Exception as exc:
+        # auto 模式的索引同步只是启动优化，失败不应中断启动；显式同步（SKIP_INDEX_SYNC=0）照常抛出
+        if not (sync and mode == INDEX_SYNC_AUTO):
+            raise
+        log.error(
+            "Beanie 索引同步失败，已跳过索引继续启动，请运行 python scripts/init/sync_indexes.py 修复: {}",
+            exc,
+        )
+        await init_beanie(database=database, document_models=models, skip_indexes=True)
+        return "failed"
 
-    if skip_indexes:
+    if mode == INDEX_SYNC_SKIP:
         log.info(
             "Beanie 索引同步已跳过（SKIP_INDEX_SYNC=1），"
             "如需同步索引请运行: python scripts/init/sync_indexes.py"
         )
+        return "skipped"
+    if not sync:
+        log.info("Beanie 索引定义未变化，跳过索引同步（{} 个集合）", len(fingerprints))
+        return "unchanged"
+
+    log.info("Beanie 索引已同步: {}", ", ".join(stale) if mode == INDEX_SYNC_AUTO else "全部集合")
+    try:
+        await record_fingerprints(database, fingerprints)
+    except Exception as exc:
+        log.warning("记录索引指纹失败，下次启动将重新同步: {}", exc)
+    return "synced"
 
 
 async def validate_workflow_consistency() -> None:
-    """启动时校验 workflow 基础配置，避免脏配置进入运行期。"""
-    from app.modules.workflow.repository.models import (
-        SysWorkflowConfigDoc,
-        SysWorkflowStateDoc,
-        SysWorkTypeDoc,
-    )
-
-    work_types = await SysWorkTypeDoc.find_all().to_list()
-    states = await SysWorkflowStateDoc.find_all().to_list()
-    configs = await SysWorkflowConfigDoc.find_all().to_list()
-
-    if not work_types and not states and not configs:
+    """启动时加载并校验 workflow 基础配置，避免脏配置进入运行期。
+
+    校验使用的编译状态机同时安装为进程内缓存，运行期流转校验不再重复查询配置集合。
+    """
+    from app.modules.workflow.application import WorkflowStateMachineStore
+
+    machine = await WorkflowStateMachineStore.load()
+
+    if machine.is_empty:
         log.warning(
             "workflow consistency check skipped: workflow configs are empty, "
             "run `python scripts/init/sync_workflow.py` to initialize"
         )
         return
 
-    if not work_types:
+    if not machine.type_codes:
         raise RuntimeError("workflow consistency check failed: no work types configured")
-    if not states:
+    if not machine.state_codes:
         raise RuntimeError("workflow consistency check failed: no states configured")
 
-    type_codes = {doc.code for doc in work_types}
-    state_codes = {doc.code for doc in states}
     errors: list[str] = []
 
-    for cfg in configs:
-        if cfg.type_code not in type_codes:
-            errors.append(f"unknown type_code={cfg.type_code}")
-        if cfg.from_state not in state_codes:
-            errors.append(f"unknown from_state={cfg.from_state}")
-        if cfg.to_state not in state_codes:
-            errors.append(f"unknown to_state={cfg.to_state}")
+    for rule in machine.transitions.values():
+        if rule.type_code not in machine.type_codes:
+            errors.append(f"unknown type_code={rule.type_code}")
+        if rule.from_state not in machine.state_codes:
+            errors.append(f"unknown from_state={rule.from_state}")
+        if rule.to_state not in machine.state_codes:
+            errors.append(f"unknown to_state={rule.to_state}")
 
     if errors:
         raise RuntimeError(
@@ -0,0 +1,72 @@
+"""Beanie 索引定义指纹。
+
+按集合计算文档模型索引定义（`Settings.indexes` 与 `Indexed(...)` 字段）的哈希，
+记录在 `sys_index_fingerprints` 集合中。启动时只要本进程注册的集合指纹都与记录一致，
+就跳过 `createIndexes`；任一集合的索引定义变化时整体同步一次并更新记录。
+
+`scripts/init/sync_indexes.py` 仍是权威的全量同步入口，执行后同样会刷新指纹记录。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+INDEX_FINGERPRINT_COLLECTION = "sys_index_fingerprints"
+_FINGERPRINT_DOC_ID = "beanie_indexes"
+
+
+def _normalize_index(index: Any) -> Any:
+    document = getattr(index, "document", None)
+    if document is not None:
+        # pymongo IndexModel：key 为 SON，其余为索引选项
+        return {name: list(value.items()) if name == "key" else value for name, value in document.items()}
+    return index
+
+
+def _collection_name(model: type[Any]) -> str:
+    settings = getattr(model, "Settings", None)
+    return getattr(settings, "name", None) or model.__name__
+
+
+def _index_spec(model: type[Any]) -> list[Any]:
+    settings = getattr(model, "Settings", None)
+    spec: list[Any] = [_normalize_index(index) for index in getattr(settings, "indexes", None) or []]
+    for field_name, field in getattr(model, "model_fields", {}).items():
+        indexed = getattr(field.annotation, "_indexed", None)
+        if indexed is not None:
+            spec.append({"field": field_name, "type": indexed[0], "options": indexed[1]})
+    return spec
+
+
+def collection_fingerprints(models: Iterable[type[Any]]) -> dict[str, str]:
+    """返回 {集合名: 索引定义哈希}，同一集合对应多个模型时合并计算。"""
+    specs: dict[str, list[Any]] = {}
+    for model in models:
+        specs.setdefault(_collection_name(model), []).extend(_index_spec(model))
+    return {
+        name: hashlib.sha256(
+            json.dumps(spec, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        for name, spec in specs.items()
+    }
+
+
+async def stale_collections(database: Any, fingerprints: dict[str, str]) -> list[str]:
+    """返回索引定义与已记录指纹不一致（或从未记录）的集合。"""
+    record = await database[INDEX_FINGERPRINT_COLLECTION].find_one({"_id": _FINGERPRINT_DOC_ID})
+    recorded = (record or {}).get("collections", {})
+    return sorted(name for name, value in fingerprints.items() if recorded.get(name) != value)
+
+
+async def record_fingerprints(database: Any, fingerprints: dict[str, str]) -> None:
+    """记录已同步集合的指纹，未参与本次同步的集合记录保持不变。"""
+    if not fingerprints:
+        return
+    update: dict[str, Any] = {f"collections.{name}": value for name, value in fingerprints.items()}
+    update["updated_at"] = datetime.now(timezone.utc)
+    await database[INDEX_FINGERPRINT_COLLECTION].update_one(
+        {"_id": _FINGERPRINT_DOC_ID}, {"$set": update}, upsert=True
+    )
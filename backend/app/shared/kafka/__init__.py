@@ -1,10 +1,33 @@
-"""Kafka 消息管理模块。"""
+"""Kafka 消息管理模块。
+
+导出对象按需从子模块加载：只用到配置或消息结构的调用方不会导入 consumer 及 kafka 客户端库。
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "ConsumerSubscription": ".config",
+    "KafkaConfig": ".config",
+    "load_kafka_config": ".config",
+    "KafkaConsumerRunner": ".consumer",
+    "DeadLetterMessage": ".dead_letter",
+    "KafkaDeadLetterPublisher": ".dead_letter",
+    "KafkaProducerManager": ".producer",
+    "ResultMessage": ".producer",
+    "TaskMessage": ".producer",
+    "KafkaTopicHandlerRegistry": ".router",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .config import ConsumerSubscription, KafkaConfig, load_kafka_config
-from .consumer import KafkaConsumerRunner
-from .dead_letter import DeadLetterMessage, KafkaDeadLetterPublisher
-from .producer import KafkaProducerManager, ResultMessage, TaskMessage
-from .router import KafkaTopicHandlerRegistry
 
 __all__ = [
     "ConsumerSubscription",
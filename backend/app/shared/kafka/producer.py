@@ -14,14 +14,14 @@ import asyncio
 import json
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any
-
-from kafka import KafkaProducer
-from kafka.errors import KafkaError, KafkaTimeoutError
+from typing import TYPE_CHECKING, Any
 
 from app.shared.core.logger import log
 from app.shared.kafka.config import KafkaConfig, load_kafka_config
 
+if TYPE_CHECKING:
+    from kafka import KafkaProducer
+
 
 def _json_dumps(payload: dict[str, Any]) -> str:
     """将消息体序列化为紧凑 JSON 字符串，并保留中文字符。"""
@@ -136,7 +136,9 @@ class KafkaProducerManager:
         self.is_running = False
 
     def _create_producer(self) -> KafkaProducer:
-        """按当前运行时配置创建 KafkaProducer 实例。"""
+        """按当前运行时配置创建 KafkaProducer 实例（kafka 客户端库在此时才导入）。"""
+        from kafka import KafkaProducer
+
         return KafkaProducer(
             bootstrap_servers=self.bootstrap_servers,
             client_id=self.client_id,
@@ -173,6 +175,8 @@ class KafkaProducerManager:
             log.error("Kafka producer manager is not running")
             return False
 
+        from kafka.errors import KafkaError, KafkaTimeoutError
+
         try:
             future = self.producer.send(topic=topic, key=key, value=value, headers=headers)
             await asyncio.to_thread(future.get, timeout=10)
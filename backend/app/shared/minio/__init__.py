@@ -1,5 +1,26 @@
+"""MinIO 对象存储封装。
+
+客户端模块按需导入，避免导入附件等业务模块时连带加载 minio SDK。
+"""
+
+from typing import Any
+
 from .config import MinIOConfig, load_minio_config
-from .client import MinIOClientWrapper, get_minio_client
+
+
+def get_minio_client() -> Any:
+    from .client import get_minio_client as _get_minio_client
+
+    return _get_minio_client()
+
+
+def __getattr__(name: str) -> Any:
+    if name == "MinIOClientWrapper":
+        from .client import MinIOClientWrapper
+
+        return MinIOClientWrapper
+    raise AttributeError(name)
+
 
 __all__ = [
     "MinIOConfig",
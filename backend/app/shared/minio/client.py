@@ -1,11 +1,12 @@
 import io
 from datetime import timedelta
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional
 
 from minio import Minio
 from minio.error import S3Error
 
 from ..minio.config import MinIOConfig, load_minio_config
+from ..minio.presign_cache import PresignedUrlCache
 
 
 class MinIOClientWrapper:
@@ -15,6 +16,7 @@ class MinIOClientWrapper:
         self.config = config or load_minio_config()
         self._client: Optional[Minio] = None
         self._bucket = self.config.bucket
+        self._presign_cache = PresignedUrlCache()
 
     @property
     def client(self) -> Minio:
@@ -65,6 +67,56 @@ class MinIOClientWrapper:
         except S3Error as e:
             raise RuntimeError(f"Failed to upload object {object_name}: {e}")
 
+    def put_stream(
+        self,
+        object_name: str,
+        stream: BinaryIO,
+        content_type: str,
+    ) -> None:
+        """流式上传对象（长度未知时由 MinIO 按分片上传）
+
+        每次只从 stream 读取一个分片（config.multipart_part_size），
+        且串行上传分片，内存占用与文件大小无关。
+
+        Args:
+            object_name: 对象名（不含bucket前缀）
+            stream: 可读的文件对象
+            content_type: MIME类型
+        """
+        try:
+            self.client.put_object(
+                bucket_name=self._bucket,
+                object_name=object_name,
+                data=stream,
+                length=-1,
+                content_type=content_type,
+                part_size=self.config.multipart_part_size,
+                num_parallel_uploads=1,
+            )
+        except S3Error as e:
+            raise RuntimeError(f"Failed to upload object {object_name}: {e}")
+
+    def get_object_stream(self, object_name: str, offset: int = 0, length: int = 0):
+        """打开对象读取流（调用方负责 close/release_conn）
+
+        Args:
+            object_name: 对象名
+            offset: 起始字节偏移
+            length: 读取长度（0 表示读到末尾）
+
+        Returns:
+            urllib3 响应对象，可通过 stream() 按块读取
+        """
+        try:
+            return self.client.get_object(
+                bucket_name=self._bucket,
+                object_name=object_name,
+                offset=offset,
+                length=length,
+            )
+        except S3Error as e:
+            raise RuntimeError(f"Failed to get object {object_name}: {e}")
+
     def get_object(self, object_name: str) -> bytes:
         """获取对象内容
 
@@ -86,6 +138,7 @@ class MinIOClientWrapper:
         Args:
             object_name: 对象名
         """
+        self._presign_cache.invalidate(object_name)
         try:
             self.client.remove_object(bucket_name=self._bucket, object_name=object_name)
         except S3Error as e:
@@ -115,9 +168,7 @@ class MinIOClientWrapper:
         object_name: str,
         expires_seconds: int | None = None,
     ) -> str:
-        if expires_seconds is None:
-            expires_seconds = self.config.presigned_url_expires_seconds
-        """生成预签名下载链接
+        """生成预签名下载链接（命中缓存时直接复用）
 
         Args:
             object_name: 对象名
@@ -126,14 +177,60 @@ class MinIOClientWrapper:
         Returns:
             预签名URL
         """
-        try:
-            return self.client.presigned_get_object(
-                bucket_name=self._bucket,
-                object_name=object_name,
-                expires=timedelta(seconds=expires_seconds),
-            )
-        except S3Error as e:
-            raise RuntimeError(f"Failed to generate presigned URL for {object_name}: {e}")
+        return self.presigned_get_objects([object_name], expires_seconds)[object_name]
+
+    def cached_presigned_urls(
+        self,
+        object_names: Iterable[str],
+        expires_seconds: int | None = None,
+    ) -> tuple[dict[str, str], list[str]]:
+        """只查缓存，不签名（不访问 MinIO，可在事件循环中直接调用）
+
+        Returns:
+            (命中的 {对象名: URL}, 未命中的对象名列表)
+        """
+        if expires_seconds is None:
+            expires_seconds = self.config.presigned_url_expires_seconds
+        hits: dict[str, str] = {}
+        misses: list[str] = []
+        for object_name in dict.fromkeys(object_names):
+            url = self._presign_cache.get(object_name, expires_seconds)
+            if url is None:
+                misses.append(object_name)
+            else:
+                hits[object_name] = url
+        return hits, misses
+
+    def presigned_get_objects(
+        self,
+        object_names: Iterable[str],
+        expires_seconds: int | None = None,
+    ) -> dict[str, str]:
+        """批量生成预签名下载链接，同一有效期窗口内复用已签名的链接
+
+        Args:
+            object_names: 对象名列表（重复项只签名一次）
+            expires_seconds: 过期时间（秒）
+
+        Returns:
+            {对象名: 预签名URL}
+        """
+        if expires_seconds is None:
+            expires_seconds = self.config.presigned_url_expires_seconds
+        urls, misses = self.cached_presigned_urls(object_names, expires_seconds)
+        for object_name in misses:
+            signed_at = self._presign_cache.now()
+            try:
+                url = self.client.presigned_get_object(
+                    bucket_name=self._bucket,
+                    object_name=object_name,
+                    expires=timedelta(seconds=expires_seconds),
+                )
+            except S3Error as e:
+                raise RuntimeError(f"Failed to generate presigned URL for {object_name}: {e}")
+            self._presign_cache.put(object_name, expires_seconds, url, signed_at=signed_at)
+            urls[object_name] = url
+        return urls
 
     def get_bucket(self) -> str:
         """获取存储桶名称"""
@@ -0,0 +1,64 @@
+"""预签名 URL 缓存。
+
+预签名 URL 在有效期内可以重复使用，按 (对象名, 有效期) 缓存已签名的 URL。
+条目在剩余有效期不足请求有效期的一半时视为过期并重新签名，
+保证调用方拿到的链接至少还有一半的有效期；同一对象每个有效期窗口最多签名两次。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class PresignedUrlCache:
+    """线程安全的 LRU 预签名 URL 缓存（签名在 to_thread 中进行，可能并发访问）。"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, int], tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, object_name: str, expires_seconds: int) -> str | None:
+        key = (object_name, expires_seconds)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at - self._clock() < expires_seconds / 2:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return url
+
+    def put(self, object_name: str, expires_seconds: int, url: str, signed_at: float | None = None) -> None:
+        """写入缓存；signed_at 为签名前取的时钟值，避免把签名耗时算进有效期。"""
+        signed_at = self._clock() if signed_at is None else signed_at
+        key = (object_name, expires_seconds)
+        with self._lock:
+            self._entries[key] = (url, signed_at + expires_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def invalidate(self, object_name: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == object_name]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -19,12 +19,15 @@ from app.shared.rabbitmq.config import RabbitMQConfig, load_rabbitmq_config
 try:
     import pika
     from pika.credentials import PlainCredentials
-    from pika.exceptions import AMQPError
+    from pika.exceptions import AMQPError, UnroutableError
 except ImportError:  # pragma: no cover - 当 pika 未安装时的降级处理
     pika = None
     PlainCredentials = None
     AMQPError = Exception
 
+    class UnroutableError(Exception):
+        """pika 未安装时的占位异常。"""
+
 
 class RabbitMQProducerManager:
     """RabbitMQ 生产者管理器。
@@ -172,12 +175,20 @@ class RabbitMQProducerManager:
             log.error(f"RabbitMQ 生产者管理器恢复失败: {exc}")
             return False
 
-    def send_task(self, task_message: TaskMessage, priority: int | None = None) -> bool:
+    def send_task(
+        self,
+        task_message: TaskMessage,
+        priority: int | None = None,
+        routing_key: str | None = None,
+    ) -> bool:
         """发送任务消息到 RabbitMQ。
 
         Args:
             task_message: 任务消息对象
             priority: 消息优先级，若为 None 则使用消息自身的优先级
+            routing_key: 路由键，若为 None 则使用共享任务队列的路由键；
+                指定时投递到对应执行代理的专属队列（队列由代理自行声明并绑定），
+                不可路由时回退共享任务队列
 
         Returns:
             bool: 发送成功返回 True，失败返回 False
@@ -187,7 +198,8 @@ class RabbitMQProducerManager:
             log.error("RabbitMQ 生产者管理器未运行")
             return False
 
-        # 确定优先级
+        # 确定优先级与路由键
+        target_routing_key = routing_key or self.config.task_routing_key
         message_priority = task_message.priority if priority is None else priority
 
         # 构建消息属性
@@ -218,20 +230,17 @@ class RabbitMQProducerManager:
         log.info(
             f"RabbitMQ 消息包详情 | task_id={task_message.task_id} | "
             f"exchange={self.config.task_exchange} | "
-            f"routing_key={self.config.task_routing_key} | "
+            f"routing_key={target_routing_key} | "
             f"payload={json.dumps(task_message.task_data, ensure_ascii=False, indent=2)}"
         )
 
         try:
             # 发布消息
-            self.channel.basic_publish(
-                exchange=self.config.task_exchange,
-                routing_key=self.config.task_routing_key,
-                body=body_bytes,
-                properties=properties,
-                mandatory=False,
+            published_key = self._publish(target_routing_key, body_bytes, properties, task_message.task_id)
+            log.info(
+                f"任务成功发送到 RabbitMQ: {task_message.task_id}, "
+                f"exchange={self.config.task_exchange}, routing_key={published_key}"
             )
-            log.info(f"任务成功发送到 RabbitMQ: {task_message.task_id}, exchange={self.config.task_exchange}, routing_key={self.config.task_routing_key}")
             log.debug(f"RabbitMQ 确认: task_id={task_message.task_id}, publisher_confirm=ACK, delivery_mode=persistent")
             return True
         except AMQPError as exc:
@@ -240,13 +249,7 @@ class RabbitMQProducerManager:
             try:
                 self.stop()
                 self.start()
-                self.channel.basic_publish(
-                    exchange=self.config.task_exchange,
-                    routing_key=self.config.task_routing_key,
-                    body=body_bytes,
-                    properties=properties,
-                    mandatory=False,
-                )
+                self._publish(target_routing_key, body_bytes, properties, task_message.task_id)
                 log.info(f"任务重发成功: {task_message.task_id}")
                 return True
             except Exception as retry_exc:
@@ -256,7 +259,44 @@ class RabbitMQProducerManager:
             log.error(f"RabbitMQ 发送失败, task_id={task_message.task_id}, error={exc}")
             return False
 
-    async def send_task_async(self, task_message: TaskMessage, priority: int | None = None) -> bool:
+    def _publish(self, routing_key: str, body: bytes, properties: Any, task_id: str) -> str:
+        """发布一条消息，返回实际投递的路由键。
+
+        定向到执行代理专属队列时以 mandatory 发布：代理队列尚未声明或已被删除时 broker 会退回消息，
+        开启发布确认的通道据此抛出 `UnroutableError`，此时改投共享任务队列，避免消息被静默丢弃。
+        """
+        agent_targeted = routing_key != self.config.task_routing_key
+        try:
+            self.channel.basic_publish(
+                exchange=self.config.task_exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=properties,
+                mandatory=agent_targeted,
+            )
+            return routing_key
+        except UnroutableError:
+            if not agent_targeted:
+                raise
+            log.warning(
+                f"代理队列不可路由, task_id={task_id}, routing_key={routing_key}, "
+                f"回退共享队列 routing_key={self.config.task_routing_key}"
+            )
+        self.channel.basic_publish(
+            exchange=self.config.task_exchange,
+            routing_key=self.config.task_routing_key,
+            body=body,
+            properties=properties,
+            mandatory=False,
+        )
+        return self.config.task_routing_key
+
+    async def send_task_async(
+        self,
+        task_message: TaskMessage,
+        priority: int | None = None,
+        routing_key: str | None = None,
+    ) -> bool:
         """异步发送任务消息到 RabbitMQ（async 安全包装）。
 
         通过 asyncio.to_thread 将同步 pika 调用推到线程池执行，
@@ -265,12 +305,35 @@ class RabbitMQProducerManager:
         Args:
             task_message: 任务消息对象
             priority: 消息优先级，若为 None 则使用消息自身的优先级
+            routing_key: 路由键，若为 None 则使用共享任务队列的路由键
 
         Returns:
             bool: 发送成功返回 True，失败返回 False
         """
         async with self._lock:
-            return await asyncio.to_thread(self.send_task, task_message, priority)
+            return await asyncio.to_thread(self.send_task, task_message, priority, routing_key)
+
+    def send_tasks(self, messages: list[tuple[TaskMessage, str | None]]) -> list[bool]:
+        """在同一通道上连续发送多条任务消息，按输入顺序返回各条是否成功。
+
+        Args:
+            messages: (任务消息, 路由键) 列表，路由键为 None 时走共享任务队列
+
+        Returns:
+            list[bool]: 与输入一一对应的发送结果
+        """
+        return [self.send_task(message, routing_key=routing_key) for message, routing_key in messages]
+
+    async def send_tasks_async(self, messages: list[tuple[TaskMessage, str | None]]) -> list[bool]:
+        """批量发送任务消息（async 安全包装）。
+
+        整批只占用一次发送锁、一次线程切换，避免逐条 send_task_async 时
+        每条消息都排队抢锁并往返线程池。
+        """
+        if not messages:
+            return []
+        async with self._lock:
+            return await asyncio.to_thread(self.send_tasks, messages)
 
     def health_check(self) -> dict[str, Any]:
         """健康检查。
@@ -11,7 +11,7 @@ import queue
 import socket
 import threading
 import time
-from typing import Any
+from typing import Any, Callable
 
 from redis.sentinel import Sentinel
 
@@ -24,6 +24,7 @@ from app.shared.redis.service.constants import (
     KEY_NAMESPACE,
     PUBLISH_QUEUE_MAXSIZE,
     SERVICE_REGISTRY_TTL_SEC,
+    SUBSCRIBE_RETRY_DELAY_SEC,
 )
 from app.shared.redis.service.exceptions import RedisConnectionError
 
@@ -96,8 +97,11 @@ _publish_queue: queue.Queue = queue.Queue(maxsize=PUBLISH_QUEUE_MAXSIZE)
 _publish_thread: threading.Thread | None = None
 
 
-def init_redis() -> None:
-    """由 FastAPI lifespan 调用，完成 Sentinel 连接池和后台线程初始化。"""
+def init_redis(register: bool = True) -> None:
+    """由 FastAPI lifespan 调用，完成 Sentinel 连接池和后台线程初始化。
+
+    Kafka worker 等非 API 进程只需要发布/订阅，传 register=False 跳过服务注册与心跳。
+    """
     global redis_mgr, redis_conn, redis_read, _publish_thread
 
     if redis_conn is not None:
@@ -111,8 +115,9 @@ def init_redis() -> None:
     _publish_thread.start()
     logger.info("Redis 后台发布线程已启动")
 
-    register_service()
-    _start_heartbeat()
+    if register:
+        register_service()
+        _start_heartbeat()
 
 
 def build_key(domain: str, entity: str, key_id: str) -> str:
@@ -140,6 +145,36 @@ def publish_event(message: str, channel: str = DEFAULT_EVENT_CHANNEL) -> None:
         logger.warning("Redis 发布队列已满，消息已丢弃")
 
 
+def subscribe_events(handler: Callable[[str], None], channel: str = DEFAULT_EVENT_CHANNEL) -> threading.Thread:
+    """后台线程订阅频道，每条消息调用一次 handler（在订阅线程中执行，需保证线程安全）。
+
+    连接中断时按 SUBSCRIBE_RETRY_DELAY_SEC 间隔重连，直到进程退出。
+    """
+    thread = threading.Thread(target=_subscribe_loop, args=(channel, handler), daemon=True)
+    thread.start()
+    logger.info(f"Redis 订阅线程已启动: channel={channel}")
+    return thread
+
+
+def _subscribe_loop(channel: str, handler: Callable[[str], None]) -> None:
+    import app.shared.redis.service as svc
+
+    while True:
+        try:
+            pubsub = svc.redis_conn.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    handler(message["data"])
+                except Exception as exc:
+                    logger.warning(f"Redis 订阅消息处理失败: channel={channel}, error={exc}")
+        except Exception as exc:
+            logger.warning(f"Redis 订阅中断，{SUBSCRIBE_RETRY_DELAY_SEC} 秒后重连: channel={channel}, error={exc}")
+        time.sleep(SUBSCRIBE_RETRY_DELAY_SEC)
+
+
 _heartbeat_thread: threading.Thread | None = None
 _heartbeat_stop = threading.Event()
 
@@ -9,6 +9,9 @@ DEFAULT_EVENT_CHANNEL = "dmlv4:events"
 # 发布队列最大容量
 PUBLISH_QUEUE_MAXSIZE = 1000
 
+# 订阅连接中断后的重连间隔（秒）
+SUBSCRIBE_RETRY_DELAY_SEC = 5
+
 # 服务注册 / 心跳相关配置
 SERVICE_REGISTRY_TTL_SEC = 600  # 注册信息过期时间（秒），心跳续期需小于此值
 HEARTBEAT_INTERVAL_SEC = 60     # 心跳续期间隔（秒）
@@ -1,5 +1,22 @@
 """通用服务工具"""
 from .base import BaseService
+from .pagination import (
+    CREATED_AT_DESC,
+    CURSOR_HEADER,
+    InvalidCursorError,
+    KeysetSort,
+    decode_offset_cursor,
+    encode_offset_cursor,
+)
 from .sequence_id import SequenceIdService
 
-__all__ = ["BaseService", "SequenceIdService"]
+__all__ = [
+    "BaseService",
+    "CREATED_AT_DESC",
+    "CURSOR_HEADER",
+    "InvalidCursorError",
+    "KeysetSort",
+    "SequenceIdService",
+    "decode_offset_cursor",
+    "encode_offset_cursor",
+]
@@ -0,0 +1,145 @@
+"""
+游标（keyset）分页
+
+`skip(offset)` 翻到第 N 页时 Mongo 需要先走过并丢弃前面所有文档，页越深越慢。
+游标分页记住上一页最后一条的 `(排序字段, _id)`，下一页直接用范围条件从该位置继续，
+配合 `(排序字段, _id)` 复合索引，任意页的代价都只与页大小有关。
+
+游标对调用方不透明（base64url 编码的 JSON），并绑定排序字段，换了排序方式的旧游标会被拒绝。
+列表接口同时保留 offset 模式：不传 `cursor` 时行为与原来一致，只是排序追加 `_id` 保证顺序稳定。
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Sequence
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING
+
+# 列表型响应通过该响应头返回下一页游标；对象型响应放在 `next_cursor` 字段
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """游标无法解析，或与当前排序方式不匹配。"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def _row_value(row: Any, key: str) -> Any:
+    return row.get(key) if isinstance(row, dict) else getattr(row, key, None)
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetSort:
+    """单字段排序 + `_id` 兜底的 keyset 分页描述。"""
+
+    field: str = "created_at"
+    descending: bool = True
+
+    @classmethod
+    def parse(cls, expression: str) -> "KeysetSort":
+        """从 Beanie 风格的排序表达式（如 `-created_at`）构造。"""
+        if expression.startswith("-"):
+            return cls(expression[1:], True)
+        return cls(expression.lstrip("+"), False)
+
+    def sort_spec(self) -> list[tuple[str, int]]:
+        direction = DESCENDING if self.descending else ASCENDING
+        return [(self.field, direction), ("_id", direction)]
+
+    def encode(self, value: Any, doc_id: Any) -> str:
+        payload = {"f": self.field, "v": _encode_value(value), "id": str(doc_id)}
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[Any, ObjectId]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            value = _decode_value(payload["v"])
+            doc_id = ObjectId(payload["id"])
+            field = payload["f"]
+        except (binascii.Error, ValueError, TypeError, KeyError, InvalidId):
+            raise InvalidCursorError("invalid cursor") from None
+        if field != self.field:
+            raise InvalidCursorError(f"cursor was issued for sort field '{field}', not '{self.field}'")
+        return value, doc_id
+
+    def filter_after(self, cursor: str) -> dict[str, Any]:
+        """返回“排在游标之后”的查询条件。
+
+        Mongo 中 null/缺失值排在最小端，且 `$lt/$gt` 不会跨类型比较，因此游标值为 None 时单独处理：
+        倒序下 null 之后只剩同为 null 的文档，正序下 null 之后是全部非 null 文档。
+        """
+        value, doc_id = self.decode(cursor)
+        id_op = "$lt" if self.descending else "$gt"
+        if value is None:
+            tie = {self.field: None, "_id": {id_op: doc_id}}
+            if self.descending:
+                return tie
+            return {"$or": [{self.field: {"$ne": None}}, tie]}
+        value_op = "$lt" if self.descending else "$gt"
+        after = [{self.field: {value_op: value}}, {self.field: value, "_id": {id_op: doc_id}}]
+        if self.descending:
+            # 倒序时 null 排在所有非 null 之后
+            after.append({self.field: None})
+        return {"$or": after}
+
+    def next_cursor(self, rows: Sequence[Any], limit: int) -> str | None:
+        """根据本页结果生成下一页游标；不足一页说明已到末尾，返回 None。
+
+        `rows` 可以是 Beanie 文档，也可以是带 `id` 字段的序列化字典。
+        """
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        doc_id = last.get("id") if isinstance(last, dict) else last.id
+        return self.encode(_row_value(last, self.field), doc_id)
+
+    def paginate(self, query: Any, *, limit: int, offset: int = 0, cursor: str | None = None) -> Any:
+        """给 Beanie 查询加上排序与分页：有游标走 keyset，否则走 offset。"""
+        if cursor:
+            query = query.find(self.filter_after(cursor))
+        query = query.sort(self.sort_spec())
+        if not cursor and offset:
+            query = query.skip(offset)
+        return query.limit(limit)
+
+
+CREATED_AT_DESC = KeysetSort("created_at", True)
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """无法 keyset 的结果（如搜索索引按相关度排序）用偏移游标，保持接口形态一致。"""
+    raw = json.dumps({"o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int | None:
+    """解析偏移游标；不是偏移游标（如 keyset 游标）时返回 None。"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError("invalid cursor") from None
+    offset = payload.get("o") if isinstance(payload, dict) else None
+    if offset is None:
+        return None
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("invalid cursor")
+    return offset
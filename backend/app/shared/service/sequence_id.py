@@ -18,13 +18,23 @@ class SequenceIdService:
 
     async def next(self, key: str, session=None) -> int:
         """获取指定 key 的下一个序号（从 1 开始）。"""
+        return await self._advance(key, 1, session)
+
+    async def next_many(self, key: str, count: int, session=None) -> range:
+        """一次原子操作预留 count 个连续序号，返回预留的序号区间。"""
+        if count <= 0:
+            return range(0)
+        last = await self._advance(key, count, session)
+        return range(last - count + 1, last + 1)
+
+    async def _advance(self, key: str, step: int, session=None) -> int:
         client = self._client or get_mongo_client()
         collection = client[get_settings().mongodb.db_name][self.COUNTERS_COLLECTION]
         now = datetime.now(timezone.utc)
         doc = await collection.find_one_and_update(
             {"_id": key},
             {
-                "$inc": {"seq": 1},
+                "$inc": {"seq": step},
                 "$set": {"updated_at": now},
                 "$setOnInsert": {"created_at": now},
             },
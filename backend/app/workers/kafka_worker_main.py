@@ -11,47 +11,30 @@ import asyncio
 import json
 import os
 import sys
-import time
 from contextlib import asynccontextmanager
 from typing import Any
 
-from beanie import init_beanie
 from pymongo import AsyncMongoClient
 
-from app.main import validate_workflow_consistency
 from app.modules.execution.application.worker_presence import (
     get_kafka_worker_heartbeat_interval_seconds,
     upsert_kafka_worker_presence,
     mark_kafka_worker_offline,
 )
-from app.modules.auth.repository.models import RoleDoc, UserDoc
 from app.modules.execution.application.kafka_handlers import register_execution_kafka_handlers
-from app.modules.execution.repository.models import (
-    ExecutionAgentDoc,
-    ExecutionBizLogDoc,
-    ExecutionEventDoc,
-    ExecutionTaskCaseDoc,
-    ExecutionTaskDoc,
-)
-from app.modules.test_specs.repository.models import (
-    AutomationTestCaseDoc,
-    TestCaseDoc,
-    TestRequirementDoc,
-)
-from app.modules.workflow.repository.models import (
-    BusFlowLogDoc,
-    BusWorkItemDoc,
-    SysWorkflowConfigDoc,
-    SysWorkflowStateDoc,
-    SysWorkTypeDoc,
-)
-from app.modules.system_config.repository.models import SystemConfigDoc, SystemConfigHistoryDoc
 from app.modules.system_config.service import ConfigService
 from app.shared.core.logger import log
+from app.shared.core.startup_timing import begin_startup_report
 from app.shared.core.mongo_client import set_mongo_client
 from app.shared.config import get_bootstrap_settings
 from app.shared.infrastructure import initialize_kafka_producer_only, shutdown_infrastructure
+from app.shared.infrastructure.bootstrap import (
+    initialize_beanie,
+    load_document_models,
+    validate_workflow_consistency,
+)
 from app.shared.kafka import KafkaConsumerRunner, KafkaTopicHandlerRegistry, load_kafka_config
+from app.shared.redis.service import init_redis
 
 # 调试模式开关，可通过环境变量 KAFKA_WORKER_DEBUG=1 开启
 DEBUG_MODE = os.getenv("KAFKA_WORKER_DEBUG", "0") == "1"
@@ -71,67 +54,76 @@ def _serialize_for_log(obj: Any) -> str:
         return f"<unserializable: {type(obj).__name__}>"
 
 
-DOCUMENT_MODELS = [
-    # Worker 进程也需要初始化 Beanie 模型，否则无法使用 ODM 访问 MongoDB。
-    SysWorkTypeDoc,
-    SysWorkflowStateDoc,
-    SysWorkflowConfigDoc,
-    BusWorkItemDoc,
-    BusFlowLogDoc,
-    TestRequirementDoc,
-    TestCaseDoc,
-    AutomationTestCaseDoc,
-    ExecutionAgentDoc,
-    ExecutionBizLogDoc,
-    ExecutionEventDoc,
-    ExecutionTaskDoc,
-    ExecutionTaskCaseDoc,
-    UserDoc,
-    RoleDoc,
-    SystemConfigDoc,
-    SystemConfigHistoryDoc,
-]
+# Worker 进程也需要初始化 Beanie 模型，否则无法使用 ODM 访问 MongoDB；
+# 只导入 worker 会访问到的模块模型（结果入库、计划回写、项目统计、运行配置等）。
+WORKER_DOCUMENT_MODULES = (
+    "app.modules.workflow.repository.models",
+    "app.modules.test_specs.repository.models",
+    "app.modules.execution.repository.models",
+    "app.modules.auth.repository.models",
+    "app.modules.execution_plan.repository.models",
+    "app.modules.system_config.repository.models",
+    "app.modules.project.repository.models",
+)
 
 _mongo_client: AsyncMongoClient | None = None
 _worker_heartbeat_task: asyncio.Task | None = None
 
 
+async def _initialize_redis() -> None:
+    # Redis 只用于广播执行进度增量；不可用时不阻断消费，前端回退到轮询。
+    try:
+        await asyncio.wait_for(asyncio.to_thread(init_redis, register=False), timeout=8)
+        log.info("Redis initialized for progress publishing")
+    except Exception as exc:
+        log.warning("Redis unavailable, execution progress push disabled: {}", exc)
+        return
+    # 计划/项目回写会解析用户名，跟随 API 实例的用户变更广播失效用户目录
+    from app.modules.auth.user_directory import start_user_change_listener
+    start_user_change_listener()
+
+
 async def initialize_worker_runtime() -> None:
     """初始化 worker 运行时资源。"""
     global _mongo_client
     global _worker_heartbeat_task
-    start_time = time.time()
+    report = begin_startup_report("kafka_worker")
     log.info("Initializing Kafka worker runtime (debug=%s)", DEBUG_MODE)
 
     # 连接 MongoDB，并把客户端注入到全局上下文，供事务或底层访问使用。
     mongo_config = get_bootstrap_settings().mongodb
     client = AsyncMongoClient(mongo_config.uri)
-    await client.admin.command("ping")
+    await report.step("mongo_ping", client.admin.command("ping"))
     set_mongo_client(client)
-    log.info("MongoDB connected (%.0fms)", (time.time() - start_time) * 1000)
 
-    # 初始化 Beanie ODM，注册 worker 会访问到的全部文档模型。
-    beanie_start = time.time()
-    await init_beanie(
-        database=client[mongo_config.db_name],
-        document_models=DOCUMENT_MODELS,
+    # 初始化 Beanie ODM，注册 worker 会访问到的全部文档模型；索引按 SKIP_INDEX_SYNC 模式同步（默认跳过）。
+    index_sync = await report.step(
+        "beanie_init",
+        initialize_beanie(
+            client[mongo_config.db_name],
+            document_models=load_document_models(WORKER_DOCUMENT_MODULES),
+        ),
     )
-    log.info("Beanie ODM initialized (%.0fms)", (time.time() - beanie_start) * 1000)
+    report.note("index_sync", index_sync)
 
-    await ConfigService.load_runtime_settings()
-
-    # 启动前校验 workflow 配置，避免 worker 消费到消息后才发现配置错误。
-    await validate_workflow_consistency()
+    # 运行配置与 workflow 校验互不依赖；启动前校验 workflow 配置，避免消费到消息后才发现配置错误。
+    await asyncio.gather(
+        report.step("runtime_settings", ConfigService.load_runtime_settings()),
+        report.step("workflow_consistency", validate_workflow_consistency()),
+    )
 
-    # Kafka worker 内部仍可能需要发送 Kafka 消息，因此只初始化 Kafka producer。
-    await initialize_kafka_producer_only()
+    # Kafka worker 内部仍可能需要发送 Kafka 消息，因此只初始化 Kafka producer；与 Redis 初始化并发执行。
+    await asyncio.gather(
+        report.step("kafka_producer", initialize_kafka_producer_only()),
+        report.step("redis", _initialize_redis()),
+    )
 
     # 将 worker 标记为在线，并启动后台心跳任务。
-    await upsert_kafka_worker_presence(status="ONLINE")
+    await report.step("worker_presence", upsert_kafka_worker_presence(status="ONLINE"))
     _worker_heartbeat_task = asyncio.create_task(_run_worker_heartbeat_loop())
     _mongo_client = client
 
-    log.info("Kafka worker runtime initialized (%.0fms)", (time.time() - start_time) * 1000)
+    report.finish()
 
 
 async def shutdown_worker_runtime() -> None:
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""对比 offset 分页与游标（keyset）分页在深页上的查询耗时。
+
+在临时集合中写入 `--docs` 条文档并建立与列表接口相同的 `(is_deleted, created_at, _id)` 复合索引，
+分别测量第 N 页的 `skip/limit` 与 keyset 查询耗时，结束后删除临时集合。
+
+运行方式：
+    uv run python scripts/dev/benchmark_pagination.py --docs 100000 --page 1 --page 100 --page 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.shared.service import CREATED_AT_DESC  # noqa: E402
+from scripts.common.database import database_runtime  # noqa: E402
+
+COLLECTION = "benchmark_pagination"
+QUERY = {"is_deleted": False}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark offset vs keyset pagination")
+    parser.add_argument("--docs", type=int, default=100_000, help="写入临时集合的文档数")
+    parser.add_argument("--page", type=int, action="append", help="测量的页码，可重复传入")
+    parser.add_argument("--page-size", type=int, default=20, help="每页数量")
+    parser.add_argument("--rounds", type=int, default=10, help="每个页码的查询轮数")
+    return parser.parse_args()
+
+
+async def seed(collection: Any, total: int) -> None:
+    await collection.create_indexes([
+        IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ])
+    started = datetime.now(timezone.utc)
+    batch: list[dict[str, Any]] = []
+    for index in range(total):
+        # 每 10 条共用一个时间戳，覆盖 created_at 相同、靠 _id 兜底的情况
+        batch.append({
+            "_id": ObjectId(),
+            "title": f"item {index}",
+            "is_deleted": False,
+            "created_at": started - timedelta(seconds=index // 10),
+        })
+        if len(batch) >= 5000:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+async def offset_page(collection: Any, page: int, page_size: int, _cursor: str | None) -> int:
+    docs = await collection.find(QUERY, sort=CREATED_AT_DESC.sort_spec()).skip(
+        (page - 1) * page_size
+    ).limit(page_size).to_list()
+    return len(docs)
+
+
+async def keyset_page(collection: Any, _page: int, page_size: int, cursor: str | None) -> int:
+    query = {"$and": [QUERY, CREATED_AT_DESC.filter_after(cursor)]} if cursor else QUERY
+    docs = await collection.find(query, sort=CREATED_AT_DESC.sort_spec()).limit(page_size).to_list()
+    return len(docs)
+
+
+async def cursor_before_page(collection: Any, page: int, page_size: int) -> str | None:
+    """取第 page 页之前最后一条文档的游标（等价于客户端逐页翻到这里拿到的游标）。"""
+    if page <= 1:
+        return None
+    docs = await collection.find(QUERY, sort=CREATED_AT_DESC.sort_spec()).skip(
+        (page - 1) * page_size - 1
+    ).limit(1).to_list()
+    return CREATED_AT_DESC.encode(docs[0]["created_at"], docs[0]["_id"]) if docs else None
+
+
+async def measure(runner, collection: Any, page: int, page_size: int, cursor: str | None, rounds: int):
+    timings: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await runner(collection, page, page_size, cursor)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    args = parse_args()
+    pages = sorted(set(args.page or [1, 100, 1000, args.docs // args.page_size]))
+    async with database_runtime(document_models=[]) as database:
+        collection = database[COLLECTION]
+        await collection.drop()
+        try:
+            print(f"写入 {args.docs} 条文档 ...")
+            await seed(collection, args.docs)
+            print(f"每页 {args.page_size} 条，每个页码 {args.rounds} 轮")
+            for page in pages:
+                cursor = await cursor_before_page(collection, page, args.page_size)
+                line = [f"  page={page:<7}"]
+                for name, runner in (("offset", offset_page), ("keyset", keyset_page)):
+                    timings = await measure(runner, collection, page, args.page_size, cursor, args.rounds)
+                    line.append(f"{name} p50={statistics.median(timings):8.2f}ms")
+                print("  ".join(line))
+        finally:
+            await collection.drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
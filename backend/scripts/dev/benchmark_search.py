@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""对比工作项搜索的正则回退路径与全局搜索倒排索引的查询耗时。
+
+需先执行 `scripts/init/sync_search_index.py --types work_item` 构建索引。
+
+运行方式：
+    uv run python scripts/dev/benchmark_search.py --keyword 内存 --keyword 压力测试 --rounds 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.modules.search.application import GlobalSearchService  # noqa: E402
+from app.modules.search.domain.constants import SearchEntityType  # noqa: E402
+from app.modules.workflow.repository.models import BusWorkItemDoc  # noqa: E402
+from scripts.common.database import database_runtime  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark regex fallback vs search index")
+    parser.add_argument("--keyword", action="append", required=True, help="查询关键字，可重复传入")
+    parser.add_argument("--rounds", type=int, default=20, help="每个关键字的查询轮数")
+    parser.add_argument("--limit", type=int, default=20, help="每次查询返回数量")
+    return parser.parse_args()
+
+
+async def regex_search(keyword: str, limit: int) -> int:
+    escaped = re.escape(keyword)
+    docs = await BusWorkItemDoc.find(
+        {
+            "is_deleted": False,
+            "$or": [
+                {"title": {"$regex": escaped, "$options": "i"}},
+                {"content": {"$regex": escaped, "$options": "i"}},
+            ],
+        }
+    ).sort("-created_at").limit(limit).to_list()
+    return len(docs)
+
+
+async def index_search(keyword: str, limit: int) -> int:
+    page = await GlobalSearchService().search(
+        keyword,
+        entity_types=[SearchEntityType.WORK_ITEM.value],
+        limit=limit,
+    )
+    return len(page["items"])
+
+
+async def measure(
+    runner: Callable[[str, int], Awaitable[int]],
+    keyword: str,
+    rounds: int,
+    limit: int,
+) -> tuple[list[float], int]:
+    timings: list[float] = []
+    hits = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hits = await runner(keyword, limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, hits
+
+
+def describe(name: str, timings: list[float], hits: int) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"  {name:<6} p50={statistics.median(ordered):8.2f}ms  p95={p95:8.2f}ms  hits={hits}"
+
+
+async def main() -> None:
+    args = parse_args()
+    async with database_runtime():
+        total = await BusWorkItemDoc.find({"is_deleted": False}).count()
+        print(f"工作项总数: {total}，每个关键字 {args.rounds} 轮")
+        for keyword in args.keyword:
+            print(f"[{keyword}]")
+            for name, runner in (("regex", regex_search), ("index", index_search)):
+                timings, hits = await measure(runner, keyword, args.rounds, args.limit)
+                print(describe(name, timings, hits))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""全量重建全局搜索索引。
+
+首次启用全局搜索、调整分词规则或修复索引漂移时执行。重建完成的实体类型会被标记为 ready，
+之后工作项搜索等查询将由倒排索引承接。
+
+运行方式：
+    uv run python scripts/init/sync_search_index.py
+    uv run python scripts/init/sync_search_index.py --types work_item,test_case
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.modules.search.application import SearchIndexer, get_search_sources  # noqa: E402
+from scripts.common.database import database_runtime  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild global search index")
+    parser.add_argument("--types", default="", help="逗号分隔的实体类型，默认重建全部")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    requested = {item.strip() for item in args.types.split(",") if item.strip()}
+    sources = [source for source in get_search_sources() if not requested or source.entity_type in requested]
+    unknown = requested - {source.entity_type for source in sources}
+    if unknown:
+        raise SystemExit(f"未知实体类型: {sorted(unknown)}")
+
+    indexer = SearchIndexer()
+    async with database_runtime():
+        for source in sources:
+            started = time.perf_counter()
+            count = await indexer.rebuild(source.entity_type)
+            print(f"[REBUILD] {source.entity_type}: {count} 条，耗时 {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from pymongo import ReturnDocument
+
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -22,6 +24,7 @@ from app.modules.workflow.repository.models import (  # noqa: E402
     SysWorkTypeDoc,
     SysWorkflowStateDoc,
     SysWorkflowConfigDoc,
+    SysWorkflowVersionDoc,
 )
 from scripts.common.database import database_runtime  # noqa: E402
 
@@ -281,6 +284,17 @@ async def _cleanup_removed_workflow_configs(
     )
 
 
+async def _bump_workflow_version() -> int:
+    """自增流程配置版本号，运行中的实例据此重新编译内存状态机。"""
+    version_doc = await SysWorkflowVersionDoc.get_pymongo_collection().find_one_and_update(
+        {"scope": "workflow"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return version_doc["version"]
+
+
 async def sync_workflow_config(*, prune: bool = False) -> None:
     """
     从配置文件初始化基础数据 (Beanie ODM 版本)
@@ -291,6 +305,7 @@ async def sync_workflow_config(*, prune: bool = False) -> None:
     3. 同步 `SysWorkflowStateDoc` (工作流状态)。
     4. 同步 `SysWorkflowConfigDoc` (流转规则)。
     5. 仅在 ``prune=True`` 时清理配置文件中不存在的数据。
+    6. 自增 `SysWorkflowVersionDoc` 版本号，通知运行中的实例重新加载状态机。
     """
     log.info("开始从配置文件初始化基础数据...")
 
@@ -315,7 +330,8 @@ async def sync_workflow_config(*, prune: bool = False) -> None:
         await _cleanup_removed_work_types(work_types_map)
         await _cleanup_removed_workflow_configs(work_types_map, workflow_configs_map)
 
-    log.success("基础数据初始化完成")
+    version = await _bump_workflow_version()
+    log.success(f"基础数据初始化完成，流程配置版本: {version}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -330,7 +346,7 @@ def parse_args() -> argparse.Namespace:
 
 async def main() -> None:
     args = parse_args()
-    models = [SysWorkTypeDoc, SysWorkflowStateDoc, SysWorkflowConfigDoc]
+    models = [SysWorkTypeDoc, SysWorkflowStateDoc, SysWorkflowConfigDoc, SysWorkflowVersionDoc]
     async with database_runtime(document_models=models):
         await sync_workflow_config(prune=args.prune)
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+回填流转日志与计划条目上冗余的 project_ids。
+
+项目看板的动态 / 阻塞项改为直接按 `(project_ids, 时间)` 索引查询 `bus_flow_logs` 与
+`execution_plan_items`，新数据在写入时从所属事项 / 计划复制 project_ids，
+历史数据由本脚本一次性补齐：以未删除事项 / 计划当前的 project_ids 为准整体覆盖，可重复执行。
+已删除事项的日志保持空列表，与看板不展示已删除事项的行为一致。
+
+`backfill_default_project.py` 修改过事项 / 计划的 project_ids 后需要再执行一次本脚本。
+
+运行方式：
+    uv run python scripts/migrations/backfill_project_activity.py
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+from pymongo import UpdateMany
+
+# 添加项目根目录到 path
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.common.database import database_runtime  # noqa: E402
+
+BATCH_SIZE = 500
+
+
+async def backfill(parent: Any, child: Any, parent_key: str, child_key: str) -> int:
+    """按父集合当前的 project_ids 批量覆盖子集合对应文档，返回修改条数。"""
+    modified = 0
+    operations: list[UpdateMany] = []
+    cursor = parent.get_pymongo_collection().find(
+        {"is_deleted": False, "project_ids.0": {"$exists": True}},
+        projection={parent_key: 1, "project_ids": 1},
+    )
+    async for doc in cursor:
+        operations.append(UpdateMany(
+            {child_key: doc[parent_key], "project_ids": {"$ne": doc["project_ids"]}},
+            {"$set": {"project_ids": doc["project_ids"]}},
+        ))
+        if len(operations) >= BATCH_SIZE:
+            result = await child.get_pymongo_collection().bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            operations = []
+    if operations:
+        result = await child.get_pymongo_collection().bulk_write(operations, ordered=False)
+        modified += result.modified_count
+    return modified
+
+
+async def main() -> None:
+    from app.modules.execution_plan.repository.models import ExecutionPlanDoc, ExecutionPlanItemDoc
+    from app.modules.workflow.repository.models import BusFlowLogDoc, BusWorkItemDoc
+
+    # 同步索引以创建 (project_ids, created_at) / (project_ids, is_deleted, status, updated_at)
+    async with database_runtime(
+        document_models=[BusWorkItemDoc, BusFlowLogDoc, ExecutionPlanDoc, ExecutionPlanItemDoc],
+        sync_indexes=True,
+    ):
+        count = await backfill(BusWorkItemDoc, BusFlowLogDoc, "_id", "work_item_id")
+        print(f"[MIGRATE] BusFlowLogDoc: {count} 条日志已回填 project_ids")
+        count = await backfill(ExecutionPlanDoc, ExecutionPlanItemDoc, "plan_id", "plan_id")
+        print(f"[MIGRATE] ExecutionPlanItemDoc: {count} 条条目已回填 project_ids")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""AIClient 响应缓存、请求合并与并发限流单元测试。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.shared.ai.cache import AICallGate, AIResponseCache, build_cache_key, get_ai_call_metrics_snapshot
+from app.shared.ai.client import AIClient
+
+CONFIG = {
+    "enabled": True,
+    "base_url": "http://localhost:11434/v1",
+    "model": "qwen2.5",
+    "api_key": "ollama",
+    "timeout": 60,
+    "temperature": 0.7,
+    "max_tokens": 2048,
+}
+MESSAGES = [{"role": "user", "content": "review"}]
+
+
+def _response(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+def _openai_client(create) -> MagicMock:
+    client = MagicMock()
+    client.chat.completions.create = create
+    return client
+
+
+@pytest.fixture
+def ai_client():
+    AIClient.reset()
+    client = AIClient.get_instance()
+    with patch.object(client, "get_config", AsyncMock(return_value=CONFIG)):
+        yield client
+    AIClient.reset()
+
+
+def test_cache_evicts_expired_and_least_recently_used():
+    ticks = [0.0]
+    cache = AIResponseCache(max_entries=2, ttl_seconds=10, clock=lambda: ticks[0])
+    cache.put("a", {"content": "a"})
+    cache.put("b", {"content": "b"})
+    assert cache.get("a") == {"content": "a"}
+
+    cache.put("c", {"content": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    ticks[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_cache_key_covers_model_and_sampling_params():
+    base = build_cache_key("http://a", "m1", MESSAGES, 0.3, 100)
+    assert base == build_cache_key("http://a", "m1", list(MESSAGES), 0.3, 100)
+    assert base != build_cache_key("http://a", "m2", MESSAGES, 0.3, 100)
+    assert base != build_cache_key("http://a", "m1", MESSAGES, 0.4, 100)
+    assert base != build_cache_key("http://a", "m1", MESSAGES, 0.3, 200)
+
+
+async def test_identical_inflight_calls_are_coalesced_and_then_cached(ai_client):
+    release = asyncio.Event()
+
+    async def _create(**_kwargs):
+        await release.wait()
+        return _response("ok")
+
+    create = AsyncMock(side_effect=_create)
+    with patch.object(ai_client, "get_client", AsyncMock(return_value=_openai_client(create))):
+        calls = [
+            asyncio.create_task(ai_client.chat_completion(MESSAGES, route="test_specs.review_case"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+        cached = await ai_client.chat_completion(MESSAGES, route="test_specs.review_case")
+
+    assert create.await_count == 1
+    assert [result.content for result in results] == ["ok"] * 3
+    assert cached.cached is True
+    route = get_ai_call_metrics_snapshot()["routes"][0]
+    assert (route["hits"], route["misses"], route["coalesced"], route["calls"]) == (1, 1, 2, 1)
+
+
+async def test_failed_call_is_not_cached(ai_client):
+    ai_client._max_retries = 1
+    create = AsyncMock(side_effect=[Exception("boom"), _response("ok")])
+    with patch.object(ai_client, "get_client", AsyncMock(return_value=_openai_client(create))):
+        with pytest.raises(Exception, match="boom"):
+            await ai_client.chat_completion(MESSAGES)
+        result = await ai_client.chat_completion(MESSAGES)
+
+    assert result.content == "ok"
+    assert result.cached is False
+    assert get_ai_call_metrics_snapshot()["summary"]["errors"] == 1
+
+
+async def test_use_cache_false_always_calls_model(ai_client):
+    create = AsyncMock(return_value=_response("ok"))
+    with patch.object(ai_client, "get_client", AsyncMock(return_value=_openai_client(create))):
+        await ai_client.chat_completion(MESSAGES, use_cache=False)
+        await ai_client.chat_completion(MESSAGES, use_cache=False)
+
+    assert create.await_count == 2
+
+
+async def test_unparseable_json_response_is_evicted(ai_client):
+    create = AsyncMock(side_effect=[_response("not json"), _response('{"score": 1}')])
+    with patch.object(ai_client, "get_client", AsyncMock(return_value=_openai_client(create))):
+        with pytest.raises(json.JSONDecodeError):
+            await ai_client.chat_completion_json("system", "user")
+        result = await ai_client.chat_completion_json("system", "user")
+
+    assert result == {"score": 1}
+    assert create.await_count == 2
+
+
+async def test_gate_queues_calls_beyond_route_limit():
+    gate = AICallGate(global_limit=3, default_route_limit=1)
+    running = 0
+    peak = 0
+
+    async def _work(route: str):
+        nonlocal running, peak
+        async with gate.slot(route):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(_work("a") for _ in range(3)))
+    assert peak == 1
+
+    peak = 0
+    await asyncio.gather(*(_work(route) for route in ("a", "b", "c", "d")))
+    assert peak == 3
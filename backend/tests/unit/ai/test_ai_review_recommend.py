@@ -13,6 +13,20 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 
+RETRIEVAL_TC = "app.modules.test_specs.application.case_retrieval.TestCaseDoc"
+RETRIEVAL_EMBED = "app.modules.test_specs.application.case_retrieval.EmbeddingService.embed_text"
+RETRIEVAL_CHUNKS = "app.modules.test_specs.application.case_retrieval.iter_cursor_chunks"
+
+
+def _candidate_chunks(docs):
+    """检索打分阶段的游标分块：所有候选一批产出。"""
+    async def _fake_chunks(collection, query, **kwargs):
+        if docs:
+            yield [{"case_id": d.case_id, "embedding": None} for d in docs]
+
+    return _fake_chunks
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  review-case
 # ═══════════════════════════════════════════════════════════════════════
@@ -169,6 +183,7 @@ async def test_recommend_cases_success():
 
     mock_query = MagicMock()
     mock_query.to_list = AsyncMock(return_value=mock_docs)
+    mock_query.project = MagicMock(return_value=mock_query)
 
     mock_tc_cls = MagicMock()
     mock_tc_cls.find = MagicMock(return_value=mock_query)
@@ -179,7 +194,8 @@ async def test_recommend_cases_success():
         client.chat_completion_json = AsyncMock(return_value=mock_raw)
         get_instance.return_value = client
 
-        with patch("app.modules.test_specs.repository.models.test_case.TestCaseDoc", mock_tc_cls):
+        with patch(RETRIEVAL_TC, mock_tc_cls), patch(RETRIEVAL_EMBED, AsyncMock(return_value=None)), \
+             patch(RETRIEVAL_CHUNKS, _candidate_chunks(mock_query.to_list.return_value)):
             from app.modules.system_config.api.ai_routes import RecommendCasesRequest, recommend_cases
             req = RecommendCasesRequest(
                 project_id="PROJ-1",
@@ -195,6 +211,8 @@ async def test_recommend_cases_success():
     assert data.excluded[0].case_id == "TC-002"
     assert data.estimated_runtime_min == 45
     assert "核心功能" in data.coverage_note
+    assert data.retrieval_strategy == "fallback"
+    assert data.retrieved_count == 5
 
 
 async def test_recommend_cases_no_candidates():
@@ -203,12 +221,14 @@ async def test_recommend_cases_no_candidates():
 
     mock_query = MagicMock()
     mock_query.to_list = AsyncMock(return_value=[])
+    mock_query.project = MagicMock(return_value=mock_query)
 
     mock_tc_cls = MagicMock()
     mock_tc_cls.find = MagicMock(return_value=mock_query)
     mock_tc_cls.is_deleted = MagicMock()
 
-    with patch("app.modules.test_specs.repository.models.test_case.TestCaseDoc", mock_tc_cls):
+    with patch(RETRIEVAL_TC, mock_tc_cls), patch(RETRIEVAL_EMBED, AsyncMock(return_value=None)), \
+         patch(RETRIEVAL_CHUNKS, _candidate_chunks(mock_query.to_list.return_value)):
         from app.modules.system_config.api.ai_routes import RecommendCasesRequest, recommend_cases
         req = RecommendCasesRequest(change_description="some change")
         with pytest.raises(HTTPException) as exc_info:
@@ -228,6 +248,7 @@ async def test_recommend_cases_respects_max_recommend():
 
     mock_query = MagicMock()
     mock_query.to_list = AsyncMock(return_value=mock_docs)
+    mock_query.project = MagicMock(return_value=mock_query)
 
     mock_tc_cls = MagicMock()
     mock_tc_cls.find = MagicMock(return_value=mock_query)
@@ -238,7 +259,8 @@ async def test_recommend_cases_respects_max_recommend():
         client.chat_completion_json = AsyncMock(return_value=mock_raw)
         get_instance.return_value = client
 
-        with patch("app.modules.test_specs.repository.models.test_case.TestCaseDoc", mock_tc_cls):
+        with patch(RETRIEVAL_TC, mock_tc_cls), patch(RETRIEVAL_EMBED, AsyncMock(return_value=None)), \
+             patch(RETRIEVAL_CHUNKS, _candidate_chunks(mock_query.to_list.return_value)):
             from app.modules.system_config.api.ai_routes import RecommendCasesRequest, recommend_cases
             req = RecommendCasesRequest(
                 change_description="test",
@@ -266,6 +288,7 @@ async def test_recommend_cases_sorted_by_priority_order():
     mock_docs = [MagicMock(case_id="TC-X", title="U", priority="P1", test_category="", tags=[])]
     mock_query = MagicMock()
     mock_query.to_list = AsyncMock(return_value=mock_docs)
+    mock_query.project = MagicMock(return_value=mock_query)
 
     mock_tc_cls = MagicMock()
     mock_tc_cls.find = MagicMock(return_value=mock_query)
@@ -276,7 +299,8 @@ async def test_recommend_cases_sorted_by_priority_order():
         client.chat_completion_json = AsyncMock(return_value=mock_raw)
         get_instance.return_value = client
 
-        with patch("app.modules.test_specs.repository.models.test_case.TestCaseDoc", mock_tc_cls):
+        with patch(RETRIEVAL_TC, mock_tc_cls), patch(RETRIEVAL_EMBED, AsyncMock(return_value=None)), \
+             patch(RETRIEVAL_CHUNKS, _candidate_chunks(mock_query.to_list.return_value)):
             from app.modules.system_config.api.ai_routes import RecommendCasesRequest, recommend_cases
             req = RecommendCasesRequest(change_description="test")
             response = await recommend_cases(req)
@@ -0,0 +1,176 @@
+"""AI 流式调用与 SSE 端点单元测试。"""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.shared.ai.cache import get_ai_call_metrics_snapshot
+from app.shared.ai.client import AIClient
+from app.shared.ai.streaming import JSONArrayItemParser
+
+CONFIG = {
+    "enabled": True,
+    "base_url": "http://localhost:11434/v1",
+    "model": "qwen2.5",
+    "api_key": "ollama",
+    "timeout": 60,
+    "temperature": 0.7,
+    "max_tokens": 2048,
+}
+
+
+class _FakeStream:
+    def __init__(self, deltas: list[str | None]) -> None:
+        self._deltas = deltas
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for delta in self._deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[index:index + size] for index in range(0, len(text), size)]
+
+
+@pytest.fixture
+def ai_client():
+    AIClient.reset()
+    client = AIClient.get_instance()
+    with patch.object(client, "get_config", AsyncMock(return_value=CONFIG)):
+        yield client
+    AIClient.reset()
+
+
+def _with_stream(client: AIClient, *streams: _FakeStream) -> tuple[MagicMock, object]:
+    create = AsyncMock(side_effect=list(streams))
+    openai_client = MagicMock()
+    openai_client.chat.completions.create = create
+    return create, patch.object(client, "get_client", AsyncMock(return_value=openai_client))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  JSONArrayItemParser
+# ═══════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_parser_emits_array_items_as_they_close(size):
+    text = (
+        '```json\n{"reason": "cases", "cases": [{"title": "含 ] 和 \\" 的标题", "steps": [{"a": [1]}]},'
+        ' {"title": "二"}], "other": [9]}\n```'
+    )
+    parser = JSONArrayItemParser("cases")
+    items = [item for chunk in _chunks(text, size) for item in parser.feed(chunk)]
+
+    assert items == [
+        {"title": '含 ] 和 " 的标题', "steps": [{"a": [1]}]},
+        {"title": "二"},
+    ]
+
+
+def test_parser_handles_scalar_items():
+    parser = JSONArrayItemParser("missing_scenarios")
+    items = parser.feed('{"score": 80, "missing_scenarios": ["超时", "断网", 3]}')
+    assert items == ["超时", "断网", 3]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  AIClient 流式调用
+# ═══════════════════════════════════════════════════════════════════════
+
+async def test_stream_json_yields_tokens_items_and_result(ai_client):
+    text = '{"issues": [{"stepIndex": 0}, {"stepIndex": 1}], "score": 70}'
+    stream = _FakeStream([None, *_chunks(text, 5)])
+    create, patcher = _with_stream(ai_client, stream)
+    with patcher:
+        events = [
+            event async for event in ai_client.stream_chat_completion_json(
+                "system", "user", array_key="issues", route="test_specs.analyze_steps",
+            )
+        ]
+
+    assert create.await_args.kwargs["stream"] is True
+    assert "".join(payload for kind, payload in events if kind == "token") == text
+    assert [payload for kind, payload in events if kind == "item"] == [{"stepIndex": 0}, {"stepIndex": 1}]
+    assert events[-1] == ("result", json.loads(text))
+    assert stream.closed is True
+
+    route = get_ai_call_metrics_snapshot()["routes"][0]
+    assert route["calls"] == 1
+    assert route["p95_ttfb_ms"] >= 0
+
+
+async def test_stream_result_is_cached_and_bad_json_is_evicted(ai_client):
+    create, patcher = _with_stream(
+        ai_client,
+        _FakeStream(["not ", "json"]),
+        _FakeStream(['{"ok": true}']),
+    )
+    with patcher:
+        with pytest.raises(json.JSONDecodeError):
+            async for _event in ai_client.stream_chat_completion_json("system", "user"):
+                pass
+        first = [event async for event in ai_client.stream_chat_completion_json("system", "user")]
+        second = [event async for event in ai_client.stream_chat_completion_json("system", "user")]
+
+    assert create.await_count == 2
+    assert first[-1] == second[-1] == ("result", {"ok": True})
+    assert get_ai_call_metrics_snapshot()["summary"]["hits"] == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  SSE 端点
+# ═══════════════════════════════════════════════════════════════════════
+
+async def test_analyze_steps_stream_pushes_items_and_result():
+    from app.modules.system_config.api.ai_routes import AnalyzeStepsRequest, analyze_test_steps_stream
+
+    async def _fake_stream(*_args, **_kwargs):
+        yield "token", '{"issues": ['
+        yield "item", {"stepIndex": 0, "severity": "warning", "message": "缺少预期"}
+        yield "result", {"score": 80, "issues": [{"stepIndex": 0, "severity": "warning", "message": "缺少预期"}]}
+
+    with patch("app.shared.ai.client.AIClient.get_instance") as get_instance:
+        get_instance.return_value = SimpleNamespace(stream_chat_completion_json=_fake_stream)
+        response = await analyze_test_steps_stream(AnalyzeStepsRequest(steps=[{"name": "登录"}]))
+        events = [event async for event in response.body_iterator]
+
+    assert [event["event"] for event in events] == ["token", "item", "result"]
+    result = json.loads(events[-1]["data"])
+    assert result["score"] == 80
+    assert result["totalSteps"] == 1
+    assert result["issues"][0]["message"] == "缺少预期"
+
+
+async def test_stream_endpoint_reports_ai_errors_as_events():
+    from app.modules.system_config.api.ai_routes import AnalyzeStepsRequest, analyze_test_steps_stream
+
+    async def _disabled(*_args, **_kwargs):
+        raise RuntimeError("AI 功能未启用")
+        yield  # pragma: no cover
+
+    with patch("app.shared.ai.client.AIClient.get_instance") as get_instance:
+        get_instance.return_value = SimpleNamespace(stream_chat_completion_json=_disabled)
+        response = await analyze_test_steps_stream(AnalyzeStepsRequest(steps=[{"name": "登录"}]))
+        events = [event async for event in response.body_iterator]
+
+    assert [event["event"] for event in events] == ["error"]
+    assert json.loads(events[0]["data"]) == {"status": 503, "detail": "AI 功能未启用"}
+
+
+async def test_stream_endpoint_validates_before_streaming():
+    from fastapi import HTTPException
+    from app.modules.system_config.api.ai_routes import AnalyzeStepsRequest, analyze_test_steps_stream
+
+    with pytest.raises(HTTPException) as exc_info:
+        await analyze_test_steps_stream(AnalyzeStepsRequest(steps=[]))
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,61 @@
+"""导入耗时预算：用 `python -X importtime` 检查各入口的冷启动导入。
+
+重型客户端库（openai / minio / httpx / kafka / pika）只允许在真正使用时导入；
+入口模块的累计导入耗时不得超过预算（预算按开发机实测值留出约 2 倍余量）。
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# 入口模块 -> (累计导入耗时预算 ms, 不允许出现在导入链中的库)
+IMPORT_BUDGETS: dict[str, tuple[int, frozenset[str]]] = {
+    "app.main": (5000, frozenset({"openai", "minio", "httpx", "kafka", "pika"})),
+    "app.workers.kafka_worker_main": (
+        2500,
+        frozenset({"openai", "minio", "httpx", "pika", "fastapi"}),
+    ),
+    "scripts.common.database": (
+        1200,
+        frozenset({"openai", "minio", "httpx", "kafka", "pika", "fastapi"}),
+    ),
+}
+
+
+def _import_profile(module: str) -> dict[str, int]:
+    """返回 {模块名: 累计导入耗时 µs}。"""
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    profile: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+def test_entrypoint_import_stays_within_budget(module: str) -> None:
+    budget_ms, forbidden = IMPORT_BUDGETS[module]
+
+    profile = _import_profile(module)
+
+    loaded = {name for name in profile if name.split(".")[0] in forbidden}
+    assert not loaded, f"{module} 导入链中出现了应延迟导入的库: {sorted(loaded)}"
+    elapsed_ms = profile[module] / 1000
+    assert elapsed_ms <= budget_ms, f"{module} 导入耗时 {elapsed_ms:.0f}ms 超出预算 {budget_ms}ms"
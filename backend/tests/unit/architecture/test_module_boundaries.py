@@ -194,14 +194,14 @@ _ALLOWED_CROSS_MODULE_REPO_IMPORTS: dict[str, set[str]] = {
     "app/modules/test_specs/service/_service_support.py": {"app.modules.workflow.repository.models"},
     "app/modules/test_specs/service/_workflow_status_support.py": {
         "app.modules.workflow.repository.models",
-        "app.modules.auth.repository.models",
     },
-    "app/modules/test_specs/service/change_log_service.py": {"app.modules.auth.repository.models"},
-    "app/modules/test_specs/service/requirement_service.py": {"app.modules.auth.repository.models"},
     "app/modules/test_specs/service/test_case_service.py": {
         "app.modules.workflow.repository.models",
         "app.modules.attachments.repository.models",
     },
+    "app/modules/test_specs/service/import_service.py": {
+        "app.modules.workflow.repository.models",
+    },
     "app/modules/test_specs/domain/policies.py": {"app.modules.workflow.repository.models"},
     # ── workflow ────────────────────────────────────────────
     "app/modules/workflow/application/common.py": {"app.modules.test_specs.repository.models"},
@@ -226,11 +226,7 @@ _ALLOWED_CROSS_MODULE_REPO_IMPORTS: dict[str, set[str]] = {
         "app.modules.test_specs.repository.models",
     },
     # ── project ──────────────────────────────────────────────
-    "app/modules/project/service/project_service.py": {
-        "app.modules.auth.repository.models",
-    },
     "app/modules/project/service/project_dashboard_service.py": {
-        "app.modules.auth.repository.models",
         "app.modules.execution_plan.repository.models",
         "app.modules.workflow.repository.models",
     },
@@ -238,10 +234,6 @@ _ALLOWED_CROSS_MODULE_REPO_IMPORTS: dict[str, set[str]] = {
         "app.modules.execution_plan.repository.models",
         "app.modules.workflow.repository.models",
     },
-    # ── notification ─────────────────────────────────────────
-    "app/modules/notification/service.py": {
-        "app.modules.auth.repository.models",
-    },
     # ── AI 工具（延迟导入需求/用例数据用于 AI 生成与分析） ───
     "app/modules/system_config/api/ai_routes.py": {
         "app.modules.test_specs.repository.models",
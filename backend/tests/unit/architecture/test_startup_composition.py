@@ -36,6 +36,7 @@ def test_bootstrap_exports_document_models_in_startup_order() -> None:
     from app.modules.execution_plan.repository.models import DOCUMENT_MODELS as EXECUTION_PLAN_DOCUMENT_MODELS
     from app.modules.notification.repository.models import DOCUMENT_MODELS as NOTIFICATION_DOCUMENT_MODELS
     from app.modules.project.repository.models import DOCUMENT_MODELS as PROJECT_DOCUMENT_MODELS
+    from app.modules.search.repository.models import DOCUMENT_MODELS as SEARCH_DOCUMENT_MODELS
     from app.modules.system_config.repository.models import DOCUMENT_MODELS as SYSTEM_CONFIG_DOCUMENT_MODELS
     from app.modules.test_specs.repository.models import DOCUMENT_MODELS as TEST_SPECS_DOCUMENT_MODELS
     from app.modules.workflow.repository.models import DOCUMENT_MODELS as WORKFLOW_DOCUMENT_MODELS
@@ -51,6 +52,7 @@ def test_bootstrap_exports_document_models_in_startup_order() -> None:
         *SYSTEM_CONFIG_DOCUMENT_MODELS,
         *PROJECT_DOCUMENT_MODELS,
         *NOTIFICATION_DOCUMENT_MODELS,
+        *SEARCH_DOCUMENT_MODELS,
     ]
 
     assert sorted(get_document_models(), key=str) == sorted(expected, key=str)
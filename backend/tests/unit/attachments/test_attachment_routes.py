@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from types import SimpleNamespace
+
 import pytest
 from fastapi import HTTPException
 
@@ -10,16 +12,6 @@ class _Attachment:
     uploaded_by = "owner"
 
 
-class _UploadFile:
-    def __init__(self, chunks: list[bytes]):
-        self._chunks = list(chunks)
-
-    async def read(self, size: int = -1) -> bytes:
-        if not self._chunks:
-            return b""
-        return self._chunks.pop(0)
-
-
 async def test_owner_can_access_attachment(monkeypatch) -> None:
     async def fail_manage_check(current_user):
         raise AssertionError("owner should not require manage permission")
@@ -68,16 +60,20 @@ async def test_can_manage_attachments_reads_explicit_permission(monkeypatch) ->
     assert await routes._can_manage_attachments({"user_id": "u-1", "role_ids": []}) is True
 
 
-async def test_read_limited_file_rejects_oversized_upload() -> None:
-    upload = _UploadFile([b"ab", b"cd"])
+def test_declared_oversized_upload_is_rejected_before_streaming() -> None:
+    upload = SimpleNamespace(size=4)
 
     with pytest.raises(HTTPException) as exc_info:
-        await routes._read_limited_file(upload, max_size=3)
+        routes._ensure_declared_size(upload, max_size=3)
 
     assert exc_info.value.status_code == 413
 
 
-async def test_read_limited_file_returns_bytes() -> None:
-    upload = _UploadFile([b"ab", b"cd"])
+def test_upload_without_declared_size_is_checked_while_streaming() -> None:
+    routes._ensure_declared_size(SimpleNamespace(size=None), max_size=3)
+
 
-    assert await routes._read_limited_file(upload, max_size=4) == b"abcd"
+def test_content_disposition_encodes_non_ascii_filename() -> None:
+    assert routes._content_disposition("日志 1.txt") == (
+        "attachment; filename*=UTF-8''%E6%97%A5%E5%BF%97%201.txt"
+    )
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import io
 from datetime import datetime, timezone
 from types import SimpleNamespace
 
@@ -8,7 +10,9 @@ import pytest
 
 from app.modules.attachments.repository.models import AttachmentDoc
 from app.modules.attachments.service.attachment_service import AttachmentService
+from app.modules.attachments.service.streaming import UploadTooLargeError
 from app.shared.domain.exceptions import ConflictError
+from app.shared.minio.client import MinIOClientWrapper
 
 
 class _FakeMinioClient:
@@ -20,7 +24,10 @@ class _FakeMinioClient:
     def get_bucket(self) -> str:
         return "attachments"
 
-    def put_object(self, **kwargs) -> None:
+    def put_stream(self, **kwargs) -> None:
+        stream = kwargs["stream"]
+        while stream.read(2):
+            pass
         self.put_calls.append(kwargs)
 
     def remove_object(self, object_name: str) -> None:
@@ -29,6 +36,44 @@ class _FakeMinioClient:
     def presigned_get_object(self, object_name: str, expires_seconds: int | None = None) -> str:
         return f"http://minio.local/{object_name}?expires={expires_seconds}"
 
+    def cached_presigned_urls(self, object_names, expires_seconds=None):
+        return {}, list(dict.fromkeys(object_names))
+
+    def presigned_get_objects(self, object_names, expires_seconds=None):
+        return {name: self.presigned_get_object(name, expires_seconds) for name in object_names}
+
+
+class _SigningClient:
+    def __init__(self):
+        self.signed = []
+
+    def presigned_get_object(self, bucket_name, object_name, expires):
+        self.signed.append(object_name)
+        return f"http://minio.local/{object_name}?expires={int(expires.total_seconds())}"
+
+
+class _FakeBlobStore:
+    """内存版内容对象登记，模拟 _acquire_blob / _release_blob 的引用计数语义。"""
+
+    def __init__(self):
+        self.blobs: dict[str, dict] = {}
+
+    async def acquire(self, sha256, bucket, object_name, size):
+        blob = self.blobs.setdefault(sha256, {"object_name": object_name, "size": size, "ref_count": 0})
+        blob["ref_count"] += 1
+        return dict(blob)
+
+    def install(self, monkeypatch, service: AttachmentService) -> None:
+        async def release(sha256, bucket):
+            blob = self.blobs[sha256]
+            blob["ref_count"] -= 1
+            if blob["ref_count"] <= 0:
+                del self.blobs[sha256]
+                await service._remove_object_quietly(blob["object_name"])
+
+        monkeypatch.setattr(service, "_acquire_blob", self.acquire)
+        monkeypatch.setattr(service, "_release_blob", release)
+
 
 class _FakeAttachment:
     file_id = "file-1"
@@ -38,6 +83,7 @@ class _FakeAttachment:
     size = 128
     content_type = "application/json"
     sha256 = "abc123"
+    blob_sha256 = None
     uploaded_by = "u-1"
     uploaded_at = datetime(2026, 7, 20, 8, 0, 0, tzinfo=timezone.utc)
     is_deleted = False
@@ -65,21 +111,71 @@ async def test_to_info_includes_sha256(monkeypatch) -> None:
     assert info.storage_path == "attachments/attachments/file-1.json"
 
 
-async def test_get_download_url_uses_default_expiry_and_to_thread(monkeypatch) -> None:
+async def test_get_download_url_signs_once_per_expiry_window(monkeypatch) -> None:
     calls = []
 
     async def fake_to_thread(func, *args, **kwargs):
         calls.append((func.__name__, args, kwargs))
         return func(*args, **kwargs)
 
+    minio = MinIOClientWrapper(config=SimpleNamespace(bucket="attachments", presigned_url_expires_seconds=123))
+    minio._client = _SigningClient()
     monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
     monkeypatch.setattr(AttachmentService, "get_attachment", lambda self, file_id: asyncio.sleep(0, _FakeAttachment()))
+    service = _service(monkeypatch, minio=minio)
+
+    first = await service.get_download_url("file-1")
+    second = await service.get_download_url("file-1")
+
+    assert first == second
+    assert first.endswith("expires=123")
+    assert calls == [("presigned_get_objects", (["attachments/file-1.json"], 123), {})]
+    assert minio._client.signed == ["attachments/file-1.json"]
+
+
+async def test_enrich_many_signs_each_object_once(monkeypatch) -> None:
+    calls = []
+
+    async def fake_to_thread(func, *args, **kwargs):
+        calls.append(func.__name__)
+        return func(*args, **kwargs)
+
+    shared = _FakeAttachment()
+    other = _FakeAttachment()
+    other.file_id = "file-2"
+    other.object_name = "attachments/file-2.json"
+    docs = {"file-1": shared, "file-2": other}
+
+    async def fake_load(self, file_ids, *, skip_missing=False):
+        return {file_id: docs[file_id] for file_id in file_ids}
+
+    monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(AttachmentService, "_load_active_docs", fake_load)
     service = _service(monkeypatch)
 
-    url = await service.get_download_url("file-1")
+    enriched = await service.enrich_many(["file-1", "file-2", "file-1"])
+
+    assert set(enriched) == {"file-1", "file-2"}
+    assert enriched["file-2"]["download_url"] == "http://minio.local/attachments/file-2.json?expires=123"
+    assert calls == ["presigned_get_objects"]
+
+
+async def test_load_active_docs_skips_missing_only_when_asked(monkeypatch) -> None:
+    found = _FakeAttachment()
 
-    assert url.endswith("expires=123")
-    assert calls == [("presigned_get_object", ("attachments/file-1.json",), {"expires_seconds": 123})]
+    async def _to_list():
+        return [found]
+
+    query = SimpleNamespace(to_list=_to_list)
+    monkeypatch.setattr(
+        "app.modules.attachments.service.attachment_service.AttachmentDoc",
+        SimpleNamespace(find=lambda *args, **kwargs: query),
+    )
+    service = _service(monkeypatch)
+
+    assert await service._load_active_docs(["file-1", "gone"], skip_missing=True) == {"file-1": found}
+    with pytest.raises(KeyError, match="gone"):
+        await service._load_active_docs(["file-1", "gone"])
 
 
 async def test_upload_file_cleans_minio_object_when_metadata_create_fails(monkeypatch) -> None:
@@ -123,3 +219,115 @@ async def test_delete_attachment_soft_deletes_unreferenced_file(monkeypatch) ->
     assert attachment.is_deleted is True
     assert attachment.deleted_at is not None
     assert attachment.updated is True
+
+
+async def test_upload_file_streams_content_and_hashes_on_the_fly(monkeypatch) -> None:
+    minio = _FakeMinioClient()
+    created = []
+    blobs = _FakeBlobStore()
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    class _RecordingAttachmentDoc(SimpleNamespace):
+        async def create(self):
+            created.append(self)
+
+    monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(
+        "app.modules.attachments.service.attachment_service.AttachmentDoc",
+        _RecordingAttachmentDoc,
+    )
+    service = _service(monkeypatch, minio=minio)
+    blobs.install(monkeypatch, service)
+
+    result = await service.upload_file("input.json", b"{}", "application/json", "u-1")
+
+    assert result.size == 2
+    assert result.sha256 == hashlib.sha256(b"{}").hexdigest()
+    assert created[0].sha256 == result.sha256
+    assert created[0].blob_sha256 == result.sha256
+
+
+async def test_upload_duplicate_content_reuses_existing_object(monkeypatch) -> None:
+    minio = _FakeMinioClient()
+    created = []
+    blobs = _FakeBlobStore()
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    class _RecordingAttachmentDoc(SimpleNamespace):
+        async def create(self):
+            created.append(self)
+
+    monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(
+        "app.modules.attachments.service.attachment_service.AttachmentDoc",
+        _RecordingAttachmentDoc,
+    )
+    service = _service(monkeypatch, minio=minio)
+    blobs.install(monkeypatch, service)
+
+    first = await service.upload_file("a.log", b"same bytes", "text/plain", "u-1")
+    second = await service.upload_file("b.log", b"same bytes", "text/plain", "u-2")
+
+    assert first.file_id != second.file_id
+    assert created[1].object_name == created[0].object_name
+    assert first.storage_path == second.storage_path
+    assert minio.removed == [minio.put_calls[1]["object_name"]]
+    assert blobs.blobs[first.sha256]["ref_count"] == 2
+
+
+async def test_upload_failure_releases_blob_reference(monkeypatch) -> None:
+    minio = _FakeMinioClient()
+    blobs = _FakeBlobStore()
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    async def fail_create(self):
+        raise RuntimeError("db unavailable")
+
+    monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
+    monkeypatch.setattr(AttachmentDoc, "create", fail_create)
+    service = _service(monkeypatch, minio=minio)
+    blobs.install(monkeypatch, service)
+
+    with pytest.raises(RuntimeError, match="Failed to upload file"):
+        await service.upload_file("input.json", b"{}", "application/json", "u-1")
+
+    assert blobs.blobs == {}
+    assert minio.removed == [minio.put_calls[0]["object_name"]]
+
+
+async def test_delete_attachment_releases_shared_content(monkeypatch) -> None:
+    attachment = _FakeAttachment()
+    attachment.blob_sha256 = "abc123"
+    released = []
+    service = _service(monkeypatch, reference_checker=lambda file_id: asyncio.sleep(0, False))
+    monkeypatch.setattr(AttachmentService, "get_attachment", lambda self, file_id: asyncio.sleep(0, attachment))
+    monkeypatch.setattr(
+        service,
+        "_release_blob",
+        lambda sha256, bucket: asyncio.sleep(0, released.append((sha256, bucket))),
+    )
+
+    assert await service.delete_attachment("file-1") is True
+    assert released == [("abc123", "attachments")]
+
+
+async def test_upload_stream_rejects_oversized_content_and_removes_nothing(monkeypatch) -> None:
+    minio = _FakeMinioClient()
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr("app.modules.attachments.service.attachment_service.asyncio.to_thread", fake_to_thread)
+    service = _service(monkeypatch, minio=minio)
+
+    with pytest.raises(UploadTooLargeError):
+        await service.upload_stream("big.log", io.BytesIO(b"abcdef"), "text/plain", "u-1", max_size=3)
+
+    assert minio.put_calls == []
+    assert minio.removed == []
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import io
+
+import pytest
+
+from app.modules.attachments.service.streaming import (
+    ByteRange,
+    HashingReader,
+    RangeNotSatisfiableError,
+    UploadTooLargeError,
+    iter_object_chunks,
+    parse_range_header,
+)
+
+
+class _FakeObjectResponse:
+    def __init__(self, chunks: list[bytes]):
+        self._chunks = chunks
+        self.closed = False
+        self.released = False
+
+    def stream(self, chunk_size: int):
+        yield from self._chunks
+
+    def close(self) -> None:
+        self.closed = True
+
+    def release_conn(self) -> None:
+        self.released = True
+
+
+def test_hashing_reader_tracks_size_and_digest() -> None:
+    reader = HashingReader(io.BytesIO(b"hello world"))
+
+    while reader.read(4):
+        pass
+
+    assert reader.size == 11
+    assert reader.hexdigest() == hashlib.sha256(b"hello world").hexdigest()
+
+
+def test_hashing_reader_enforces_max_size() -> None:
+    reader = HashingReader(io.BytesIO(b"abcdef"), max_size=4)
+    reader.read(4)
+
+    with pytest.raises(UploadTooLargeError):
+        reader.read(4)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-99", ByteRange(0, 99)),
+        ("bytes=100-", ByteRange(100, 999)),
+        ("bytes=-200", ByteRange(800, 999)),
+        ("bytes=900-5000", ByteRange(900, 999)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=abc", None),
+    ],
+)
+def test_parse_range_header(header, expected) -> None:
+    assert parse_range_header(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-2", "bytes=-0"])
+def test_parse_range_header_rejects_unsatisfiable_ranges(header) -> None:
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range_header(header, 1000)
+
+
+def test_byte_range_content_range_header() -> None:
+    assert ByteRange(10, 19).length == 10
+    assert ByteRange(10, 19).content_range(100) == "bytes 10-19/100"
+
+
+def test_iter_object_chunks_releases_connection() -> None:
+    response = _FakeObjectResponse([b"ab", b"cd"])
+
+    assert list(iter_object_chunks(response)) == [b"ab", b"cd"]
+    assert response.closed and response.released
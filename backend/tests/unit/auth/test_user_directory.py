@@ -0,0 +1,145 @@
+"""用户目录缓存单元测试 — 批量解析、负缓存、过期与失效广播"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.auth import user_directory
+from app.modules.auth.user_directory import (
+    UserDirectory,
+    build_user_changed_message,
+    handle_user_event,
+    invalidate_users,
+)
+
+USER_DOC = "app.modules.auth.repository.models.UserDoc"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(UserDirectory, "_clock", staticmethod(clock))
+    return clock
+
+
+def _user_doc(users):
+    doc = MagicMock()
+
+    def _find(query):
+        ids = query["user_id"]["$in"]
+        return SimpleNamespace(to_list=AsyncMock(return_value=[u for u in users if u.user_id in ids]))
+
+    doc.find.side_effect = _find
+    return doc
+
+
+def _user(user_id, username, **fields):
+    return SimpleNamespace(user_id=user_id, username=username, **fields)
+
+
+async def test_get_many_batches_misses_and_serves_hits_from_cache():
+    doc = _user_doc([_user("u-1", "张三"), _user("u-2", "李四", itcode="lisi", subscribe_notifications=True)])
+
+    with patch(USER_DOC, doc):
+        first = await UserDirectory.get_many(["u-1", "u-2", None, "u-1"])
+        second = await UserDirectory.get_names(["u-2", "u-1"])
+
+    assert doc.find.call_count == 1
+    assert doc.find.call_args.args[0] == {"user_id": {"$in": ["u-1", "u-2"]}}
+    assert first["u-2"].itcode == "lisi" and first["u-2"].subscribe_notifications is True
+    assert first["u-1"].status == "ACTIVE"
+    assert second == {"u-1": "张三", "u-2": "李四"}
+
+
+async def test_missing_users_are_negatively_cached_until_short_ttl(clock):
+    doc = _user_doc([])
+
+    with patch(USER_DOC, doc):
+        assert await UserDirectory.get("ghost") is None
+        assert await UserDirectory.get("ghost") is None
+        clock.now += user_directory.USER_DIRECTORY_NEGATIVE_TTL_SECONDS
+        await UserDirectory.get("ghost")
+
+    assert doc.find.call_count == 2
+
+
+async def test_entries_expire_after_ttl(clock):
+    doc = _user_doc([_user("u-1", "张三")])
+
+    with patch(USER_DOC, doc):
+        await UserDirectory.get("u-1")
+        clock.now += user_directory.USER_DIRECTORY_TTL_SECONDS
+        await UserDirectory.get("u-1")
+
+    assert doc.find.call_count == 2
+
+
+async def test_invalidate_users_clears_entry_and_broadcasts(monkeypatch):
+    import app.shared.redis.service as redis_service
+
+    publish = MagicMock()
+    monkeypatch.setattr(redis_service, "redis_conn", object())
+    monkeypatch.setattr(redis_service, "publish_event", publish)
+    users = [_user("u-1", "旧名")]
+    doc = _user_doc(users)
+
+    with patch(USER_DOC, doc):
+        await UserDirectory.get("u-1")
+        users[0] = _user("u-1", "新名")
+        invalidate_users(["u-1"])
+        assert (await UserDirectory.get("u-1")).username == "新名"
+
+    publish.assert_called_once_with(build_user_changed_message(["u-1"]))
+
+
+async def test_load_skips_caching_when_invalidated_during_query():
+    doc = MagicMock()
+
+    async def _to_list():
+        UserDirectory.invalidate(["u-1"])
+        return [_user("u-1", "旧名")]
+
+    doc.find.return_value = SimpleNamespace(to_list=_to_list)
+
+    with patch(USER_DOC, doc):
+        assert (await UserDirectory.get("u-1")).username == "旧名"
+        await UserDirectory.get("u-1")
+
+    assert doc.find.call_count == 2
+
+
+async def test_handle_user_event_invalidates_only_listed_users():
+    doc = _user_doc([_user("u-1", "张三"), _user("u-2", "李四")])
+
+    with patch(USER_DOC, doc):
+        await UserDirectory.get_many(["u-1", "u-2"])
+        handle_user_event(build_user_changed_message(["u-1"]))
+        handle_user_event('{"event":"system_config.changed","version":3}')
+        handle_user_event("not json")
+        await UserDirectory.get_many(["u-1", "u-2"])
+
+    assert doc.find.call_args.args[0] == {"user_id": {"$in": ["u-1"]}}
+
+
+async def test_fresh_read_bypasses_cache_and_refreshes_entry():
+    users = [_user("u-1", "张三", itcode="zs", subscribe_notifications=True)]
+    doc = _user_doc(users)
+
+    with patch(USER_DOC, doc):
+        await UserDirectory.get("u-1")
+        # 其他实例退订，失效广播尚未送达
+        users[0] = _user("u-1", "张三", itcode="zs", subscribe_notifications=False)
+        assert (await UserDirectory.get("u-1", fresh=True)).subscribe_notifications is False
+        assert (await UserDirectory.get("u-1")).subscribe_notifications is False
+
+    assert doc.find.call_count == 2
@@ -0,0 +1,11 @@
+import pytest
+
+from app.modules.auth.user_directory import UserDirectory
+
+
+@pytest.fixture(autouse=True)
+def _reset_user_directory():
+    # 用户目录是进程级缓存，每个测试前后清空，避免用例之间互相串数据
+    UserDirectory.reset()
+    yield
+    UserDirectory.reset()
@@ -0,0 +1,131 @@
+"""执行代理负载注册表测试。"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.modules.execution.application.agent_registry import ExecutionAgentRegistry
+from app.modules.execution.application.agent_service import ExecutionAgentService
+
+NOW = datetime(2026, 5, 1, 8, 0, 0, tzinfo=timezone.utc)
+
+
+def _agent(agent_id: str, region: str = "sh", capacity: int = 2, in_flight_count: int = 0, **overrides) -> dict:
+    values = {
+        "agent_id": agent_id,
+        "region": region,
+        "capacity": capacity,
+        "in_flight_count": in_flight_count,
+        "routing_key": f"{agent_id}.tasks",
+        "last_heartbeat_at": NOW,
+        "is_online": True,
+    }
+    values.update(overrides)
+    return values
+
+
+def test_select_prefers_region_then_lowest_load_ratio() -> None:
+    registry = ExecutionAgentRegistry()
+    registry.replace([
+        _agent("busy-sh", capacity=4, in_flight_count=3),
+        _agent("idle-bj", region="bj", capacity=4),
+        _agent("half-sh", capacity=2, in_flight_count=1),
+    ])
+
+    assert registry.select(region="sh").agent_id == "half-sh"
+    assert registry.select().agent_id == "idle-bj"
+    # 指定区域没有空闲代理时回落到其他区域
+    assert registry.select(region="gz").agent_id == "idle-bj"
+
+
+def test_select_skips_full_and_unroutable_agents() -> None:
+    registry = ExecutionAgentRegistry()
+    registry.replace([
+        _agent("full", capacity=1, in_flight_count=1),
+        _agent("shared-only", routing_key=None),
+    ])
+
+    assert registry.select(routable_only=True) is None
+    assert registry.select().agent_id == "shared-only"
+
+
+def test_reservations_count_until_covered_by_heartbeat() -> None:
+    registry = ExecutionAgentRegistry()
+    registry.replace([_agent("a1", capacity=2)])
+
+    registry.reserve("a1", now=NOW + timedelta(seconds=1))
+    registry.reserve("a1", now=NOW + timedelta(seconds=5))
+    assert registry.get("a1").free_slots == 0
+    assert registry.select() is None
+
+    # 新心跳已经统计了第一次预占对应的 case，只保留心跳之后的预占
+    registry.observe(_agent("a1", capacity=2, in_flight_count=1, last_heartbeat_at=NOW + timedelta(seconds=3)))
+    assert registry.get("a1").in_flight == 2
+
+    registry.release("a1")
+    assert registry.get("a1").in_flight == 1
+    registry.release("a1")
+    assert registry.get("a1").in_flight == 1
+
+
+def test_observe_offline_agent_removes_it() -> None:
+    registry = ExecutionAgentRegistry()
+    registry.replace([_agent("a1")])
+
+    registry.observe({"agent_id": "a1", "is_online": False})
+
+    assert registry.get("a1") is None
+
+
+async def test_ensure_fresh_reloads_only_after_interval() -> None:
+    ticks = [0.0]
+    registry = ExecutionAgentRegistry(refresh_interval_seconds=5, clock=lambda: ticks[0])
+    agent_service = SimpleNamespace(list_agents=AsyncMock(return_value=[_agent("a1")]))
+
+    await registry.ensure_fresh(agent_service)
+    ticks[0] = 4.0
+    await registry.ensure_fresh(agent_service)
+    assert agent_service.list_agents.await_count == 1
+
+    ticks[0] = 5.0
+    await registry.ensure_fresh(agent_service)
+    assert agent_service.list_agents.await_count == 2
+    agent_service.list_agents.assert_awaited_with(online_only=True)
+
+
+async def test_heartbeat_updates_load_and_registry(monkeypatch) -> None:
+    class _AgentDoc(SimpleNamespace):
+        async def save(self) -> None:
+            return None
+
+        def model_dump(self) -> dict:
+            return dict(vars(self))
+
+    agent_doc = _AgentDoc(
+        agent_id="a1",
+        region="sh",
+        status="ONLINE",
+        capacity=1,
+        in_flight_count=0,
+        routing_key="a1.tasks",
+        last_heartbeat_at=NOW,
+        heartbeat_ttl_seconds=90,
+    )
+    monkeypatch.setattr(
+        "app.modules.execution.application.agent_service.ExecutionAgentDoc",
+        SimpleNamespace(find_one=AsyncMock(return_value=agent_doc)),
+    )
+    registry = ExecutionAgentRegistry()
+    monkeypatch.setattr("app.modules.execution.application.agent_service.get_agent_registry", lambda: registry)
+
+    data = await ExecutionAgentService().heartbeat_agent(
+        "a1", {"status": "ONLINE", "capacity": 4, "in_flight_count": 3}
+    )
+    assert data["capacity"] == 4
+    assert registry.get("a1").free_slots == 1
+
+    # 只上报状态的旧代理不会清空已有的容量信息
+    await ExecutionAgentService().heartbeat_agent("a1", {"status": "ONLINE", "capacity": None})
+    assert agent_doc.capacity == 4
+    assert agent_doc.in_flight_count == 3
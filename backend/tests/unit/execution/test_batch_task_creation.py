@@ -0,0 +1,142 @@
+"""批量创建执行任务测试：编号一次预留、绑定整批解析、单个请求失败不影响其余请求。"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.modules.execution.application.case_resolver import AutoCaseDispatchBinding
+from app.modules.execution.application.plan_dispatch_adapter import PlanDispatchAdapter
+from app.modules.execution.application.task_command_service import ExecutionTaskCommandService
+from app.modules.execution.schemas import DispatchTaskRequest
+from app.modules.execution.service.task_dispatcher import ExecutionTaskDispatcher
+from app.modules.execution_plan.application.ports import PlanDispatchTarget
+from app.shared.domain.exceptions import NotFoundError
+
+
+def _binding(auto_case_id: str) -> AutoCaseDispatchBinding:
+    return AutoCaseDispatchBinding(
+        auto_case_id=auto_case_id,
+        case_id=f"TC-{auto_case_id}",
+        script_entity_id=None,
+        script_path="tests/test_x.py",
+        script_name="test_x",
+    )
+
+
+def _request(auto_case_id: str) -> DispatchTaskRequest:
+    return DispatchTaskRequest(trigger_source="t", cases=[{"auto_case_id": auto_case_id}])
+
+
+def _service(resolve) -> tuple[ExecutionTaskCommandService, MagicMock, MagicMock]:
+    dispatch_service = MagicMock()
+    dispatch_service.create_tasks_from_commands = AsyncMock(
+        side_effect=lambda commands, actor_id: [{"task_id": command.task_id} for command in commands]
+    )
+    resolver = MagicMock()
+    resolver.resolve_case_dispatch_bindings_by_auto_case_ids = AsyncMock(side_effect=resolve)
+    attachment_service = MagicMock(enrich_many=AsyncMock(return_value={}))
+    service = ExecutionTaskCommandService(
+        dispatch_service=dispatch_service,
+        case_resolver=resolver,
+        attachment_service=attachment_service,
+    )
+    return service, dispatch_service, resolver
+
+
+async def test_batch_creation_resolves_bindings_once_and_reserves_ids_once() -> None:
+    service, dispatch_service, resolver = _service(lambda ids: [_binding(auto_id) for auto_id in ids])
+    sequence = MagicMock(next_many=AsyncMock(return_value=range(7, 10)))
+
+    results = await service.create_and_dispatch_tasks(
+        [_request("A-1"), _request("A-2"), _request("A-1")], "u-1", sequence, skip_dedup=True
+    )
+
+    resolver.resolve_case_dispatch_bindings_by_auto_case_ids.assert_awaited_once_with(["A-1", "A-2"])
+    sequence.next_many.assert_awaited_once()
+    [commands] = dispatch_service.create_tasks_from_commands.await_args.args
+    assert [command.case_ids for command in commands] == [["TC-A-1"], ["TC-A-2"], ["TC-A-1"]]
+    assert all(command.skip_dedup for command in commands)
+    assert [result["task_id"].split("-")[2] for result in results] == ["000007", "000008", "000009"]
+
+
+async def test_batch_creation_isolates_invalid_requests() -> None:
+    def resolve(ids):
+        if "MISSING" in ids:
+            raise NotFoundError(f"Automation test cases not found: {['MISSING']}")
+        return [_binding(auto_id) for auto_id in ids]
+
+    service, dispatch_service, _resolver = _service(resolve)
+    sequence = MagicMock(next_many=AsyncMock(return_value=range(1, 3)))
+
+    results = await service.create_and_dispatch_tasks(
+        [_request("A-1"), _request("MISSING")], "u-1", sequence
+    )
+
+    assert "task_id" in results[0]
+    assert isinstance(results[1], NotFoundError)
+    [commands] = dispatch_service.create_tasks_from_commands.await_args.args
+    assert len(commands) == 1
+
+
+async def test_plan_adapter_dispatch_tasks_reports_failures_as_errors() -> None:
+    task_service = MagicMock()
+    task_service.create_and_dispatch_tasks = AsyncMock(
+        return_value=[{"task_id": "T-1"}, ValueError("bad case")]
+    )
+    adapter = PlanDispatchAdapter(task_command_service=task_service)
+    targets = [PlanDispatchTarget(item_id=f"EPI-{n}", case_id=f"AUTO-{n}", plan_id="EP-1") for n in (1, 2)]
+
+    results = await adapter.dispatch_tasks(actor_id="u-1", targets=targets)
+
+    assert results == [{"task_id": "T-1"}, {"error": "bad case"}]
+    requests = task_service.create_and_dispatch_tasks.await_args.kwargs["requests"]
+    assert [request.category for request in requests] == ["EP-1/EPI-1", "EP-1/EPI-2"]
+
+
+async def test_dispatch_many_publishes_whole_batch_in_one_call(monkeypatch) -> None:
+    manager = SimpleNamespace(send_tasks_async=AsyncMock(return_value=[True, False]))
+    monkeypatch.setattr("app.shared.infrastructure.get_rabbitmq_manager", lambda: manager)
+    monkeypatch.setattr(
+        "app.modules.execution.application.task_command_helpers.build_dispatch_task_data",
+        lambda _command: {"action": "create", "data": {}},
+    )
+    commands = [
+        SimpleNamespace(task_id="task-1", dispatch_case_id="case-1", routing_key="agent-a.tasks"),
+        SimpleNamespace(task_id="task-2", dispatch_case_id="case-1", routing_key=None),
+    ]
+
+    results = await ExecutionTaskDispatcher().dispatch_many(commands)
+
+    [messages] = manager.send_tasks_async.await_args.args
+    assert [(message.delivery_id, routing_key) for message, routing_key in messages] == [
+        ("task-1:case-1", "agent-a.tasks"),
+        ("task-2:case-1", None),
+    ]
+    assert [result.success for result in results] == [True, False]
+
+
+async def test_batch_creation_fails_only_requests_with_deleted_attachment() -> None:
+    service, dispatch_service, _resolver = _service(lambda ids: [_binding(auto_id) for auto_id in ids])
+    # F-GONE 已删除：整批 enrich 只返回找到的附件
+    service._attachment_service.enrich_many = AsyncMock(
+        return_value={"F-OK": {"download_url": "http://minio/f-ok"}}
+    )
+    sequence = MagicMock(next_many=AsyncMock(return_value=range(1, 4)))
+
+    def _with_file(auto_case_id, file_id):
+        return DispatchTaskRequest(trigger_source="t", cases=[{
+            "auto_case_id": auto_case_id,
+            "parameters": {"firmware": {"type": "file", "file_id": file_id}},
+        }])
+
+    results = await service.create_and_dispatch_tasks(
+        [_with_file("A-1", "F-OK"), _with_file("A-2", "F-GONE"), _request("A-3")], "u-1", sequence
+    )
+
+    assert service._attachment_service.enrich_many.await_args.kwargs == {"skip_missing": True}
+    assert isinstance(results[1], KeyError)
+    assert "F-GONE" in str(results[1])
+    assert "task_id" in results[0] and "task_id" in results[2]
+    [commands] = dispatch_service.create_tasks_from_commands.await_args.args
+    assert [command.auto_case_ids for command in commands] == [["A-1"], ["A-3"]]
+    assert commands[0].case_payloads[0]["parameters"]["firmware"]["download_url"] == "http://minio/f-ok"
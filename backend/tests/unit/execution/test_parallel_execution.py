@@ -0,0 +1,442 @@
+"""单任务内并行（分片）执行编排测试。"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.modules.execution.application.agent_registry import ExecutionAgentRegistry
+from app.modules.execution.application.agent_selector import ExecutionAgentSelector
+from app.modules.execution.application.event_ingest_service import ExecutionEventIngestService
+from app.modules.execution.application.progress_coordinator import ExecutionProgressCoordinator
+from app.modules.execution.application.task_dispatch_coordinator import ExecutionTaskDispatchCoordinator
+from app.modules.execution.schemas.kafka_events import TestEvent as KafkaTestEvent
+from app.modules.execution.service.task_dispatcher import DispatchResult
+
+
+class _TaskDoc(SimpleNamespace):
+    async def save(self) -> None:
+        return None
+
+
+def _task(case_count: int = 3, max_parallel_cases: int = 2, **overrides) -> _TaskDoc:
+    values = dict(
+        task_id="task-1",
+        agent_id=None,
+        case_count=case_count,
+        max_parallel_cases=max_parallel_cases,
+        in_flight_case_ids=[],
+        next_case_index=0,
+        current_case_id=None,
+        current_case_index=0,
+        dispatch_status="DISPATCHING",
+        dispatch_channel="RABBITMQ",
+        dispatch_error=None,
+        dispatch_response={},
+        schedule_status="READY",
+        overall_status="QUEUED",
+        triggered_at=None,
+        finished_at=None,
+        last_callback_at=None,
+        failed_case_count=0,
+    )
+    values.update(overrides)
+    return _TaskDoc(**values)
+
+
+class _FakeProgressRepository:
+    """内存版任务原子更新：按 Mongo 语义作用于 rows，返回更新后文档的副本。"""
+
+    def __init__(self, *tasks: _TaskDoc) -> None:
+        self.rows: dict[str, dict] = {}
+        self.track(*tasks)
+
+    def track(self, *tasks: _TaskDoc) -> None:
+        for task in tasks:
+            self.rows[task.task_id] = {**vars(task), "in_flight_case_ids": list(task.in_flight_case_ids)}
+
+    @staticmethod
+    def _after(row: dict) -> dict:
+        return {**row, "in_flight_case_ids": list(row["in_flight_case_ids"])}
+
+    async def update_fields(self, task_id, fields, *, inc=None):
+        row = self.rows.get(task_id)
+        if row is None:
+            return None
+        row.update(fields)
+        for key, value in (inc or {}).items():
+            row[key] = row.get(key, 0) + value
+        return self._after(row)
+
+    async def load_progress(self, task_id):
+        row = self.rows.get(task_id)
+        return self._after(row) if row is not None else None
+
+    async def claim_case_slot(self, task_id, case_id, case_index, slot_count):
+        row = self.rows.get(task_id)
+        if (
+            row is None
+            or row["next_case_index"] != case_index
+            or case_index >= row["case_count"]
+            or len(row["in_flight_case_ids"]) >= slot_count
+        ):
+            return None
+        row["next_case_index"] += 1
+        if case_id not in row["in_flight_case_ids"]:
+            row["in_flight_case_ids"].append(case_id)
+        return self._after(row)
+
+    async def mark_case_dispatched(self, task_id, case_id, fields):
+        row = self.rows.get(task_id)
+        if row is None or case_id not in row["in_flight_case_ids"]:
+            return None
+        row.update(fields)
+        return self._after(row)
+
+    async def set_status_unless(self, task_id, status, keep_statuses):
+        row = self.rows[task_id]
+        if row["overall_status"] in keep_statuses:
+            return False
+        row["overall_status"] = status
+        return True
+
+    async def release_case(self, task_id, case_id, fields):
+        row = self.rows.get(task_id)
+        if row is None or case_id not in row["in_flight_case_ids"]:
+            return None
+        row["in_flight_case_ids"].remove(case_id)
+        row.update(fields)
+        return self._after(row)
+
+    async def complete_if_drained(self, task_id, fields):
+        row = self.rows.get(task_id)
+        if row is None or row["in_flight_case_ids"]:
+            return None
+        row.update(fields)
+        return self._after(row)
+
+
+class _FindOneNone:
+    @staticmethod
+    async def find_one(*args, **kwargs):
+        return None
+
+
+def _agent(agent_id: str, capacity: int = 1, in_flight_count: int = 0, routing_key: str | None = None) -> dict:
+    return {
+        "agent_id": agent_id,
+        "region": "lab",
+        "capacity": capacity,
+        "in_flight_count": in_flight_count,
+        "routing_key": routing_key if routing_key is not None else f"{agent_id}.tasks",
+        "last_heartbeat_at": datetime.now(timezone.utc),
+        "is_online": True,
+    }
+
+
+def _selector(agents) -> ExecutionAgentSelector:
+    agent_service = SimpleNamespace(list_agents=AsyncMock(return_value=agents))
+    return ExecutionAgentSelector(agent_service=agent_service, registry=ExecutionAgentRegistry())
+
+
+def _command(task_doc, index):
+    return SimpleNamespace(
+        task_id=task_doc.task_id,
+        dispatch_case_id=f"C{index + 1}",
+        dispatch_case_index=index,
+        agent_id=task_doc.agent_id,
+        region=None,
+        routing_key=None,
+    )
+
+
+def _coordinator(monkeypatch, agents, results=None):
+    dispatcher = SimpleNamespace(
+        dispatch=AsyncMock(side_effect=results or (lambda command: DispatchResult(
+            success=True, channel="RABBITMQ", message="ok", response={"accepted": True},
+        ))),
+    )
+    repository = _FakeProgressRepository()
+    coordinator = ExecutionTaskDispatchCoordinator(
+        dispatcher=dispatcher,
+        case_coordinator=SimpleNamespace(resolve_task_case_pairs=AsyncMock(return_value=([],) * 5)),
+        agent_selector=_selector(agents),
+        progress_repository=repository,
+    )
+
+    async def build_command(task_doc, index):
+        return _command(task_doc, index)
+
+    async def build_case_command(task_doc, *args):
+        return _command(task_doc, args[-1])
+
+    monkeypatch.setattr(coordinator, "build_task_dispatch_command", build_command)
+    monkeypatch.setattr(coordinator, "build_case_dispatch_command", build_case_command)
+    monkeypatch.setattr(
+        "app.modules.execution.application.task_dispatch_coordinator.ExecutionTaskCaseDoc",
+        _FindOneNone,
+    )
+    coordinator.repository = repository
+    return coordinator, dispatcher
+
+
+async def test_agent_selector_caps_slots_by_total_capacity() -> None:
+    selector = _selector([_agent("a1", capacity=2), _agent("a2")])
+
+    assert await selector.resolve_slot_count(8, None) == 3
+    assert await selector.resolve_slot_count(2, None) == 2
+    assert await selector.resolve_slot_count(8, "a1") == 2
+    assert await _selector([]).resolve_slot_count(8, None) == 8
+
+
+async def test_fill_parallel_slots_spreads_cases_by_load(monkeypatch) -> None:
+    coordinator, dispatcher = _coordinator(monkeypatch, [_agent("agent-a"), _agent("agent-b")])
+    task_doc = _task(case_count=5, max_parallel_cases=4)
+    coordinator.repository.track(task_doc)
+
+    dispatched = await coordinator.fill_parallel_slots(task_doc)
+
+    assert dispatched == 2
+    assert task_doc.in_flight_case_ids == ["C1", "C2"]
+    assert task_doc.next_case_index == 2
+    assert coordinator.repository.rows["task-1"]["in_flight_case_ids"] == ["C1", "C2"]
+    # case 清单每次补位只解析一次
+    coordinator._case_coordinator.resolve_task_case_pairs.assert_awaited_once()
+    commands = [call.args[0] for call in dispatcher.dispatch.await_args_list]
+    assert [command.agent_id for command in commands] == ["agent-a", "agent-b"]
+    assert [command.routing_key for command in commands] == ["agent-a.tasks", "agent-b.tasks"]
+
+
+async def test_fill_parallel_slots_stops_on_dispatch_failure(monkeypatch) -> None:
+    results = [
+        DispatchResult(success=True, channel="RABBITMQ", message="ok", response={}),
+        DispatchResult(success=False, channel="RABBITMQ", message="down", response={}, error="down"),
+    ]
+    coordinator, dispatcher = _coordinator(monkeypatch, [], results=results)
+    task_doc = _task(case_count=5, max_parallel_cases=3)
+    coordinator.repository.track(task_doc)
+
+    dispatched = await coordinator.fill_parallel_slots(task_doc)
+
+    assert dispatched == 1
+    assert task_doc.in_flight_case_ids == ["C1"]
+    assert task_doc.dispatch_status == "DISPATCH_FAILED"
+    # 发布失败的 C2 已回滚认领，不会占住在途列表
+    assert coordinator.repository.rows["task-1"]["in_flight_case_ids"] == ["C1"]
+    # 注册表中没有代理时走共享队列
+    assert dispatcher.dispatch.await_args_list[0].args[0].routing_key is None
+
+
+async def test_concurrent_fills_claim_each_case_once(monkeypatch) -> None:
+    async def _publish(command):
+        # 让出事件循环，模拟 API 首次下发与 worker 补位交错执行
+        await asyncio.sleep(0)
+        return DispatchResult(success=True, channel="RABBITMQ", message="ok", response={})
+
+    coordinator, dispatcher = _coordinator(monkeypatch, [], results=_publish)
+    api_copy = _task(case_count=4, max_parallel_cases=2)
+    worker_copy = _task(case_count=4, max_parallel_cases=2)
+    coordinator.repository.track(api_copy)
+
+    counts = await asyncio.gather(
+        coordinator.fill_parallel_slots(api_copy),
+        coordinator.fill_parallel_slots(worker_copy),
+    )
+
+    published = [call.args[0].dispatch_case_id for call in dispatcher.dispatch.await_args_list]
+    assert sorted(published) == ["C1", "C2"]
+    assert sum(counts) == 2
+    row = coordinator.repository.rows["task-1"]
+    assert (row["in_flight_case_ids"], row["next_case_index"]) == (["C1", "C2"], 2)
+
+
+async def test_case_finish_before_dispatch_record_still_completes_task(monkeypatch) -> None:
+    now = datetime.now(timezone.utc)
+    api_copy = _task(case_count=1, max_parallel_cases=2)
+    worker_copy = _task(case_count=1, max_parallel_cases=2, in_flight_case_ids=["C1"], next_case_index=1)
+
+    async def _publish(command):
+        # agent 在下发结果写回之前就已执行完并上报 case_finish
+        await _finish_case(progress, worker_copy, command.dispatch_case_id, now)
+        return DispatchResult(success=True, channel="RABBITMQ", message="ok", response={})
+
+    coordinator, _ = _coordinator(monkeypatch, [], results=_publish)
+    coordinator.repository.track(api_copy)
+    progress, _ = _progress_coordinator(monkeypatch, coordinator.repository)
+
+    assert await coordinator.fill_parallel_slots(api_copy) == 1
+
+    row = coordinator.repository.rows["task-1"]
+    assert row["in_flight_case_ids"] == []
+    assert (row["overall_status"], row["dispatch_status"]) == ("PASSED", "COMPLETED")
+    assert row["finished_at"] == now
+
+
+async def test_dispatch_new_tasks_publishes_serial_tasks_in_one_batch(monkeypatch) -> None:
+    coordinator, dispatcher = _coordinator(monkeypatch, [_agent("agent-a"), _agent("agent-b")])
+    dispatcher.dispatch_many = AsyncMock(return_value=[
+        DispatchResult(success=True, channel="RABBITMQ", message="ok", response={}),
+        DispatchResult(success=False, channel="RABBITMQ", message="down", response={}, error="down"),
+    ])
+    serial = [_task(case_count=1, max_parallel_cases=1, task_id=f"task-{index}") for index in range(2)]
+    parallel = _task(case_count=2, max_parallel_cases=2, task_id="task-p")
+    coordinator.repository.track(*serial, parallel)
+
+    await coordinator.dispatch_new_tasks([*serial, parallel])
+
+    [commands] = dispatcher.dispatch_many.await_args.args
+    assert [command.task_id for command in commands] == ["task-0", "task-1"]
+    # 逐条预占：第二条命令选代理时已能看到第一条的负载
+    assert [command.agent_id for command in commands] == ["agent-a", "agent-b"]
+    assert [task.dispatch_status for task in serial] == ["DISPATCHED", "DISPATCH_FAILED"]
+    # 下发失败的命令归还预占；并行任务仍按槽位逐条下发
+    registry = coordinator._agent_selector._registry
+    assert registry.get("agent-a").in_flight == 1
+    assert dispatcher.dispatch.await_count == 2
+    assert parallel.in_flight_case_ids == ["C1", "C2"]
+
+
+async def test_dispatch_new_tasks_marks_tasks_failed_instead_of_raising(monkeypatch) -> None:
+    coordinator, dispatcher = _coordinator(monkeypatch, [_agent("agent-a", capacity=4)])
+    dispatcher.dispatch_many = AsyncMock(side_effect=RuntimeError("broker down"))
+    serial = [_task(case_count=1, max_parallel_cases=1, task_id=f"task-{index}") for index in range(2)]
+    parallel = _task(case_count=2, max_parallel_cases=2, task_id="task-p")
+    coordinator.repository.track(*serial, parallel)
+    monkeypatch.setattr(coordinator, "fill_parallel_slots", AsyncMock(side_effect=RuntimeError("no cases")))
+
+    await coordinator.dispatch_new_tasks([*serial, parallel])
+
+    rows = coordinator.repository.rows
+    for task in (*serial, parallel):
+        assert task.dispatch_status == "DISPATCH_FAILED"
+        assert rows[task.task_id]["overall_status"] == "FAILED"
+        assert rows[task.task_id]["finished_at"] is not None
+    assert "broker down" in serial[0].dispatch_error
+    assert "no cases" in parallel.dispatch_error
+    # 整批发布失败时归还全部预占
+    assert coordinator._agent_selector._registry.get("agent-a").in_flight == 0
+
+
+def _finish_event(case_id: str) -> SimpleNamespace:
+    return SimpleNamespace(event_type="progress", phase="case_finish", case_id=case_id)
+
+
+async def _finish_case(coordinator, task_doc, case_id: str, now) -> None:
+    await coordinator.advance_after_case_finish(
+        task_doc, SimpleNamespace(case_id=case_id), _finish_event(case_id), now, "PASSED"
+    )
+
+
+def _progress_coordinator(monkeypatch, repository, fill=None):
+    dispatch_service = SimpleNamespace(fill_parallel_slots=AsyncMock(side_effect=fill or (lambda doc: 0)))
+    coordinator = ExecutionProgressCoordinator(
+        dispatch_service=dispatch_service,
+        progress_repository=repository,
+    )
+    monkeypatch.setattr(coordinator, "_recount_case_progress", AsyncMock(return_value={}))
+    return coordinator, dispatch_service
+
+
+async def test_parallel_advance_refills_slot_and_completes_when_drained(monkeypatch) -> None:
+    task_doc = _task(case_count=3, in_flight_case_ids=["C1", "C2"], next_case_index=2, overall_status="RUNNING")
+    repository = _FakeProgressRepository(task_doc)
+
+    async def fill(doc):
+        updated = await repository.claim_case_slot(
+            doc.task_id, f"C{doc.next_case_index + 1}", doc.next_case_index, 2
+        )
+        doc.in_flight_case_ids = updated["in_flight_case_ids"]
+        doc.next_case_index = updated["next_case_index"]
+        return 1
+
+    coordinator, dispatch_service = _progress_coordinator(monkeypatch, repository, fill)
+    now = datetime.now(timezone.utc)
+
+    await coordinator.advance_after_case_finish(task_doc, SimpleNamespace(case_id="C1"), _finish_event("C1"), now, "PASSED")
+    assert task_doc.in_flight_case_ids == ["C2", "C3"]
+    assert task_doc.overall_status == "RUNNING"
+
+    # 重复的 case_finish 不会再次释放槽位
+    await coordinator.advance_after_case_finish(task_doc, SimpleNamespace(case_id="C1"), _finish_event("C1"), now, "PASSED")
+    assert dispatch_service.fill_parallel_slots.await_count == 1
+
+    await coordinator.advance_after_case_finish(task_doc, SimpleNamespace(case_id="C3"), _finish_event("C3"), now, "PASSED")
+    await coordinator.advance_after_case_finish(task_doc, SimpleNamespace(case_id="C2"), _finish_event("C2"), now, "PASSED")
+
+    assert task_doc.in_flight_case_ids == []
+    assert task_doc.overall_status == "PASSED"
+    assert task_doc.dispatch_status == "COMPLETED"
+    assert task_doc.finished_at == now
+    assert repository.rows["task-1"]["overall_status"] == "PASSED"
+    assert dispatch_service.fill_parallel_slots.await_count == 1
+
+
+async def test_parallel_advance_keeps_cases_dispatched_by_another_process(monkeypatch) -> None:
+    # worker 读到的任务还停留在 API 补位下发之前
+    stale = _task(case_count=3, in_flight_case_ids=["C1"], next_case_index=1, overall_status="RUNNING")
+    repository = _FakeProgressRepository(stale)
+    repository.rows["task-1"].update(in_flight_case_ids=["C1", "C2", "C3"], next_case_index=3)
+    coordinator, _ = _progress_coordinator(monkeypatch, repository)
+    now = datetime.now(timezone.utc)
+
+    await _finish_case(coordinator, stale, "C1", now)
+
+    assert repository.rows["task-1"]["in_flight_case_ids"] == ["C2", "C3"]
+    assert repository.rows["task-1"]["overall_status"] == "RUNNING"
+    assert stale.in_flight_case_ids == ["C2", "C3"]
+    assert stale.finished_at is None
+
+
+async def test_parallel_advance_completes_once_when_last_cases_finish_concurrently(monkeypatch) -> None:
+    first = _task(case_count=2, in_flight_case_ids=["C1", "C2"], next_case_index=2, overall_status="RUNNING")
+    second = _task(**{**vars(first), "in_flight_case_ids": ["C1", "C2"]})
+    repository = _FakeProgressRepository(first)
+    coordinator, _ = _progress_coordinator(monkeypatch, repository)
+    now = datetime.now(timezone.utc)
+
+    await _finish_case(coordinator, first, "C1", now)
+    await _finish_case(coordinator, second, "C2", now)
+
+    assert first.overall_status == "RUNNING"
+    assert second.overall_status == "PASSED"
+    assert repository.rows["task-1"]["in_flight_case_ids"] == []
+    assert repository.rows["task-1"]["dispatch_status"] == "COMPLETED"
+
+
+async def test_refill_dispatch_does_not_downgrade_running_task(monkeypatch) -> None:
+    coordinator, _ = _coordinator(monkeypatch, [])
+    task_doc = _task(case_count=3, max_parallel_cases=2, in_flight_case_ids=["C1"], next_case_index=1)
+    coordinator.repository.track(task_doc)
+    # 本地对象仍是 QUEUED，库里已被 worker 更新为 RUNNING
+    coordinator.repository.rows["task-1"]["overall_status"] = "RUNNING"
+
+    await coordinator.fill_parallel_slots(task_doc)
+
+    assert coordinator.repository.rows["task-1"]["overall_status"] == "RUNNING"
+    assert task_doc.overall_status == "RUNNING"
+    assert task_doc.in_flight_case_ids == ["C1", "C2"]
+
+
+def test_parallel_task_aggregate_ignores_single_case_completion_counters() -> None:
+    task_doc = _task(overall_status="RUNNING", started_at=None, finished_case_count=0)
+    event = KafkaTestEvent.model_validate({
+        "schema": "dml-test-event@1",
+        "event_id": "event-1",
+        "task_id": "task-1",
+        "case_id": "C1",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "event_type": "progress",
+        "phase": "case_finish",
+        "status": "PASSED",
+        "total_cases": 1,
+        "started_cases": 1,
+        "finished_cases": 1,
+        "failed_cases": 0,
+    })
+
+    ExecutionEventIngestService._apply_task_aggregate(task_doc, event, event.timestamp)
+
+    assert task_doc.overall_status == "RUNNING"
+    assert task_doc.finished_at is None
+    assert task_doc.finished_case_count == 0
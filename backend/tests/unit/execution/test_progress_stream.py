@@ -0,0 +1,220 @@
+"""执行进度推送通道测试。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import app.shared.redis.service as redis_service
+from app.modules.execution.application.event_ingest_service import ExecutionEventIngestService
+from app.modules.execution.application.progress_stream import (
+    PROGRESS_EVENT_CHANNEL,
+    ExecutionProgressHub,
+    ProgressSubscription,
+    parse_progress_cursor,
+    plan_topic,
+    stream_progress_events,
+    task_topic,
+)
+
+
+def _delta(task_id: str, seq: int, case_id: str | None = None, status: str = "RUNNING", plan_id=None) -> dict:
+    return {
+        "task_id": task_id,
+        "plan_id": plan_id,
+        "seq": seq,
+        "task": {"overall_status": status, "progress_percent": seq},
+        "case": {"case_id": case_id, "status": status} if case_id else None,
+    }
+
+
+def test_subscription_coalesces_per_case_and_keeps_latest_order():
+    subscription = ProgressSubscription(task_topic("t1"))
+    subscription.push(_delta("t1", 1, "c1"))
+    subscription.push(_delta("t1", 2, "c2"))
+    subscription.push(_delta("t1", 3, "c1"))
+
+    events = subscription.drain()
+    assert [(kind, payload["seq"]) for kind, payload in events] == [("delta", 2), ("delta", 3)]
+    assert subscription.coalesced == 1
+    assert subscription.drain() == []
+
+
+def test_subscription_overflow_falls_back_to_full_resync():
+    subscription = ProgressSubscription(task_topic("t1"), max_pending=2)
+    for seq, case_id in enumerate(["c1", "c2", "c3"], start=1):
+        subscription.push(_delta("t1", seq, case_id))
+
+    events = subscription.drain()
+    assert events[0] == ("resync", {"task_id": None})
+    assert [payload["seq"] for kind, payload in events if kind == "delta"] == [3]
+
+
+def test_parse_progress_cursor():
+    assert parse_progress_cursor(None, "") is None
+    assert parse_progress_cursor("t1:3,t2:x,bad", "t1:5, t2:1") == {"t1": 5, "t2": 1}
+
+
+def test_hub_fans_out_to_task_and_plan_topics_and_drops_stale_deltas():
+    hub = ExecutionProgressHub()
+    task_sub = hub.subscribe(task_topic("t1"))
+    plan_sub = hub.subscribe(plan_topic("p1"))
+    other_sub = hub.subscribe(task_topic("t2"))
+
+    hub.dispatch(_delta("t1", 1, "c1", plan_id="p1"))
+    hub.dispatch(_delta("t1", 1, "c1", plan_id="p1"))
+
+    assert len(task_sub.drain()) == 1
+    assert len(plan_sub.drain()) == 1
+    assert other_sub.drain() == []
+
+    hub.unsubscribe(task_sub)
+    hub.unsubscribe(plan_sub)
+    hub.unsubscribe(other_sub)
+    assert hub.connection_count() == 0
+
+
+def test_resume_replays_missing_deltas_or_requests_resync():
+    hub = ExecutionProgressHub(buffer_size=3)
+    for seq in range(1, 6):
+        hub.dispatch(_delta("t1", seq, f"c{seq}", plan_id="p1"))
+    hub.dispatch(_delta("t2", 1, "c1", plan_id="p1"))
+
+    resumed = hub.subscribe(task_topic("t1"), {"t1": 3})
+    assert [payload["seq"] for _kind, payload in resumed.drain()] == [4, 5]
+
+    too_old = hub.subscribe(plan_topic("p1"), {"t1": 1, "t2": 1})
+    assert too_old.drain() == [("resync", {"task_id": "t1"})]
+
+    unknown = hub.subscribe(task_topic("t9"), {"t9": 4})
+    assert unknown.drain() == [("resync", {"task_id": "t9"})]
+
+
+def test_handle_message_hands_off_to_event_loop():
+    hub = ExecutionProgressHub()
+    loop = MagicMock()
+    hub.attach(loop)
+
+    hub.handle_message("not json")
+    hub.handle_message(json.dumps({"task_id": "t1"}))
+    hub.handle_message(json.dumps(_delta("t1", 1)))
+
+    loop.call_soon_threadsafe.assert_called_once()
+    assert loop.call_soon_threadsafe.call_args.args[0] == hub.dispatch
+
+
+async def test_task_stream_closes_after_terminal_delta_and_unsubscribes():
+    hub = ExecutionProgressHub()
+    loader = AsyncMock(return_value=_delta("t1", 0))
+    events = stream_progress_events(task_topic("t1"), close_on_terminal=True, hub=hub, snapshot_loader=loader)
+    first = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+
+    hub.dispatch(_delta("t1", 1, "c1"))
+    assert (await first)["id"] == "t1:1"
+
+    hub.dispatch(_delta("t1", 2, "c1", status="PASSED"))
+    received = [event async for event in events]
+
+    assert [event["id"] for event in received] == ["t1:2"]
+    assert json.loads(received[0]["data"])["task"]["overall_status"] == "PASSED"
+    assert hub.connection_count() == 0
+
+
+async def test_task_stream_for_finished_task_sends_snapshot_and_closes():
+    hub = ExecutionProgressHub()
+    loader = AsyncMock(return_value=_delta("t1", 7, status="FAILED"))
+
+    received = [
+        event async for event in stream_progress_events(
+            task_topic("t1"), {"t1": 3}, close_on_terminal=True, hub=hub, snapshot_loader=loader,
+        )
+    ]
+
+    loader.assert_awaited_once_with("t1")
+    assert [(event["event"], event["id"]) for event in received] == [("delta", "t1:7")]
+    assert hub.connection_count() == 0
+
+
+async def test_plan_stream_does_not_load_task_snapshot():
+    hub = ExecutionProgressHub()
+    loader = AsyncMock()
+    events = stream_progress_events(plan_topic("p1"), hub=hub, snapshot_loader=loader)
+    first = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+
+    hub.dispatch(_delta("t1", 1, plan_id="p1", status="PASSED"))
+
+    assert (await first)["id"] == "t1:1"
+    await events.aclose()
+    loader.assert_not_awaited()
+
+
+class _AwaitableDoc(SimpleNamespace):
+    async def save(self) -> None:
+        return None
+
+
+class _FindOneDoc:
+    def __init__(self, doc):
+        self._doc = doc
+
+    async def __call__(self, *args, **kwargs):
+        return self._doc
+
+
+async def test_ingest_publishes_compact_delta_with_next_seq(monkeypatch):
+    task_doc = _AwaitableDoc(
+        task_id="task-1",
+        request_payload={"trigger_source": "execution_plan:plan-1:item-1"},
+        progress_seq=4,
+        overall_status="QUEUED",
+        finished_case_count=0,
+        started_case_count=0,
+        failed_case_count=0,
+        passed_case_count=0,
+        reported_case_count=0,
+        current_case_id=None,
+        current_case_index=0,
+        case_count=2,
+        progress_percent=None,
+        started_at=None,
+        finished_at=None,
+        last_callback_at=None,
+    )
+    published = []
+    monkeypatch.setattr(redis_service, "redis_conn", object())
+    monkeypatch.setattr(
+        redis_service, "publish_event", lambda message, channel: published.append((channel, message)),
+    )
+    service = ExecutionEventIngestService(
+        progress_coordinator=SimpleNamespace(advance_after_case_finish=AsyncMock()),
+        result_sink=SimpleNamespace(apply_execution_result=AsyncMock()),
+    )
+    payload = {
+        "schema": "dml-test-event@1",
+        "event_id": "event-1",
+        "task_id": "task-1",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "event_type": "progress",
+        "phase": "case_start",
+        "total_cases": 2,
+        "started_cases": 1,
+        "finished_cases": 0,
+        "failed_cases": 0,
+    }
+
+    module = "app.modules.execution.application.event_ingest_service"
+    with patch(f"{module}.ExecutionTaskDoc.find_one", _FindOneDoc(task_doc)):
+        with patch(f"{module}.ExecutionTaskCaseDoc.find_one", _FindOneDoc(None)):
+            await service.ingest_event("test-events", payload, {"offset": 1})
+
+    assert task_doc.progress_seq == 5
+    [(channel, message)] = published
+    delta = json.loads(message)
+    assert channel == PROGRESS_EVENT_CHANNEL
+    assert (delta["task_id"], delta["plan_id"], delta["seq"]) == ("task-1", "plan-1", 5)
+    assert delta["task"]["overall_status"] == "RUNNING"
+    assert delta["case"] is None
@@ -0,0 +1,101 @@
+"""执行任务原子更新 Repository 测试。"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pymongo import ReturnDocument
+
+from app.modules.execution.application.constants import DispatchStatus
+from app.modules.execution.repository.models import ExecutionTaskDoc
+from app.modules.execution.repository.task_progress_repository import (
+    ExecutionTaskProgressRepository,
+    sync_task_doc,
+)
+
+
+def _collection(returned=None):
+    collection = MagicMock()
+    collection.find_one_and_update = AsyncMock(return_value=returned)
+    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=1))
+    return collection
+
+
+async def test_claim_case_slot_is_conditional_on_cursor_and_free_slots():
+    collection = _collection({"in_flight_case_ids": ["C1"], "next_case_index": 1})
+
+    with patch.object(ExecutionTaskDoc, "get_pymongo_collection", return_value=collection):
+        claimed = await ExecutionTaskProgressRepository().claim_case_slot("T1", "C1", 0, 2)
+
+    assert claimed["next_case_index"] == 1
+    query, update = collection.find_one_and_update.await_args.args
+    assert query == {
+        "task_id": "T1",
+        "is_deleted": False,
+        "next_case_index": 0,
+        "case_count": {"$gt": 0},
+        "$expr": {"$lt": [{"$size": "$in_flight_case_ids"}, 2]},
+    }
+    assert update["$inc"] == {"next_case_index": 1}
+    assert update["$addToSet"] == {"in_flight_case_ids": "C1"}
+    assert "updated_at" in update["$set"]
+    assert collection.find_one_and_update.await_args.kwargs["return_document"] == ReturnDocument.AFTER
+
+
+async def test_mark_case_dispatched_only_while_case_in_flight():
+    collection = _collection()
+
+    with patch.object(ExecutionTaskDoc, "get_pymongo_collection", return_value=collection):
+        updated = await ExecutionTaskProgressRepository().mark_case_dispatched(
+            "T1", "C1", {"dispatch_status": DispatchStatus.DISPATCHED}
+        )
+
+    assert updated is None
+    query, update = collection.find_one_and_update.await_args.args
+    assert query == {"task_id": "T1", "in_flight_case_ids": "C1"}
+    # 枚举展开为原始值
+    assert type(update["$set"]["dispatch_status"]) is str
+
+
+async def test_release_case_only_matches_in_flight_case():
+    collection = _collection()
+
+    with patch.object(ExecutionTaskDoc, "get_pymongo_collection", return_value=collection):
+        released = await ExecutionTaskProgressRepository().release_case("T1", "C1", {"failed_case_count": 1})
+
+    assert released is None
+    query, update = collection.find_one_and_update.await_args.args
+    assert query == {"task_id": "T1", "in_flight_case_ids": "C1"}
+    assert update["$pull"] == {"in_flight_case_ids": "C1"}
+    assert update["$set"]["failed_case_count"] == 1
+
+
+async def test_complete_if_drained_and_status_guards_are_conditional():
+    collection = _collection({"in_flight_case_ids": []})
+
+    with patch.object(ExecutionTaskDoc, "get_pymongo_collection", return_value=collection):
+        repository = ExecutionTaskProgressRepository()
+        await repository.complete_if_drained("T1", {"overall_status": "PASSED"})
+        assert await repository.set_status_unless("T1", "QUEUED", ["RUNNING", "QUEUED"]) is True
+
+    assert collection.find_one_and_update.await_args.args[0] == {
+        "task_id": "T1",
+        "in_flight_case_ids": {"$size": 0},
+    }
+    assert collection.update_one.await_args.args[0] == {
+        "task_id": "T1",
+        "overall_status": {"$nin": ["RUNNING", "QUEUED"]},
+    }
+
+
+def test_sync_task_doc_prefers_returned_orchestration_fields():
+    task_doc = SimpleNamespace(in_flight_case_ids=["C1"], next_case_index=1, dispatch_error=None)
+
+    sync_task_doc(
+        task_doc,
+        {"dispatch_error": "down"},
+        {"in_flight_case_ids": ["C1", "C2"], "next_case_index": 2, "dispatch_error": "ignored", "_id": "x"},
+    )
+
+    assert task_doc.in_flight_case_ids == ["C1", "C2"]
+    assert task_doc.next_case_index == 2
+    assert task_doc.dispatch_error == "down"
+    assert not hasattr(task_doc, "_id")
@@ -62,9 +62,12 @@ def test_execution_plan_route_surface_is_preserved() -> None:
         ("POST", "/execution-plans/items/{item_id}/cancel-execution"),
         ("POST", "/execution-plans/items/{item_id}/rerun"),
         ("POST", "/execution-plans/items/batch-dispatch"),
+        ("GET", "/execution-plans/items/batch-dispatch/{job_id}"),
+        ("POST", "/execution-plans/items/batch-dispatch/{job_id}/resume"),
         ("POST", "/execution-plans/items/{item_id}/result"),
         ("GET", "/execution-plans/items/{item_id}/result"),
         ("GET", "/execution-plans/cases/{case_id}/execution-stats"),
+        ("GET", "/execution-plans/plans/{plan_id}/results/export"),
         ("GET", "/execution-plans/plans"),
         ("POST", "/execution-plans/plans"),
         ("GET", "/execution-plans/plans/{plan_id}"),
@@ -11,6 +11,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -22,7 +23,12 @@ if str(ROOT) not in sys.path:
 from app.modules.execution_plan.service.execution_plan_service import ExecutionPlanService  # noqa: E402
 from app.modules.execution_plan.application.plan_command_service import PlanCommandService  # noqa: E402
 from app.modules.execution_plan.domain.constants import PlanItemStatus  # noqa: E402
-from app.modules.execution_plan.domain.exceptions import ItemNotFoundError, ResultNotFoundError  # noqa: E402
+from app.modules.execution_plan.domain.exceptions import (  # noqa: E402
+    DispatchJobNotFoundError,
+    ItemNotFoundError,
+    PlanNotFoundError,
+    ResultNotFoundError,
+)
 from app.shared.domain.exceptions import PermissionDeniedError  # noqa: E402
 
 
@@ -273,6 +279,10 @@ class _FakePlanDoc(_FakeDoc):
     store: dict[str, "_FakePlanDoc"] = {}
     id_field = "plan_id"
 
+    def __init__(self, **payload):
+        payload.setdefault("project_ids", [])
+        super().__init__(**payload)
+
 
 class _FakeItemDoc(_FakeDoc):
     store: dict[str, "_FakeItemDoc"] = {}
@@ -866,6 +876,44 @@ class TestSubmitResult:
             await service.get_result(item_id="EPI-NO-RESULT")
 
 
+class TestPlanResultExport:
+    async def test_export_joins_results_and_user_names_per_chunk(self, service, auto_item, manual_item):
+        _FakeResultDoc(
+            result_id="MER-1", item_id=manual_item.item_id, plan_id=manual_item.plan_id,
+            case_id=manual_item.case_id, passed=False, notes="复现", severity="major", actual="挂死",
+            expected="", env="", test_data="", bug_id="BUG-9", actual_duration="5m", attachments=[],
+            result_source="manual", executed_by="user2", executed_at=datetime(2026, 1, 1), is_deleted=False,
+        ).save()
+        rows = [
+            {"item_id": auto_item.item_id, "assignee_id": "user1", "result_id": None},
+            {"item_id": manual_item.item_id, "assignee_id": "user2", "result_id": "MER-1"},
+        ]
+
+        async def _fake_chunks(collection, query, **kwargs):
+            assert query == {"plan_id": auto_item.plan_id, "is_deleted": False}
+            assert kwargs["sort"] == [("order_no", 1)]
+            yield rows
+
+        service._user_query.get_user_names.return_value = {"user1": "张三", "user2": "李四"}
+        get_collection = MagicMock(return_value=MagicMock())
+        with patch(f"{SERVICE_PATH}.iter_cursor_chunks", _fake_chunks), \
+             patch.object(_FakeItemDoc, "get_pymongo_collection", get_collection, create=True):
+            chunks = await service.export_plan_results(auto_item.plan_id)
+            exported = [chunk async for chunk in chunks]
+
+        assert len(exported) == 1
+        auto_row, manual_row = exported[0]
+        assert auto_row["assignee_name"] == "张三"
+        assert auto_row["passed"] is None and auto_row["executed_by_name"] is None
+        assert (manual_row["passed"], manual_row["bug_id"]) == (False, "BUG-9")
+        assert manual_row["executed_by_name"] == "李四"
+        service._user_query.get_user_names.assert_awaited_once_with(["user1", "user2", "user2"])
+
+    async def test_export_unknown_plan_raises_before_streaming(self, service):
+        with pytest.raises(PlanNotFoundError):
+            await service.export_plan_results("EP-MISSING")
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  Tests — batch operations
 # ═══════════════════════════════════════════════════════════════════════
@@ -912,6 +960,160 @@ class TestBatchDispatch:
                 actor_id="owner1",
             )
 
+    async def test_batch_dispatch_registers_job_and_returns_immediately(self, command_service):
+        from app.modules.execution_plan.schemas.execution_plan import BatchDispatchRequest
+
+        job_doc = MagicMock(side_effect=lambda **payload: SimpleNamespace(
+            insert=AsyncMock(), created_at=None, started_at=None, finished_at=None,
+            status="PENDING", dispatched_count=0, failed_count=0, error=None, **payload,
+        ))
+        with patch(f"{COMMAND_PATH}.ExecutionPlanDispatchJobDoc", job_doc), \
+             patch.object(command_service, "_start_dispatch_job") as start:
+            job = await command_service.batch_dispatch(
+                request=BatchDispatchRequest(item_ids=["EPI-1", "EPI-2", "EPI-1"], agent_id="agent-A"),
+                actor_id="owner1",
+            )
+
+        start.assert_called_once()
+        command_service._dispatch_port.dispatch_tasks.assert_not_awaited()
+        assert job["job_id"].startswith("EPD-")
+        assert (job["status"], job["total"]) == ("PENDING", 2)
+        assert [entry["item_id"] for entry in job["items"]] == ["EPI-1", "EPI-2"]
+        assert job_doc.call_args.kwargs["params"]["agent_id"] == "agent-A"
+
+    async def test_dispatch_job_bulk_dispatches_and_refreshes_plan_once(self, command_service, plan):
+        for item_id, ref_type, status in (
+            ("EPI-A", "auto", PlanItemStatus.PENDING.value),
+            ("EPI-B", "auto", PlanItemStatus.PENDING.value),
+            ("EPI-C", "manual", PlanItemStatus.PENDING.value),
+            ("EPI-D", "auto", PlanItemStatus.RUNNING.value),
+        ):
+            _FakeItemDoc(
+                item_id=item_id, plan_id=plan.plan_id, ref_type=ref_type, case_id=f"AUTO-{item_id}",
+                status=status, assignee_id="user1", is_deleted=False,
+            )
+        item_ids = ["EPI-A", "EPI-B", "EPI-C", "EPI-D", "EPI-MISSING"]
+        job = SimpleNamespace(
+            job_id="EPD-1", created_by="owner1", params={"schedule_type": "IMMEDIATE"},
+            items=[{"item_id": item_id, "status": "queued", "task_id": None, "error": None} for item_id in item_ids],
+            status="PENDING", dispatched_count=0, failed_count=0, error=None,
+            started_at=None, finished_at=None, save=AsyncMock(),
+        )
+        port = command_service._dispatch_port
+        port.dispatch_tasks = AsyncMock(return_value=[{"task_id": "ET-1"}, {"error": "agent offline"}])
+        collection = MagicMock(bulk_write=AsyncMock(return_value=SimpleNamespace(matched_count=1)))
+        command_service._plan_service.refresh_plan_status = AsyncMock()
+
+        with patch.object(_FakeItemDoc, "get_pymongo_collection", create=True, return_value=collection):
+            await command_service._run_dispatch_job(job)
+
+        targets = port.dispatch_tasks.await_args.kwargs["targets"]
+        assert [target.item_id for target in targets] == ["EPI-A", "EPI-B"]
+        port.dispatch_task.assert_not_awaited()
+        [update] = collection.bulk_write.await_args.args[0]
+        assert update._filter == {"item_id": "EPI-A", "status": PlanItemStatus.PENDING.value}
+        assert update._doc["$set"]["execution_task_id"] == "ET-1"
+        assert _FakeItemDoc.store["EPI-A"].status == PlanItemStatus.RUNNING.value
+        command_service._plan_service.refresh_plan_status.assert_awaited_once_with(plan.plan_id)
+
+        statuses = {entry["item_id"]: (entry["status"], entry["error"]) for entry in job.items}
+        assert statuses["EPI-A"] == ("dispatched", None)
+        assert statuses["EPI-B"] == ("failed", "agent offline")
+        assert "仅自动化条目" in statuses["EPI-C"][1]
+        assert "pending" in statuses["EPI-D"][1]
+        assert "不存在" in statuses["EPI-MISSING"][1]
+        assert (job.status, job.dispatched_count, job.failed_count) == ("SUCCEEDED", 1, 4)
+        assert job.finished_at is not None
+
+    async def test_dispatch_job_revokes_task_for_concurrently_dispatched_item(self, command_service, plan):
+        _FakeItemDoc(
+            item_id="EPI-A", plan_id=plan.plan_id, ref_type="auto", case_id="AUTO-A",
+            status=PlanItemStatus.PENDING.value, assignee_id="user1", is_deleted=False,
+        )
+        job = SimpleNamespace(
+            job_id="EPD-1", created_by="owner1", params={"schedule_type": "IMMEDIATE"},
+            items=[
+                {"item_id": "EPI-A", "status": "queued", "task_id": None, "error": None},
+                {"item_id": "EPI-DONE", "status": "dispatched", "task_id": "ET-0", "error": None},
+            ],
+            status="FAILED", dispatched_count=1, failed_count=0, error="boom",
+            started_at=None, finished_at=None, save=AsyncMock(),
+        )
+        port = command_service._dispatch_port
+        port.dispatch_tasks = AsyncMock(return_value=[{"task_id": "ET-1"}])
+
+        async def _bulk_write(operations, ordered):
+            # 校验之后条目已被另一个请求下发到 ET-OTHER
+            _FakeItemDoc.store["EPI-A"].execution_task_id = "ET-OTHER"
+            return SimpleNamespace(matched_count=0)
+
+        collection = MagicMock(bulk_write=AsyncMock(side_effect=_bulk_write))
+        command_service._plan_service.refresh_plan_status = AsyncMock()
+
+        with patch.object(_FakeItemDoc, "get_pymongo_collection", create=True, return_value=collection):
+            await command_service._run_dispatch_job(job)
+
+        # 续跑只处理 queued 条目
+        assert [target.item_id for target in port.dispatch_tasks.await_args.kwargs["targets"]] == ["EPI-A"]
+        port.cancel_task.assert_awaited_once_with("ET-1")
+        assert job.items[0]["status"] == "failed"
+        assert "其他请求" in job.items[0]["error"]
+        assert (job.status, job.dispatched_count, job.failed_count) == ("SUCCEEDED", 1, 1)
+
+    async def test_resume_batch_dispatch_claims_failed_or_stale_jobs_only(self, command_service):
+        from datetime import timedelta
+
+        stale = datetime.now(timezone.utc) - timedelta(hours=1)
+        jobs = {
+            "EPD-FAILED": SimpleNamespace(status="FAILED", updated_at=datetime.now(timezone.utc)),
+            "EPD-STALE": SimpleNamespace(status="RUNNING", updated_at=stale),
+            "EPD-ALIVE": SimpleNamespace(status="RUNNING", updated_at=datetime.now(timezone.utc)),
+        }
+        for job_id, job in jobs.items():
+            job.__dict__.update(
+                job_id=job_id, created_by="owner1", total=0, dispatched_count=0, failed_count=0,
+                items=[], error="boom", created_at=None, started_at=None, finished_at=None,
+            )
+
+        async def _claim(query, update):
+            job = jobs[query["job_id"]]
+            failed, stale_running = query["$or"]
+            matched = job.status == failed["status"] or (
+                job.status == stale_running["status"] and job.updated_at < stale_running["updated_at"]["$lt"]
+            )
+            if matched:
+                job.status = update["$set"]["status"]
+            return SimpleNamespace(matched_count=int(matched))
+
+        job_doc = MagicMock(find_one=AsyncMock(side_effect=lambda query: jobs[query["job_id"]]))
+        job_doc.get_pymongo_collection.return_value.update_one = AsyncMock(side_effect=_claim)
+
+        with patch(f"{COMMAND_PATH}.ExecutionPlanDispatchJobDoc", job_doc), \
+             patch.object(command_service, "_start_dispatch_job") as start:
+            assert (await command_service.resume_batch_dispatch_job("EPD-FAILED", "owner1"))["error"] is None
+            resumed = await command_service.resume_batch_dispatch_job("EPD-STALE", "owner1")
+            assert resumed["status"] == "PENDING"
+            with pytest.raises(ValueError):
+                await command_service.resume_batch_dispatch_job("EPD-ALIVE", "owner1")
+            with pytest.raises(PermissionDeniedError):
+                await command_service.resume_batch_dispatch_job("EPD-ALIVE", "stranger")
+
+        assert start.call_count == 2
+
+    async def test_get_batch_dispatch_job_is_limited_to_submitter(self, command_service):
+        job = SimpleNamespace(
+            job_id="EPD-1", created_by="owner1", status="RUNNING", total=1, dispatched_count=0,
+            failed_count=0, items=[], error=None, created_at=None, started_at=None, finished_at=None,
+        )
+        job_doc = MagicMock(find_one=AsyncMock(side_effect=lambda query: job if query["job_id"] == "EPD-1" else None))
+
+        with patch(f"{COMMAND_PATH}.ExecutionPlanDispatchJobDoc", job_doc):
+            assert (await command_service.get_batch_dispatch_job("EPD-1", "owner1"))["status"] == "RUNNING"
+            with pytest.raises(PermissionDeniedError):
+                await command_service.get_batch_dispatch_job("EPD-1", "stranger")
+            with pytest.raises(DispatchJobNotFoundError):
+                await command_service.get_batch_dispatch_job("EPD-404", "owner1")
+
 
 class TestUpdateItemBoundaries:
     async def test_update_item_allows_metadata_fields_only(self, command_service, auto_item):
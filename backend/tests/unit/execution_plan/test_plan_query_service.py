@@ -60,7 +60,7 @@ async def test_list_plans_delegates_to_plan_service(query_service, mock_service)
     result = await query_service.list_plans(status="active")
 
     # list_plans 透传默认分页参数 page=1, page_size=20
-    mock_service.list_plans.assert_awaited_once_with(status="active", page=1, page_size=20)
+    mock_service.list_plans.assert_awaited_once_with(status="active", page=1, page_size=20, cursor=None)
     assert result == [{"plan_id": "EP-1"}, {"plan_id": "EP-2"}]
 
 
@@ -69,7 +69,7 @@ async def test_list_plans_without_status(query_service, mock_service):
 
     result = await query_service.list_plans()
 
-    mock_service.list_plans.assert_awaited_once_with(status=None, page=1, page_size=20)
+    mock_service.list_plans.assert_awaited_once_with(status=None, page=1, page_size=20, cursor=None)
     assert result == []
 
 
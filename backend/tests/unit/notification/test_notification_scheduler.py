@@ -0,0 +1,171 @@
+"""通知聚合调度测试：时间堆调度、租约 claim 与共享 HTTP 客户端。"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+import app.modules.notification.service as service_mod
+from app.modules.notification.scheduler import NotificationFlushScheduler
+from app.modules.notification.service import NotificationService
+
+NOW = datetime(2026, 5, 1, 8, 0, 0, tzinfo=timezone.utc)
+
+
+def test_reset_window_invalidates_older_heap_entry() -> None:
+    scheduler = NotificationFlushScheduler(flush=AsyncMock(), scan=AsyncMock(return_value=[]))
+    key = ("u1", "assign")
+
+    scheduler.schedule(key, NOW + timedelta(seconds=10))
+    scheduler.schedule(key, NOW + timedelta(seconds=30))
+    scheduler.schedule(("u2", "assign"), NOW + timedelta(seconds=20))
+
+    assert scheduler.pop_due(NOW + timedelta(seconds=15)) == []
+    assert scheduler.next_due_at() == NOW + timedelta(seconds=20)
+    assert scheduler.pop_due(NOW + timedelta(seconds=30)) == [("u2", "assign"), key]
+    assert scheduler.next_due_at() is None
+
+
+async def test_run_once_scans_then_flushes_due_batches() -> None:
+    flush = AsyncMock(side_effect=[RuntimeError("bot down"), None])
+    scan = AsyncMock(return_value=[
+        (("u1", "assign"), NOW - timedelta(seconds=1)),
+        (("u2", "assign"), NOW),
+        (("u3", "assign"), NOW + timedelta(seconds=5)),
+    ])
+    scheduler = NotificationFlushScheduler(flush=flush, scan=scan, scan_interval_seconds=30)
+
+    await scheduler.run_once(NOW)
+    # 单个批次失败不影响其他批次；未到期的批次留在堆中
+    assert flush.await_count == 2
+    assert scheduler.next_due_at() == NOW + timedelta(seconds=5)
+
+    await scheduler.run_once(NOW + timedelta(seconds=5))
+    assert scan.await_count == 1
+    flush.assert_awaited_with(("u3", "assign"))
+
+
+class _FakeQuery:
+    def __init__(self, results):
+        self._results = results
+        self.updates = []
+
+    def update(self, update, **_kwargs):
+        self.updates.append(update)
+        return self._results.pop(0) if self._results else None
+
+
+def _as_awaitable(value):
+    async def _value():
+        return value
+    return _value()
+
+
+async def test_flush_batch_claims_with_lease_and_marks_sent(monkeypatch) -> None:
+    claimed = SimpleNamespace(id="doc-1", items=[{"title": "指派", "content": "用例 A"}])
+    claim_results = [_as_awaitable(claimed), _as_awaitable(None)]
+    queries: list[tuple[dict, _FakeQuery]] = []
+
+    def _find_one(query):
+        fake = _FakeQuery(claim_results if "$or" in query else [_as_awaitable(None)])
+        queries.append((query, fake))
+        return fake
+
+    monkeypatch.setattr(service_mod, "PendingNotificationDoc", SimpleNamespace(find_one=_find_one))
+    do_flush = AsyncMock()
+    monkeypatch.setattr(NotificationService, "_do_flush", do_flush)
+
+    await NotificationService._flush_batch(("u1", "assign"))
+
+    batch = do_flush.await_args.args[2]
+    assert [item.content for item in batch.items] == ["用例 A"]
+    claim_query, claim = queries[0]
+    assert claim_query["user_id"] == "u1"
+    assert claim.updates[0]["$set"]["status"] == "sending"
+    assert claim.updates[0]["$set"]["claim_owner"] == NotificationService._owner
+    sent_query, sent = queries[1]
+    assert sent_query == {"_id": "doc-1", "claim_owner": NotificationService._owner}
+    assert sent.updates[0]["$set"]["status"] == "sent"
+    # 第二次 claim 没有可发送批次，循环结束
+    assert len(queries) == 3
+
+
+async def test_notify_appends_atomically_and_schedules(monkeypatch) -> None:
+    collection = SimpleNamespace(update_one=AsyncMock())
+    monkeypatch.setattr(
+        service_mod,
+        "PendingNotificationDoc",
+        SimpleNamespace(get_pymongo_collection=lambda: collection),
+    )
+    monkeypatch.setattr(
+        service_mod,
+        "get_settings",
+        lambda: SimpleNamespace(notification=SimpleNamespace(enabled=True, batch_window_seconds=60)),
+    )
+    scheduler = MagicMock()
+    monkeypatch.setattr(NotificationService, "_get_scheduler", classmethod(lambda cls: scheduler))
+
+    await NotificationService.notify_by_user_id("u1", "指派", "用例 A", notify_type="assign")
+
+    query, update = collection.update_one.await_args.args
+    assert query == {"user_id": "u1", "notify_type": "assign", "status": "pending"}
+    assert update["$push"] == {"items": {"title": "指派", "content": "用例 A"}}
+    assert collection.update_one.await_args.kwargs == {"upsert": True}
+    key, due_at = scheduler.schedule.call_args.args
+    assert key == ("u1", "assign")
+    assert due_at == update["$set"]["scheduled_at"]
+
+
+async def test_bot_sends_share_one_bounded_client(monkeypatch) -> None:
+    monkeypatch.setattr(service_mod, "BOT_SEND_CONCURRENCY", 2)
+    monkeypatch.setattr(NotificationService, "_http_client", None)
+    monkeypatch.setattr(NotificationService, "_send_semaphore", None)
+    monkeypatch.setattr(
+        service_mod,
+        "get_settings",
+        lambda: SimpleNamespace(notification=SimpleNamespace(guangquan=SimpleNamespace(
+            component_name="DML",
+            api_url="http://bot.local/notify",
+            timeout_sec=5,
+        ))),
+    )
+    active = {"now": 0, "max": 0}
+
+    async def _post(_url, json):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0)
+        active["now"] -= 1
+        return SimpleNamespace(status_code=200, raise_for_status=lambda: None)
+
+    client = SimpleNamespace(is_closed=False, post=_post, aclose=AsyncMock())
+    created = []
+
+    def _client_factory(**kwargs):
+        created.append(kwargs)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", _client_factory)
+
+    await asyncio.gather(*(
+        NotificationService._send_to_bot(itcode=f"user{i}", title="t", content="c", notify_type="assign")
+        for i in range(6)
+    ))
+
+    assert len(created) == 1
+    assert created[0]["limits"].max_connections == 2
+    assert active["max"] == 2
+    await NotificationService._close_http_client()
+    client.aclose.assert_awaited_once()
+
+
+@pytest.fixture(autouse=True)
+def _reset_notification_state():
+    yield
+    NotificationService._scheduler = None
+    NotificationService._http_client = None
+    NotificationService._send_semaphore = None
@@ -68,9 +68,9 @@ def _index_keys(idx: IndexModel) -> list[str]:
     return [str(k) for k in idx.document["key"].keys()]
 
 
-def test_three_indexes_configured() -> None:
+def test_four_indexes_configured() -> None:
     indexes = PendingNotificationDoc.Settings.indexes
-    assert len(indexes) == 3, f"expected 3 indexes, got {len(indexes)}"
+    assert len(indexes) == 4, f"expected 4 indexes, got {len(indexes)}"
 
 
 def test_scheduled_at_index_exists() -> None:
@@ -104,6 +104,14 @@ def test_ttl_index_filters_sent_only() -> None:
     assert ttl_index.document.get("partialFilterExpression") == {"status": "sent"}
 
 
+def test_unique_pending_batch_index() -> None:
+    """第四个索引：同用户同类型只允许一个 pending 批次。"""
+    unique_index = PendingNotificationDoc.Settings.indexes[3]
+    assert _index_keys(unique_index) == ["user_id", "notify_type"]
+    assert unique_index.document.get("unique") is True
+    assert unique_index.document.get("partialFilterExpression") == {"status": "pending"}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  Field type annotations
 # ═══════════════════════════════════════════════════════════════════════
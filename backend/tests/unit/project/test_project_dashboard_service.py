@@ -0,0 +1,79 @@
+"""ProjectDashboardService 单元测试：动态与阻塞项直接按冗余的 project_ids 查询，不再 $lookup。"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bson import ObjectId
+
+from app.modules.project.service.project_dashboard_service import ProjectDashboardService
+from app.modules.project.service.project_service import ProjectService
+
+NOW = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _query(docs: list) -> MagicMock:
+    query = MagicMock()
+    query.to_list = AsyncMock(return_value=docs)
+    return query
+
+
+@patch("app.modules.auth.repository.models.UserDoc")
+@patch("app.modules.workflow.repository.models.business.BusWorkItemDoc")
+@patch("app.modules.workflow.repository.models.business.BusFlowLogDoc")
+async def test_activities_query_flow_logs_by_project_and_skip_deleted_items(
+    MockLogDoc, MockWorkItemDoc, MockUserDoc
+):
+    live, deleted = ObjectId(), ObjectId()
+    logs = [
+        SimpleNamespace(id=ObjectId(), work_item_id=item_id, operator_id=user, action=action, created_at=NOW)
+        for item_id, user, action in ((live, "u-1", "APPROVE"), (deleted, "u-2", "SUBMIT"))
+    ]
+    MockLogDoc.find.return_value = _query(logs)
+    work_item = SimpleNamespace(id=live, title="登录", type_code="requirement")
+    MockWorkItemDoc.find.return_value = _query([work_item])
+    MockUserDoc.find.return_value = _query([SimpleNamespace(user_id="u-1", username="alice")])
+
+    activities = await ProjectDashboardService.get_activities("PRJ-1", limit=5)
+
+    MockLogDoc.find.assert_called_once_with({"project_ids": "PRJ-1"}, sort=[("created_at", -1)], limit=5)
+    MockLogDoc.aggregate.assert_not_called()
+    assert [(a.target, a.target_type, a.username) for a in activities] == [("登录", "requirement", "alice")]
+
+
+@patch("app.modules.project.service.project_dashboard_service.get_related_models", return_value=[])
+@patch("app.modules.project.service.project_dashboard_service.find_model")
+@patch("app.modules.execution_plan.repository.models.ExecutionPlanItemDoc")
+async def test_blockers_use_denormalized_project_ids_on_plan_items(MockItemDoc, mock_find_model, _related):
+    item = SimpleNamespace(
+        item_id="EPI-1", case_title="登录", assignee_id="u-1",
+        status="fail", priority="P1", updated_at=NOW,
+    )
+    MockItemDoc.find.return_value = _query([item])
+    mock_find_model.return_value.find.return_value = _query([])
+
+    blockers = await ProjectDashboardService.get_blockers("PRJ-1")
+
+    query = MockItemDoc.find.call_args.args[0]
+    assert query["project_ids"] == "PRJ-1" and query["is_deleted"] is False
+    MockItemDoc.aggregate.assert_not_called()
+    assert [(b.id, b.source) for b in blockers] == [("EPI-1", "plan_item")]
+
+
+@patch("app.modules.project.service.project_service.get_denormalized_models")
+@patch("app.modules.project.service.project_service.get_related_models", return_value=[])
+@patch("app.modules.project.service.project_service.ProjectDoc")
+async def test_delete_project_pulls_project_from_denormalized_collections(
+    MockProjectDoc, _related, mock_denormalized
+):
+    MockProjectDoc.find_one = AsyncMock(return_value=MagicMock(save=AsyncMock()))
+    model = MagicMock()
+    model.find.return_value.update_many = AsyncMock()
+    mock_denormalized.return_value = [model]
+
+    await ProjectService.delete_project("PRJ-1")
+
+    model.find.assert_called_once_with({"project_ids": "PRJ-1"})
+    model.find.return_value.update_many.assert_awaited_once_with({"$pull": {"project_ids": "PRJ-1"}})
@@ -291,10 +291,10 @@ class TestToProjectResponse:
 class TestProjectServiceFacades:
 
     @patch(
-        "app.modules.project.service.project_service.ProjectDashboardService.get_project_stats",
+        "app.modules.project.service.project_service.ProjectStatsRollupService.get_stats",
         new_callable=AsyncMock,
     )
-    async def test_stats_delegate_to_dashboard_service(self, mock_get_stats):
+    async def test_stats_read_from_rollup_service(self, mock_get_stats):
         expected = MagicMock()
         mock_get_stats.return_value = expected
 
@@ -0,0 +1,113 @@
+"""项目统计汇总测试：看板读单条汇总文档，写路径按分区后台刷新，过期时后台全量对账。"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.project.domain.constants import STATS_SECTION_TASKS, STATS_SECTIONS
+from app.modules.project.service import project_stats_rollup
+from app.modules.project.service.project_dashboard_service import ProjectDashboardService
+from app.modules.project.service.project_stats_rollup import (
+    ProjectStatsRollupService,
+    schedule_project_stats_refresh,
+)
+
+MODULE = "app.modules.project.service.project_stats_rollup"
+
+
+@pytest.fixture
+def rollup_doc():
+    with patch(f"{MODULE}.ProjectStatsRollupDoc") as doc_cls:
+        doc_cls.get_pymongo_collection.return_value.update_one = AsyncMock()
+        yield doc_cls
+
+
+@pytest.fixture
+def compute():
+    with patch.object(
+        ProjectDashboardService, "compute_stats_sections", new_callable=AsyncMock,
+        return_value={"test_case_count": 3},
+    ) as mock_compute:
+        yield mock_compute
+
+
+async def _drain() -> None:
+    await asyncio.gather(*list(project_stats_rollup._pending_rollup_tasks))
+
+
+async def test_first_read_computes_all_sections_and_stores_reconciled_rollup(rollup_doc, compute):
+    rollup_doc.find_one = AsyncMock(return_value=None)
+
+    stats = await ProjectStatsRollupService.get_stats("PRJ-1")
+
+    assert stats.test_case_count == 3
+    compute.assert_awaited_once_with("PRJ-1", STATS_SECTIONS)
+    (query, update), kwargs = rollup_doc.get_pymongo_collection.return_value.update_one.await_args
+    assert query == {"project_id": "PRJ-1"} and kwargs == {"upsert": True}
+    assert update["$set"]["stats.test_case_count"] == 3
+    assert "reconciled_at" in update["$set"]
+
+
+async def test_fresh_rollup_is_a_single_document_read(rollup_doc, compute):
+    rollup_doc.find_one = AsyncMock(return_value=SimpleNamespace(
+        stats={"plan_count": 7}, reconciled_at=datetime.now(timezone.utc),
+    ))
+
+    stats = await ProjectStatsRollupService.get_stats("PRJ-1")
+
+    assert stats.plan_count == 7
+    compute.assert_not_awaited()
+    assert not project_stats_rollup._pending_rollup_tasks
+
+
+async def test_expired_rollup_is_served_and_reconciled_in_background(rollup_doc, compute):
+    max_age = timedelta(seconds=project_stats_rollup.ROLLUP_RECONCILE_SECONDS + 1)
+    expired = datetime.now(timezone.utc) - max_age
+    rollup_doc.find_one = AsyncMock(return_value=SimpleNamespace(
+        stats={"plan_count": 7}, reconciled_at=expired.replace(tzinfo=None),
+    ))
+
+    stats = await ProjectStatsRollupService.get_stats("PRJ-1")
+    await ProjectStatsRollupService.get_stats("PRJ-1")
+    await _drain()
+
+    assert stats.plan_count == 7
+    compute.assert_awaited_once_with("PRJ-1", STATS_SECTIONS)
+    assert not project_stats_rollup._reconciling_projects
+
+
+async def test_write_path_refresh_recomputes_only_given_section_of_existing_rollups(rollup_doc, compute):
+    rollup_doc.find_one = AsyncMock(
+        side_effect=lambda query: None if query["project_id"] == "PRJ-2" else object()
+    )
+
+    schedule_project_stats_refresh(["PRJ-1", "PRJ-2", None, "PRJ-1"], STATS_SECTION_TASKS)
+    await _drain()
+
+    compute.assert_awaited_once_with("PRJ-1", (STATS_SECTION_TASKS,))
+    update = rollup_doc.get_pymongo_collection.return_value.update_one.await_args.args[1]["$set"]
+    assert "reconciled_at" not in update
+
+
+async def test_task_breakdown_groups_statuses_in_one_aggregation():
+    from app.modules.project.service.project_dashboard_service import _compute_task_breakdown
+
+    task_cls = MagicMock()
+    task_cls.aggregate.return_value.to_list = AsyncMock(return_value=[
+        {"_id": "DONE", "count": 3}, {"_id": "RUNNING", "count": 1},
+        {"_id": "FAILED", "count": 2}, {"_id": "PENDING", "count": 4},
+    ])
+
+    breakdown = await _compute_task_breakdown(task_cls, "PRJ-1")
+
+    task_cls.aggregate.assert_called_once()
+    task_cls.find.assert_not_called()
+    assert (breakdown.total, breakdown.done, breakdown.running, breakdown.failed, breakdown.pending) == (
+        10, 3, 1, 2, 4
+    )
+    assert breakdown.progress == 30.0
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -53,6 +54,7 @@ async def test_workflow_cleanup_requires_explicit_prune(
     monkeypatch.setattr(sync_workflow, "_sync_workflow_configs", no_op)
     monkeypatch.setattr(sync_workflow, "_cleanup_removed_work_types", cleanup_work_types)
     monkeypatch.setattr(sync_workflow, "_cleanup_removed_workflow_configs", cleanup_configs)
+    monkeypatch.setattr(sync_workflow, "_bump_workflow_version", AsyncMock(return_value=1))
 
     await sync_workflow.sync_workflow_config(prune=prune)
 
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.modules.search.application.indexer import SearchIndexer  # noqa: E402
+from app.modules.search.application.search_service import GlobalSearchService  # noqa: E402
+from app.modules.search.domain.entry import SearchEntry  # noqa: E402
+
+
+class _FakeAggregation:
+    def __init__(self, results: list[dict]) -> None:
+        self._results = results
+
+    async def to_list(self) -> list[dict]:
+        return self._results
+
+
+class _FakeSearchIndexDoc:
+    pipelines: list[list[dict]] = []
+    results: list[dict] = []
+
+    @classmethod
+    def aggregate(cls, pipeline: list[dict], projection_model=None) -> _FakeAggregation:
+        cls.pipelines.append(pipeline)
+        return _FakeAggregation(cls.results)
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.operations: list = []
+
+    async def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        self.operations.extend(operations)
+
+
+class _ReadyIndexer:
+    def __init__(self, ready: bool) -> None:
+        self._ready = ready
+
+    async def is_ready(self, entity_type: str) -> bool:
+        return self._ready
+
+
+def _patch_index_doc(monkeypatch, results: list[dict]) -> None:
+    _FakeSearchIndexDoc.pipelines = []
+    _FakeSearchIndexDoc.results = results
+    monkeypatch.setattr(
+        "app.modules.search.application.search_service.SearchIndexDoc",
+        _FakeSearchIndexDoc,
+    )
+
+
+def test_search_builds_ranked_match_with_filters(monkeypatch) -> None:
+    _patch_index_doc(
+        monkeypatch,
+        [{"items": [{"entity_type": "test_case", "entity_id": "TC-1", "score": 4.0}], "total": [{"count": 1}]}],
+    )
+
+    page = asyncio.run(
+        GlobalSearchService().search(
+            "内存测试",
+            entity_types=["test_case"],
+            project_id="PRJ-1",
+            owner_id="u1",
+            creator_id="u2",
+            limit=10,
+            offset=5,
+        )
+    )
+
+    match = _FakeSearchIndexDoc.pipelines[0][0]["$match"]
+    assert match["terms"] == {"$all": ["内存", "存测", "测试"]}
+    assert match["entity_type"] == "test_case"
+    assert match["project_ids"] == "PRJ-1"
+    assert match["$or"] == [{"owner_id": "u1"}, {"creator_id": "u2"}]
+    items_stage = _FakeSearchIndexDoc.pipelines[0][1]["$facet"]["items"]
+    assert {"$skip": 5} in items_stage and {"$limit": 10} in items_stage
+    assert page == {
+        "items": [{"entity_type": "test_case", "entity_id": "TC-1", "score": 4.0}],
+        "total": 1,
+        "limit": 10,
+        "offset": 5,
+    }
+
+
+def test_search_without_terms_skips_query(monkeypatch) -> None:
+    _patch_index_doc(monkeypatch, [])
+
+    page = asyncio.run(GlobalSearchService().search("  --  "))
+
+    assert page["items"] == [] and page["total"] == 0
+    assert _FakeSearchIndexDoc.pipelines == []
+
+
+def test_search_rejects_unknown_entity_type(monkeypatch) -> None:
+    _patch_index_doc(monkeypatch, [])
+
+    with pytest.raises(ValueError):
+        asyncio.run(GlobalSearchService().search("内存", entity_types=["comment"]))
+
+
+def test_search_entity_ids_returns_none_until_index_is_ready(monkeypatch) -> None:
+    _patch_index_doc(monkeypatch, [])
+    service = GlobalSearchService(indexer=_ReadyIndexer(False))
+
+    assert asyncio.run(service.search_entity_ids("work_item", "内存")) is None
+
+
+def test_search_entity_ids_preserves_rank_order(monkeypatch) -> None:
+    _patch_index_doc(
+        monkeypatch,
+        [{"items": [{"entity_id": "b"}, {"entity_id": "a"}], "total": [{"count": 2}]}],
+    )
+    service = GlobalSearchService(indexer=_ReadyIndexer(True))
+
+    assert asyncio.run(service.search_entity_ids("work_item", "内存", sub_type="REQUIREMENT")) == ["b", "a"]
+    assert _FakeSearchIndexDoc.pipelines[0][0]["$match"]["sub_type"] == "REQUIREMENT"
+
+
+def test_refresh_upserts_present_entries_and_deletes_missing(monkeypatch) -> None:
+    collection = _FakeCollection()
+
+    class _FakeSource:
+        async def load_entries(self, ids: list[str]) -> list[SearchEntry]:
+            return [SearchEntry(entity_type="test_case", entity_id="TC-1", title="内存压力")]
+
+    monkeypatch.setattr(
+        "app.modules.search.application.indexer.get_search_source",
+        lambda entity_type: _FakeSource(),
+    )
+    monkeypatch.setattr(
+        "app.modules.search.application.indexer.SearchIndexDoc",
+        SimpleNamespace(get_pymongo_collection=lambda: collection),
+    )
+
+    count = asyncio.run(SearchIndexer().refresh("test_case", ["TC-1", "TC-2", "TC-1", None]))
+
+    assert count == 2
+    upsert, delete = collection.operations
+    assert upsert._filter == {"entity_type": "test_case", "entity_id": "TC-1"}
+    assert "内存" in upsert._doc["$set"]["terms"]
+    assert delete._filter == {"entity_type": "test_case", "entity_id": "TC-2"}
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.modules.search.domain.tokenizer import (  # noqa: E402
+    MAX_TERMS_PER_ENTRY,
+    build_term_weights,
+    query_terms,
+    tokenize,
+)
+
+
+def test_tokenize_splits_cjk_runs_into_bigrams_and_latin_into_words() -> None:
+    assert tokenize("内存压力 Memory-Stress TC-2026-00001") == [
+        "内存", "存压", "压力", "memory", "stress", "tc", "2026", "00001",
+    ]
+
+
+def test_tokenize_keeps_single_cjk_character_as_unigram() -> None:
+    assert tokenize("测 a") == ["测", "a"]
+    assert tokenize(None) == []
+
+
+def test_query_terms_are_deduplicated_in_order() -> None:
+    assert query_terms("内存 内存 测试") == ["内存", "测试"]
+
+
+def test_title_terms_outweigh_body_terms_and_title_is_prefix_indexed() -> None:
+    weights = build_term_weights("内存压力测试", [("内存泄漏 memory", 1.0)])
+
+    assert weights["内存"] > weights["泄漏"]
+    # 标题额外索引单字，支持单字查询
+    assert "压" in weights
+    # 正文英文词不做前缀扩展
+    assert "mem" not in weights
+
+
+def test_title_latin_words_get_edge_prefixes() -> None:
+    weights = build_term_weights("Memory stress", [])
+
+    assert {"me", "mem", "memo", "memor", "memory"} <= set(weights)
+
+
+def test_term_weights_are_capped() -> None:
+    body = " ".join(f"word{i}" for i in range(MAX_TERMS_PER_ENTRY * 2))
+
+    assert len(build_term_weights("title", [(body, 1.0)])) == MAX_TERMS_PER_ENTRY
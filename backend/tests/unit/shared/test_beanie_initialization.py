@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from app.shared.infrastructure import bootstrap
+from app.shared.infrastructure import bootstrap, index_fingerprint
 
 
 async def test_initialize_beanie_accepts_explicit_index_sync(
@@ -24,3 +24,110 @@ async def test_initialize_beanie_accepts_explicit_index_sync(
         "document_models": [object],
         "skip_indexes": False,
     }
+
+
+class _FakeFingerprintCollection:
+    def __init__(self, record: dict | None = None) -> None:
+        self.record = record
+        self.updates: list[dict] = []
+
+    async def find_one(self, query: dict) -> dict | None:
+        return self.record
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> None:
+        self.updates.append(update["$set"])
+
+
+class _FakeDatabase(dict):
+    def __getitem__(self, name: str) -> _FakeFingerprintCollection:
+        return self.setdefault(name, _FakeFingerprintCollection())
+
+
+async def test_initialize_beanie_auto_mode_syncs_then_skips_unchanged_indexes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[bool] = []
+
+    async def fake_init_beanie(**kwargs: object) -> None:
+        calls.append(bool(kwargs["skip_indexes"]))
+
+    monkeypatch.setattr(bootstrap, "init_beanie", fake_init_beanie)
+    monkeypatch.setattr(bootstrap, "get_document_models_list", lambda: [object])
+    monkeypatch.setenv("SKIP_INDEX_SYNC", "auto")
+
+    database = _FakeDatabase()
+    assert await bootstrap.initialize_beanie(database) == "synced"
+
+    fingerprints = index_fingerprint.collection_fingerprints([object])
+    collection = database[index_fingerprint.INDEX_FINGERPRINT_COLLECTION]
+    assert collection.updates[0]["collections.object"] == fingerprints["object"]
+
+    collection.record = {"collections": dict(fingerprints)}
+    assert await bootstrap.initialize_beanie(database) == "unchanged"
+    assert calls == [False, True]
+
+
+@pytest.mark.parametrize(("env_value", "expected"), [(None, "skipped"), ("1", "skipped"), ("0", "synced")])
+async def test_initialize_beanie_respects_explicit_index_sync_env(
+    monkeypatch: pytest.MonkeyPatch, env_value: str | None, expected: str
+) -> None:
+    async def fake_init_beanie(**kwargs: object) -> None:
+        return None
+
+    monkeypatch.setattr(bootstrap, "init_beanie", fake_init_beanie)
+    monkeypatch.setattr(bootstrap, "get_document_models_list", lambda: [object])
+    if env_value is None:
+        monkeypatch.delenv("SKIP_INDEX_SYNC", raising=False)
+    else:
+        monkeypatch.setenv("SKIP_INDEX_SYNC", env_value)
+
+    assert await bootstrap.initialize_beanie(_FakeDatabase()) == expected
+
+
+async def test_initialize_beanie_auto_mode_survives_index_creation_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[bool] = []
+
+    async def fake_init_beanie(**kwargs: object) -> None:
+        calls.append(bool(kwargs["skip_indexes"]))
+        if not kwargs["skip_indexes"]:
+            raise RuntimeError("E11000 duplicate key error building unique index")
+
+    monkeypatch.setattr(bootstrap, "init_beanie", fake_init_beanie)
+    monkeypatch.setattr(bootstrap, "get_document_models_list", lambda: [object])
+    monkeypatch.setenv("SKIP_INDEX_SYNC", "auto")
+
+    database = _FakeDatabase()
+    assert await bootstrap.initialize_beanie(database) == "failed"
+
+    # 建索引失败后跳过索引完成初始化，且不记录指纹，下次启动会重试
+    assert calls == [False, True]
+    assert database[index_fingerprint.INDEX_FINGERPRINT_COLLECTION].updates == []
+
+
+async def test_initialize_beanie_explicit_sync_propagates_index_creation_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fake_init_beanie(**kwargs: object) -> None:
+        raise RuntimeError("index build failed")
+
+    monkeypatch.setattr(bootstrap, "init_beanie", fake_init_beanie)
+    monkeypatch.setattr(bootstrap, "get_document_models_list", lambda: [object])
+    monkeypatch.setenv("SKIP_INDEX_SYNC", "0")
+
+    with pytest.raises(RuntimeError, match="index build failed"):
+        await bootstrap.initialize_beanie(_FakeDatabase())
+
+
+def test_load_document_models_only_returns_requested_modules() -> None:
+    from app.modules.auth.repository.models import DOCUMENT_MODELS as AUTH_DOCUMENT_MODELS
+    from app.modules.system_config.repository.models import DOCUMENT_MODELS as SYSTEM_CONFIG_DOCUMENT_MODELS
+
+    models = bootstrap.load_document_models([
+        "app.modules.auth.repository.models",
+        "app.modules.system_config.repository.models",
+        "app.modules.auth.repository.models",
+    ])
+
+    assert models == [*AUTH_DOCUMENT_MODELS, *SYSTEM_CONFIG_DOCUMENT_MODELS]
@@ -0,0 +1,122 @@
+"""流式导出工具单元测试。"""
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from app.shared.export import (
+    ExportColumn,
+    ExportFormat,
+    build_export_response,
+    iter_cursor_chunks,
+    iter_export_bytes,
+)
+
+COLUMNS = (ExportColumn("case_id", "用例编号"), ExportColumn("tags", "标签"), ExportColumn("is_active", "是否有效"))
+
+
+class _FakeCursor:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = docs
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._docs:
+            yield dict(doc)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = docs
+        self.calls: list[tuple[dict, dict]] = []
+        self.cursor: _FakeCursor | None = None
+
+    def find(self, query, **kwargs):
+        self.calls.append((query, kwargs))
+        self.cursor = _FakeCursor(self._docs)
+        return self.cursor
+
+
+async def _chunks(*chunks: list[dict]):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([data async for data in stream])
+
+
+async def test_cursor_chunks_split_by_size_and_close_cursor():
+    collection = _FakeCollection([{"case_id": f"TC-{index}"} for index in range(5)])
+
+    chunks = [
+        chunk
+        async for chunk in iter_cursor_chunks(
+            collection,
+            {"is_deleted": False},
+            projection={"case_id": 1},
+            sort=[("created_at", -1)],
+            chunk_size=2,
+        )
+    ]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert collection.calls[0][1]["batch_size"] == 2
+    assert collection.cursor.closed is True
+
+
+async def test_csv_has_bom_header_and_escapes_formulas():
+    rows = [
+        {"case_id": "TC-1", "tags": ["a", "b"], "is_active": True},
+        {"case_id": "=HYPERLINK()", "tags": [], "is_active": False},
+    ]
+
+    data = await _collect(iter_export_bytes(ExportFormat.CSV, COLUMNS, _chunks(rows[:1], rows[1:])))
+    text = data.decode("utf-8")
+
+    assert text.startswith("\ufeff用例编号,标签,是否有效\r\n")
+    assert 'TC-1,"a, b",是\r\n' in text
+    assert "'=HYPERLINK(),,否" in text
+
+
+async def test_ndjson_keeps_native_values():
+    created_at = datetime(2026, 1, 2)
+    rows = [{"case_id": "TC-1", "tags": ["a"], "is_active": True, "ignored": 1, "created_at": created_at}]
+    columns = (*COLUMNS, ExportColumn("created_at", "创建时间"))
+
+    data = await _collect(iter_export_bytes(ExportFormat.NDJSON, columns, _chunks(rows)))
+    lines = data.decode("utf-8").splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {"case_id": "TC-1", "tags": ["a"], "is_active": True, "created_at": "2026-01-02T00:00:00"},
+    ]
+
+
+async def test_xlsx_is_readable_workbook():
+    rows = [{"case_id": f"TC-{index}", "tags": ["x"], "is_active": True} for index in range(3)]
+
+    data = await _collect(
+        iter_export_bytes(ExportFormat.XLSX, COLUMNS, _chunks(rows[:2], rows[2:]), sheet_title="cases"),
+    )
+
+    sheet = load_workbook(io.BytesIO(data), read_only=True)["cases"]
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0] == ["用例编号", "标签", "是否有效"]
+    assert values[1:] == [[f"TC-{index}", "x", "是"] for index in range(3)]
+
+
+def test_export_response_sets_download_headers():
+    response = build_export_response(ExportFormat.NDJSON, COLUMNS, _chunks(), filename="用例导出")
+
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"].endswith(".ndjson")
+    assert "UTF-8''" in response.headers["content-disposition"]
@@ -0,0 +1,102 @@
+"""流式导入读取单元测试。"""
+from __future__ import annotations
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from app.shared.export import (
+    ExportFormat,
+    ImportCellKind,
+    ImportColumn,
+    decode_import_row,
+    detect_import_format,
+    iter_import_chunks,
+)
+
+COLUMNS = (
+    ImportColumn("title", "用例名称"),
+    ImportColumn("catalog_path", "目录", ImportCellKind.PATH),
+    ImportColumn("tags", "标签", ImportCellKind.LIST),
+    ImportColumn("is_active", "是否有效", ImportCellKind.BOOL),
+    ImportColumn("estimated_duration_sec", "预估耗时(秒)", ImportCellKind.INT),
+    ImportColumn("steps", "执行步骤", ImportCellKind.JSON),
+)
+
+
+def _rows(data: bytes, fmt: ExportFormat, **kwargs) -> list:
+    return [row for chunk in iter_import_chunks(io.BytesIO(data), fmt, COLUMNS, **kwargs) for row in chunk]
+
+
+def test_detect_import_format():
+    assert detect_import_format("cases.XLSX") == ExportFormat.XLSX
+    assert detect_import_format("cases.jsonl") == ExportFormat.NDJSON
+    with pytest.raises(ValueError):
+        detect_import_format("cases.doc")
+
+
+def test_csv_maps_export_titles_and_keeps_row_numbers_for_resume():
+    data = "\ufeff用例名称,目录,未知列,tags\r\nA,bios/mem,x,\"a, b\"\r\n,,,\r\nB,bios,,\r\nC,bios,,\r\n"
+
+    rows = _rows(data.encode("utf-8"), ExportFormat.CSV, chunk_size=2)
+    assert [(row.row_number, row.values) for row in rows] == [
+        (1, {"title": "A", "catalog_path": "bios/mem", "tags": "a, b"}),
+        (2, {}),
+        (3, {"title": "B", "catalog_path": "bios"}),
+        (4, {"title": "C", "catalog_path": "bios"}),
+    ]
+
+    resumed = _rows(data.encode("utf-8"), ExportFormat.CSV, skip_rows=2)
+    assert [row.row_number for row in resumed] == [3, 4]
+
+
+def test_ndjson_reports_bad_lines_without_stopping():
+    data = b'{"title": "A", "tags": ["x"]}\n\nnot json\n[1]\n{"title": "B"}\n'
+
+    rows = _rows(data, ExportFormat.NDJSON)
+    assert [row.row_number for row in rows] == [1, 2, 3, 4]
+    assert rows[0].values == {"title": "A", "tags": ["x"]}
+    assert rows[1].error.startswith("JSON 格式错误")
+    assert rows[2].error == "每行必须是 JSON 对象"
+
+
+def test_xlsx_reads_first_sheet():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["用例名称", "是否有效", "预估耗时(秒)"])
+    sheet.append(["A", "是", 30])
+    sheet.append(["B", None, None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    rows = _rows(buffer.getvalue(), ExportFormat.XLSX)
+    assert [row.values for row in rows] == [
+        {"title": "A", "is_active": "是", "estimated_duration_sec": 30},
+        {"title": "B"},
+    ]
+
+
+def test_decode_import_row_converts_by_kind():
+    decoded = decode_import_row(
+        {
+            "title": "'=SUM(A1)",
+            "catalog_path": "BIOS / Memory",
+            "tags": "a，b; c",
+            "is_active": "否",
+            "estimated_duration_sec": 30.0,
+            "steps": '[{"step_id": "1"}]',
+        },
+        COLUMNS,
+    )
+
+    assert decoded == {
+        "title": "=SUM(A1)",
+        "catalog_path": ["BIOS", "Memory"],
+        "tags": ["a", "b", "c"],
+        "is_active": False,
+        "estimated_duration_sec": 30,
+        "steps": [{"step_id": "1"}],
+    }
+    with pytest.raises(ValueError, match="预估耗时"):
+        decode_import_row({"estimated_duration_sec": "abc"}, COLUMNS)
@@ -0,0 +1,98 @@
+"""游标（keyset）分页单元测试。"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from app.shared.service import (
+    CREATED_AT_DESC,
+    InvalidCursorError,
+    KeysetSort,
+    decode_offset_cursor,
+    encode_offset_cursor,
+)
+
+CREATED = datetime(2026, 3, 1, 8, 30, 15, 123000, tzinfo=timezone.utc)
+DOC_ID = ObjectId()
+
+
+def test_cursor_round_trips_datetime_and_object_id():
+    cursor = CREATED_AT_DESC.encode(CREATED, DOC_ID)
+
+    assert CREATED_AT_DESC.decode(cursor) == (CREATED, DOC_ID)
+
+
+def test_cursor_is_bound_to_sort_field_and_rejects_garbage():
+    cursor = KeysetSort("title", descending=False).encode("abc", DOC_ID)
+
+    with pytest.raises(InvalidCursorError, match="title"):
+        CREATED_AT_DESC.decode(cursor)
+    with pytest.raises(InvalidCursorError):
+        CREATED_AT_DESC.decode("not-a-cursor")
+
+
+def test_filter_after_descending_includes_ties_and_trailing_nulls():
+    condition = CREATED_AT_DESC.filter_after(CREATED_AT_DESC.encode(CREATED, DOC_ID))
+
+    assert condition == {"$or": [
+        {"created_at": {"$lt": CREATED}},
+        {"created_at": CREATED, "_id": {"$lt": DOC_ID}},
+        {"created_at": None},
+    ]}
+
+
+def test_filter_after_handles_null_sort_values():
+    ascending = KeysetSort("title", descending=False)
+
+    assert ascending.filter_after(ascending.encode(None, DOC_ID)) == {"$or": [
+        {"title": {"$ne": None}},
+        {"title": None, "_id": {"$gt": DOC_ID}},
+    ]}
+    assert CREATED_AT_DESC.filter_after(CREATED_AT_DESC.encode(None, DOC_ID)) == {
+        "created_at": None, "_id": {"$lt": DOC_ID},
+    }
+
+
+def test_parse_and_sort_spec_append_id_tiebreaker():
+    assert KeysetSort.parse("-updated_at").sort_spec() == [("updated_at", DESCENDING), ("_id", DESCENDING)]
+    assert KeysetSort.parse("title").sort_spec() == [("title", ASCENDING), ("_id", ASCENDING)]
+
+
+def test_next_cursor_reads_docs_or_serialized_rows_and_stops_on_short_page():
+    rows = [{"id": str(ObjectId()), "created_at": CREATED}, {"id": str(DOC_ID), "created_at": CREATED}]
+    docs = [SimpleNamespace(id=DOC_ID, created_at=CREATED)]
+
+    assert CREATED_AT_DESC.decode(CREATED_AT_DESC.next_cursor(rows, 2)) == (CREATED, DOC_ID)
+    assert CREATED_AT_DESC.decode(CREATED_AT_DESC.next_cursor(docs, 1)) == (CREATED, DOC_ID)
+    assert CREATED_AT_DESC.next_cursor(rows, 3) is None
+    assert CREATED_AT_DESC.next_cursor([], 3) is None
+
+
+def test_paginate_uses_range_filter_instead_of_skip_when_cursor_given():
+    query = MagicMock()
+    query.find.return_value = query
+    query.sort.return_value = query
+    query.skip.return_value = query
+
+    CREATED_AT_DESC.paginate(query, limit=20, offset=400, cursor=CREATED_AT_DESC.encode(CREATED, DOC_ID))
+    query.find.assert_called_once()
+    query.skip.assert_not_called()
+    query.limit.assert_called_once_with(20)
+
+    query.reset_mock()
+    CREATED_AT_DESC.paginate(query, limit=20, offset=400)
+    query.find.assert_not_called()
+    query.sort.assert_called_once_with(CREATED_AT_DESC.sort_spec())
+    query.skip.assert_called_once_with(400)
+
+
+def test_offset_cursor_is_distinguished_from_keyset_cursor():
+    assert decode_offset_cursor(encode_offset_cursor(40)) == 40
+    assert decode_offset_cursor(CREATED_AT_DESC.encode(CREATED, DOC_ID)) is None
+    with pytest.raises(InvalidCursorError):
+        decode_offset_cursor("%%%")
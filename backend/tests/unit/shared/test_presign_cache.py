@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from app.shared.minio.presign_cache import PresignedUrlCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_presign_cache_reuses_url_until_half_of_lifetime() -> None:
+    clock = _Clock()
+    cache = PresignedUrlCache(clock=clock)
+    cache.put("attachments/a.log", 600, "url-a")
+
+    clock.now += 299
+    assert cache.get("attachments/a.log", 600) == "url-a"
+
+    clock.now += 2
+    assert cache.get("attachments/a.log", 600) is None
+
+
+def test_presign_cache_keys_by_expiry_and_evicts_lru() -> None:
+    cache = PresignedUrlCache(max_entries=2, clock=_Clock())
+    cache.put("a", 600, "url-a")
+    cache.put("b", 600, "url-b")
+    assert cache.get("a", 60) is None
+    assert cache.get("a", 600) == "url-a"
+
+    cache.put("c", 600, "url-c")
+
+    assert cache.get("b", 600) is None
+    assert cache.get("a", 600) == "url-a"
+
+
+def test_presign_cache_invalidate_drops_all_expiries() -> None:
+    cache = PresignedUrlCache(clock=_Clock())
+    cache.put("a", 600, "url-a-600")
+    cache.put("a", 60, "url-a-60")
+
+    cache.invalidate("a")
+
+    assert cache.get("a", 600) is None
+    assert cache.get("a", 60) is None
@@ -0,0 +1,52 @@
+"""RabbitMQ 生产者定向投递测试：代理队列不可路由时回退共享队列。"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pika.exceptions import UnroutableError
+
+from app.shared.kafka.producer import TaskMessage
+from app.shared.rabbitmq.producer import RabbitMQProducerManager
+
+
+def _manager(side_effect=None) -> RabbitMQProducerManager:
+    config = SimpleNamespace(task_exchange="tasks", task_routing_key="shared.tasks")
+    manager = RabbitMQProducerManager(config=config)
+    manager.is_running = True
+    manager.connection = SimpleNamespace(is_open=True)
+    manager.channel = MagicMock(is_open=True)
+    manager.channel.basic_publish.side_effect = side_effect
+    return manager
+
+
+def _message() -> TaskMessage:
+    return TaskMessage(task_id="task-1", task_type="execution", task_data={"action": "create"})
+
+
+def _published(manager) -> list[tuple[str, bool]]:
+    return [
+        (call.kwargs["routing_key"], call.kwargs["mandatory"])
+        for call in manager.channel.basic_publish.call_args_list
+    ]
+
+
+def test_agent_routing_key_is_published_mandatory():
+    manager = _manager()
+
+    assert manager.send_task(_message(), routing_key="agent-a.tasks") is True
+    assert _published(manager) == [("agent-a.tasks", True)]
+
+
+def test_unroutable_agent_message_falls_back_to_shared_queue():
+    manager = _manager(side_effect=[UnroutableError([]), None])
+
+    assert manager.send_task(_message(), routing_key="agent-gone.tasks") is True
+    assert _published(manager) == [("agent-gone.tasks", True), ("shared.tasks", False)]
+
+
+def test_shared_queue_is_not_published_mandatory():
+    manager = _manager()
+
+    assert manager.send_task(_message()) is True
+    assert _published(manager) == [("shared.tasks", False)]
@@ -0,0 +1,47 @@
+"""启动耗时报告单元测试。"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.shared.core import startup_timing
+
+
+async def _ok(value: str) -> str:
+    await asyncio.sleep(0)
+    return value
+
+
+async def _boom() -> None:
+    raise RuntimeError("down")
+
+
+async def test_startup_report_records_concurrent_and_optional_steps() -> None:
+    report = startup_timing.begin_startup_report("api")
+
+    results = await asyncio.gather(
+        report.step("a", _ok("A")),
+        report.step("b", _boom(), required=False),
+    )
+    report.note("index_sync", "unchanged")
+    report.finish()
+
+    assert results == ["A", None]
+    payload = startup_timing.get_startup_report()
+    assert payload["service"] == "api"
+    assert payload["details"] == {"index_sync": "unchanged"}
+    assert payload["total_ms"] is not None
+    steps = {item["name"]: item for item in payload["steps"]}
+    assert steps["a"]["status"] == startup_timing.STEP_OK
+    assert steps["b"]["status"] == startup_timing.STEP_FAILED
+    assert steps["b"]["error"] == "down"
+
+
+async def test_required_step_failure_is_recorded_and_raised() -> None:
+    report = startup_timing.StartupReport(service="kafka_worker")
+
+    with pytest.raises(RuntimeError):
+        await report.step("mongo_ping", _boom())
+
+    assert [item.status for item in report.steps] == [startup_timing.STEP_FAILED]
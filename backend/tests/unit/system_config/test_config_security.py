@@ -1,6 +1,9 @@
 """System configuration ownership and strict-source tests."""
 from __future__ import annotations
 
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
 import pytest
 
 import app.modules.system_config.service.config_service as service_mod
@@ -9,6 +12,7 @@ from app.modules.system_config.constants.ai_analysis import (
     AI_PENDING_TASKS_USER_PROMPT_TEMPLATE_CONFIG_KEY,
 )
 from app.modules.system_config.service.config_service import ConfigService
+from app.modules.system_config.service.config_snapshot import ConfigSnapshotStore
 
 
 def test_runtime_allowlist_includes_infrastructure_and_excludes_bootstrap() -> None:
@@ -48,10 +52,16 @@ async def test_get_config_rejects_missing_database_value(monkeypatch):
         config_key: str = "config_key"
 
         @staticmethod
-        async def find_one(_query):
-            return None
+        def find(_query):
+            return SimpleNamespace(to_list=AsyncMock(return_value=[]))
 
     monkeypatch.setattr(service_mod, "SystemConfigDoc", _FakeConfigDoc)
+    monkeypatch.setattr(
+        service_mod,
+        "SystemConfigVersionDoc",
+        SimpleNamespace(scope="scope", find_one=AsyncMock(return_value=None)),
+    )
+    ConfigSnapshotStore.reset()
 
     with pytest.raises(RuntimeError, match="运行配置缺失"):
         await ConfigService.get_config("kafka.bootstrap_servers")
@@ -65,7 +75,7 @@ def test_startup_default_seeding_is_removed() -> None:
 def test_runtime_config_descriptions_are_chinese() -> None:
     descriptions = [item["description"] for item in ConfigService.RUNTIME_CONFIGS]
 
-    assert len(descriptions) == 72
+    assert len(descriptions) == 74
     assert all(any("\u4e00" <= char <= "\u9fff" for char in value) for value in descriptions)
 
 
@@ -0,0 +1,120 @@
+"""Runtime configuration snapshot tests."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import app.modules.system_config.service.config_service as service_mod
+from app.modules.system_config.service.config_service import ConfigService
+from app.modules.system_config.service.config_snapshot import (
+    ConfigSnapshotStore,
+    build_config_changed_message,
+    handle_config_event,
+)
+
+
+class _FakeConfigDocs:
+    config_key: str = "config_key"
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.find_calls = 0
+
+    def find(self, _query):
+        self.find_calls += 1
+        return SimpleNamespace(to_list=AsyncMock(return_value=list(self.docs)))
+
+
+def _doc(key: str, value: str, config_type: str) -> SimpleNamespace:
+    return SimpleNamespace(config_key=key, config_value=value, config_type=config_type)
+
+
+@pytest.fixture
+def snapshot_env(monkeypatch):
+    ticks = [0.0]
+    version = SimpleNamespace(version=1)
+    config_docs = _FakeConfigDocs([
+        _doc("ai.model", "qwen", "string"),
+        _doc("ai.timeout", "60", "integer"),
+        _doc("execution.scheduler_interval_sec", "oops", "integer"),
+        _doc("minio.bucket", "1", "integer"),
+    ])
+    version_docs = SimpleNamespace(scope="scope", find_one=AsyncMock(side_effect=lambda _query: version))
+    monkeypatch.setattr(service_mod, "SystemConfigDoc", config_docs)
+    monkeypatch.setattr(service_mod, "SystemConfigVersionDoc", version_docs)
+    monkeypatch.setattr(ConfigSnapshotStore, "_clock", staticmethod(lambda: ticks[0]))
+    ConfigSnapshotStore.reset()
+    yield SimpleNamespace(ticks=ticks, version=version, config_docs=config_docs, version_docs=version_docs)
+    ConfigSnapshotStore.reset()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_one_snapshot(snapshot_env):
+    assert await ConfigService.get_config("ai.model") == "qwen"
+    assert await ConfigService.get_config("ai.timeout") == 60
+    assert await ConfigService.get_config("ai.model") == "qwen"
+
+    assert snapshot_env.config_docs.find_calls == 1
+    assert snapshot_env.version_docs.find_one.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_and_missing_values_raise_per_key(snapshot_env):
+    with pytest.raises(RuntimeError, match="无法解析"):
+        await ConfigService.get_config("execution.scheduler_interval_sec")
+    with pytest.raises(RuntimeError, match="类型错误"):
+        await ConfigService.get_config("minio.bucket")
+    with pytest.raises(RuntimeError, match="缺失"):
+        await ConfigService.get_config("ai.base_url")
+    # 单个坏配置不影响同一快照中的其他配置
+    assert await ConfigService.get_config("ai.model") == "qwen"
+
+
+@pytest.mark.asyncio
+async def test_newer_version_triggers_reload_and_expiry_only_revalidates(snapshot_env):
+    await ConfigService.get_config("ai.model")
+
+    snapshot_env.ticks[0] = 31.0
+    await ConfigService.get_config("ai.model")
+    assert snapshot_env.version_docs.find_one.await_count == 2
+    assert snapshot_env.config_docs.find_calls == 1
+
+    snapshot_env.version.version = 2
+    handle_config_event(build_config_changed_message(2, ["ai.model"]))
+    snapshot_env.config_docs.docs[0] = _doc("ai.model", "deepseek", "string")
+
+    assert await ConfigService.get_config("ai.model") == "deepseek"
+    assert snapshot_env.config_docs.find_calls == 2
+
+
+def test_config_event_handler_ignores_unrelated_messages():
+    ConfigSnapshotStore.reset()
+
+    handle_config_event("not json")
+    handle_config_event('{"event":"other","version":9}')
+    assert ConfigSnapshotStore.latest_version() == 0
+
+    handle_config_event(build_config_changed_message(3, []))
+    handle_config_event(build_config_changed_message(2, []))
+    assert ConfigSnapshotStore.latest_version() == 3
+    ConfigSnapshotStore.reset()
+
+
+@pytest.mark.asyncio
+async def test_batch_update_announces_one_version(monkeypatch):
+    write = AsyncMock()
+    announce = AsyncMock(return_value=5)
+    monkeypatch.setattr(ConfigService, "_write_config", write)
+    monkeypatch.setattr(ConfigService, "_announce_change", announce)
+
+    count = await ConfigService.batch_update([
+        {"config_key": "ai.model", "config_value": "qwen"},
+        {"config_key": "ai.timeout", "config_value": "30"},
+        {"config_key": "ai.max_tokens"},
+    ])
+
+    assert count == 2
+    assert write.await_count == 2
+    announce.assert_awaited_once_with(["ai.model", "ai.timeout"])
@@ -3,9 +3,12 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
@@ -14,6 +17,7 @@ if str(ROOT) not in sys.path:
 from app.modules.test_specs.service.automation_test_case_service import (  # noqa: E402
     AutomationTestCaseService,
 )
+from app.shared.domain.exceptions import ConflictError  # noqa: E402
 
 
 def asyncio_run(coro):
@@ -111,6 +115,9 @@ class _FakeAutoDoc:
                 elif key == "$or":
                     if not any(_matches(doc, item) for item in value):
                         return False
+                elif isinstance(value, dict) and "$in" in value:
+                    if getattr(doc, key, None) not in value["$in"]:
+                        return False
                 elif isinstance(value, dict) and "$exists" in value:
                     exists = hasattr(doc, key)
                     if exists != value["$exists"]:
@@ -145,6 +152,33 @@ class _FakeAutoDoc:
             docs = [d for d in docs if _matches(d, expr)]
         return _Query(docs)
 
+    @classmethod
+    def get_pymongo_collection(cls):
+        return _FakeCollection(cls)
+
+
+class _FakeCollection:
+    """记录 bulk_write 操作，并把 InsertOne 写回 _FakeAutoDoc.store。"""
+
+    calls: list[list] = []
+    # 依次在 bulk_write 前执行的钩子，返回异常时抛出（模拟并发写入冲突）
+    before_write: list = []
+
+    def __init__(self, doc_cls):
+        self._doc_cls = doc_cls
+
+    async def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        assert ordered is False
+        type(self).calls.append(operations)
+        if type(self).before_write:
+            error = type(self).before_write.pop(0)()
+            if error is not None:
+                raise error
+        for op in operations:
+            if isinstance(op, InsertOne):
+                doc = self._doc_cls(**{k: v for k, v in op._doc.items() if k != "_id"})
+                self._doc_cls.store[doc.auto_case_id] = doc
+
 
 class _FakeTestCaseDoc:
     store: dict[str, "_FakeTestCaseDoc"] = {}
@@ -168,12 +202,24 @@ class _FakeTestCaseDoc:
             return None
         return _coro()
 
+    @classmethod
+    def find(cls, query):
+        case_ids = query["case_id"]["$in"]
+        docs = [
+            doc for doc in cls.store.values()
+            if doc.case_id in case_ids and not getattr(doc, "is_deleted", False)
+        ]
+        return SimpleNamespace(to_list=AsyncMock(return_value=docs))
+
 
 @pytest.fixture(autouse=True)
 def reset_stores():
     _FakeAutoDoc.reset()
     _FakeTestCaseDoc.reset()
-    yield
+    _FakeCollection.calls = []
+    _FakeCollection.before_write = []
+    with patch.object(AutomationTestCaseService, "_to_mongo", staticmethod(lambda doc: dict(vars(doc)))):
+        yield
     _FakeAutoDoc.reset()
     _FakeTestCaseDoc.reset()
 
@@ -364,7 +410,7 @@ def test_report_metadata_new_case():
     }
     with patch(f"{SERVICE}.AutomationTestCaseDoc", _FakeAutoDoc), \
          patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc), \
-         patch.object(service, "_generate_auto_case_id", AsyncMock(return_value="ATC-NEW")):
+         patch.object(service, "_generate_auto_case_ids", AsyncMock(return_value=["ATC-NEW"])):
         result = asyncio_run(service.report_automation_test_case_metadata(payload))
     assert result["total_cases"] == 1
     assert result["saved_count"] == 1
@@ -385,30 +431,145 @@ def test_report_metadata_updates_existing():
     assert _FakeAutoDoc.store["ATC-001"].framework == "new-fw"
 
 
-# ══════════════════════════════════════════════
-#  Tests: _try_link_test_case
-# ══════════════════════════════════════════════
+def _git_case(case_id: str, commit_id: str, **overrides) -> dict:
+    case = {
+        "linked_manual_case_id": case_id,
+        "framework": "pytest",
+        "git_snapshot": {"commit_id": commit_id, "commit_short_id": commit_id[:7]},
+        "param_spec": [{"name": "loops", "type": "int", "default": 1}],
+    }
+    case.update(overrides)
+    return case
 
-def test_try_link_test_case_no_manual_id():
+
+def test_report_metadata_batches_ids_links_and_writes():
+    _make_auto("ATC-001", linked_manual_case_id="TC-001", framework="old-fw")
+    _FakeTestCaseDoc.store["TC-002"] = _FakeTestCaseDoc(case_id="TC-002", is_deleted=False)
     service = AutomationTestCaseService()
-    doc = _FakeAutoDoc(auto_case_id="ATC-001", linked_manual_case_id=None)
-    result = asyncio_run(service._try_link_test_case(doc, {}))
-    assert result["linked"] is False
+    payload = {
+        "cases": [
+            _git_case("TC-001", "a" * 40),
+            _git_case("TC-002", "a" * 40),
+            _git_case("TC-003", "a" * 40),
+        ],
+    }
+    with patch(f"{SERVICE}.AutomationTestCaseDoc", _FakeAutoDoc), \
+         patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc), \
+         patch(f"{SERVICE}.SequenceIdService") as mock_seq:
+        mock_seq.return_value.next_many = AsyncMock(return_value=range(7, 9))
+        result = asyncio_run(service.report_automation_test_case_metadata(payload))
+
+    mock_seq.return_value.next_many.assert_awaited_once()
+    assert mock_seq.return_value.next_many.await_args.args[1] == 2
+    assert len(_FakeCollection.calls) == 1
+    operations = _FakeCollection.calls[0]
+    assert [type(op) for op in operations] == [UpdateOne, InsertOne, InsertOne]
+    assert operations[0]._doc["$set"]["framework"] == "pytest"
+    auto_case_ids = [case["auto_case_id"] for case in result["cases"]]
+    assert auto_case_ids[0] == "ATC-001"
+    assert [auto_case_id[-5:] for auto_case_id in auto_case_ids[1:]] == ["00007", "00008"]
+    assert result["saved_count"] == 3
+    assert result["linked_count"] == 1
+    assert [case["linked"] for case in result["cases"]] == [False, True, False]
+
+
+def test_report_metadata_skips_unchanged_fingerprint():
+    service = AutomationTestCaseService()
+    payload = {"cases": [_git_case("TC-001", "b" * 40)]}
+    with patch(f"{SERVICE}.AutomationTestCaseDoc", _FakeAutoDoc), \
+         patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc), \
+         patch.object(service, "_generate_auto_case_ids", AsyncMock(return_value=["ATC-NEW"])):
+        asyncio_run(service.report_automation_test_case_metadata(payload))
+        unchanged = asyncio_run(service.report_automation_test_case_metadata(payload))
+        payload["cases"][0]["param_spec"][0]["default"] = 2
+        changed = asyncio_run(service.report_automation_test_case_metadata(payload))
 
+    assert unchanged["saved_count"] == 0
+    assert unchanged["unchanged_count"] == 1
+    assert unchanged["cases"][0]["unchanged"] is True
+    assert changed["saved_count"] == 1
+    assert len(_FakeCollection.calls) == 2
 
-def test_try_link_test_case_found():
-    _FakeTestCaseDoc.store["TC-001"] = _FakeTestCaseDoc(case_id="TC-001", is_deleted=False)
+
+def _duplicate_key_error(index: int) -> BulkWriteError:
+    error = {"index": index, "code": 11000, "errmsg": "E11000 duplicate key"}
+    return BulkWriteError({"writeErrors": [error]})
+
+
+def test_report_metadata_updates_rows_inserted_concurrently():
+    def _concurrent_insert():
+        _make_auto("ATC-OTHER", linked_manual_case_id="TC-001", framework="old-fw")
+        return _duplicate_key_error(0)
+
+    _FakeCollection.before_write = [_concurrent_insert]
     service = AutomationTestCaseService()
-    doc = _FakeAutoDoc(auto_case_id="ATC-001", linked_manual_case_id="TC-001")
-    with patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc):
-        result = asyncio_run(service._try_link_test_case(doc, {}))
-    assert result["linked"] is True
-    assert result["linked_case_id"] == "TC-001"
+    payload = {"cases": [_git_case("TC-001", "d" * 40)]}
+    with patch(f"{SERVICE}.AutomationTestCaseDoc", _FakeAutoDoc), \
+         patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc), \
+         patch.object(service, "_generate_auto_case_ids", AsyncMock(return_value=["ATC-NEW"])):
+        result = asyncio_run(service.report_automation_test_case_metadata(payload))
 
+    retry = _FakeCollection.calls[1]
+    assert [type(op) for op in retry] == [UpdateOne]
+    assert retry[0]._doc["$set"]["framework"] == "pytest"
+    assert result["cases"][0]["auto_case_id"] == "ATC-OTHER"
+    assert "ATC-NEW" not in _FakeAutoDoc.store
 
-def test_try_link_test_case_not_found():
+
+def test_report_metadata_raises_conflict_when_duplicate_cannot_be_resolved():
+    _FakeCollection.before_write = [lambda: _duplicate_key_error(0)]
     service = AutomationTestCaseService()
-    doc = _FakeAutoDoc(auto_case_id="ATC-001", linked_manual_case_id="TC-MISSING")
-    with patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc):
-        result = asyncio_run(service._try_link_test_case(doc, {}))
-    assert result["linked"] is False
+    payload = {"cases": [_git_case("TC-001", "d" * 40)]}
+    with patch(f"{SERVICE}.AutomationTestCaseDoc", _FakeAutoDoc), \
+         patch(f"{SERVICE}.TestCaseDoc", _FakeTestCaseDoc), \
+         patch.object(service, "_generate_auto_case_ids", AsyncMock(return_value=["ATC-NEW"])):
+        with pytest.raises(ConflictError, match="TC-001"):
+            asyncio_run(service.report_automation_test_case_metadata(payload))
+
+
+def test_report_fingerprint_requires_commit_id():
+    with_commit = AutomationTestCaseService._build_report_doc_data("TC-001", _git_case("TC-001", "c" * 40))
+    without_commit = AutomationTestCaseService._build_report_doc_data("TC-001", {"framework": "pytest"})
+
+    assert AutomationTestCaseService._report_fingerprint(with_commit)
+    assert AutomationTestCaseService._report_fingerprint(without_commit) is None
+
+
+def test_build_link_result():
+    assert AutomationTestCaseService._build_link_result("TC-001", {"TC-001"})["linked_case_id"] == "TC-001"
+    assert AutomationTestCaseService._build_link_result("TC-002", {"TC-001"})["linked"] is False
+    assert AutomationTestCaseService._build_link_result(None, set())["linked"] is False
+
+
+def test_report_job_runs_in_background():
+    service = AutomationTestCaseService()
+    jobs: dict[str, SimpleNamespace] = {}
+
+    class _FakeJobDoc(SimpleNamespace):
+        def __init__(self, **payload):
+            super().__init__(id="job-1", status="PENDING", result=None, error=None, **payload)
+
+        async def insert(self):
+            jobs[self.report_id] = self
+
+        async def save(self):
+            jobs[self.report_id] = self
+
+        def model_dump(self):
+            return dict(vars(self))
+
+    report = AsyncMock(return_value={"total_cases": 1, "saved_count": 1, "cases": [{}]})
+
+    async def _run():
+        with patch(f"{SERVICE}.AutomationReportJobDoc", _FakeJobDoc), \
+             patch.object(service, "report_automation_test_case_metadata", report):
+            job = await service.submit_report_job({"cases": [{"linked_manual_case_id": "TC-001"}]})
+            assert job["status"] == "PENDING"
+            import asyncio
+            await asyncio.sleep(0)
+            return job["report_id"]
+
+    report_id = asyncio_run(_run())
+    assert jobs[report_id].status == "SUCCEEDED"
+    assert jobs[report_id].result == {"total_cases": 1, "saved_count": 1}
+    assert jobs[report_id].finished_at is not None
@@ -0,0 +1,207 @@
+"""批量创建测试用例单元测试 — 编号一次预留、分块事务、逐行结果"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.test_specs.application import BatchCreateTestCasesCommand, TestCaseCommandService
+from app.modules.test_specs.service import test_case_service as service_module
+from app.modules.test_specs.service.test_case_service import TestCaseService
+
+SUPPORT = "app.modules.test_specs.service._service_support"
+SERVICE = "app.modules.test_specs.service.test_case_service"
+
+
+class _FakeDoc(SimpleNamespace):
+    """替代 Beanie 文档：只校验必填字段，批量写入记录到 inserted。"""
+
+    required: tuple[str, ...] = ()
+    inserted: list = []
+
+    def __init__(self, **payload):
+        missing = [field for field in self.required if not payload.get(field)]
+        if missing:
+            raise ValueError(f"{missing[0]}: Field required")
+        super().__init__(**payload)
+
+    def __getattr__(self, name):
+        return None
+
+    def model_dump(self):
+        return dict(vars(self))
+
+    @classmethod
+    async def insert_many(cls, docs, session=None):
+        cls.inserted.extend(docs)
+
+
+class _FakeCaseDoc(_FakeDoc):
+    required = ("title", "lab_id", "catalog_path")
+    inserted: list = []
+
+
+class _FakeChangeLogDoc(_FakeDoc):
+    inserted: list = []
+
+
+class _FakeRequirementDoc:
+    @classmethod
+    def find(cls, query, session=None):
+        return SimpleNamespace(to_list=AsyncMock(return_value=[
+            SimpleNamespace(req_id="TR-2026-00001", workflow_item_id="wf-req-1"),
+        ]))
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def start_transaction(self):
+        return self
+
+
+@contextmanager
+def _patched_persistence(next_seq=range(21, 30)):
+    for doc_cls in (_FakeCaseDoc, _FakeChangeLogDoc):
+        doc_cls.inserted = []
+    labs = [
+        SimpleNamespace(lab_id="LAB-BIOS", is_active=True),
+        SimpleNamespace(lab_id="LAB-OLD", is_active=False),
+    ]
+    lab_doc = MagicMock()
+    lab_doc.find.return_value.to_list = AsyncMock(return_value=labs)
+    sequence = MagicMock()
+    sequence.return_value.next_many = AsyncMock(return_value=next_seq)
+    refresh = MagicMock()
+    with patch(f"{SERVICE}.TestCaseDoc", _FakeCaseDoc), \
+         patch(f"{SERVICE}.TestRequirementDoc", _FakeRequirementDoc), \
+         patch(f"{SUPPORT}.TestCaseDoc", _FakeCaseDoc), \
+         patch(f"{SUPPORT}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch(f"{SERVICE}.TestLabDoc", lab_doc), \
+         patch(f"{SERVICE}.SequenceIdService", sequence), \
+         patch(f"{SERVICE}.schedule_search_refresh", refresh), \
+         patch(f"{SERVICE}.get_mongo_client", return_value=SimpleNamespace(start_session=_FakeSession)):
+        yield SimpleNamespace(sequence=sequence, refresh=refresh)
+
+
+def _service(item_ids):
+    gateway = MagicMock()
+    gateway.create_work_items = AsyncMock(side_effect=lambda items, session=None: item_ids[:len(items)])
+    catalog = MagicMock()
+    catalog.normalize_path_segments.side_effect = lambda path: [segment.lower() for segment in path]
+    catalog.build_path_key.side_effect = lambda path: "/".join(path)
+    catalog.register_paths_bulk = AsyncMock()
+    backfill = MagicMock()
+    service = TestCaseService(workflow_gateway=gateway, catalog_service=catalog, backfill_queue=backfill)
+    return service, gateway, catalog, backfill
+
+
+def _item(title, **overrides):
+    values = {"title": title, "lab_id": "LAB-BIOS", "catalog_path": ["BIOS", "Boot"], "owner_id": "u-owner"}
+    values.update(overrides)
+    return values
+
+
+async def test_create_test_cases_reserves_ids_once_and_bulk_writes_each_chunk():
+    service, gateway, catalog, backfill = _service(["wf-1", "wf-2"])
+
+    with _patched_persistence() as patched:
+        results = await service.create_test_cases(
+            [_item("开机自检", ref_req_id="TR-2026-00001"), _item("热重启")],
+            operator_id="u-actor",
+        )
+
+    patched.sequence.return_value.next_many.assert_awaited_once()
+    assert patched.sequence.return_value.next_many.await_args.args[1] == 2
+    assert [row["success"] for row in results] == [True, True]
+    assert [row["case_id"][-5:] for row in results] == ["00021", "00022"]
+    assert results[0]["data"]["status"] == "DEVELOPING"
+    assert results[0]["data"]["catalog_path_key"] == "bios/boot"
+
+    work_items = gateway.create_work_items.await_args.args[0]
+    assert work_items[0]["parent_item_id"] == "wf-req-1"
+    assert work_items[1]["parent_item_id"] is None
+    assert {item["initial_state"] for item in work_items} == {"DEVELOPING"}
+    assert [doc.workflow_item_id for doc in _FakeCaseDoc.inserted] == ["wf-1", "wf-2"]
+
+    logs = _FakeChangeLogDoc.inserted
+    assert [(log.action, log.revision_no, log.operator_id) for log in logs] == [("CREATE", 1, "u-actor")] * 2
+    catalog.register_paths_bulk.assert_awaited_once()
+    backfill.enqueue.assert_called_once_with("test_case", [row["case_id"] for row in results])
+    patched.refresh.assert_any_call("work_item", ["wf-1", "wf-2"])
+
+
+async def test_create_test_cases_reports_row_errors_in_input_order():
+    service, gateway, _, _ = _service(["wf-1", None])
+
+    with _patched_persistence():
+        results = await service.create_test_cases([
+            _item("缺少目录", catalog_path=[]),
+            _item("停用 Lab", lab_id="LAB-OLD"),
+            _item("未知 Lab", lab_id="LAB-NONE"),
+            _item("需求不存在", ref_req_id="TR-2026-09999"),
+            _item("正常用例"),
+            _item("重复标题"),
+        ])
+
+    assert [row["index"] for row in results] == list(range(6))
+    assert [row["error"] for row in results] == [
+        "lab_id 与 catalog_path 为必填项",
+        "Lab LAB-OLD 未启用",
+        "Lab ID=LAB-NONE 不存在",
+        "requirement not found",
+        None,
+        "已存在相同标题的TEST_CASE: 重复标题",
+    ]
+    assert [row["success"] for row in results] == [False, False, False, False, True, False]
+    assert len(gateway.create_work_items.await_args.args[0]) == 2
+    assert [doc.title for doc in _FakeCaseDoc.inserted] == ["正常用例"]
+
+
+async def test_create_test_cases_marks_whole_chunk_failed_when_transaction_fails(monkeypatch):
+    monkeypatch.setattr(service_module, "BATCH_CREATE_CHUNK_SIZE", 1)
+    service, gateway, _, backfill = _service(["wf-1"])
+    gateway.create_work_items = AsyncMock(side_effect=[RuntimeError("write conflict"), ["wf-2"]])
+
+    with _patched_persistence():
+        results = await service.create_test_cases([_item("第一块"), _item("第二块")])
+
+    assert results[0]["success"] is False
+    assert results[0]["error"] == "write conflict"
+    assert results[1]["success"] is True
+    assert [doc.title for doc in _FakeCaseDoc.inserted] == ["第二块"]
+    backfill.enqueue.assert_called_once_with("test_case", [results[1]["case_id"]])
+
+
+async def test_create_test_cases_requires_mongo_client():
+    service, _, _, _ = _service([])
+
+    with patch(f"{SERVICE}.get_mongo_client", side_effect=RuntimeError("not initialized")):
+        with pytest.raises(RuntimeError, match="MongoDB客户端未初始化"):
+            await service.create_test_cases([_item("用例")])
+
+
+async def test_command_service_defaults_owner_to_actor():
+    case_service = MagicMock()
+    case_service.create_test_cases = AsyncMock(return_value=[])
+    command_service = TestCaseCommandService(
+        test_case_service=case_service,
+        requirement_service=MagicMock(),
+        workflow_command_service=MagicMock(),
+        change_log_service=MagicMock(),
+    )
+    context = SimpleNamespace(actor_id="u-actor")
+    items = [{"title": "a", "owner_id": None}, {"title": "b", "owner_id": "u-other"}]
+
+    await command_service.create_test_cases(context, BatchCreateTestCasesCommand(items=items))
+
+    sent, kwargs = case_service.create_test_cases.await_args
+    assert [item["owner_id"] for item in sent[0]] == ["u-actor", "u-other"]
+    assert kwargs == {"operator_id": "u-actor"}
+    assert items[0]["owner_id"] is None
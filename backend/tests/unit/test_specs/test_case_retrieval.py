@@ -0,0 +1,127 @@
+"""AI 用例检索阶段测试：向量排序、字段投影与 token 预算。"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.modules.test_specs.application import case_retrieval
+from app.modules.test_specs.application.case_retrieval import rank_case_ids, retrieve_relevant_cases
+from app.shared.ai.token_budget import estimate_tokens, take_within_budget
+
+
+def _vector(case_id: str, embedding: list[float] | None) -> SimpleNamespace:
+    return SimpleNamespace(case_id=case_id, embedding=embedding)
+
+
+def test_rank_case_ids_orders_by_similarity_and_keeps_unembedded_last() -> None:
+    vectors = [
+        _vector("TC-far", [0.0, 1.0]),
+        _vector("TC-new", None),
+        _vector("TC-near", [1.0, 0.1]),
+        _vector("TC-wrong-dim", [1.0, 0.0, 0.0]),
+    ]
+
+    ranked, strategy = rank_case_ids([1.0, 0.0], vectors, top_k=3)
+
+    assert strategy == "semantic"
+    assert ranked == ["TC-near", "TC-far", "TC-new"]
+
+
+def test_numpy_similarity_scores_match_pure_python_cosine() -> None:
+    pytest.importorskip("numpy")
+    embeddings = [[1.0, 0.0], [0.0, 0.0], [3.0, 4.0]]
+    expected = [case_retrieval.cosine_similarity([1.0, 1.0], embedding) for embedding in embeddings]
+
+    assert case_retrieval._similarity_scores([1.0, 1.0], embeddings) == pytest.approx(expected)
+
+
+def test_rank_case_ids_falls_back_without_query_vector() -> None:
+    vectors = [_vector(f"TC-{i}", [1.0]) for i in range(5)]
+
+    ranked, strategy = rank_case_ids(None, vectors, top_k=2)
+
+    assert (ranked, strategy) == (["TC-0", "TC-1"], "fallback")
+
+
+def test_take_within_budget_keeps_prefix() -> None:
+    items = ["用例" * 10, "a" * 8, "b" * 400]
+
+    kept, used = take_within_budget(items, 25, lambda item: item)
+
+    assert kept == items[:2]
+    assert used == estimate_tokens(items[0]) + estimate_tokens(items[1]) == 22
+
+
+def _patch_candidates(monkeypatch, rows: list[dict], prompt_views: list, batch_size: int = 2) -> dict:
+    """候选按 batch_size 分批流出，第二次查询返回 prompt 投影。"""
+    captured: dict = {"batches": 0, "prompt_queries": []}
+
+    async def _fake_chunks(collection, query, **kwargs):
+        captured["vector_query"] = (query, kwargs)
+        for start in range(0, len(rows), batch_size):
+            captured["batches"] += 1
+            yield rows[start:start + batch_size]
+
+    def _find(query):
+        captured["prompt_queries"].append(query)
+        cursor = MagicMock()
+
+        def _project(model):
+            captured["prompt_model"] = model.__name__
+            cursor.to_list = AsyncMock(return_value=prompt_views)
+            return cursor
+
+        cursor.project = _project
+        return cursor
+
+    fake_doc = SimpleNamespace(find=_find, get_pymongo_collection=MagicMock())
+    monkeypatch.setattr(case_retrieval, "TestCaseDoc", fake_doc)
+    monkeypatch.setattr(case_retrieval, "iter_cursor_chunks", _fake_chunks)
+    return captured
+
+
+def _prompt_view(case_id: str, title: str = "标题") -> SimpleNamespace:
+    return SimpleNamespace(case_id=case_id, title=title, priority=None, test_category="", tags=[])
+
+
+async def test_retrieve_projects_fields_and_enforces_budget(monkeypatch) -> None:
+    rows = [{"case_id": f"TC-{i}", "embedding": [1.0, float(i)]} for i in range(4)]
+    prompt_views = [_prompt_view(f"TC-{i}", "标题" * 20) for i in range(4)]
+    captured = _patch_candidates(monkeypatch, rows, prompt_views)
+    monkeypatch.setattr(case_retrieval.EmbeddingService, "embed_text", AsyncMock(return_value=[0.0, 1.0]))
+
+    result = await retrieve_relevant_cases(
+        "变更",
+        case_ids=["TC-0", "TC-1", "TC-2", "TC-3"],
+        top_k=3,
+        token_budget=130,
+    )
+
+    query, kwargs = captured["vector_query"]
+    assert query == {"is_deleted": False, "case_id": {"$in": ["TC-0", "TC-1", "TC-2", "TC-3"]}}
+    assert kwargs["projection"] == {"case_id": 1, "embedding": 1, "_id": 0}
+    assert kwargs["chunk_size"] == case_retrieval.SCORING_BATCH_SIZE
+    assert captured["prompt_queries"][0]["case_id"] == {"$in": ["TC-3", "TC-2", "TC-1"]}
+    assert captured["prompt_model"] == "_CasePromptView"
+    assert result.strategy == "semantic"
+    assert result.candidate_count == 4
+    # 每条约 61 token，预算 130 只能放下两条，且按相关度截断
+    assert [item["case_id"] for item in result.cases] == ["TC-3", "TC-2"]
+    assert result.cases[0]["priority"] == "P2"
+    assert result.prompt_tokens <= 130
+
+
+async def test_retrieve_scores_every_batch_without_truncation(monkeypatch) -> None:
+    # 最相关的用例位于最后一批（最早创建），分批打分后仍应排在首位
+    rows = [{"case_id": f"TC-{i}", "embedding": [1.0, 0.0]} for i in range(6)]
+    rows.append({"case_id": "TC-oldest", "embedding": [0.0, 1.0]})
+    captured = _patch_candidates(monkeypatch, rows, [_prompt_view("TC-oldest"), _prompt_view("TC-0")])
+
+    result = await retrieve_relevant_cases("变更", query_vector=[0.0, 1.0], top_k=2)
+
+    assert captured["batches"] == 4
+    assert captured["prompt_queries"][0]["case_id"] == {"$in": ["TC-oldest", "TC-0"]}
+    assert [item["case_id"] for item in result.cases] == ["TC-oldest", "TC-0"]
+    assert result.candidate_count == 7
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -226,6 +226,29 @@ def test_register_path_noop_when_delta_zero():
     assert len(_FakeCatalogSegmentDoc.store) == 0
 
 
+def test_register_paths_bulk_merges_deltas_into_one_bulk_write():
+    service = CatalogService()
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock()
+    segment_doc = MagicMock()
+    segment_doc.get_pymongo_collection.return_value = collection
+    with patch(f"{SERVICE}.TestCatalogSegmentDoc", segment_doc):
+        written = asyncio_run(service.register_paths_bulk(
+            [("LAB-BIOS", ["BIOS", "memory"]), ("LAB-BIOS", ["bios", "cpu"]), ("LAB-BMC", ["bmc"])],
+            session="session",
+        ))
+
+    assert written == 4
+    operations = collection.bulk_write.await_args.args[0]
+    increments = {
+        (op._filter["lab_id"], tuple(op._filter["parent_path"]), op._filter["segment_name"]): op._doc["$inc"]
+        for op in operations
+    }
+    assert increments[("LAB-BIOS", (), "bios")] == {"usage_count": 2}
+    assert increments[("LAB-BIOS", ("bios",), "memory")] == {"usage_count": 1}
+    assert collection.bulk_write.await_args.kwargs["session"] == "session"
+
+
 def test_adjust_path_on_update_no_change():
     service = CatalogService()
     with patch(f"{SERVICE}.TestCatalogSegmentDoc", _FakeCatalogSegmentDoc):
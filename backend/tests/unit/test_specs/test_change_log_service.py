@@ -3,14 +3,16 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from pymongo.errors import DuplicateKeyError
 
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.modules.test_specs.service import change_log_service as change_log_module  # noqa: E402
 from app.modules.test_specs.service.change_log_service import TestCaseChangeLogService  # noqa: E402
 
 
@@ -48,6 +50,10 @@ class _FakeChangeLogDoc:
             setattr(self, k, v)
 
     async def insert(self) -> None:
+        # 模拟 (case_id, revision_no) 唯一索引
+        for doc in self.__class__.store.values():
+            if (doc.case_id, doc.revision_no) == (self.case_id, self.revision_no):
+                raise DuplicateKeyError("E11000 duplicate key error")
         self.__class__.store[self.id] = self
 
     @classmethod
@@ -94,8 +100,12 @@ class _FakeUserDoc:
         for k, v in payload.items():
             setattr(self, k, v)
 
+    queries = 0
+
     @classmethod
     def find(cls, query=None):
+        cls.queries += 1
+
         class _Query:
             async def to_list(self):
                 if isinstance(query, dict) and "$in" in query.get("user_id", {}):
@@ -107,6 +117,7 @@ class _FakeUserDoc:
     @classmethod
     def reset(cls):
         cls.store = {}
+        cls.queries = 0
 
 
 @pytest.fixture(autouse=True)
@@ -119,6 +130,7 @@ def reset_stores():
 
 
 SERVICE_MODULE = "app.modules.test_specs.service.change_log_service"
+USER_DOC = "app.modules.auth.repository.models.UserDoc"
 
 
 def asyncio_run(coro):
@@ -154,7 +166,7 @@ def test_append_creates_log_entry():
     old = {"title": "Old"}
     new = {"title": "New"}
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "UPDATE", old, new))
     assert len(_FakeChangeLogDoc.store) == 1
 
@@ -165,7 +177,7 @@ def test_append_no_changes_skips():
     old = {"title": "Same"}
     new = {"title": "Same"}
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "UPDATE", old, new))
     assert len(_FakeChangeLogDoc.store) == 0
 
@@ -176,7 +188,7 @@ def test_append_no_changes_but_has_remark():
     old = {"title": "Same"}
     new = {"title": "Same"}
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "UPDATE", old, new, remark="手工修正"))
     assert len(_FakeChangeLogDoc.store) == 1
 
@@ -185,7 +197,7 @@ def test_append_delete_action_always_writes():
     """DELETE 操作即使没有变更也应写入"""
     service = TestCaseChangeLogService()
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "DELETE", None, {}))
     assert len(_FakeChangeLogDoc.store) == 1
 
@@ -196,7 +208,7 @@ def test_append_extra_changes_appended():
     new = {"title": "New"}
     extra = [{"field": "custom", "old_value": "a", "new_value": "b"}]
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "UPDATE", old, new, extra_changes=extra))
     assert len(_FakeChangeLogDoc.store) == 1
 
@@ -207,12 +219,34 @@ def test_append_next_revision_no():
     old = {"title": "v1"}
     new = {"title": "v2"}
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         asyncio_run(service.append("TC-001", "u-1", "UPDATE", old, new))
     log = list(_FakeChangeLogDoc.store.values())[0]
     assert log.revision_no == 1
 
 
+def test_append_retries_when_revision_taken_concurrently():
+    """并发写入抢先占用版本号时，重新取号后写入"""
+    service = TestCaseChangeLogService()
+    _FakeChangeLogDoc.store["other"] = _FakeChangeLogDoc(case_id="TC-001", revision_no=3)
+    with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch.object(service, "_next_revision_no", AsyncMock(side_effect=[3, 4])):
+        asyncio_run(service.append("TC-001", "u-1", "UPDATE", {"title": "v1"}, {"title": "v2"}))
+    revisions = sorted(doc.revision_no for doc in _FakeChangeLogDoc.store.values())
+    assert revisions == [3, 4]
+
+
+def test_append_gives_up_after_max_retries():
+    service = TestCaseChangeLogService()
+    _FakeChangeLogDoc.store["other"] = _FakeChangeLogDoc(case_id="TC-001", revision_no=1)
+    next_revision = AsyncMock(return_value=1)
+    with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch.object(service, "_next_revision_no", next_revision):
+        with pytest.raises(DuplicateKeyError):
+            asyncio_run(service.append("TC-001", "u-1", "UPDATE", {"title": "v1"}, {"title": "v2"}))
+    assert next_revision.await_count == change_log_module.MAX_REVISION_RETRIES
+
+
 # ══════════════════════════════════════════════
 #  Tests: list_logs
 # ══════════════════════════════════════════════
@@ -220,7 +254,7 @@ def test_append_next_revision_no():
 def test_list_logs_empty():
     service = TestCaseChangeLogService()
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         result = asyncio_run(service.list_logs("TC-001"))
     assert result["total"] == 0
     assert result["items"] == []
@@ -236,7 +270,7 @@ def test_list_logs_with_entries():
     _FakeUserDoc.store["u-1"] = _FakeUserDoc(user_id="u-1", username="张三")
 
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         result = asyncio_run(service.list_logs("TC-001"))
     assert result["total"] == 1
     assert result["items"][0]["operator_name"] == "张三"
@@ -256,6 +290,36 @@ def test_list_logs_filters_by_case_id():
         created_at=__import__("datetime").datetime.now(__import__("datetime").timezone.utc),
     )
     with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
-         patch(f"{SERVICE_MODULE}.UserDoc", _FakeUserDoc):
+         patch(USER_DOC, _FakeUserDoc):
         result = asyncio_run(service.list_logs("TC-001"))
     assert result["total"] == 1
+
+
+def test_list_logs_returns_next_cursor_for_full_page():
+    service = TestCaseChangeLogService()
+    for revision in (1, 2):
+        _FakeChangeLogDoc.store[f"l{revision}"] = _FakeChangeLogDoc(
+            case_id="TC-001", revision_no=revision, action="UPDATE",
+            operator_id="u-1", changes=[], remark=None, created_at=None,
+        )
+    with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch(USER_DOC, _FakeUserDoc):
+        full_page = asyncio_run(service.list_logs("TC-001", limit=2))
+        last_page = asyncio_run(service.list_logs("TC-001", limit=5))
+    assert full_page["next_cursor"]
+    assert last_page["next_cursor"] is None
+
+
+def test_list_logs_caches_operator_names():
+    service = TestCaseChangeLogService()
+    _FakeChangeLogDoc.store["l1"] = _FakeChangeLogDoc(
+        case_id="TC-001", revision_no=1, action="UPDATE",
+        operator_id="u-1", changes=[], remark=None, created_at=None,
+    )
+    _FakeUserDoc.store["u-1"] = _FakeUserDoc(user_id="u-1", username="张三")
+    with patch(f"{SERVICE_MODULE}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch(USER_DOC, _FakeUserDoc):
+        asyncio_run(service.list_logs("TC-001"))
+        result = asyncio_run(service.list_logs("TC-001"))
+    assert result["items"][0]["operator_name"] == "张三"
+    assert _FakeUserDoc.queries == 1
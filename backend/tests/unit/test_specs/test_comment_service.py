@@ -132,7 +132,10 @@ class _FakeCommentDoc:
                 self._sort_steps: list[tuple[str, int]] = []
 
             def sort(self, field, direction=None):
-                if isinstance(field, _FakeExpr):
+                if isinstance(field, list):
+                    # keyset 排序规格 [(field, direction), ("_id", direction)]，按主键排序即可
+                    self._sort_steps.append(field[0])
+                elif isinstance(field, _FakeExpr):
                     field_name = field._field
                     if isinstance(field._value, int) and field._value < 0:
                         self._sort_steps.append((field_name, -1))
@@ -0,0 +1,336 @@
+"""批量导入服务单元测试 — 分块校验、批量写入、进度续传、embedding 批量回填"""
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.test_specs.service import embedding_backfill as backfill_module
+from app.modules.test_specs.service.embedding_backfill import EmbeddingBackfillQueue
+from app.modules.test_specs.service.import_service import SpecImportService
+from app.shared.export import ImportRow
+
+SUPPORT = "app.modules.test_specs.service._service_support"
+SERVICE = "app.modules.test_specs.service.import_service"
+
+
+class _FakeDoc(SimpleNamespace):
+    """替代 Beanie 文档：只校验必填字段，批量写入记录到 inserted。"""
+
+    required: tuple[str, ...] = ()
+    inserted: list = []
+
+    def __init__(self, **payload):
+        missing = [field for field in self.required if not payload.get(field)]
+        if missing:
+            raise ValueError(f"{missing[0]}: Field required")
+        super().__init__(**payload)
+
+    def __getattr__(self, name):
+        return None
+
+    @classmethod
+    async def insert_many(cls, docs, session=None):
+        cls.inserted.extend(docs)
+
+
+class _FakeCaseDoc(_FakeDoc):
+    required = ("title", "lab_id", "catalog_path")
+    inserted: list = []
+
+
+class _FakeRequirementDoc(_FakeDoc):
+    required = ("title", "tpm_owner_id")
+    inserted: list = []
+
+    @classmethod
+    def find(cls, query):
+        return SimpleNamespace(to_list=AsyncMock(return_value=[
+            SimpleNamespace(req_id="TR-2026-00001", workflow_item_id="wf-req-1"),
+        ]))
+
+
+class _FakeChangeLogDoc(_FakeDoc):
+    inserted: list = []
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def start_transaction(self):
+        return _FakeTransaction()
+
+
+def _job(entity_type="test_case", **overrides):
+    values = dict(
+        id="job-oid",
+        job_id="IMP-1",
+        entity_type=entity_type,
+        file_id="file-1",
+        file_format="csv",
+        defaults={"lab_id": "LAB-BIOS", "workflow_item_id": "ignored"},
+        created_by="u-import",
+        status="PENDING",
+        processed_rows=0,
+        created_count=0,
+        failed_count=0,
+        errors=[],
+        error=None,
+        started_at=None,
+        finished_at=None,
+        updated_at=datetime.now(timezone.utc),
+    )
+    values.update(overrides)
+    return SimpleNamespace(save=AsyncMock(), **values)
+
+
+def _steps(action="click") -> str:
+    return json.dumps([{"step_id": "s1", "name": "n", "action": action, "expected": "ok"}])
+
+
+@contextmanager
+def _patched_persistence(next_seq=range(11, 20)):
+    for doc_cls in (_FakeCaseDoc, _FakeRequirementDoc, _FakeChangeLogDoc):
+        doc_cls.inserted = []
+    job_collection = MagicMock()
+    job_collection.update_one = AsyncMock()
+    job_doc = MagicMock()
+    job_doc.get_pymongo_collection.return_value = job_collection
+    labs = [
+        SimpleNamespace(lab_id="LAB-BIOS", is_active=True),
+        SimpleNamespace(lab_id="LAB-OLD", is_active=False),
+    ]
+    lab_doc = MagicMock()
+    lab_doc.find.return_value.to_list = AsyncMock(return_value=labs)
+    sequence = MagicMock()
+    sequence.return_value.next_many = AsyncMock(return_value=next_seq)
+    refresh = MagicMock()
+    with patch(f"{SERVICE}.TestCaseDoc", _FakeCaseDoc), \
+         patch(f"{SERVICE}.TestRequirementDoc", _FakeRequirementDoc), \
+         patch(f"{SUPPORT}.TestCaseDoc", _FakeCaseDoc), \
+         patch(f"{SUPPORT}.TestCaseChangeLogDoc", _FakeChangeLogDoc), \
+         patch(f"{SERVICE}.TestSpecImportJobDoc", job_doc), \
+         patch(f"{SERVICE}.TestLabDoc", lab_doc), \
+         patch(f"{SERVICE}.SequenceIdService", sequence), \
+         patch(f"{SERVICE}.schedule_search_refresh", refresh), \
+         patch(f"{SERVICE}.load_user_names", AsyncMock(return_value={"u-tpm": "Tpm"})), \
+         patch(f"{SERVICE}.get_mongo_client", return_value=SimpleNamespace(start_session=_FakeSession)):
+        yield SimpleNamespace(job_update=job_collection.update_one, sequence=sequence, refresh=refresh)
+
+
+def _service(item_ids):
+    gateway = MagicMock()
+    gateway.create_work_items = AsyncMock(return_value=item_ids)
+    catalog = MagicMock()
+    catalog.normalize_path_segments.side_effect = lambda path: [segment.lower() for segment in path]
+    catalog.build_path_key.side_effect = lambda path: "/".join(path)
+    catalog.register_paths_bulk = AsyncMock()
+    queue = MagicMock()
+    service = SpecImportService(workflow_gateway=gateway, catalog_service=catalog, backfill_queue=queue)
+    return service, gateway, catalog, queue
+
+
+async def test_case_chunk_validates_rows_and_bulk_writes_survivors():
+    service, gateway, catalog, queue = _service(["wf-1", None])
+    job = _job()
+    rows = [
+        ImportRow(1, {"title": "A", "catalog_path": "BIOS/Mem", "ref_req_id": "TR-2026-00001",
+                      "steps": _steps()}),
+        ImportRow(2, {"title": "bad steps", "catalog_path": "bios", "steps": _steps(action=" ")}),
+        ImportRow(3, {"title": "old lab", "lab_id": "LAB-OLD", "catalog_path": "bios"}),
+        ImportRow(4, {}, "JSON 格式错误"),
+        ImportRow(5, {}),
+        ImportRow(6, {"title": "dup", "catalog_path": "bios"}),
+        ImportRow(7, {"catalog_path": "bios", "is_active": "maybe"}),
+    ]
+
+    with _patched_persistence() as env:
+        await service._import_chunk(job, rows)
+
+    work_items = gateway.create_work_items.await_args.args[0]
+    assert [item["title"] for item in work_items] == ["A", "dup"]
+    assert work_items[0]["parent_item_id"] == "wf-req-1"
+    assert work_items[0]["creator_id"] == "u-import"
+    env.sequence.return_value.next_many.assert_awaited_once()
+
+    [case] = _FakeCaseDoc.inserted
+    assert case.case_id == f"TC-{datetime.now().year}-00011"
+    assert (case.workflow_item_id, case.catalog_path_key) == ("wf-1", "bios/mem")
+    [change_log] = _FakeChangeLogDoc.inserted
+    assert (change_log.case_id, change_log.revision_no, change_log.action) == (case.case_id, 1, "CREATE")
+    assert (change_log.operator_id, change_log.remark) == ("u-import", "批量导入 IMP-1")
+    catalog.register_paths_bulk.assert_awaited_once()
+    queue.enqueue.assert_called_once_with("test_case", [case.case_id])
+
+    assert sorted(error["row"] for error in job.errors) == [2, 3, 4, 6, 7]
+    assert "已存在相同标题" in job.errors[-1]["message"]
+    assert (job.processed_rows, job.created_count, job.failed_count) == (7, 1, 5)
+    update = env.job_update.await_args.args[1]
+    assert update["$set"]["processed_rows"] == 7
+    assert update["$inc"] == {"created_count": 1, "failed_count": 5}
+
+
+async def test_requirement_chunk_defaults_owner_and_writes_redundant_req_id():
+    service, gateway, _catalog, queue = _service(["wf-9"])
+    job = _job("requirement", defaults={})
+
+    with _patched_persistence(next_seq=range(5, 6)):
+        await service._import_chunk(job, [ImportRow(1, {"title": "R1", "tags": "a,b"})])
+
+    [item] = gateway.create_work_items.await_args.args[0]
+    [requirement] = _FakeRequirementDoc.inserted
+    assert item["req_id"] == requirement.req_id == f"TR-{datetime.now().year}-00005"
+    assert requirement.tpm_owner_id == "u-import"
+    assert requirement.tags == ["a", "b"]
+    queue.enqueue.assert_called_once_with("requirement", [requirement.req_id])
+
+
+async def test_failed_chunk_transaction_keeps_resume_position():
+    service, gateway, _catalog, queue = _service(["wf-1"])
+    gateway.create_work_items.side_effect = RuntimeError("write conflict")
+    job = _job(processed_rows=500)
+
+    with _patched_persistence():
+        with pytest.raises(RuntimeError):
+            await service._import_chunk(job, [ImportRow(501, {"title": "A", "catalog_path": "bios"})])
+
+    assert job.processed_rows == 500
+    queue.enqueue.assert_not_called()
+
+
+async def test_run_job_resumes_after_processed_rows():
+    service, *_ = _service([])
+    job = _job(processed_rows=1)
+
+    async def _download(file_id, target):
+        target.write("用例名称,目录\nA,bios\nB,bios\n".encode("utf-8"))
+        return "cases.csv"
+
+    seen = []
+    with patch(f"{SERVICE}.download_attachment_content", _download), \
+         patch.object(service, "_import_chunk", AsyncMock(side_effect=lambda _job, rows: seen.extend(rows))):
+        await service._run_import_job(job)
+
+    assert [row.row_number for row in seen] == [2]
+    assert job.status == "SUCCEEDED"
+    assert job.finished_at is not None
+
+
+async def test_resume_allows_failed_or_stale_running_jobs_only():
+    service, *_ = _service([])
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    jobs = {
+        "failed": _job(id="failed", status="FAILED", error="boom"),
+        "stale": _job(id="stale", status="RUNNING", updated_at=stale),
+        "running": _job(id="running", status="RUNNING"),
+    }
+
+    async def _claim(query, update):
+        # 按认领条件匹配：FAILED，或 updated_at 早于阈值的 RUNNING
+        job = jobs[query["_id"]]
+        failed, stale_running = query["$or"]
+        matched = job.status == failed["status"] or (
+            job.status == stale_running["status"] and job.updated_at < stale_running["updated_at"]["$lt"]
+        )
+        if matched:
+            job.status = update["$set"]["status"]
+        return SimpleNamespace(matched_count=int(matched))
+
+    job_doc = MagicMock()
+    job_doc.find_one = AsyncMock(side_effect=lambda query: jobs[query["job_id"]])
+    job_doc.get_pymongo_collection.return_value.update_one = AsyncMock(side_effect=_claim)
+
+    with patch(f"{SERVICE}.TestSpecImportJobDoc", job_doc), \
+         patch.object(service, "_start") as start, \
+         patch.object(service, "_doc_to_dict", side_effect=lambda job: {"status": job.status}):
+        assert (await service.resume_import_job("failed"))["status"] == "PENDING"
+        assert (await service.resume_import_job("stale"))["status"] == "PENDING"
+        with pytest.raises(ValueError):
+            await service.resume_import_job("running")
+        # 已被认领的任务不会被第二次续传重复启动
+        with pytest.raises(ValueError):
+            await service.resume_import_job("stale")
+        with pytest.raises(KeyError):
+            await service.resume_import_job("failed", entity_type="requirement")
+
+    assert jobs["failed"].error is None
+    assert start.call_count == 2
+
+
+async def test_run_job_heartbeats_updated_at_while_running(monkeypatch):
+    import app.modules.test_specs.service.import_service as import_module
+
+    monkeypatch.setattr(import_module, "IMPORT_JOB_HEARTBEAT_SECONDS", 0)
+    service, *_ = _service([])
+    job = _job()
+
+    async def _download(file_id, target):
+        target.write("用例名称,目录\nA,bios\n".encode("utf-8"))
+        return "cases.csv"
+
+    async def _slow_chunk(_job, rows):
+        await asyncio.sleep(0.01)
+
+    with _patched_persistence() as patched, \
+         patch(f"{SERVICE}.download_attachment_content", _download), \
+         patch.object(service, "_import_chunk", AsyncMock(side_effect=_slow_chunk)):
+        await service._run_import_job(job)
+        beats = patched.job_update.await_count
+        await asyncio.sleep(0.01)
+
+    assert beats > 0
+    # 任务结束后心跳停止
+    assert patched.job_update.await_count == beats
+    query, update = patched.job_update.await_args.args
+    assert query == {"_id": "job-oid", "status": "RUNNING"}
+    assert set(update["$set"]) == {"updated_at"}
+
+
+async def test_embedding_backfill_batches_requests():
+    docs = [{"case_id": f"TC-{index}", "title": f"case {index}"} for index in range(5)]
+
+    class _Cursor:
+        def __init__(self, query):
+            self._docs = [doc for doc in docs if doc["case_id"] in query["case_id"]["$in"]]
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for doc in self._docs:
+                yield doc
+
+    collection = MagicMock()
+    collection.find.side_effect = lambda query, projection: _Cursor(query)
+    collection.bulk_write = AsyncMock()
+    case_doc = MagicMock()
+    case_doc.get_pymongo_collection.return_value = collection
+    embed = AsyncMock(side_effect=lambda texts: [[0.1]] * (len(texts) - 1) + [None])
+    target = backfill_module._TARGETS["test_case"]
+
+    with patch.dict(backfill_module._TARGETS, {"test_case": (case_doc, *target[1:])}), \
+         patch.object(backfill_module.EmbeddingService, "embed_texts", embed):
+        queue = EmbeddingBackfillQueue(batch_size=2)
+        queue.enqueue("test_case", [doc["case_id"] for doc in docs])
+        await queue.wait_idle()
+
+    assert [len(call.args[0]) for call in embed.await_args_list] == [2, 2, 1]
+    assert sum(len(call.args[0]) for call in collection.bulk_write.await_args_list) == 2
+    assert queue.pending_count() == 0
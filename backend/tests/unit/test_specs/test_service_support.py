@@ -16,6 +16,7 @@ from app.modules.test_specs.service._service_support import (  # noqa: E402
     create_with_workflow_transaction,
     ensure_safe_generic_update,
     load_workflow_states_for_entities,
+    project_export_rows,
     workflow_aware_soft_delete,
 )
 
@@ -113,6 +114,30 @@ def test_apply_workflow_status_projection_adds_status_from_state_map() -> None:
     ]
 
 
+def test_project_export_rows_resolves_states_and_names_once_per_chunk(monkeypatch) -> None:
+    support = "app.modules.test_specs.service._service_support"
+    details = {"TC-1": {"status": "IN_REVIEW", "creator": "u1", "current_owner": "u2"}}
+    load_details = AsyncMock(return_value=details)
+    load_names = AsyncMock(return_value={"u1": "张三", "u2": "李四", "u3": "王五"})
+    monkeypatch.setattr(f"{support}.get_workflow_details_by_item_ids", load_details)
+    monkeypatch.setattr(f"{support}.load_user_names", load_names)
+    rows = [
+        {"case_id": "TC-1", "workflow_item_id": "wi-1", "owner_id": "u3"},
+        {"case_id": "TC-2", "owner_id": "u-gone", "owner_name": "旧名字"},
+    ]
+
+    result = asyncio.run(project_export_rows(rows, id_field="case_id", user_fields=("owner_id",)))
+
+    load_details.assert_awaited_once_with({"wi-1": "TC-1"}, resolve_user_names=False)
+    load_names.assert_awaited_once()
+    assert result[0]["status"] == "IN_REVIEW"
+    assert result[0]["creator_name"] == "张三"
+    assert result[0]["current_owner_name"] == "李四"
+    assert result[0]["owner_name"] == "王五"
+    assert result[1]["status"] == "未开始"
+    assert result[1]["owner_name"] == "旧名字"
+
+
 def test_load_workflow_states_for_entities_reads_docs_and_delegates(monkeypatch) -> None:
     monkeypatch.setattr(
         "app.modules.test_specs.service._service_support.get_workflow_states",
@@ -425,6 +425,34 @@ def test_list_test_cases_returns_empty_when_none():
     assert result == []
 
 
+def test_export_test_cases_streams_projected_chunks_with_list_filters():
+    service = build_service()
+    collection = MagicMock()
+    chunks = [[{"case_id": "TC-1"}, {"case_id": "TC-2"}], [{"case_id": "TC-3"}]]
+
+    async def _fake_chunks(coll, query, **kwargs):
+        assert coll is collection
+        assert query == {"$and": [{"is_deleted": False, "lab_id": "lab-1"}, {"owner_id": "u1"}]}
+        assert kwargs["projection"]["title"] == 1 and kwargs["projection"]["_id"] == 0
+        for chunk in chunks:
+            yield chunk
+
+    async def _collect():
+        return [rows async for rows in service.export_test_cases(["title"], lab_id="lab-1", owner_id="u1")]
+
+    fake_doc = MagicMock()
+    fake_doc.get_pymongo_collection.return_value = collection
+    project = AsyncMock(side_effect=lambda rows, **kwargs: rows)
+    with patch(f"{SERVICE}.TestCaseDoc", fake_doc), \
+         patch(f"{SERVICE}.iter_cursor_chunks", _fake_chunks), \
+         patch(f"{SERVICE}.project_export_rows", project):
+        result = asyncio_run(_collect())
+
+    assert result == chunks
+    assert project.await_count == 2
+    assert project.await_args.kwargs["user_fields"] == ("owner_id", "reviewer_id", "auto_dev_id")
+
+
 # ══════════════════════════════════════════════
 #  Tests: _generate_case_id
 # ══════════════════════════════════════════════
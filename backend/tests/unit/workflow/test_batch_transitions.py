@@ -0,0 +1,123 @@
+"""批量状态流转测试：整块一次查询并按内存状态机校验、一次 bulk_write + insert_many，单项失败不影响其余事项。"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from beanie import PydanticObjectId
+
+from app.modules.workflow.application import mutation_service as module
+from app.modules.workflow.application.mutation_service import WorkflowMutationService
+from app.modules.workflow.application.state_machine_store import WorkflowStateMachineStore
+from app.modules.workflow.domain.state_machine import compile_workflow
+
+OWNER = "u-1"
+
+
+def _item(state: str = "DRAFT", owner: str = OWNER) -> SimpleNamespace:
+    fields = {
+        "id": PydanticObjectId(),
+        "type_code": "TEST_CASE",
+        "current_state": state,
+        "current_owner_id": owner,
+        "creator_id": owner,
+        "project_ids": ["P-1"],
+    }
+    return SimpleNamespace(**fields, model_dump=lambda: dict(fields))
+
+
+def _config(from_state: str, to_state: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        type_code="TEST_CASE",
+        from_state=from_state,
+        to_state=to_state,
+        action="SUBMIT",
+        required_fields=[],
+        target_owner_strategy="KEEP",
+        properties={},
+    )
+
+
+class _FakeSession:
+    @asynccontextmanager
+    async def _transaction(self):
+        yield
+
+    async def start_transaction(self):
+        return self._transaction()
+
+
+def _patch(monkeypatch, items, configs, matched=None) -> SimpleNamespace:
+    session = _FakeSession()
+
+    @asynccontextmanager
+    async def start_session():
+        yield session
+
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(
+        side_effect=lambda updates, **_: SimpleNamespace(
+            matched_count=len(updates) if matched is None else matched
+        )
+    )
+    work_item_doc = MagicMock()
+    work_item_doc.find.return_value.to_list = AsyncMock(return_value=items)
+    work_item_doc.get_pymongo_collection.return_value = collection
+    flow_log_doc = MagicMock(side_effect=lambda **fields: SimpleNamespace(**fields))
+    flow_log_doc.insert_many = AsyncMock()
+    refresh = MagicMock()
+
+    monkeypatch.setattr(module, "BusWorkItemDoc", work_item_doc)
+    monkeypatch.setattr(WorkflowStateMachineStore, "_machine", compile_workflow(configs))
+    monkeypatch.setattr(WorkflowStateMachineStore, "_checked_at", WorkflowStateMachineStore.now())
+    monkeypatch.setattr(module, "BusFlowLogDoc", flow_log_doc)
+    monkeypatch.setattr(module, "schedule_search_refresh", refresh)
+    monkeypatch.setattr(
+        module, "docs_to_dicts", AsyncMock(side_effect=lambda docs: [{"id": str(doc.id)} for doc in docs])
+    )
+    monkeypatch.setattr(
+        WorkflowMutationService,
+        "get_mongo_client_or_none",
+        staticmethod(lambda: SimpleNamespace(start_session=start_session)),
+    )
+    return SimpleNamespace(
+        collection=collection, work_item_doc=work_item_doc,
+        flow_log_doc=flow_log_doc, refresh=refresh,
+    )
+
+
+async def test_batch_transition_writes_once_and_reports_per_item_outcomes(monkeypatch) -> None:
+    draft, approved, foreign = _item(), _item(state="APPROVED"), _item(owner="u-2")
+    missing = str(PydanticObjectId())
+    fakes = _patch(monkeypatch, [draft, approved, foreign], [_config("DRAFT", "PENDING_REVIEW")])
+    ids = [str(draft.id), str(approved.id), str(foreign.id), missing, str(draft.id)]
+
+    results = await WorkflowMutationService().handle_transitions(ids, "SUBMIT", OWNER, {})
+
+    assert [result["work_item_id"] for result in results] == ids[:4]
+    assert [result["success"] for result in results] == [True, False, False, False]
+    assert results[0]["to_state"] == "PENDING_REVIEW"
+    assert results[0]["work_item"] == {"id": str(draft.id)}
+    fakes.work_item_doc.find.assert_called_once()
+    [updates] = fakes.collection.bulk_write.await_args.args
+    assert len(updates) == 1
+    [logs] = fakes.flow_log_doc.insert_many.await_args.args
+    assert [(log.to_state, log.project_ids) for log in logs] == [("PENDING_REVIEW", ["P-1"])]
+    fakes.refresh.assert_called_once_with("work_item", [str(draft.id)])
+
+
+async def test_batch_transition_fails_whole_chunk_on_concurrent_change(monkeypatch) -> None:
+    monkeypatch.setattr(module, "BATCH_TRANSITION_CHUNK_SIZE", 1)
+    first, second = _item(), _item()
+    fakes = _patch(monkeypatch, [first, second], [_config("DRAFT", "PENDING_REVIEW")], matched=0)
+
+    results = await WorkflowMutationService().handle_transitions(
+        [str(first.id), str(second.id)], "SUBMIT", OWNER, {}
+    )
+
+    assert [result["success"] for result in results] == [False, False]
+    assert "并发流转冲突" in results[0]["error"]
+    assert fakes.collection.bulk_write.await_count == 2
+    fakes.flow_log_doc.insert_many.assert_not_awaited()
+    fakes.refresh.assert_not_called()
@@ -9,6 +9,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.modules.workflow.application import (  # noqa: E402
+    BatchTransitionWorkItemsCommand,
     DeleteWorkItemCommand,
     OperationContext,
     TransitionWorkItemCommand,
@@ -40,6 +41,19 @@ class _FakeMutationService:
             },
         }
 
+    async def handle_transitions(
+        self,
+        work_item_ids: list[str],
+        action: str,
+        operator_id: str,
+        form_data: dict,
+        actor_role_ids: list[str],
+    ) -> list[dict]:
+        return [
+            {"work_item_id": item_id, "success": item_id != "wi-bad", "to_state": "DONE"}
+            for item_id in work_item_ids
+        ]
+
     async def delete_item(
         self,
         item_id: str,
@@ -50,6 +64,17 @@ class _FakeMutationService:
         return True
 
 
+class _FakeBatchHook:
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+
+    async def after_transitions(self, results: list[dict]) -> None:
+        self.batches.append(results)
+
+    async def after_transition(self, result: dict) -> None:
+        raise AssertionError("batch hook should be preferred")
+
+
 class _FakeQueryService:
     async def get_item_by_id(self, item_id: str) -> dict:
         return {
@@ -100,6 +125,29 @@ def test_transition_work_item_runs_post_transition_hooks() -> None:
     assert hook.transition_results == [result]
 
 
+def test_batch_transition_runs_batch_hook_once_and_falls_back_per_item() -> None:
+    batch_hook = _FakeBatchHook()
+    single_hook = _FakeHook()
+    command_service = WorkflowCommandService(
+        mutation_service=_FakeMutationService(),
+        query_service=_FakeQueryService(),
+        mutation_hooks=[batch_hook, single_hook],
+    )
+    context = OperationContext(actor_id="u-1", role_ids=["ROLE_QA"])
+
+    results = asyncio.run(
+        command_service.transition_work_items(
+            context,
+            BatchTransitionWorkItemsCommand(work_item_ids=["wi-1", "wi-bad", "wi-2"], action="submit"),
+        )
+    )
+
+    succeeded = [result for result in results if result["success"]]
+    assert [result["work_item_id"] for result in succeeded] == ["wi-1", "wi-2"]
+    assert batch_hook.batches == [succeeded]
+    assert single_hook.transition_results == succeeded
+
+
 def test_delete_work_item_runs_delete_hooks_around_workflow_delete() -> None:
     mutation_service = _FakeMutationService()
     hook = _FakeHook()
@@ -10,25 +10,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.modules.workflow.application.query_service import WorkflowQueryService  # noqa: E402
-
-
-class _FakeConfigQuery:
-    def __init__(self, configs: list[SimpleNamespace]) -> None:
-        self._configs = configs
-
-    async def to_list(self) -> list[SimpleNamespace]:
-        return self._configs
-
-
-class _FakeWorkflowConfigDoc:
-    type_code = object()
-    from_state = object()
-
-    configs: list[SimpleNamespace] = []
-
-    @classmethod
-    def find(cls, *args) -> _FakeConfigQuery:
-        return _FakeConfigQuery(cls.configs)
+from app.modules.workflow.application.state_machine_store import WorkflowStateMachineStore  # noqa: E402
+from app.modules.workflow.domain.state_machine import compile_workflow  # noqa: E402
 
 
 def test_get_item_with_transitions_filters_by_actor_role(monkeypatch) -> None:
@@ -45,6 +28,8 @@ def test_get_item_with_transitions_filters_by_actor_role(monkeypatch) -> None:
 
     configs = [
         SimpleNamespace(
+            type_code="REQUIREMENT",
+            from_state="DRAFT",
             action="SUBMIT",
             to_state="PENDING_REVIEW",
             target_owner_strategy="TO_SPECIFIC_USER",
@@ -52,6 +37,8 @@ def test_get_item_with_transitions_filters_by_actor_role(monkeypatch) -> None:
             properties={"allowed_role_ids": ["TPM"]},
         ),
         SimpleNamespace(
+            type_code="REQUIREMENT",
+            from_state="DRAFT",
             action="QA_ONLY",
             to_state="PENDING_TEST",
             target_owner_strategy="KEEP",
@@ -61,11 +48,8 @@ def test_get_item_with_transitions_filters_by_actor_role(monkeypatch) -> None:
     ]
 
     monkeypatch.setattr(service, "get_item_by_id", fake_get_item_by_id)
-    _FakeWorkflowConfigDoc.configs = configs
-    monkeypatch.setattr(
-        "app.modules.workflow.application.query_service.SysWorkflowConfigDoc",
-        _FakeWorkflowConfigDoc,
-    )
+    monkeypatch.setattr(WorkflowStateMachineStore, "_machine", compile_workflow(configs))
+    monkeypatch.setattr(WorkflowStateMachineStore, "_checked_at", WorkflowStateMachineStore.now())
 
     result = asyncio.run(
         service.get_item_with_transitions(
@@ -75,3 +59,34 @@ def test_get_item_with_transitions_filters_by_actor_role(monkeypatch) -> None:
     )
 
     assert [transition["action"] for transition in result["available_transitions"]] == ["SUBMIT"]
+
+
+def test_search_items_page_returns_offset_cursor_for_ranked_results(monkeypatch) -> None:
+    ranked_ids = ["65f000000000000000000001", "65f000000000000000000002"]
+    search_calls: list[dict] = []
+
+    class _FakeSearchService:
+        async def search_entity_ids(self, entity_type, keyword, **kwargs):
+            search_calls.append(kwargs)
+            return ranked_ids
+
+    class _FakeItemQuery:
+        def find(self, *args):
+            return self
+
+        async def to_list(self):
+            return [SimpleNamespace(id=item_id) for item_id in reversed(ranked_ids)]
+
+    async def fake_docs_to_dicts(docs):
+        return [{"id": str(doc.id)} for doc in docs]
+
+    module = "app.modules.workflow.application.query_service"
+    monkeypatch.setattr(f"{module}.base_item_query", lambda *args: _FakeItemQuery())
+    monkeypatch.setattr(f"{module}.docs_to_dicts", fake_docs_to_dicts)
+    service = WorkflowQueryService(search_service=_FakeSearchService())
+
+    items, next_cursor = asyncio.run(service.search_items_page("内存", limit=2))
+    assert [item["id"] for item in items] == ranked_ids
+
+    asyncio.run(service.search_items_page("内存", limit=2, cursor=next_cursor))
+    assert [call["offset"] for call in search_calls] == [0, 2]
@@ -0,0 +1,92 @@
+"""编译状态机测试：查表与权限判断不访问数据库、与 can_transition 结果一致、版本变化时整体替换。"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.modules.workflow.application import state_machine_store as store_module
+from app.modules.workflow.application.state_machine_store import WorkflowStateMachineStore
+from app.modules.workflow.domain.policies import can_transition
+from app.modules.workflow.domain.state_machine import compile_workflow
+
+ITEM = {"type_code": "REQUIREMENT", "current_state": "DRAFT", "creator_id": "u-1", "current_owner_id": "u-2"}
+
+
+def _config(action: str, **properties) -> SimpleNamespace:
+    return SimpleNamespace(
+        type_code="REQUIREMENT",
+        from_state="DRAFT",
+        action=action,
+        to_state="PENDING_REVIEW",
+        target_owner_strategy="KEEP",
+        required_fields=["remark"],
+        properties=properties,
+    )
+
+
+CONFIGS = [
+    _config("DEFAULT"),
+    _config("TPM_ONLY", allowed_role_ids=["ROLE_TPM", "pm"]),
+    _config("OWNER_ONLY", owner_only=True, allowed_role_ids=["QA"]),
+    _config("REVIEWER", allowed_actor_types=["reviewer"], allowed_role_ids=["QA"]),
+]
+
+
+def test_compiled_table_indexes_rules_and_precomputes_role_grants() -> None:
+    machine = compile_workflow(CONFIGS, version=3, type_codes=["REQUIREMENT"], state_codes=["DRAFT"])
+
+    rule = machine.transition("REQUIREMENT", "DRAFT", "TPM_ONLY")
+    assert rule.required_fields == ("remark",)
+    assert machine.transition("REQUIREMENT", "DRAFT", "MISSING") is None
+    assert [rule.action for rule in machine.transitions_from("REQUIREMENT", "DRAFT")] == [
+        "DEFAULT", "TPM_ONLY", "OWNER_ONLY", "REVIEWER",
+    ]
+    # 只有纯角色授权的规则进入角色动作表
+    assert machine.role_actions[("REQUIREMENT", "DRAFT")] == {"TPM": {"TPM_ONLY"}, "PM": {"TPM_ONLY"}}
+
+
+@pytest.mark.parametrize(
+    "actor",
+    [
+        {"actor_id": "u-1", "role_ids": []},
+        {"actor_id": "u-2", "role_ids": ["QA"]},
+        {"actor_id": "u-9", "role_ids": ["tpm"]},
+        {"actor_id": "u-9", "role_ids": ["ROLE_REVIEWER", "ROLE_QA"]},
+    ],
+)
+def test_permits_matches_can_transition(actor) -> None:
+    machine = compile_workflow(CONFIGS)
+
+    expected = [config.action for config in CONFIGS if can_transition(actor, ITEM, config)]
+    assert [rule.action for rule in machine.allowed_transitions(actor, ITEM)] == expected
+
+
+async def test_store_reloads_only_when_version_changes(monkeypatch) -> None:
+    versions = iter([1, 1, 2])
+    monkeypatch.setattr(
+        store_module, "current_workflow_version", AsyncMock(side_effect=lambda: next(versions))
+    )
+    loads: list[int] = []
+
+    async def fake_load(version: int):
+        loads.append(version)
+        machine = compile_workflow(CONFIGS, version=version)
+        WorkflowStateMachineStore.install(machine)
+        return machine
+
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(WorkflowStateMachineStore, "_clock", staticmethod(lambda: clock.now))
+    monkeypatch.setattr(WorkflowStateMachineStore, "_load", staticmethod(fake_load))
+    monkeypatch.setattr(WorkflowStateMachineStore, "_machine", None)
+
+    first = await WorkflowStateMachineStore.get()
+    assert await WorkflowStateMachineStore.get() is first
+    clock.now += store_module.STATE_MACHINE_CHECK_SECONDS
+    assert await WorkflowStateMachineStore.get() is first
+    clock.now += store_module.STATE_MACHINE_CHECK_SECONDS
+    second = await WorkflowStateMachineStore.get()
+
+    assert loads == [1, 2]
+    assert second.version == 2 and second is not first
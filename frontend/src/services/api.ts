@@ -120,11 +120,12 @@ class ApiClient {
 
   async getTestCaseChangeLogs(
     caseId: string,
-    params?: { limit?: number; offset?: number },
+    params?: { limit?: number; offset?: number; cursor?: string },
   ): Promise<ApiResponse<TestCaseChangeLogListResponse>> {
     const searchParams = new URLSearchParams();
     if (params?.limit != null) searchParams.set('limit', String(params.limit));
     if (params?.offset != null) searchParams.set('offset', String(params.offset));
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
     const qs = searchParams.toString();
     return this.request(`/test-cases/${caseId}/change-logs${qs ? `?${qs}` : ''}`, {
       method: 'GET',
@@ -746,16 +747,23 @@ class ApiClient {
     });
   }
 
-  /** 批量下发自动化用例 */
+  /** 批量下发自动化用例（后台任务，返回任务句柄与逐条进度） */
   async batchDispatchPlanItems(
     data: BatchDispatchPlanItemsRequest,
-  ): Promise<ApiResponse<Array<Record<string, unknown>>>> {
-    return this.request<Array<Record<string, unknown>>>('/execution-plans/items/batch-dispatch', {
+  ): Promise<ApiResponse<Record<string, unknown>>> {
+    return this.request<Record<string, unknown>>('/execution-plans/items/batch-dispatch', {
       method: 'POST',
       body: JSON.stringify(data),
     });
   }
 
+  /** 查询批量下发任务进度 */
+  async getBatchDispatchJob(jobId: string): Promise<ApiResponse<Record<string, unknown>>> {
+    return this.request<Record<string, unknown>>(`/execution-plans/items/batch-dispatch/${jobId}`, {
+      method: 'GET',
+    });
+  }
+
   // ══════════════════════════════════════════════════════════════
   //  执行计划 — Plan CRUD
   // ══════════════════════════════════════════════════════════════
@@ -317,6 +317,7 @@ export interface TestCaseChangeLog {
 export interface TestCaseChangeLogListResponse {
   items: TestCaseChangeLog[];
   total: number;
+  next_cursor?: string | null;
 }
 
 // ═══════════════════════════════════════════════════════════════════════